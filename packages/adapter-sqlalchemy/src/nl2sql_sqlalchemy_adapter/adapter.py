@@ -1,4 +1,4 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from sqlalchemy import create_engine, inspect, text, Engine, select, func, table, column, case, literal_column, Connection
 from sqlalchemy.engine.reflection import Inspector
 from typing import Tuple
@@ -108,11 +108,29 @@ class BaseSQLAlchemyAdapter:
             DatasourceCapability.SUPPORTS_COST_ESTIMATE,
         }
 
-    def execute_sql(self, sql: str) -> ResultFrame:
+    def _effective_timeout_ms(self, timeout_ms: Optional[int]) -> Optional[int]:
+        """Tighter of the per-request timeout and the configured statement timeout."""
+        candidates = [t for t in (timeout_ms, self.statement_timeout_ms) if t]
+        return int(min(candidates)) if candidates else None
+
+    def set_statement_timeout(self, conn: Connection, timeout_ms: int) -> None:
+        """Applies a per-statement timeout on ``conn``.
+
+        No-op by default; dialect adapters override it with their native
+        server-side mechanism.
+        """
+
+    def clear_statement_timeout(self, conn: Connection) -> None:
+        """Reverts ``set_statement_timeout`` before ``conn`` returns to the pool."""
+
+    def execute_sql(self, sql: str, timeout_ms: Optional[int] = None) -> ResultFrame:
         """Executes a SQL query against the datasource.
 
         Args:
             sql (str): The SQL query string to execute.
+            timeout_ms (Optional[int]): Per-request statement timeout, typically
+                the remaining request budget. The configured
+                ``statement_timeout_ms`` still applies if it is tighter.
 
         Returns:
             ResultFrame: The results of the query execution.
@@ -127,15 +145,21 @@ class BaseSQLAlchemyAdapter:
         start = time.perf_counter()
         
         with self.engine.connect() as conn:
-            result = conn.execute(text(sql))
-            if result.returns_rows:
-                rows = [list(row) for row in result.fetchall()]
-                cols = list(result.keys())
-                row_count = len(rows)
-            else:
-                rows = []
-                cols = []
-                row_count = result.rowcount
+            if timeout_ms:
+                self.set_statement_timeout(conn, self._effective_timeout_ms(timeout_ms))
+            try:
+                result = conn.execute(text(sql))
+                if result.returns_rows:
+                    rows = [list(row) for row in result.fetchall()]
+                    cols = list(result.keys())
+                    row_count = len(rows)
+                else:
+                    rows = []
+                    cols = []
+                    row_count = result.rowcount
+            finally:
+                if timeout_ms:
+                    self.clear_statement_timeout(conn)
             
         duration = time.perf_counter() - start
         
@@ -193,7 +217,7 @@ class BaseSQLAlchemyAdapter:
                 ),
             )
 
-        return self.execute_sql(sql)
+        return self.execute_sql(sql, timeout_ms=request.limits.get("timeout_ms"))
 
 
     @property
@@ -62,6 +62,13 @@ class MssqlAdapter(BaseSQLAlchemyAdapter):
         
         return f"mssql+pyodbc://{creds}{netloc}/{database}{query_str}"
 
+    def set_statement_timeout(self, conn, timeout_ms: int) -> None:
+        # pyodbc query timeout, in whole seconds (0 disables it).
+        conn.connection.driver_connection.timeout = max(1, -(-int(timeout_ms) // 1000))
+
+    def clear_statement_timeout(self, conn) -> None:
+        conn.connection.driver_connection.timeout = 0
+
     def dry_run(self, sql: str) -> DryRunResult:
         try:
             with self.engine.connect() as conn:
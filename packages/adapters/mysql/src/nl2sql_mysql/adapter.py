@@ -79,6 +79,13 @@ class MysqlAdapter(BaseSQLAlchemyAdapter):
             logging.getLogger(__name__).error(f"Failed to connect to MySQL: {e}")
             raise
 
+    def set_statement_timeout(self, conn, timeout_ms: int) -> None:
+        conn.execute(text(f"SET SESSION MAX_EXECUTION_TIME = {int(timeout_ms)}"))
+
+    def clear_statement_timeout(self, conn) -> None:
+        # Pooled connections keep session variables; restore the configured default.
+        conn.execute(text(f"SET SESSION MAX_EXECUTION_TIME = {int(self.statement_timeout_ms or 0)}"))
+
     def dry_run(self, sql: str) -> DryRunResult:
         try:
             with self.engine.connect() as conn:
@@ -77,6 +77,11 @@ class PostgresAdapter(BaseSQLAlchemyAdapter):
             logging.getLogger(__name__).error(f"Failed to connect to Postgres: {e}")
             raise
 
+    def set_statement_timeout(self, conn, timeout_ms: int) -> None:
+        # SET LOCAL is scoped to the connection's implicit transaction, which
+        # is rolled back when the connection is released.
+        conn.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+
     def dry_run(self, sql: str) -> DryRunResult:
         try:
             self.execute_sql(f"EXPLAIN {sql}")
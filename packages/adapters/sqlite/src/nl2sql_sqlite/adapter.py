@@ -58,6 +58,19 @@ class SqliteAdapter(BaseSQLAlchemyAdapter):
             import logging
             logging.getLogger(__name__).error(f"Failed to connect to Sqlite: {e}")
             raise
+    def set_statement_timeout(self, conn, timeout_ms: int) -> None:
+        # SQLite has no statement timeout; a progress handler that returns
+        # non-zero interrupts the running statement once the budget is spent.
+        import time
+
+        expires_at = time.monotonic() + timeout_ms / 1000.0
+        conn.connection.driver_connection.set_progress_handler(
+            lambda: 1 if time.monotonic() >= expires_at else 0, 10_000
+        )
+
+    def clear_statement_timeout(self, conn) -> None:
+        conn.connection.driver_connection.set_progress_handler(None, 0)
+
     def dry_run(self, query: str) -> DryRunResult:
         try:
             with self.engine.connect() as conn:
@@ -1,11 +1,18 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 
 class QueryRequest(BaseModel):
     natural_language: str
     datasource_id: Optional[str] = None
     execute: bool = True
     user_context: Optional[Dict[str, Any]] = None
+    priority: Literal["interactive", "batch"] = "interactive"
+
+
+class ResumeRequest(BaseModel):
+    execute: bool = True
+    user_context: Optional[Dict[str, Any]] = None
+    priority: Literal["interactive", "batch"] = "interactive"
 
 
 class QueryResponse(BaseModel):
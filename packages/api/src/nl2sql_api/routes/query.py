@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Annotated
-from nl2sql_api.models.query import QueryRequest, QueryResponse
+import math
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Annotated, Any, AsyncIterator, Dict, Literal, Optional
+from nl2sql import AdmissionRejected, ResumeUnavailable
+from nl2sql_api.models.query import QueryRequest, QueryResponse, ResumeRequest
 from nl2sql_api.dependencies import get_query_service
 from nl2sql_api.services import QueryService
 
@@ -8,13 +12,82 @@ router = APIRouter()
 
 QuerySvc = Annotated[QueryService, Depends(get_query_service)]
 
+
+def _too_many_requests(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(e),
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after_sec)))},
+    )
+
 @router.post("/query", response_model=QueryResponse)
 async def execute_query(
     payload: QueryRequest,
     service: QuerySvc,
 ):
     try:
-        return service.execute_query(payload)
+        return await service.aexecute_query(payload)
+    except AdmissionRejected as e:
+        raise _too_many_requests(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/query/stream")
+async def stream_query(
+    payload: QueryRequest,
+    service: QuerySvc,
+    format: Literal["sse", "ndjson"] = Query("sse"),
+):
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/event-stream"
+    events = service.astream_query(payload, format=format)
+    # Admission happens before the first event, so read it eagerly to answer
+    # a shed request with 429 instead of an empty 200 stream.
+    try:
+        first = await events.__anext__()
+    except AdmissionRejected as e:
+        raise _too_many_requests(e)
+    except StopAsyncIteration:
+        first = None
+
+    async def _body() -> AsyncIterator[str]:
+        if first is None:
+            return
+        yield first
+        async for line in events:
+            yield line
+
+    return StreamingResponse(
+        _body(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.delete("/query/cache", response_model=Dict[str, Any])
+async def purge_answer_cache(
+    service: QuerySvc,
+    datasource_id: Optional[str] = Query(None),
+    tenant_id: Optional[str] = Query(None),
+):
+    try:
+        return service.purge_answer_cache(datasource_id=datasource_id, tenant_id=tenant_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/query/{trace_id}/resume", response_model=QueryResponse)
+async def resume_query(
+    trace_id: str,
+    service: QuerySvc,
+    payload: ResumeRequest = ResumeRequest(),
+):
+    try:
+        return await service.aresume_query(trace_id, payload)
+    except ResumeUnavailable as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except AdmissionRejected as e:
+        raise _too_many_requests(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
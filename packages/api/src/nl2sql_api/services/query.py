@@ -1,6 +1,6 @@
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, Union
 from nl2sql import NL2SQL
-from nl2sql_api.models.query import QueryRequest, QueryResponse
+from nl2sql_api.models.query import QueryRequest, QueryResponse, ResumeRequest
 from nl2sql.auth.models import UserContext
 
 
@@ -8,19 +8,13 @@ class QueryService:
     def __init__(self, engine: NL2SQL):
         self.engine = engine
 
-    def execute_query(self, request: QueryRequest) -> QueryResponse:
+    def _user_context(self, request: Union[QueryRequest, ResumeRequest]) -> Optional[UserContext]:
         # Convert user_context if provided
-        user_context = None
         if request.user_context:
-            user_context = UserContext(**request.user_context)
-
-        result = self.engine.run_query(
-            request.natural_language,
-            datasource_id=request.datasource_id,
-            execute=request.execute,
-            user_context=user_context
-        )
+            return UserContext(**request.user_context)
+        return None
 
+    def _to_response(self, result) -> QueryResponse:
         # Map the result to QueryResponse
         return QueryResponse(
             sql=result.sql,
@@ -30,4 +24,49 @@ class QueryService:
             trace_id=result.trace_id,
             reasoning=result.reasoning or [],
             warnings=result.warnings or []
-        )
\ No newline at end of file
+        )
+
+    def execute_query(self, request: QueryRequest) -> QueryResponse:
+        result = self.engine.run_query(
+            request.natural_language,
+            datasource_id=request.datasource_id,
+            execute=request.execute,
+            user_context=self._user_context(request),
+            priority=request.priority,
+        )
+        return self._to_response(result)
+
+    async def aexecute_query(self, request: QueryRequest) -> QueryResponse:
+        result = await self.engine.arun_query(
+            request.natural_language,
+            datasource_id=request.datasource_id,
+            execute=request.execute,
+            user_context=self._user_context(request),
+            priority=request.priority,
+        )
+        return self._to_response(result)
+
+    async def aresume_query(self, trace_id: str, request: ResumeRequest) -> QueryResponse:
+        result = await self.engine.aresume_query(
+            trace_id,
+            execute=request.execute,
+            user_context=self._user_context(request),
+            priority=request.priority,
+        )
+        return self._to_response(result)
+
+    async def astream_query(self, request: QueryRequest, format: str = "sse") -> AsyncIterator[str]:
+        async for event in self.engine.astream_query(
+            request.natural_language,
+            datasource_id=request.datasource_id,
+            execute=request.execute,
+            user_context=self._user_context(request),
+            priority=request.priority,
+        ):
+            yield event.to_ndjson() if format == "ndjson" else event.to_sse()
+
+    def purge_answer_cache(
+        self, datasource_id: Optional[str] = None, tenant_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        purged = self.engine.purge_answer_cache(datasource_id=datasource_id, tenant_id=tenant_id)
+        return {"success": True, "purged": purged}
@@ -548,7 +548,12 @@ class ConsolePresenter:
 
     def print_cost_summary(self, total_duration: float, token_log: List[Dict[str, Any]]) -> None:
         total_tokens = sum(entry["total_tokens"] for entry in token_log)
-        self.console.print(f"[dim]Total Duration: {total_duration:.2f}s | Total Tokens: {total_tokens}[/dim]")
+        prompt_tokens = sum(entry.get("prompt_tokens", 0) for entry in token_log)
+        cached_tokens = sum(entry.get("cached_prompt_tokens", 0) for entry in token_log)
+        cache_rate = f" | Prompt Cache Hits: {cached_tokens / prompt_tokens:.0%}" if prompt_tokens else ""
+        self.console.print(
+            f"[dim]Total Duration: {total_duration:.2f}s | Total Tokens: {total_tokens}{cache_rate}[/dim]"
+        )
 
     # ------------------------------------------------------------------
     # Benchmarking (benchmark.py)
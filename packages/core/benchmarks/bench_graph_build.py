@@ -0,0 +1,72 @@
+"""Per-request graph setup cost: rebuild-per-query vs. cached compiled graph.
+
+Run from the repository root:
+
+    python packages/core/benchmarks/bench_graph_build.py --iterations 50
+
+Nodes are constructed against stub registries so the numbers reflect graph
+construction and compilation only (no LLM, vector store or database I/O).
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from nl2sql.pipeline.graph import build_graph, get_compiled_graph
+from nl2sql.pipeline.graph_cache import CompiledGraphCache
+
+
+def _stub_context() -> SimpleNamespace:
+    llm = MagicMock()
+    llm.with_structured_output.return_value = llm
+    return SimpleNamespace(
+        llm_registry=SimpleNamespace(get_llm=lambda _name: llm),
+        ds_registry=MagicMock(),
+        vector_store=MagicMock(),
+        schema_store=MagicMock(),
+        rbac=MagicMock(),
+        tenant_id="bench",
+        graph_cache=CompiledGraphCache(),
+        config_revision=(0, 0, 0),
+    )
+
+
+def _measure(fn, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:<22} mean={statistics.mean(samples):8.3f} ms  "
+        f"p50={statistics.median(samples):8.3f} ms  p95={p95:8.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    ctx = _stub_context()
+
+    before = _measure(lambda: build_graph(ctx, execute=True), args.iterations)
+    get_compiled_graph(ctx, execute=True)
+    after = _measure(lambda: get_compiled_graph(ctx, execute=True), args.iterations)
+
+    _report("build_graph (before)", before)
+    _report("cached graph (after)", after)
+
+
+if __name__ == "__main__":
+    main()
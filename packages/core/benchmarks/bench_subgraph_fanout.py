@@ -0,0 +1,188 @@
+"""Per-branch state handoff cost for wide scan layers.
+
+Compares the previous handoff (whole decomposer/resolver responses in every
+``Send`` payload, ``model_dump`` into the subgraph, ``model_validate`` of its
+result, linear sub-query lookup) with the current by-reference handoff.
+
+Run from the repository root:
+
+    python packages/core/benchmarks/bench_subgraph_fanout.py --width 64 --tables 40
+
+The subgraph is a passthrough runnable that returns ``--tables`` retrieved
+tables and an executor response, and both wrappers are called directly, so
+the numbers reflect state handoff only (no runnable overhead and no LLM,
+vector store or database I/O).
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from langchain_core.runnables import RunnableLambda
+
+from nl2sql.execution.contracts import ArtifactRef, ExecutorResponse
+from nl2sql.pipeline.graph_utils import build_scan_payload, wrap_subgraph
+from nl2sql.pipeline.nodes.datasource_resolver.schemas import DatasourceResolverResponse, ResolvedDatasource
+from nl2sql.pipeline.nodes.decomposer.schemas import (
+    DecomposerResponse,
+    ExpectedColumn,
+    FilterSpec,
+    MetricSpec,
+    SubQuery,
+)
+from nl2sql.pipeline.nodes.schema_retriever.schema import Column, Table
+from nl2sql.pipeline.state import GraphState, SubgraphExecutionState
+
+_SUBGRAPH = "sql_agent"
+
+
+def _tables(count: int) -> list[Table]:
+    return [
+        Table(
+            name=f"table_{i}",
+            columns=[Column(name=f"col_{j}", type="INTEGER") for j in range(12)],
+        )
+        for i in range(count)
+    ]
+
+
+def _state(width: int) -> GraphState:
+    sub_queries = [
+        SubQuery(
+            id=f"sq_{i}",
+            datasource_id="ds",
+            intent=f"intent {i}",
+            metrics=[MetricSpec(name="amount", aggregation="sum")],
+            filters=[FilterSpec(attribute="region", operator="=", value=f"r{i}")],
+            expected_schema=[ExpectedColumn(name="amount", dtype="float")],
+        )
+        for i in range(width)
+    ]
+    resolver = DatasourceResolverResponse(
+        resolved_datasources=[ResolvedDatasource(datasource_id="ds")],
+        allowed_datasource_ids=["ds"],
+    )
+    return GraphState(
+        user_query="q",
+        decomposer_response=DecomposerResponse(sub_queries=sub_queries, combine_groups=[]),
+        datasource_resolver_response=resolver,
+    )
+
+
+class _Subgraph:
+    """Minimal stand-in for a compiled subgraph, without runnable call overhead."""
+
+    def __init__(self, fn):
+        self._fn = fn
+
+    def invoke(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        return self._fn(state)
+
+
+def _scan_subgraph(tables: int) -> _Subgraph:
+    """Passthrough subgraph that returns retrieved tables and an executor response."""
+    relevant_tables = _tables(tables)
+
+    def _scan(state: Dict[str, Any]) -> Dict[str, Any]:
+        sub_query = state["sub_query"]
+        sq_id = sub_query["id"] if isinstance(sub_query, dict) else sub_query.id
+        artifact = ArtifactRef(
+            uri=f"file:///{sq_id}.parquet",
+            backend="local",
+            format="parquet",
+            row_count=1,
+            columns=["n"],
+            bytes=1,
+            content_hash=sq_id,
+            created_at=datetime(2026, 1, 1),
+            path_template="{sq_id}",
+        )
+        response = ExecutorResponse(
+            executor_name="sql_executor", subgraph_name=_SUBGRAPH, node_id=sq_id,
+            trace_id=state["trace_id"], artifact=artifact, tenant_id="bench",
+        )
+        return {**state, "relevant_tables": relevant_tables, "executor_response": response}
+
+    return _Subgraph(_scan)
+
+
+def _copying_wrapper(subgraph):
+    """The handoff as it was before by-reference payloads."""
+
+    def _wrapper(payload: Dict[str, Any]) -> Dict[str, Any]:
+        sub_query_id = payload["subgraph_id"].split(":")[1]
+        target = next(q for q in payload["decomposer_response"].sub_queries if q.id == sub_query_id)
+        sub_state = SubgraphExecutionState(
+            trace_id=payload["trace_id"],
+            user_context=payload["user_context"],
+            sub_query=target,
+            subgraph_id=payload["subgraph_id"],
+            subgraph_name=_SUBGRAPH,
+        )
+        returned = SubgraphExecutionState.model_validate(subgraph.invoke(sub_state.model_dump()))
+        return {"errors": returned.errors}
+
+    return RunnableLambda(_wrapper, name=_SUBGRAPH)
+
+
+def _copying_layer(state: GraphState, wrapped) -> None:
+    for sq in state.decomposer_response.sub_queries:
+        wrapped.func({
+            "subgraph_id": f"{_SUBGRAPH}:{sq.id}:{state.trace_id}",
+            "trace_id": state.trace_id,
+            "user_context": state.user_context,
+            "decomposer_response": state.decomposer_response,
+            "datasource_resolver_response": state.datasource_resolver_response,
+        })
+
+
+def _reference_layer(state: GraphState, wrapped) -> None:
+    sub_query_map = {sq.id: sq for sq in state.decomposer_response.sub_queries}
+    for node_id, sq in sub_query_map.items():
+        wrapped.func(build_scan_payload(state, _SUBGRAPH, node_id, sq))
+
+
+def _measure(fn, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float], width: int) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    mean = statistics.mean(samples)
+    print(
+        f"{label:<24} layer mean={mean:8.3f} ms  p95={p95:8.3f} ms  "
+        f"per branch={mean / width * 1000:8.1f} us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=64, help="Scan branches in the layer.")
+    parser.add_argument("--tables", type=int, default=40, help="Relevant tables per sub-query.")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    state = _state(args.width)
+    subgraph = _scan_subgraph(args.tables)
+    copying = _copying_wrapper(subgraph)
+    wrapped = wrap_subgraph(subgraph, _SUBGRAPH, ctx=None)
+
+    before = _measure(lambda: _copying_layer(state, copying), args.iterations)
+    after = _measure(lambda: _reference_layer(state, wrapped), args.iterations)
+
+    _report("copying handoff (before)", before, args.width)
+    _report("by-reference (after)", after, args.width)
+
+
+if __name__ == "__main__":
+    main()
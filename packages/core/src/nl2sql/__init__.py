@@ -15,6 +15,9 @@ from .api.benchmark_api import BenchmarkAPI
 
 # Also expose core models and enums
 from .common.errors import ErrorSeverity, ErrorCode, PipelineError
+from .pipeline.streaming import PipelineEvent
+from .pipeline.admission import AdmissionRejected, Priority
+from .pipeline.checkpointing import ResumeUnavailable
 from .auth.models import UserContext
 from .evaluation.types import BenchmarkConfig
 
@@ -33,6 +36,10 @@ __all__ = [
     "ErrorSeverity",
     "ErrorCode",
     "PipelineError",
+    "PipelineEvent",
+    "AdmissionRejected",
+    "Priority",
+    "ResumeUnavailable",
     "UserContext",
     "BenchmarkConfig",
 ]
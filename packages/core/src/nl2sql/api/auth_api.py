@@ -20,7 +20,11 @@ class AuthAPI:
     
     def __init__(self, ctx: NL2SQLContext):
         self._ctx = ctx
-        self._rbac: RBAC = ctx.rbac
+
+    @property
+    def _rbac(self) -> RBAC:
+        # Read per call: reloading policies replaces the context's RBAC.
+        return self._ctx.rbac
     
     def check_permissions(
         self,
@@ -79,4 +79,14 @@ class LLM_API:
         Returns:
             List of LLM names
         """
-        return self._registry.list_llms()
\ No newline at end of file
+        return self._registry.list_llms()
+
+    def endpoint_health(self) -> dict:
+        """
+        Report health and load of pooled LLM endpoints.
+
+        Returns:
+            Map of agent name to per-endpoint health (in-flight calls,
+            cooldown, failure streaks, rate factor)
+        """
+        return self._registry.endpoint_health()
\ No newline at end of file
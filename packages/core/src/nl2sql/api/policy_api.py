@@ -41,6 +41,21 @@ class PolicyAPI:
     def __init__(self, ctx: Optional[NL2SQLContext] = None):
         self._ctx = ctx
 
+    def reload_policies(self, policies_path: Optional[pathlib.Path] = None) -> None:
+        """
+        Reload RBAC policies into the running engine.
+
+        The next request recompiles the pipeline graph, and cached plans and
+        answers computed under the old policies are dropped.
+
+        Args:
+            policies_path: Path to the policies file; defaults to the configured path.
+        """
+        if self._ctx is None:
+            raise ValueError("Reloading policies requires an engine context.")
+        path = pathlib.Path(policies_path) if policies_path else pathlib.Path(settings.policies_config_path)
+        self._ctx.set_policies(self._ctx.config_manager.load_policies(path))
+
     def validate_policies(
         self,
         policies_path: Optional[pathlib.Path] = None,
@@ -6,11 +6,22 @@ Provides functionality for executing natural language queries against databases.
 
 from __future__ import annotations
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterator, Sequence
 
 from pydantic import BaseModel, Field
 from nl2sql.context import NL2SQLContext
-from nl2sql.pipeline.runtime import run_with_graph
+from nl2sql.pipeline.runtime import (
+    aresume_with_graph,
+    arun_with_graph,
+    astream_with_graph,
+    resume_with_graph,
+    run_with_graph,
+    stream_with_graph,
+)
+from nl2sql.common.concurrency import ConcurrencyLimits
+from nl2sql.pipeline.admission import Priority
+from nl2sql.pipeline.batch import BatchInput, BatchQuery, BatchRun
+from nl2sql.pipeline.streaming import PipelineEvent
 from nl2sql.auth import UserContext
 from nl2sql.execution.contracts import ArtifactRef
 
@@ -50,6 +61,7 @@ class QueryAPI:
         datasource_id: Optional[str] = None,
         execute: bool = True,
         user_context: Optional[UserContext] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> Dict[str, Any]:
         """
         Execute a natural language query against the database.
@@ -59,6 +71,7 @@ class QueryAPI:
             datasource_id: Optional specific datasource to query (otherwise auto-resolved)
             execute: Whether to actually execute the SQL against the database
             user_context: Optional user context for permissions
+            priority: Admission class (interactive or batch)
             
         Returns:
             Raw graph state dict from the pipeline execution
@@ -68,6 +81,226 @@ class QueryAPI:
             natural_language,
             datasource_id=datasource_id,
             execute=execute,
-            user_context=user_context
+            user_context=user_context,
+            priority=priority,
+        )
+        return result_dict
+
+    async def arun_query(
+        self,
+        natural_language: str,
+        datasource_id: Optional[str] = None,
+        execute: bool = True,
+        user_context: Optional[UserContext] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of ``run_query``.
+
+        Awaits the pipeline on the running event loop instead of occupying a
+        worker thread, so many queries can be in flight while waiting on LLM
+        and database I/O.
+
+        Args:
+            natural_language: The natural language query to execute
+            datasource_id: Optional specific datasource to query (otherwise auto-resolved)
+            execute: Whether to actually execute the SQL against the database
+            user_context: Optional user context for permissions
+            priority: Admission class (interactive or batch)
+
+        Returns:
+            Raw graph state dict from the pipeline execution
+        """
+        return await arun_with_graph(
+            self._ctx,
+            natural_language,
+            datasource_id=datasource_id,
+            execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    def resume_query(
+        self,
+        trace_id: str,
+        execute: bool = True,
+        user_context: Optional[UserContext] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Dict[str, Any]:
+        """
+        Resume a failed query from its last successful pipeline step.
+
+        Requires checkpointing (CHECKPOINT_ENABLED). Steps that completed
+        before the failure, including successful datasource scans, are not
+        repeated.
+
+        Args:
+            trace_id: Trace ID of the failed query
+            execute: Whether to actually execute the SQL against the database
+            user_context: Optional caller identity; must match the original request
+            priority: Admission class (interactive or batch)
+
+        Returns:
+            Raw graph state dict from the resumed execution
+
+        Raises:
+            ResumeUnavailable: If the trace cannot be resumed
+        """
+        return resume_with_graph(
+            self._ctx,
+            trace_id,
+            execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    async def aresume_query(
+        self,
+        trace_id: str,
+        execute: bool = True,
+        user_context: Optional[UserContext] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of ``resume_query``.
+
+        Returns:
+            Raw graph state dict from the resumed execution
+        """
+        return await aresume_with_graph(
+            self._ctx,
+            trace_id,
+            execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    def stream_query(
+        self,
+        natural_language: str,
+        datasource_id: Optional[str] = None,
+        execute: bool = True,
+        user_context: Optional[UserContext] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Iterator[PipelineEvent]:
+        """
+        Execute a natural language query, yielding progress events as they occur.
+
+        Emits ``node`` events for resolver output, decomposition, per-subgraph
+        SQL and artifact refs, ``token`` events while the answer is synthesized,
+        and a final ``result`` (or ``error``) event.
+
+        Args:
+            natural_language: The natural language query to execute
+            datasource_id: Optional specific datasource to query (otherwise auto-resolved)
+            execute: Whether to actually execute the SQL against the database
+            user_context: Optional user context for permissions
+            priority: Admission class (interactive or batch)
+
+        Returns:
+            Iterator of PipelineEvent
+        """
+        return stream_with_graph(
+            self._ctx,
+            natural_language,
+            datasource_id=datasource_id,
+            execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    def astream_query(
+        self,
+        natural_language: str,
+        datasource_id: Optional[str] = None,
+        execute: bool = True,
+        user_context: Optional[UserContext] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[PipelineEvent]:
+        """
+        Async variant of ``stream_query``.
+
+        Returns:
+            Async iterator of PipelineEvent
+        """
+        return astream_with_graph(
+            self._ctx,
+            natural_language,
+            datasource_id=datasource_id,
+            execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    def purge_answer_cache(
+        self,
+        datasource_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+    ) -> int:
+        """
+        Drop cached answers so the next identical questions run the pipeline.
+
+        Use after a data load when a datasource's answers must not wait for
+        their TTL. Schema changes invalidate cached answers on their own.
+
+        Args:
+            datasource_id: Only purge answers that read this datasource
+            tenant_id: Only purge answers cached for this tenant
+
+        Returns:
+            Number of purged answers (0 when ANSWER_CACHE_ENABLED is off)
+        """
+        cache = getattr(self._ctx, "answer_cache", None)
+        if cache is None:
+            return 0
+        return cache.purge(datasource_id=datasource_id, tenant_id=tenant_id)
+
+    def run_queries(
+        self,
+        batch: Sequence[BatchInput],
+        concurrency: int = 4,
+        per_datasource_concurrency: Optional[int] = None,
+        per_llm_concurrency: Optional[int] = None,
+        execute: bool = True,
+        user_context: Optional[UserContext] = None,
+    ) -> BatchRun:
+        """
+        Execute many natural language queries, yielding results as they complete.
+
+        Identical questions run once. Questions without a datasource override
+        are embedded in a single batch for datasource resolution. Questions are
+        admitted with batch priority, behind interactive requests.
+
+        Args:
+            batch: Questions as strings or BatchQuery (query + datasource override)
+            concurrency: Maximum number of pipelines in flight
+            per_datasource_concurrency: Optional cap on concurrent SQL executions per datasource
+            per_llm_concurrency: Optional cap on concurrent calls per LLM agent
+            execute: Whether to actually execute the SQL against the database
+            user_context: Optional user context for permissions
+
+        Returns:
+            BatchRun iterator of BatchItemResult (raw graph state dicts);
+            aggregate throughput is available on ``.stats``
+        """
+
+        def _run_one(item: BatchQuery) -> Dict[str, Any]:
+            return run_with_graph(
+                self._ctx,
+                item.query,
+                datasource_id=item.datasource_id,
+                execute=execute,
+                user_context=user_context,
+                priority=Priority.BATCH,
+            )
+
+        return BatchRun(
+            batch,
+            _run_one,
+            concurrency=concurrency,
+            limits=ConcurrencyLimits(
+                per_llm=per_llm_concurrency,
+                per_datasource=per_datasource_concurrency,
+            ),
+            vector_store=getattr(self._ctx, "vector_store", None),
         )
-        return result_dict
\ No newline at end of file
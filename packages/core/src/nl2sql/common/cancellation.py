@@ -1,22 +1,98 @@
 from __future__ import annotations
 
+import asyncio
 import threading
+import time
+import weakref
 from typing import Optional
 
-_cancel_event = threading.Event()
+
+class CancellationToken:
+    """Request-scoped cancellation flag.
+
+    Each pipeline request owns one token, carried in graph state so that nodes
+    and retry handlers only observe cancellation of their own request.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks up to ``timeout`` seconds; returns True if cancelled."""
+        return self._event.wait(timeout=timeout)
+
+    def __deepcopy__(self, memo) -> "CancellationToken":
+        # Copies of graph state must keep observing the same request.
+        return self
+
+    def __repr__(self) -> str:
+        return f"CancellationToken(cancelled={self.is_cancelled()})"
+
+
+_active_tokens: "weakref.WeakSet[CancellationToken]" = weakref.WeakSet()
+_tokens_lock = threading.Lock()
+
+
+def register(token: CancellationToken) -> None:
+    """Tracks a token so process-wide cancellation (signals) reaches it."""
+    with _tokens_lock:
+        _active_tokens.add(token)
+
+
+def unregister(token: CancellationToken) -> None:
+    with _tokens_lock:
+        _active_tokens.discard(token)
 
 
 def cancel() -> None:
-    _cancel_event.set()
+    """Cancels every in-flight request (process-wide, e.g. on SIGINT).
+
+    Only registered tokens are cancelled; nothing process-wide stays set, so
+    requests started afterwards are unaffected.
+    """
+    with _tokens_lock:
+        tokens = list(_active_tokens)
+    for token in tokens:
+        token.cancel()
+
 
+def is_cancelled(token: Optional[CancellationToken] = None) -> bool:
+    """Whether ``token`` is cancelled; work without a token cannot be cancelled."""
+    return token is not None and token.is_cancelled()
 
-def reset() -> None:
-    _cancel_event.clear()
 
+def wait(token: Optional[CancellationToken] = None, timeout: Optional[float] = None) -> bool:
+    """Blocks up to ``timeout`` seconds; returns True if ``token`` was cancelled."""
+    if token is not None:
+        return token.wait(timeout=timeout)
+    if timeout:
+        time.sleep(timeout)
+    return False
 
-def is_cancelled() -> bool:
-    return _cancel_event.is_set()
 
+async def async_wait(
+    token: Optional[CancellationToken] = None,
+    timeout: Optional[float] = None,
+    poll_interval: float = 0.1,
+) -> bool:
+    """Event-loop friendly ``wait``: sleeps without holding a thread.
 
-def wait(timeout: Optional[float] = None) -> bool:
-    return _cancel_event.wait(timeout=timeout)
\ No newline at end of file
+    Tokens are thread-based, so this polls at ``poll_interval``. Returns True
+    as soon as cancellation is observed, False once ``timeout`` elapses.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not is_cancelled(token):
+        if deadline is None:
+            await asyncio.sleep(poll_interval)
+            continue
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(poll_interval, remaining))
+    return True
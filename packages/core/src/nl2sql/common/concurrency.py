@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+# How often ``aslot`` retries a busy semaphore.
+_ASYNC_POLL_INTERVAL_SEC = 0.01
+
+
+class KeyedLimiter:
+    """Lazily created bounded semaphores, one per key (e.g. datasource id)."""
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        self.limit = limit
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._semaphores.get(key)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.limit)
+                self._semaphores[key] = sem
+            return sem
+
+    @contextmanager
+    def slot(self, key: str) -> Iterator[None]:
+        sem = self._get(key)
+        sem.acquire()
+        try:
+            yield
+        finally:
+            sem.release()
+
+    @asynccontextmanager
+    async def aslot(self, key: str) -> AsyncIterator[None]:
+        sem = self._get(key)
+        # Semaphores are shared with sync callers, so the loop polls a
+        # non-blocking acquire. A blocking acquire in a worker thread would
+        # still take the slot after the awaiting task was cancelled, and the
+        # slot would never be released.
+        while not sem.acquire(blocking=False):
+            await asyncio.sleep(_ASYNC_POLL_INTERVAL_SEC)
+        try:
+            yield
+        finally:
+            sem.release()
+
+
+class ConcurrencyLimits:
+    """Per-LLM-agent and per-datasource concurrency bounds.
+
+    Activated for a scope with ``use_limits``; pipeline code consults them via
+    ``llm_slot``/``datasource_slot``, which are no-ops when no limits are
+    active. Limits propagate to pipeline worker threads with the context.
+    """
+
+    def __init__(
+        self,
+        per_llm: Optional[int] = None,
+        per_datasource: Optional[int] = None,
+    ):
+        self.llm = KeyedLimiter(per_llm) if per_llm else None
+        self.datasource = KeyedLimiter(per_datasource) if per_datasource else None
+
+
+_active_limits: contextvars.ContextVar[Optional[ConcurrencyLimits]] = contextvars.ContextVar(
+    "nl2sql_concurrency_limits", default=None
+)
+
+
+@contextmanager
+def use_limits(limits: Optional[ConcurrencyLimits]) -> Iterator[None]:
+    """Activates ``limits`` for the current context."""
+    token = _active_limits.set(limits)
+    try:
+        yield
+    finally:
+        _active_limits.reset(token)
+
+
+@contextmanager
+def _slot(limiter: Optional[KeyedLimiter], key: Optional[str]) -> Iterator[None]:
+    if limiter is None or not key:
+        yield
+        return
+    with limiter.slot(key):
+        yield
+
+
+@asynccontextmanager
+async def _aslot(limiter: Optional[KeyedLimiter], key: Optional[str]) -> AsyncIterator[None]:
+    if limiter is None or not key:
+        yield
+        return
+    async with limiter.aslot(key):
+        yield
+
+
+def llm_slot(agent: Optional[str]):
+    limits = _active_limits.get()
+    return _slot(limits.llm if limits else None, agent)
+
+
+def allm_slot(agent: Optional[str]):
+    limits = _active_limits.get()
+    return _aslot(limits.llm if limits else None, agent)
+
+
+def datasource_slot(datasource_id: Optional[str]):
+    limits = _active_limits.get()
+    return _slot(limits.datasource if limits else None, datasource_id)
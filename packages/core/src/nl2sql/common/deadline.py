@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from nl2sql.common.exceptions import NL2SQLError
+
+
+class DeadlineExceeded(NL2SQLError):
+    """Raised when an operation would start after the request deadline."""
+
+
+_active_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "nl2sql_deadline", default=None
+)
+
+
+def deadline_after(timeout_sec: Optional[float]) -> Optional[float]:
+    """Absolute deadline (epoch seconds) ``timeout_sec`` from now."""
+    if timeout_sec is None:
+        return None
+    return time.time() + timeout_sec
+
+
+def remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left until ``deadline`` (never negative); None if unbounded."""
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.time())
+
+
+def is_expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.time() >= deadline
+
+
+@contextmanager
+def use_deadline(deadline: Optional[float]) -> Iterator[None]:
+    """Activates ``deadline`` for the current context.
+
+    LLM clients, embeddings, vector searches and executors read it through
+    ``call_timeout`` so they can bound their own I/O without the deadline
+    being threaded through every signature.
+    """
+    token = _active_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _active_deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    return _active_deadline.get()
+
+
+def call_timeout(default: Optional[float] = None, operation: str = "operation") -> Optional[float]:
+    """Timeout for an I/O call under the active deadline.
+
+    Returns the smaller of ``default`` and the time left, or ``default`` when
+    no deadline is active.
+
+    Raises:
+        DeadlineExceeded: If the active deadline has already passed.
+    """
+    left = remaining(_active_deadline.get())
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded(f"Request deadline exceeded before {operation} started.")
+    return left if default is None else min(default, left)
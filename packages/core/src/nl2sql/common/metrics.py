@@ -21,6 +21,140 @@ token_usage_counter = _meter.create_counter(
     unit="1",
 )
 
+single_flight_counter = _meter.create_counter(
+    name="nl2sql.single_flight.coalesced",
+    description="Number of requests served by attaching to an identical in-flight execution",
+    unit="1",
+)
+
+admission_queue_depth = _meter.create_up_down_counter(
+    name="nl2sql.admission.queue_depth",
+    description="Number of requests waiting for admission",
+    unit="1",
+)
+admission_wait_histogram = _meter.create_histogram(
+    name="nl2sql.admission.wait_time",
+    description="Time requests spent waiting for admission in seconds",
+    unit="s",
+)
+admission_rejected_counter = _meter.create_counter(
+    name="nl2sql.admission.rejected",
+    description="Number of requests rejected by admission control",
+    unit="1",
+)
+
+llm_cache_hit_counter = _meter.create_counter(
+    name="nl2sql.llm_cache.hits",
+    description="Number of LLM calls answered from the response cache",
+    unit="1",
+)
+llm_cache_miss_counter = _meter.create_counter(
+    name="nl2sql.llm_cache.misses",
+    description="Number of cache-enabled LLM calls sent to the provider",
+    unit="1",
+)
+
+schema_prompt_tokens_counter = _meter.create_counter(
+    name="nl2sql.schema_prompt.tokens",
+    description="Estimated tokens of rendered schema sections in planner and refiner prompts",
+    unit="1",
+)
+schema_prompt_tokens_saved_counter = _meter.create_counter(
+    name="nl2sql.schema_prompt.tokens_saved",
+    description="Estimated prompt tokens saved by compact schema rendering versus JSON dumps",
+    unit="1",
+)
+plan_cache_hit_counter = _meter.create_counter(
+    name="nl2sql.plan_cache.hits",
+    description="Number of SQL agent runs that reused a cached AST plan",
+    unit="1",
+)
+plan_cache_miss_counter = _meter.create_counter(
+    name="nl2sql.plan_cache.misses",
+    description="Number of SQL agent runs that had to plan from scratch",
+    unit="1",
+)
+llm_pool_requests_counter = _meter.create_counter(
+    name="nl2sql.llm_pool.requests",
+    description="Number of LLM pool calls by endpoint and outcome (ok, rate_limited, failed, error, cancelled)",
+    unit="1",
+)
+llm_pool_wait_histogram = _meter.create_histogram(
+    name="nl2sql.llm_pool.wait_time",
+    description="Time LLM calls waited for pool endpoint capacity in seconds",
+    unit="s",
+)
+llm_tier_calls_counter = _meter.create_counter(
+    name="nl2sql.llm_tier.calls",
+    description="Cascaded LLM calls per model tier and routing reason",
+    unit="1",
+)
+llm_tier_latency_histogram = _meter.create_histogram(
+    name="nl2sql.llm_tier.latency",
+    description="Latency of cascaded LLM calls per model tier in seconds",
+    unit="s",
+)
+llm_hedge_fired_counter = _meter.create_counter(
+    name="nl2sql.llm_hedge.fired",
+    description="Number of slow LLM calls that sent a hedged duplicate",
+    unit="1",
+)
+llm_hedge_won_counter = _meter.create_counter(
+    name="nl2sql.llm_hedge.won",
+    description="Number of hedged duplicates that returned before the original call",
+    unit="1",
+)
+cassette_counter = _meter.create_counter(
+    name="nl2sql.cassette.calls",
+    description="LLM and embedding calls recorded to or replayed from the cassette",
+    unit="1",
+)
+plan_template_hit_counter = _meter.create_counter(
+    name="nl2sql.plan_templates.hits",
+    description="Number of SQL agent runs that bound literals into a plan template",
+    unit="1",
+)
+plan_template_miss_counter = _meter.create_counter(
+    name="nl2sql.plan_templates.misses",
+    description="Number of template lookups that fell back to the planner",
+    unit="1",
+)
+answer_synthesis_counter = _meter.create_counter(
+    name="nl2sql.answer_synthesizer.answers",
+    description="Synthesized answers by path (template or llm)",
+    unit="1",
+)
+answer_cache_hit_counter = _meter.create_counter(
+    name="nl2sql.answer_cache.hits",
+    description="Number of requests answered from the answer cache",
+    unit="1",
+)
+answer_cache_miss_counter = _meter.create_counter(
+    name="nl2sql.answer_cache.misses",
+    description="Number of answer cache lookups that ran the pipeline",
+    unit="1",
+)
+plan_repair_counter = _meter.create_counter(
+    name="nl2sql.plan_repair.attempts",
+    description="Rule-based repairs of plans that failed logical validation, by outcome",
+    unit="1",
+)
+single_source_route_counter = _meter.create_counter(
+    name="nl2sql.single_source.routes",
+    description="Questions routed by the single-datasource classifier, by route and reason",
+    unit="1",
+)
+decomposition_cache_hit_counter = _meter.create_counter(
+    name="nl2sql.decomposition_cache.hits",
+    description="Number of decompositions reused without calling the decomposer LLM",
+    unit="1",
+)
+decomposition_cache_miss_counter = _meter.create_counter(
+    name="nl2sql.decomposition_cache.misses",
+    description="Number of decompositions that called the decomposer LLM",
+    unit="1",
+)
+
 
 def configure_metrics(exporter_type: str = "none", otlp_endpoint: Optional[str] = None):
     """Configures the OpenTelemetry Metric Provider.
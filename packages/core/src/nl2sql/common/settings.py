@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 import os
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,6 +28,23 @@ class Settings(BaseSettings):
     benchmark_config_path: str = Field(default="configs/benchmark_suite.yaml", validation_alias="BENCHMARK_CONFIG")
     secrets_config_path: str = Field(default="configs/secrets.yaml", validation_alias="SECRETS_CONFIG")
     embedding_model: str = Field(default="text-embedding-3-small", validation_alias="EMBEDDING_MODEL")
+    embedding_provider: Literal["openai", "local"] = Field(
+        default="openai",
+        validation_alias="EMBEDDING_PROVIDER",
+        description="Embedding backend: 'openai', or 'local' for deterministic offline hash embeddings."
+    )
+    local_embedding_dimensions: int = Field(
+        default=384,
+        ge=8,
+        validation_alias="LOCAL_EMBEDDING_DIMENSIONS",
+        description="Vector size of the local hash embeddings."
+    )
+    local_embedding_latency_ms: float = Field(
+        default=0.0,
+        ge=0,
+        validation_alias="LOCAL_EMBEDDING_LATENCY_MS",
+        description="Artificial latency per local embedding call, for load tests."
+    )
     tenant_id: str = Field(default="default_tenant", validation_alias="TENANT_ID")
     sample_questions_path: str = Field(
         default="configs/sample_questions.yaml", 
@@ -63,6 +80,318 @@ class Settings(BaseSettings):
         description="Max workers for latency-sensitive execution pool."
     )
 
+    pipeline_max_workers: int = Field(
+        default=16,
+        validation_alias="PIPELINE_MAX_WORKERS",
+        description="Max concurrent pipeline executions in the shared worker pool."
+    )
+
+    single_flight_enabled: bool = Field(
+        default=True,
+        validation_alias="SINGLE_FLIGHT_ENABLED",
+        description="Coalesce concurrent identical requests into one pipeline execution."
+    )
+
+    admission_enabled: bool = Field(
+        default=True,
+        validation_alias="ADMISSION_ENABLED",
+        description="Enable admission control in front of pipeline executions."
+    )
+
+    admission_max_concurrent: int = Field(
+        default=16,
+        validation_alias="ADMISSION_MAX_CONCURRENT",
+        description="Max pipeline executions admitted at once across all tenants."
+    )
+
+    admission_tenant_max_concurrent: Optional[int] = Field(
+        default=None,
+        validation_alias="ADMISSION_TENANT_MAX_CONCURRENT",
+        description="Max pipeline executions admitted at once per tenant (unbounded if unset)."
+    )
+
+    admission_max_queue: int = Field(
+        default=64,
+        validation_alias="ADMISSION_MAX_QUEUE",
+        description="Max requests waiting for admission before new ones are rejected."
+    )
+
+    admission_queue_timeout_sec: float = Field(
+        default=10.0,
+        validation_alias="ADMISSION_QUEUE_TIMEOUT_SEC",
+        description="Max seconds a request waits for admission before it is rejected."
+    )
+
+    checkpoint_enabled: bool = Field(
+        default=False,
+        validation_alias="CHECKPOINT_ENABLED",
+        description="Checkpoint main-graph state per trace so failed requests can be resumed."
+    )
+
+    checkpoint_backend: str = Field(
+        default="sqlite",
+        validation_alias="CHECKPOINT_BACKEND",
+        description="Checkpoint backend identifier ('sqlite' or 'memory')."
+    )
+
+    checkpoint_path: str = Field(
+        default="data/checkpoints.db",
+        validation_alias="CHECKPOINT_PATH",
+        description="SQLite database path for pipeline checkpoints."
+    )
+
+    checkpoint_retention_sec: Optional[float] = Field(
+        default=86400.0,
+        validation_alias="CHECKPOINT_RETENTION_SEC",
+        description="Age after which a trace's checkpoints are deleted (kept forever if unset)."
+    )
+
+    llm_pool_max_attempts: int = Field(
+        default=3,
+        validation_alias="LLM_POOL_MAX_ATTEMPTS",
+        description="Max endpoints tried per call when pool endpoints are rate limited or failing."
+    )
+
+    llm_pool_max_wait_sec: float = Field(
+        default=30.0,
+        validation_alias="LLM_POOL_MAX_WAIT_SEC",
+        description="Max time a call waits for a pool endpoint to have capacity (seconds)."
+    )
+
+    llm_pool_backoff_base_sec: float = Field(
+        default=1.0,
+        validation_alias="LLM_POOL_BACKOFF_BASE_SEC",
+        description="Base cooldown after a 429 without retry headers; doubles per consecutive 429 (seconds)."
+    )
+
+    llm_pool_backoff_max_sec: float = Field(
+        default=60.0,
+        validation_alias="LLM_POOL_BACKOFF_MAX_SEC",
+        description="Max cooldown after a 429 without retry headers (seconds)."
+    )
+
+    llm_pool_unhealthy_after: int = Field(
+        default=3,
+        validation_alias="LLM_POOL_UNHEALTHY_AFTER",
+        description="Consecutive transient failures after which a pool endpoint is taken out of rotation."
+    )
+
+    llm_pool_unhealthy_cooldown_sec: float = Field(
+        default=30.0,
+        validation_alias="LLM_POOL_UNHEALTHY_COOLDOWN_SEC",
+        description="Time an unhealthy pool endpoint stays out of rotation (seconds)."
+    )
+
+    llm_hedge_percentile: float = Field(
+        default=95.0,
+        validation_alias="LLM_HEDGE_PERCENTILE",
+        description="Percentile of an agent's recent LLM latency after which a hedged duplicate is sent."
+    )
+
+    llm_hedge_min_delay_sec: float = Field(
+        default=0.5,
+        validation_alias="LLM_HEDGE_MIN_DELAY_SEC",
+        description="Minimum wait before a hedged duplicate is sent (seconds)."
+    )
+
+    llm_hedge_min_samples: int = Field(
+        default=20,
+        validation_alias="LLM_HEDGE_MIN_SAMPLES",
+        description="Recent latencies required before an agent's calls are hedged."
+    )
+
+    llm_hedge_window: int = Field(
+        default=200,
+        validation_alias="LLM_HEDGE_WINDOW",
+        description="Number of recent calls used for hedge latency percentiles and spend caps."
+    )
+
+    llm_hedge_max_ratio: float = Field(
+        default=0.1,
+        validation_alias="LLM_HEDGE_MAX_RATIO",
+        description="Max fraction of recent calls that may send a hedged duplicate (caps extra spend)."
+    )
+
+    llm_hedge_max_workers: int = Field(
+        default=32,
+        validation_alias="LLM_HEDGE_MAX_WORKERS",
+        description="Threads shared by hedged sync LLM calls."
+    )
+
+    cassette_mode: Literal["off", "record", "replay"] = Field(
+        default="off",
+        validation_alias="CASSETTE_MODE",
+        description="Record LLM and embedding calls to a cassette, or replay them from it instead of calling the APIs."
+    )
+
+    cassette_path: str = Field(
+        default="data/cassette.jsonl",
+        validation_alias="CASSETTE_PATH",
+        description="JSON Lines cassette file used by CASSETTE_MODE."
+    )
+
+    cassette_replay_latency: bool = Field(
+        default=False,
+        validation_alias="CASSETTE_REPLAY_LATENCY",
+        description="Sleep for the recorded latency of each replayed call."
+    )
+
+    llm_cache_backend: str = Field(
+        default="sqlite",
+        validation_alias="LLM_CACHE_BACKEND",
+        description="LLM response cache backend ('sqlite' or 'memory') for agents with cache enabled."
+    )
+
+    llm_cache_path: str = Field(
+        default="data/llm_cache.db",
+        validation_alias="LLM_CACHE_PATH",
+        description="SQLite database path for the LLM response cache."
+    )
+
+    llm_cache_ttl_sec: Optional[float] = Field(
+        default=86400.0,
+        validation_alias="LLM_CACHE_TTL_SEC",
+        description="Age after which cached LLM responses expire (never if unset)."
+    )
+
+    llm_cache_max_entries: int = Field(
+        default=10000,
+        validation_alias="LLM_CACHE_MAX_ENTRIES",
+        description="Max cached LLM responses; least recently used are evicted first."
+    )
+
+    plan_cache_enabled: bool = Field(
+        default=True,
+        validation_alias="PLAN_CACHE_ENABLED",
+        description="Reuse validated AST plans for repeated sub-queries on the same schema version."
+    )
+
+    plan_cache_max_entries: int = Field(
+        default=1024,
+        validation_alias="PLAN_CACHE_MAX_ENTRIES",
+        description="Max cached AST plans; least recently used are evicted first."
+    )
+
+    schema_prompt_max_tokens: int = Field(
+        default=4000,
+        validation_alias="SCHEMA_PROMPT_MAX_TOKENS",
+        description="Token budget for the schema section of planner and refiner prompts (0 disables the limit)."
+    )
+
+    schema_prompt_max_distinct_for_samples: int = Field(
+        default=25,
+        validation_alias="SCHEMA_PROMPT_MAX_DISTINCT_FOR_SAMPLES",
+        description="Show sample values in schema prompts only for columns with at most this many distinct values."
+    )
+
+    schema_prompt_max_sample_values: int = Field(
+        default=5,
+        validation_alias="SCHEMA_PROMPT_MAX_SAMPLE_VALUES",
+        description="Max sample values shown per column in schema prompts."
+    )
+
+    plan_templates_enabled: bool = Field(
+        default=False,
+        validation_alias="PLAN_TEMPLATES_ENABLED",
+        description="Bind new filter literals into plans of sub-queries with the same shape instead of calling the planner."
+    )
+
+    plan_templates_max_entries: int = Field(
+        default=512,
+        validation_alias="PLAN_TEMPLATES_MAX_ENTRIES",
+        description="Max plan templates; least recently used are evicted first."
+    )
+
+    single_source_fast_path_enabled: bool = Field(
+        default=False,
+        validation_alias="SINGLE_SOURCE_FAST_PATH_ENABLED",
+        description="Send simple single-datasource questions from the resolver straight to a SQL agent, skipping decomposition and global planning."
+    )
+
+    single_source_max_words: int = Field(
+        default=30,
+        ge=1,
+        validation_alias="SINGLE_SOURCE_MAX_WORDS",
+        description="Longest question (in words) the single-datasource fast path accepts."
+    )
+
+    single_source_max_inline_rows: int = Field(
+        default=1000,
+        ge=0,
+        validation_alias="SINGLE_SOURCE_MAX_INLINE_ROWS",
+        description="Most rows a fast-path scan returns inline in graph state; larger results are read from their artifact by the aggregator."
+    )
+
+    decomposition_cache_enabled: bool = Field(
+        default=True,
+        validation_alias="DECOMPOSITION_CACHE_ENABLED",
+        description="Reuse decomposer output for repeated queries over the same resolved datasources."
+    )
+
+    decomposition_cache_ttl_sec: Optional[float] = Field(
+        default=3600.0,
+        validation_alias="DECOMPOSITION_CACHE_TTL_SEC",
+        description="Age after which cached decompositions expire (never if unset)."
+    )
+
+    decomposition_cache_max_entries: int = Field(
+        default=1024,
+        validation_alias="DECOMPOSITION_CACHE_MAX_ENTRIES",
+        description="Max cached decompositions; least recently used are evicted first."
+    )
+
+    answer_cache_enabled: bool = Field(
+        default=False,
+        validation_alias="ANSWER_CACHE_ENABLED",
+        description="Serve repeated questions from a cache of final answers."
+    )
+
+    answer_cache_ttl_sec: float = Field(
+        default=300.0,
+        validation_alias="ANSWER_CACHE_TTL_SEC",
+        description="Default age after which cached answers expire; datasources may override it."
+    )
+
+    answer_cache_max_entries: int = Field(
+        default=1024,
+        validation_alias="ANSWER_CACHE_MAX_ENTRIES",
+        description="Max cached answers; least recently used are evicted first."
+    )
+
+    answer_fast_path_enabled: bool = Field(
+        default=False,
+        validation_alias="ANSWER_FAST_PATH_ENABLED",
+        description="Answer small results (empty, scalar, single row or short table) from templates instead of an LLM call."
+    )
+
+    answer_fast_path_max_rows: int = Field(
+        default=10,
+        ge=1,
+        validation_alias="ANSWER_FAST_PATH_MAX_ROWS",
+        description="Most rows a result may have to be answered from a template."
+    )
+
+    answer_fast_path_max_columns: int = Field(
+        default=8,
+        ge=1,
+        validation_alias="ANSWER_FAST_PATH_MAX_COLUMNS",
+        description="Most columns a result may have to be answered from a template."
+    )
+
+    answer_summary_min_rows: int = Field(
+        default=100,
+        ge=1,
+        validation_alias="ANSWER_SUMMARY_MIN_ROWS",
+        description="Results with more rows are sent to the answer synthesizer as a summary (row count, column stats, top rows)."
+    )
+
+    answer_summary_top_k: int = Field(
+        default=20,
+        ge=0,
+        validation_alias="ANSWER_SUMMARY_TOP_K",
+        description="Rows included verbatim in a result summary."
+    )
+
     sandbox_index_workers: int = Field(
         default=2,
         validation_alias="SANDBOX_INDEX_WORKERS",
@@ -153,6 +482,12 @@ class Settings(BaseSettings):
         description="Treat missing columns as errors in logical validation."
     )
 
+    plan_repair_enabled: bool = Field(
+        default=True,
+        validation_alias="PLAN_REPAIR_ENABLED",
+        description="Repair mechanical plan mistakes (alias, case, GROUP BY, ordinals) and re-validate before falling back to the refiner."
+    )
+
     sql_agent_max_retries: int = Field(
         default=3,
         validation_alias="SQL_AGENT_MAX_RETRIES",
@@ -173,6 +508,11 @@ class Settings(BaseSettings):
         validation_alias="SQL_AGENT_RETRY_JITTER_SEC",
         description="Max jitter added to SQL agent retry delays (seconds)."
     )
+    sql_agent_retry_min_budget_sec: float = Field(
+        default=5.0,
+        validation_alias="SQL_AGENT_RETRY_MIN_BUDGET_SEC",
+        description="Min request time that must remain after the backoff delay for a SQL agent retry to start (seconds)."
+    )
 
     observability_exporter: str = Field(
         default="none",
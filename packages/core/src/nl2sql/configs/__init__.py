@@ -1,6 +1,6 @@
 
 from .datasources import DatasourceConfig, ConnectionConfig, DatasourceFileConfig
-from .llm import LLMFileConfig, AgentConfig
+from .llm import LLMFileConfig, AgentConfig, LLMEndpointConfig
 from .policies import PolicyFileConfig, RolePolicy
 from .secrets import SecretProviderConfig
 from .manager import ConfigManager
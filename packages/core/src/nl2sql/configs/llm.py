@@ -1,6 +1,19 @@
 
-from typing import Optional, Dict
-from pydantic import BaseModel, Field, SecretStr
+from typing import List, Literal, Optional, Dict
+from pydantic import BaseModel, Field, SecretStr, model_validator
+
+class LLMEndpointConfig(BaseModel):
+    """One API key, endpoint or deployment in an agent's LLM pool.
+
+    Unset ``model`` and ``api_key`` fall back to the agent's values.
+    """
+    name: Optional[str] = Field(None, description="Endpoint name used in metrics and health (defaults to '<agent>-<index>')")
+    model: Optional[str] = None
+    api_key: Optional[SecretStr] = None
+    base_url: Optional[str] = None
+    weight: float = Field(1.0, gt=0, description="Relative share of traffic")
+    rpm: Optional[int] = Field(None, ge=1, description="Client-side requests-per-minute limit")
+    tpm: Optional[int] = Field(None, ge=1, description="Client-side tokens-per-minute limit")
 
 class AgentConfig(BaseModel):
     """Configuration for a specific agent's LLM."""
@@ -9,9 +22,25 @@ class AgentConfig(BaseModel):
     temperature: float = 0.0
     api_key: Optional[SecretStr] = None
     name: str = Field("default", description="Name of the agent")
+    cache: bool = Field(False, description="Serve repeated identical calls from the LLM response cache")
+    endpoints: List[LLMEndpointConfig] = Field(default_factory=list, description="Pool of endpoints serving this agent")
+    routing: Literal["least_loaded", "weighted"] = Field("least_loaded", description="How calls are spread over endpoints")
+    hedge: bool = Field(False, description="Duplicate slow non-streaming calls and keep the first response")
+    latency_ms: float = Field(0.0, ge=0, description="Artificial latency per call (fake and local_replay providers)")
+    responses_path: Optional[str] = Field(None, description="YAML/JSON file of recorded responses (local_replay provider)")
+    small_agent: Optional[str] = Field(None, description="Agent whose model serves simple requests; this agent's model serves complex ones and escalations")
+    small_max_complexity: int = Field(2, ge=0, description="Highest request complexity score routed to small_agent")
 
 class LLMFileConfig(BaseModel):
     """Global LLM configuration (File Envelope)."""
     version: int = Field(1, description="Schema version")
     default: AgentConfig
     agents: Optional[Dict[str, AgentConfig]] = Field(default_factory=dict)
+
+    @model_validator(mode="after")
+    def name_agents_by_key(self):
+        # Agents are registered under ``name``; default it to the map key.
+        for key, agent in (self.agents or {}).items():
+            if "name" not in agent.model_fields_set:
+                agent.name = key
+        return self
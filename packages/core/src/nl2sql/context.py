@@ -2,7 +2,7 @@ from __future__ import annotations
 import pathlib
 from typing import Optional
 
-from nl2sql.configs import ConfigManager
+from nl2sql.configs import ConfigManager, PolicyFileConfig
 from nl2sql.datasources import DatasourceRegistry
 from nl2sql.llm import LLMRegistry
 from nl2sql.indexing.vector_store import VectorStore
@@ -13,6 +13,15 @@ from nl2sql.auth import RBAC
 from nl2sql.schema import build_schema_store
 from nl2sql.execution import ExecutionStore
 from nl2sql.execution.artifacts import build_artifact_store
+from nl2sql.pipeline.graph_cache import CompiledGraphCache
+from nl2sql.pipeline.admission import build_admission_controller
+from nl2sql.pipeline.answer_cache import AnswerCache
+from nl2sql.pipeline.checkpointing import build_checkpointer
+from nl2sql.pipeline.decomposition_cache import DecompositionCache
+from nl2sql.pipeline.plan_cache import PlanCache
+from nl2sql.pipeline.plan_templates import PlanTemplateStore
+from nl2sql.pipeline.single_flight import SingleFlight
+from nl2sql.pipeline.worker_pool import PipelineWorkerPool
 
 from nl2sql.common.logger import get_logger
 logger = get_logger(__name__)
@@ -72,6 +81,7 @@ class NL2SQLContext:
 
         self.policies_cfg = cm.load_policies(policies_config_path)
         self.rbac = RBAC(self.policies_cfg.roles)
+        self._policies_revision = 0
 
         self.vector_store = VectorStore(
             collection_name=settings.vector_store_collection_name,
@@ -84,5 +94,52 @@ class NL2SQLContext:
         )
         self.execution_store = ExecutionStore()
         self.artifact_store = build_artifact_store()
+        self.graph_cache = CompiledGraphCache()
+        self.worker_pool = PipelineWorkerPool(max_workers=settings.pipeline_max_workers)
+        self.single_flight = SingleFlight()
+        self.admission = build_admission_controller()
+        self.checkpointer = build_checkpointer()
+        self.plan_cache = (
+            PlanCache(max_entries=settings.plan_cache_max_entries)
+            if settings.plan_cache_enabled
+            else None
+        )
+        self.plan_templates = (
+            PlanTemplateStore(max_entries=settings.plan_templates_max_entries)
+            if settings.plan_templates_enabled
+            else None
+        )
+        self.decomposition_cache = (
+            DecompositionCache(
+                max_entries=settings.decomposition_cache_max_entries,
+                ttl_sec=settings.decomposition_cache_ttl_sec,
+            )
+            if settings.decomposition_cache_enabled
+            else None
+        )
+        self.answer_cache = (
+            AnswerCache(max_entries=settings.answer_cache_max_entries)
+            if settings.answer_cache_enabled
+            else None
+        )
+
+    @property
+    def config_revision(self) -> tuple:
+        """Revision of the configuration that compiled graphs depend on."""
+        return (
+            self.ds_registry.revision,
+            self.llm_registry.revision,
+            self._policies_revision,
+        )
 
-       
+    def set_policies(self, policies_cfg: PolicyFileConfig) -> None:
+        """Replaces the active RBAC policies and invalidates compiled graphs and cached plans/answers."""
+        self.policies_cfg = policies_cfg
+        self.rbac = RBAC(policies_cfg.roles)
+        self._policies_revision += 1
+        if self.plan_cache is not None:
+            self.plan_cache.clear()
+        if self.plan_templates is not None:
+            self.plan_templates.clear()
+        if self.answer_cache is not None:
+            self.answer_cache.clear()
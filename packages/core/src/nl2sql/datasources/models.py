@@ -16,6 +16,11 @@ class DatasourceConfig(BaseModel):
     description: Optional[str] = None
     connection: ConnectionConfig
     options: Dict[str, Any] = Field(default_factory=dict)
+    answer_cache_ttl_sec: Optional[float] = Field(
+        default=None,
+        ge=0,
+        description="TTL for cached answers that read this datasource; ANSWER_CACHE_TTL_SEC if unset, 0 disables.",
+    )
 
 
 
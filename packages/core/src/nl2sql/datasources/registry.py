@@ -1,4 +1,4 @@
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any, Optional, Set
 from threading import RLock
 
 from nl2sql_adapter_sdk.capabilities import DatasourceCapability
@@ -17,9 +17,11 @@ class DatasourceRegistry:
         """Initializes the registry by eagerly creating adapters for all configs."""
         self._adapters: Dict[str, DatasourceAdapterProtocol] = {}
         self._capabilities: Dict[str, Set[str]] = {}
+        self._answer_cache_ttls: Dict[str, Optional[float]] = {}
         self._available_adapters = discover_adapters()
         self._secret_manager = secret_manager
         self._lock = RLock()
+        self._revision = 0
 
     def find_and_resolve_secret(self, key: str) -> str:
         """Attempts to resolve a secret using the secret manager.
@@ -105,12 +107,14 @@ class DatasourceRegistry:
             )
             with self._lock:
                 self._adapters[ds_id] = adapter
+                self._answer_cache_ttls[ds_id] = config.answer_cache_ttl_sec
                 if hasattr(adapter, "capabilities"):
                     self._capabilities[ds_id] = self._normalize_capabilities(
                         adapter.capabilities()
                     )
                 else:
                     self._capabilities[ds_id] = {DatasourceCapability.SUPPORTS_SQL.value}
+                self._revision += 1
             return adapter
         else:
             raise ValueError(
@@ -118,6 +122,12 @@ class DatasourceRegistry:
             )
 
 
+    @property
+    def revision(self) -> int:
+        """Monotonic counter bumped whenever a datasource is (re)registered."""
+        with self._lock:
+            return self._revision
+
     def get_adapter(self, datasource_id: str) -> DatasourceAdapterProtocol:
         """Retrieves the adapter for a datasource.
 
@@ -153,6 +163,11 @@ class DatasourceRegistry:
                 raise ValueError(f"Unknown datasource ID: {datasource_id}")
             return set(self._capabilities[datasource_id])
 
+    def get_answer_cache_ttl(self, datasource_id: str) -> Optional[float]:
+        """Returns the configured answer cache TTL, or None to use the default."""
+        with self._lock:
+            return self._answer_cache_ttls.get(datasource_id)
+
     def list_adapters(self) -> List[DatasourceAdapterProtocol]:
         """Returns a list of all registered adapters.
 
@@ -37,6 +37,12 @@ class ExecutorRequest(BaseModel):
     sql: Optional[str] = None
     user_context: Optional[UserContext] = None
     tenant_id: str
+    deadline: Optional[float] = Field(
+        default=None, description="Request deadline as epoch seconds; bounds the statement timeout."
+    )
+    return_rows: bool = Field(
+        default=False, description="Also return the result rows inline, for callers that skip aggregation."
+    )
 
     model_config = ConfigDict(extra="ignore")
 
@@ -49,6 +55,7 @@ class ExecutorResponse(BaseModel):
     datasource_id: Optional[str] = None
     schema_version: Optional[str] = None
     artifact: Optional[ArtifactRef] = None
+    rows: Optional[List[Dict[str, Any]]] = None
     metrics: Dict[str, float] = Field(default_factory=dict)
     errors: List[PipelineError] = Field(default_factory=list)
     reasoning: List[Dict[str, Any]] = Field(default_factory=list)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 
 from nl2sql.execution.contracts import ExecutorRequest, ExecutorResponse
@@ -9,3 +10,8 @@ class ExecutorService(ABC):
     @abstractmethod
     def execute(self, request: ExecutorRequest) -> ExecutorResponse:
         raise NotImplementedError
+
+    async def aexecute(self, request: ExecutorRequest) -> ExecutorResponse:
+        """Async dispatch; adapters are synchronous, so the default runs
+        ``execute`` in a worker thread instead of blocking the event loop."""
+        return await asyncio.to_thread(self.execute, request)
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from typing import Optional, Dict, Any
 
+from nl2sql.common.concurrency import datasource_slot
+from nl2sql.common.deadline import remaining
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
 from nl2sql.common.logger import get_logger
+from nl2sql.common.settings import settings
 from nl2sql.execution.contracts import ExecutorRequest, ExecutorResponse
 from nl2sql.execution.artifacts import build_artifact_store
 from nl2sql_adapter_sdk.capabilities import DatasourceCapability
@@ -72,13 +75,38 @@ class SqlExecutorService(ExecutorService):
         ds_id = request.datasource_id
         adapter = self.ds_registry.get_adapter(ds_id)
 
+        limits = {}
+        time_left = remaining(request.deadline)
+        if time_left is not None:
+            if time_left <= 0:
+                return ExecutorResponse(
+                    executor_name="sql_executor",
+                    subgraph_name=request.subgraph_name,
+                    node_id=request.node_id,
+                    trace_id=request.trace_id,
+                    datasource_id=request.datasource_id,
+                    schema_version=request.schema_version,
+                    errors=[
+                        PipelineError(
+                            node="sql_executor",
+                            message="Request deadline exceeded before SQL execution started.",
+                            severity=ErrorSeverity.ERROR,
+                            error_code=ErrorCode.EXECUTION_TIMEOUT,
+                        )
+                    ],
+                    tenant_id=request.tenant_id,
+                )
+            # Adapters apply this as a server-side statement timeout.
+            limits["timeout_ms"] = max(1, int(time_left * 1000))
+
         adapter_request = AdapterRequest(
             plan_type="sql",
             payload={"sql": request.sql},
-            limits={}
+            limits=limits,
         )
 
-        result_frame = adapter.execute(adapter_request)
+        with datasource_slot(ds_id):
+            result_frame = adapter.execute(adapter_request)
 
         if not result_frame.success:
             error_msg = result_frame.error.safe_message if result_frame.error else "SQL execution failed."
@@ -99,6 +127,9 @@ class SqlExecutorService(ExecutorService):
                 tenant_id=request.tenant_id,
             )
     
+        # Inline rows live in graph state (and checkpoints); large results stay in the artifact.
+        inline = request.return_rows and len(result_frame.rows) <= settings.single_source_max_inline_rows
+
         artifact_ref = self.artifact_store.create_artifact_ref(
             result_frame, {"schema_version": request.schema_version, "request_id": request.trace_id, "tenant_id": request.tenant_id} )
         
@@ -110,6 +141,7 @@ class SqlExecutorService(ExecutorService):
             datasource_id=request.datasource_id,
             schema_version=request.schema_version,
             artifact=artifact_ref,
+            rows=[dict(zip(result_frame.columns, row)) for row in result_frame.rows] if inline else None,
             metrics={
                 "row_count": result_frame.row_count,
                 "bytes_returned": result_frame.bytes or 0,
@@ -1,10 +1,74 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import hashlib
+import math
+import re
+import time
+from typing import Any, Dict, List, Optional
 from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
+from nl2sql.common.deadline import call_timeout
 from nl2sql.common.settings import settings
 
+
+class DeadlineAwareOpenAIEmbeddings(OpenAIEmbeddings):
+    """OpenAI embeddings whose requests are bounded by the active request deadline."""
+
+    @property
+    def _invocation_params(self) -> Dict[str, Any]:
+        params = super()._invocation_params
+        timeout = call_timeout(operation="embedding request")
+        if timeout is not None:
+            params = {**params, "timeout": timeout}
+        return params
+
+
+class LocalHashEmbeddings(Embeddings):
+    """Deterministic offline embeddings built with the hashing trick.
+
+    Each lower-cased word and word bigram is hashed to a signed bucket; the
+    vector is L2-normalised. Texts sharing words get similar vectors, which is
+    enough for retrieval to behave plausibly in load tests without a network.
+
+    Args:
+        dimensions: Vector size.
+        latency_ms: Artificial latency per call.
+    """
+
+    _WORD = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, dimensions: int = 384, latency_ms: float = 0.0):
+        self.dimensions = dimensions
+        self.latency_ms = latency_ms
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        words = self._WORD.findall(text.lower())
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "big")
+            vector[value % self.dimensions] += 1.0 if value >> 63 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_ms > 0:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
 class EmbeddingService:
     """
     Centralized service for managing embedding models.
@@ -20,13 +84,32 @@ class EmbeddingService:
         Lazy loads the instance.
         """
         if cls._instance is None:
-            cls._instance = OpenAIEmbeddings(
-                model=settings.embedding_model,
-                api_key=settings.openai_api_key
-            )
+            from nl2sql.llm.cassette import CassetteEmbeddings, active_cassette
+
+            cassette = active_cassette()
+            if cassette is not None and cassette.mode == "replay":
+                cls._instance = CassetteEmbeddings(cassette, cls.get_model_name())
+            elif cassette is not None:
+                cls._instance = CassetteEmbeddings(cassette, cls.get_model_name(), inner=cls._build())
+            else:
+                cls._instance = cls._build()
         return cls._instance
 
+    @classmethod
+    def _build(cls) -> Embeddings:
+        if settings.embedding_provider == "local":
+            return LocalHashEmbeddings(
+                dimensions=settings.local_embedding_dimensions,
+                latency_ms=settings.local_embedding_latency_ms,
+            )
+        return DeadlineAwareOpenAIEmbeddings(
+            model=settings.embedding_model,
+            api_key=settings.openai_api_key
+        )
+
     @classmethod
     def get_model_name(cls) -> str:
         """Returns the name of the configured embedding model."""
+        if settings.embedding_provider == "local":
+            return f"local-hash-{settings.local_embedding_dimensions}"
         return settings.embedding_model
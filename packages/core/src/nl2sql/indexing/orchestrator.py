@@ -18,7 +18,8 @@ class IndexingOrchestrator:
     Orchestrates schema indexing for datasources.
 
     This class coordinates schema snapshot retrieval, schema version
-    registration, chunk construction, and vector store refresh.
+    registration, chunk construction, and vector store refresh. Cached plans
+    built against evicted schema versions are dropped.
     """
 
     def __init__(self, ctx: NL2SQLContext):
@@ -32,6 +33,8 @@ class IndexingOrchestrator:
         self.schema_store = ctx.schema_store
         self.config_manager = ctx.config_manager
         self.llm_registry = ctx.llm_registry
+        self.plan_cache = getattr(ctx, "plan_cache", None)
+        self.plan_templates = getattr(ctx, "plan_templates", None)
 
     def clear_store(self) -> None:
         """
@@ -70,6 +73,10 @@ class IndexingOrchestrator:
         schema_version, evicted_versions = self.schema_store.register_snapshot(
             schema_snapshot
         )
+        if self.plan_cache is not None:
+            self.plan_cache.evict_schema_versions(adapter.datasource_id, evicted_versions)
+        if self.plan_templates is not None:
+            self.plan_templates.evict_schema_versions(adapter.datasource_id, evicted_versions)
 
         chunk_builder = SchemaChunkBuilder(
             ds_id=adapter.datasource_id,
@@ -1,17 +1,40 @@
 from __future__ import annotations
 
-from typing import List, Optional, Dict, Any
+import asyncio
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from threading import Lock
+from typing import Callable, Iterable, List, Optional, Dict, Any
 
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 
 from nl2sql.indexing.embeddings import EmbeddingService
+from nl2sql.common.deadline import DeadlineExceeded, call_timeout
 from nl2sql.common.logger import get_logger
 from .models import BaseChunk
 
 logger = get_logger(__name__)
 
+QUERY_EMBEDDING_CACHE_SIZE = 10_000
+SEARCH_MAX_WORKERS = 16
+
+_search_executor: Optional[ThreadPoolExecutor] = None
+_search_executor_lock = Lock()
+
+
+def _get_search_executor() -> ThreadPoolExecutor:
+    global _search_executor
+    with _search_executor_lock:
+        if _search_executor is None:
+            _search_executor = ThreadPoolExecutor(
+                max_workers=SEARCH_MAX_WORKERS,
+                thread_name_prefix="vector-search",
+            )
+        return _search_executor
+
 
 class VectorStore:
     """
@@ -38,6 +61,8 @@ class VectorStore:
         self.collection_name = collection_name
         self.embeddings = embeddings or EmbeddingService.get_embeddings()
         self.persist_directory = persist_directory
+        self._query_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_embeddings_lock = Lock()
         self._initialize_vector_store()
 
     def _initialize_vector_store(self) -> None:
@@ -182,6 +207,62 @@ class VectorStore:
             for chunk in chunks
         ]
 
+    def prime_query_embeddings(self, queries: Iterable[str]) -> int:
+        """
+        Embeds user queries in one batched call and caches the vectors.
+
+        Subsequent ``retrieve_datasource_candidates`` calls for these exact
+        queries search by vector instead of embedding one query per request.
+
+        Args:
+            queries: User queries to embed.
+
+        Returns:
+            Number of queries that were newly embedded.
+        """
+        with self._query_embeddings_lock:
+            missing = [q for q in dict.fromkeys(queries) if q and q not in self._query_embeddings]
+        if not missing:
+            return 0
+
+        vectors = self.embeddings.embed_documents(missing)
+        with self._query_embeddings_lock:
+            for query, vector in zip(missing, vectors):
+                self._query_embeddings[query] = vector
+                self._query_embeddings.move_to_end(query)
+            while len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        logger.info(f"Primed {len(missing)} query embeddings in one batch.")
+        return len(missing)
+
+    def _get_query_embedding(self, query: str) -> Optional[List[float]]:
+        with self._query_embeddings_lock:
+            return self._query_embeddings.get(query)
+
+    def _bounded(self, execute: Callable[[], List[Document]], operation: str) -> List[Document]:
+        """
+        Runs a search within the active request deadline.
+
+        With a deadline active the search runs on a shared thread pool and is
+        abandoned once the time left runs out; Chroma cannot interrupt a
+        running query, so its result is discarded when it completes. The
+        deadline is handled outside the breaker: running out of time is not
+        a store failure.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before or during the search.
+        """
+        timeout = call_timeout(operation=operation)
+        if timeout is None:
+            return execute()
+        # The embedding client reads the deadline from context variables.
+        future = _get_search_executor().submit(contextvars.copy_context().run, execute)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(f"Request deadline exceeded during {operation}.") from None
+
     def retrieve_datasource_candidates(
         self,
         query: str,
@@ -200,8 +281,18 @@ class VectorStore:
         self.initialize_if_not_exists()
         from nl2sql.common.resilience import VECTOR_BREAKER
 
+        embedding = self._get_query_embedding(query)
+
         @VECTOR_BREAKER
         def _execute():
+            if embedding is not None:
+                return self.vectorstore.max_marginal_relevance_search_by_vector(
+                    embedding,
+                    k=k,
+                    fetch_k=k * 4,
+                    lambda_mult=0.7,
+                    filter={"type": "schema.datasource"},
+                )
             return self.vectorstore.max_marginal_relevance_search(
                 query,
                 k=k,
@@ -210,7 +301,7 @@ class VectorStore:
                 filter={"type": "schema.datasource"},
             )
 
-        return _execute()
+        return self._bounded(_execute, "datasource search")
 
     def retrieve_schema_context(
         self,
@@ -248,7 +339,7 @@ class VectorStore:
                 },
             )
 
-        return _execute()
+        return self._bounded(_execute, "schema search")
 
     def retrieve_column_candidates(
         self,
@@ -286,7 +377,7 @@ class VectorStore:
                 },
             )
 
-        return _execute()
+        return self._bounded(_execute, "column search")
 
     def retrieve_planning_context(
         self,
@@ -327,4 +418,47 @@ class VectorStore:
                 },
             )
 
-        return _execute()
+        return self._bounded(_execute, "planning search")
+
+    async def aretrieve_datasource_candidates(
+        self,
+        query: str,
+        k: int = 3,
+    ) -> List[Document]:
+        """
+        Async variant of ``retrieve_datasource_candidates``.
+
+        The Chroma client is synchronous, so the search runs in a worker thread
+        and the circuit breaker keeps guarding it.
+        """
+        return await asyncio.to_thread(self.retrieve_datasource_candidates, query, k)
+
+    async def aretrieve_schema_context(
+        self,
+        query: str,
+        datasource_id: str,
+        k: int = 8,
+    ) -> List[Document]:
+        """Async variant of ``retrieve_schema_context``."""
+        return await asyncio.to_thread(self.retrieve_schema_context, query, datasource_id, k)
+
+    async def aretrieve_column_candidates(
+        self,
+        query: str,
+        datasource_id: str,
+        k: int = 8,
+    ) -> List[Document]:
+        """Async variant of ``retrieve_column_candidates``."""
+        return await asyncio.to_thread(self.retrieve_column_candidates, query, datasource_id, k)
+
+    async def aretrieve_planning_context(
+        self,
+        query: str,
+        datasource_id: str,
+        tables: List[str],
+        k: int = 12,
+    ) -> List[Document]:
+        """Async variant of ``retrieve_planning_context``."""
+        return await asyncio.to_thread(
+            self.retrieve_planning_context, query, datasource_id, tables, k
+        )
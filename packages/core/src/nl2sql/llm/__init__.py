@@ -1,8 +1,19 @@
-
 from .registry import LLMRegistry
 from .models import AgentConfig
+from .cache import InMemoryLLMCache, SqliteLLMCache
+from .pool import LLMEndpoint, LLMPool, LLMPoolExhausted
+from .local import LocalChatModel
+from .cassette import Cassette, CassetteMiss
 
 __all__ = [
     "LLMRegistry",
     "AgentConfig",
-]
\ No newline at end of file
+    "InMemoryLLMCache",
+    "SqliteLLMCache",
+    "LLMEndpoint",
+    "LLMPool",
+    "LLMPoolExhausted",
+    "LocalChatModel",
+    "Cassette",
+    "CassetteMiss",
+]
@@ -0,0 +1,221 @@
+"""Response caches for LLM calls.
+
+Caches plug into LangChain's chat-model cache hook (``BaseChatModel.cache``),
+which keys each call on the rendered prompt and the serialized model
+parameters. The parameters include the model name, temperature, seed and any
+bound tools, so structured-output calls are also keyed on their output schema.
+
+Two backends are provided:
+
+- ``InMemoryLLMCache``: process-local LRU.
+- ``SqliteLLMCache``: on-disk, shared by worker processes on the same host.
+
+Both apply a TTL and an entry limit. ``AgentLLMCache`` binds a backend to one
+agent and records hit/miss metrics; ``LLMRegistry`` attaches it to agents whose
+``AgentConfig.cache`` is enabled.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+from langchain_core._api import suppress_langchain_beta_warning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import llm_cache_hit_counter, llm_cache_miss_counter
+from nl2sql.common.settings import settings
+
+logger = get_logger(__name__)
+
+
+def _cache_key(prompt: str, llm_string: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(llm_string.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class InMemoryLLMCache(BaseCache):
+    """Process-local LRU cache with optional TTL.
+
+    Args:
+        max_entries: Max cached responses; least recently used are evicted first.
+        ttl_sec: Age after which an entry is treated as missing (no expiry if None).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_sec: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self._entries: "OrderedDict[str, Tuple[float, RETURN_VAL_TYPE]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = _cache_key(prompt, llm_string)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if self.ttl_sec is not None and time.time() - created_at > self.ttl_sec:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = _cache_key(prompt, llm_string)
+        with self._lock:
+            self._entries[key] = (time.time(), return_val)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SqliteLLMCache(BaseCache):
+    """SQLite-backed LRU cache with optional TTL.
+
+    The database runs in WAL mode so several worker processes can share one
+    file. Generations are stored with LangChain's ``dumps``/``loads``.
+
+    Args:
+        path: SQLite database path (parent directories are created).
+        max_entries: Max cached responses; least recently used are evicted first.
+        ttl_sec: Age after which an entry is deleted (no expiry if None).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: int = 10000,
+        ttl_sec: Optional[float] = None,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = _cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl_sec is not None and now - created_at > self.ttl_sec:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        try:
+            with suppress_langchain_beta_warning():
+                return loads(value, allowed_objects="core")
+        except Exception as exc:
+            # Entries written by an incompatible LangChain version are misses.
+            logger.warning(f"Discarding unreadable LLM cache entry: {exc}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = _cache_key(prompt, llm_string)
+        value = dumps(list(return_val))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._prune(now)
+            self._conn.commit()
+
+    def _prune(self, now: float) -> None:
+        if self.ttl_sec is not None:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_sec,))
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class AgentLLMCache(BaseCache):
+    """Binds a shared cache backend to one agent and records hit/miss metrics."""
+
+    def __init__(self, backend: BaseCache, agent_name: str):
+        self.backend = backend
+        self.agent_name = agent_name
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self.backend.lookup(prompt, llm_string)
+        counter = llm_cache_miss_counter if value is None else llm_cache_hit_counter
+        counter.add(1, {"agent": self.agent_name})
+        return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.backend.update(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.backend.clear(**kwargs)
+
+
+def build_llm_cache() -> BaseCache:
+    """Creates the shared LLM cache backend configured in settings."""
+    backend = settings.llm_cache_backend
+    if backend == "memory":
+        return InMemoryLLMCache(
+            max_entries=settings.llm_cache_max_entries,
+            ttl_sec=settings.llm_cache_ttl_sec,
+        )
+    if backend == "sqlite":
+        return SqliteLLMCache(
+            path=settings.llm_cache_path,
+            max_entries=settings.llm_cache_max_entries,
+            ttl_sec=settings.llm_cache_ttl_sec,
+        )
+    raise ValueError(f"Unsupported LLM cache backend: {backend}")
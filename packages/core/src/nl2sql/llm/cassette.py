@@ -0,0 +1,236 @@
+"""Record/replay cassettes for LLM and embedding calls.
+
+With ``CASSETTE_MODE=record`` every LLM response and embedding vector of a
+real run is appended to ``CASSETTE_PATH`` (JSON Lines). LLM calls are captured
+by ``CassetteRecorder``, a callback attached to each registered model;
+embedding calls by the ``CassetteEmbeddings`` wrapper.
+
+With ``CASSETTE_MODE=replay`` the same calls are answered from the cassette by
+prompt hash, without network access or API keys, so benchmarks measure
+everything except the model. ``CASSETTE_REPLAY_LATENCY`` additionally sleeps
+for each call's recorded latency.
+
+A prompt recorded several times is replayed in recording order, wrapping
+around. A call missing from the cassette raises ``CassetteMiss``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+from langchain_core.outputs import ChatGeneration, ChatResult, LLMResult
+
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import cassette_counter
+from nl2sql.common.settings import settings
+
+logger = get_logger(__name__)
+
+LLM = "llm"
+EMBEDDING = "embedding"
+
+
+class CassetteMiss(LookupError):
+    """Raised when a replayed call was never recorded."""
+
+
+def prompt_hash(messages: Sequence[BaseMessage]) -> str:
+    """Stable hash of a chat prompt (message types and contents)."""
+    payload = [[message.type, message.content] for message in messages]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def embedding_hash(model: str, text: str) -> str:
+    """Stable hash of one embedded text for ``model``."""
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """JSON Lines file of recorded calls.
+
+    Args:
+        path: Cassette file. Recording appends to it; delete it to start over.
+        mode: ``record`` or ``replay``.
+    """
+
+    def __init__(self, path: str, mode: str):
+        self.path = Path(path)
+        self.mode = mode
+        self._entries: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._cursors: Dict[Tuple[str, str], int] = {}
+        self._lock = Lock()
+        if mode == "replay":
+            self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette '{self.path}' not found; record one with CASSETTE_MODE=record.")
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                self._entries.setdefault((entry["kind"], entry["key"]), []).append(entry)
+        logger.info(f"Loaded {len(self)} recorded call(s) from cassette '{self.path}'.")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._entries.values())
+
+    def record(self, kind: str, key: str, latency_ms: float, **payload: Any) -> None:
+        """Appends one call to the cassette file."""
+        line = json.dumps({"kind": kind, "key": key, "latency_ms": round(latency_ms, 3), **payload}, default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+        cassette_counter.add(1, {"kind": kind, "mode": "record"})
+
+    def lookup(self, kind: str, key: str) -> Dict[str, Any]:
+        """Next recorded entry for ``key``; raises ``CassetteMiss`` if there is none."""
+        with self._lock:
+            entries = self._entries.get((kind, key))
+            if entries:
+                cursor = self._cursors.get((kind, key), 0)
+                self._cursors[(kind, key)] = cursor + 1
+                entry = entries[cursor % len(entries)]
+        if not entries:
+            cassette_counter.add(1, {"kind": kind, "mode": "miss"})
+            raise CassetteMiss(f"No recorded {kind} call with key {key[:12]} in cassette '{self.path}'.")
+        cassette_counter.add(1, {"kind": kind, "mode": "replay"})
+        return entry
+
+    def replay_llm(self, messages: Sequence[BaseMessage]) -> ChatResult:
+        entry = self.lookup(LLM, prompt_hash(messages))
+        time.sleep(_delay([entry]))
+        return _chat_result(entry)
+
+    async def areplay_llm(self, messages: Sequence[BaseMessage]) -> ChatResult:
+        entry = self.lookup(LLM, prompt_hash(messages))
+        await asyncio.sleep(_delay([entry]))
+        return _chat_result(entry)
+
+
+def _delay(entries: List[Dict[str, Any]]) -> float:
+    if not settings.cassette_replay_latency:
+        return 0.0
+    return sum(entry.get("latency_ms", 0.0) for entry in entries) / 1000
+
+
+def _chat_result(entry: Dict[str, Any]) -> ChatResult:
+    messages = messages_from_dict(entry["generations"])
+    return ChatResult(
+        generations=[ChatGeneration(message=message) for message in messages],
+        llm_output=entry.get("llm_output"),
+    )
+
+
+class CassetteRecorder(BaseCallbackHandler):
+    """Callback that records each chat model response with its prompt hash and latency.
+
+    Args:
+        cassette: Cassette to append to.
+        agent: Agent name stored with each entry (informational only).
+    """
+
+    def __init__(self, cassette: Cassette, agent: str):
+        self.cassette = cassette
+        self.agent = agent
+        self._pending: Dict[UUID, Tuple[str, float]] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[BaseMessage]], *, run_id: UUID, **kwargs: Any) -> Any:
+        self._pending[run_id] = (prompt_hash(messages[0]), time.monotonic())
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> Any:
+        pending = self._pending.pop(run_id, None)
+        if pending is None or not response.generations:
+            return
+        key, start = pending
+        messages = [g.message for g in response.generations[0] if isinstance(g, ChatGeneration)]
+        self.cassette.record(
+            LLM,
+            key,
+            (time.monotonic() - start) * 1000,
+            agent=self.agent,
+            generations=messages_to_dict(messages),
+            llm_output=response.llm_output,
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._pending.pop(run_id, None)
+
+
+class CassetteEmbeddings(Embeddings):
+    """Embeddings that record to, or replay from, a cassette.
+
+    Args:
+        cassette: Cassette to record to or replay from.
+        model: Embedding model name, part of each entry's key.
+        inner: Real embeddings; required when recording, unused when replaying.
+    """
+
+    def __init__(self, cassette: Cassette, model: str, inner: Optional[Embeddings] = None):
+        self.cassette = cassette
+        self.model = model
+        self.inner = inner
+
+    def _replay(self, texts: List[str]) -> Tuple[List[List[float]], float]:
+        entries = [self.cassette.lookup(EMBEDDING, embedding_hash(self.model, text)) for text in texts]
+        return [entry["vector"] for entry in entries], _delay(entries)
+
+    def _record(self, texts: List[str], vectors: List[List[float]], elapsed: float) -> None:
+        latency_ms = elapsed * 1000 / max(len(texts), 1)
+        for text, vector in zip(texts, vectors):
+            self.cassette.record(EMBEDDING, embedding_hash(self.model, text), latency_ms, model=self.model, vector=vector)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.cassette.mode == "replay":
+            vectors, delay = self._replay(texts)
+            time.sleep(delay)
+            return vectors
+        start = time.monotonic()
+        vectors = self.inner.embed_documents(texts)
+        self._record(texts, vectors, time.monotonic() - start)
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.cassette.mode == "replay":
+            vectors, delay = self._replay(texts)
+            await asyncio.sleep(delay)
+            return vectors
+        start = time.monotonic()
+        vectors = await self.inner.aembed_documents(texts)
+        self._record(texts, vectors, time.monotonic() - start)
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = Lock()
+
+
+def active_cassette() -> Optional[Cassette]:
+    """The cassette selected by ``CASSETTE_MODE``/``CASSETTE_PATH``, or None when off."""
+    global _cassette
+    if settings.cassette_mode == "off":
+        return None
+    with _cassette_lock:
+        if _cassette is None or (_cassette.mode, str(_cassette.path)) != (
+            settings.cassette_mode,
+            str(Path(settings.cassette_path)),
+        ):
+            _cassette = Cassette(settings.cassette_path, settings.cassette_mode)
+        return _cassette
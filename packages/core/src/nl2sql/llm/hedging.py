@@ -0,0 +1,162 @@
+"""Hedged LLM requests.
+
+For agents with ``hedge: true``, a non-streaming call that has not returned
+after the ``LLM_HEDGE_PERCENTILE`` of that agent's recent latencies gets a
+duplicate request. Whichever finishes first wins and the other is cancelled.
+Pooled agents send the duplicate through the pool, which routes it to the
+least-loaded endpoint (usually not the one still busy with the original).
+
+Extra spend is bounded: no hedging until ``LLM_HEDGE_MIN_SAMPLES`` latencies
+are known, and at most ``LLM_HEDGE_MAX_RATIO`` of the last
+``LLM_HEDGE_WINDOW`` calls may be hedged.
+
+Async calls cancel the losing task, which aborts its HTTP request. Sync calls
+run both requests on a shared thread pool; a losing request cannot be
+interrupted there, so its result is discarded when it completes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Optional
+
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import llm_hedge_fired_counter, llm_hedge_won_counter
+from nl2sql.common.settings import settings
+
+logger = get_logger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.llm_hedge_max_workers,
+                thread_name_prefix="llm-hedge",
+            )
+        return _executor
+
+
+def _submit(call: Callable[[], Any]) -> Future:
+    # Deadline, concurrency limits and tracing live in context variables.
+    ctx = contextvars.copy_context()
+    return _get_executor().submit(ctx.run, call)
+
+
+class Hedger:
+    """Tracks one agent's LLM latency and hedges its slow calls.
+
+    Args:
+        agent: Agent name, used as metric label.
+    """
+
+    def __init__(self, agent: str):
+        self.agent = agent
+        self._latencies: Deque[float] = deque(maxlen=settings.llm_hedge_window)
+        self._hedged: Deque[bool] = deque(maxlen=settings.llm_hedge_window)
+        self._lock = threading.Lock()
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while too few latencies are known."""
+        with self._lock:
+            if len(self._latencies) < settings.llm_hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(settings.llm_hedge_percentile / 100 * len(ordered)) - 1)
+        return max(settings.llm_hedge_min_delay_sec, ordered[max(index, 0)])
+
+    def _reserve_hedge(self) -> bool:
+        with self._lock:
+            hedged = sum(self._hedged)
+            if hedged + 1 > settings.llm_hedge_max_ratio * max(len(self._hedged), 1):
+                return False
+            # Counted now so concurrent slow calls share the same budget.
+            self._hedged.append(True)
+        llm_hedge_fired_counter.add(1, {"agent": self.agent})
+        return True
+
+    def _record(self, latency: Optional[float], hedged: bool, won: bool) -> None:
+        with self._lock:
+            if latency is not None:
+                self._latencies.append(latency)
+            if not hedged:
+                self._hedged.append(False)
+        if won:
+            llm_hedge_won_counter.add(1, {"agent": self.agent})
+
+    def run(self, call: Callable[[], Any]) -> Any:
+        """Runs ``call``, hedging it with a duplicate if it is slow."""
+        delay = self.hedge_delay()
+        start = time.monotonic()
+        if delay is None:
+            result = call()
+            self._record(time.monotonic() - start, hedged=False, won=False)
+            return result
+
+        primary = _submit(call)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._reserve_hedge():
+            result = primary.result()
+            self._record(time.monotonic() - start, hedged=False, won=False)
+            return result
+
+        hedge = _submit(call)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    self._record(time.monotonic() - start, hedged=True, won=future is hedge)
+                    return future.result()
+                error = error or future.exception()
+        self._record(None, hedged=True, won=False)
+        raise error
+
+    async def arun(self, acall: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of ``run``; the losing request is cancelled."""
+        delay = self.hedge_delay()
+        start = time.monotonic()
+        if delay is None:
+            result = await acall()
+            self._record(time.monotonic() - start, hedged=False, won=False)
+            return result
+
+        primary = asyncio.ensure_future(acall())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._reserve_hedge():
+                result = await primary
+                self._record(time.monotonic() - start, hedged=False, won=False)
+                return result
+
+            hedge = asyncio.ensure_future(acall())
+            tasks.add(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._record(time.monotonic() - start, hedged=True, won=task is hedge)
+                        return task.result()
+                    error = error or task.exception()
+            self._record(None, hedged=True, won=False)
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
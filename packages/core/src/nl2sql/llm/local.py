@@ -0,0 +1,287 @@
+"""Offline chat model for load tests and air-gapped runs.
+
+Agents configured with ``provider: fake`` or ``provider: local_replay`` are
+served by ``LocalChatModel`` instead of a remote API. It never opens a
+network connection, so the whole graph can run on a box without API keys.
+
+- ``fake`` answers structured-output calls with rule-generated instances:
+  a single-datasource decomposition, a plan selecting the first relevant
+  table's columns, and an answer echoing the aggregated results. Other
+  schemas get a minimal valid instance.
+- ``local_replay`` serves recorded outputs from ``responses_path`` (YAML or
+  JSON mapping agent name to a list of responses, served round-robin) and
+  falls back to the ``fake`` rules when an agent has no recordings.
+
+``latency_ms`` adds artificial latency to every call so load tests see
+realistic concurrency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+import types
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, List, Literal, Optional, Union, get_args, get_origin
+
+import yaml
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, Field, PrivateAttr
+
+from nl2sql.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+LOCAL_PROVIDERS = ("fake", "local_replay")
+
+# Mirrors the decomposer's forbidden tokens so fake intents pass validation.
+_PHYSICAL_TOKENS = re.compile(r"select|from|join|where|group by|order by|;|--|/\*|\*/", re.IGNORECASE)
+_DATASOURCE_ID = re.compile(r"['\"]datasource_id['\"]:\s*['\"]([^'\"]+)['\"]")
+_EXPECTED_NAME = re.compile(r"['\"]name['\"]:\s*['\"]([^'\"]+)['\"]")
+_COLUMN_LINE = re.compile(r"^  ([A-Za-z_][\w.]*)(?:\s|$)")
+
+_MAX_FAKE_COLUMNS = 5
+_MAX_FAKE_ROWS = 100
+_MAX_ANSWER_CHARS = 2000
+
+
+def _prompt_text(value: Any) -> str:
+    if hasattr(value, "to_string"):
+        return value.to_string()
+    if isinstance(value, list):
+        return "\n".join(str(getattr(m, "content", m)) for m in value)
+    return str(value)
+
+
+def _section(text: str, start: str, end: Optional[str] = None) -> str:
+    index = text.find(start)
+    if index < 0:
+        return ""
+    rest = text[index + len(start):]
+    if end is not None and end in rest:
+        rest = rest[: rest.find(end)]
+    return rest.strip()
+
+
+def _semantic(text: str) -> str:
+    return " ".join(_PHYSICAL_TOKENS.sub(" ", text).split())
+
+
+def _first_table(schema_text: str):
+    """Name and column names of the first ``TABLE`` block of a rendered schema."""
+    table, columns = None, []
+    for line in schema_text.splitlines():
+        if table is None:
+            if line.startswith("TABLE "):
+                table = line[len("TABLE "):].split(" -- ")[0].strip()
+            continue
+        if not line.startswith("  "):
+            break
+        match = _COLUMN_LINE.match(line)
+        if match and not line.startswith("  PRIMARY KEY"):
+            columns.append(match.group(1))
+    return table, columns
+
+
+def _fake_decomposition(text: str) -> Dict[str, Any]:
+    query = _section(text, "User Query:\n")
+    intent = _semantic(query) or "answer the question"
+    datasource_ids = _DATASOURCE_ID.findall(_section(text, "Resolved Datasources", "User Query:\n"))
+    if not datasource_ids:
+        return {
+            "sub_queries": [],
+            "combine_groups": [],
+            "unmapped_subqueries": [{"intent": intent, "reason": "no_datasource"}],
+        }
+    return {
+        "sub_queries": [{"id": "sq_1", "datasource_id": datasource_ids[0], "intent": intent}],
+        "combine_groups": [
+            {"group_id": "cg_1", "operation": "standalone", "inputs": [{"subquery_id": "sq_1", "role": "base"}]}
+        ],
+    }
+
+
+def _fake_plan(text: str) -> Dict[str, Any]:
+    table, columns = _first_table(_section(text, "[RELEVANT_TABLES]\n", "\n\n[EXPECTED_SCHEMA]"))
+    if table is None:
+        raise ValueError("Fake planner found no relevant tables in the prompt.")
+    expected = _EXPECTED_NAME.findall(_section(text, "[EXPECTED_SCHEMA]\n", "\n\n[SEMANTIC_CONTEXT]"))
+    names = expected or columns[:_MAX_FAKE_COLUMNS]
+    if not names:
+        raise ValueError(f"Fake planner found no columns for table '{table}'.")
+    select_items = []
+    for ordinal, name in enumerate(names):
+        if name in columns or not columns:
+            column = name
+        else:
+            column = columns[ordinal % len(columns)]
+        select_items.append(
+            {
+                "expr": {"kind": "column", "alias": "t0", "column_name": column},
+                "alias": name if expected else None,
+                "ordinal": ordinal,
+            }
+        )
+    return {
+        "tables": [{"name": table, "alias": "t0", "ordinal": 0}],
+        "select_items": select_items,
+        "limit": _MAX_FAKE_ROWS,
+        "reasoning": "Generated by the fake LLM provider.",
+    }
+
+
+def _fake_answer(text: str) -> Dict[str, Any]:
+    query = _section(text, "User Query: ", "\n")
+    results = _section(text, "Aggregated Results (keyed by terminal node id):\n", "\n\nUnmapped Subqueries")
+    return {
+        "summary": f"Results for: {query}" if query else "Results",
+        "format_type": "text",
+        "content": results[:_MAX_ANSWER_CHARS],
+    }
+
+
+# Keyed by schema name so this module does not import the pipeline.
+_RULES: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "DecomposerResponse": _fake_decomposition,
+    "PlanModel": _fake_plan,
+    "AggregatedResponse": _fake_answer,
+}
+
+
+def _placeholder(annotation: Any) -> Any:
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is Literal:
+        return args[0]
+    if origin in (Union, types.UnionType):
+        if type(None) in args:
+            return None
+        return _placeholder(args[0])
+    if origin in (list, set, tuple):
+        return []
+    if origin is dict:
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return minimal_instance(annotation)
+    return {str: "", int: 0, float: 0.0, bool: False}.get(annotation)
+
+
+def minimal_instance(schema: type[BaseModel]) -> Dict[str, Any]:
+    """Smallest payload that fills every required field of ``schema``."""
+    return {
+        name: _placeholder(field.annotation)
+        for name, field in schema.model_fields.items()
+        if field.is_required()
+    }
+
+
+def load_responses(path: Optional[str]) -> Dict[str, List[Any]]:
+    """Loads recorded responses (agent name -> list of outputs) from YAML or JSON."""
+    if not path:
+        return {}
+    data = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"Recorded responses in '{path}' must map agent names to lists.")
+    return {str(agent): value if isinstance(value, list) else [value] for agent, value in data.items()}
+
+
+class LocalChatModel(BaseChatModel):
+    """Chat model that answers from recordings or rules, without network access.
+
+    Args:
+        agent: Agent name; selects the recordings to replay.
+        mode: ``fake`` (rules only) or ``local_replay`` (recordings first).
+        latency_ms: Artificial latency added to every call.
+        responses: Recorded outputs per agent name.
+    """
+
+    agent: str = "default"
+    mode: Literal["fake", "local_replay"] = "fake"
+    latency_ms: float = 0.0
+    responses: Dict[str, List[Any]] = Field(default_factory=dict)
+
+    _cursor: int = PrivateAttr(default=0)
+    _lock: Lock = PrivateAttr(default_factory=Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return self.mode
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"agent": self.agent, "mode": self.mode}
+
+    def _recorded(self) -> Optional[Any]:
+        if self.mode != "local_replay":
+            return None
+        recordings = self.responses.get(self.agent)
+        if not recordings:
+            return None
+        with self._lock:
+            response = recordings[self._cursor % len(recordings)]
+            self._cursor += 1
+        return response
+
+    def _pause(self) -> None:
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+
+    async def _apause(self) -> None:
+        if self.latency_ms > 0:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+    def _text(self, messages) -> ChatResult:
+        recorded = self._recorded()
+        if recorded is None:
+            prompt = _prompt_text(messages)
+            content = f"[{self.mode}] {prompt.strip().splitlines()[-1] if prompt.strip() else ''}"
+        elif isinstance(recorded, str):
+            content = recorded
+        else:
+            content = json.dumps(recorded)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self._pause()
+        return self._text(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await self._apause()
+        return self._text(messages)
+
+    def _structured(self, schema: type[BaseModel], value: Any) -> BaseModel:
+        recorded = self._recorded()
+        if recorded is not None:
+            if isinstance(recorded, str):
+                return schema.model_validate_json(recorded)
+            return schema.model_validate(recorded)
+        rule = _RULES.get(schema.__name__)
+        if rule is None:
+            return schema.model_validate(minimal_instance(schema))
+        return schema.model_validate(rule(_prompt_text(value)))
+
+    def with_structured_output(self, schema, *, include_raw: bool = False, **kwargs):
+        """Returns a runnable producing ``schema`` instances; provider kwargs are ignored."""
+        if not (isinstance(schema, type) and issubclass(schema, BaseModel)):
+            raise ValueError(f"The {self.mode} provider only supports pydantic output schemas.")
+
+        def _wrap(parsed: BaseModel) -> Any:
+            if not include_raw:
+                return parsed
+            raw = AIMessage(content=parsed.model_dump_json())
+            return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+        def _invoke(value: Any) -> Any:
+            self._pause()
+            return _wrap(self._structured(schema, value))
+
+        async def _ainvoke(value: Any) -> Any:
+            await self._apause()
+            return _wrap(self._structured(schema, value))
+
+        return RunnableLambda(_invoke, afunc=_ainvoke, name=f"{self.mode}_{schema.__name__}")
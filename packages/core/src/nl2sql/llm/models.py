@@ -1,8 +1,9 @@
 
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional
 from pydantic import SecretStr
+from nl2sql.configs.llm import LLMEndpointConfig
 
 class AgentConfig(BaseModel):
     """Configuration for a specific agent's LLM."""
@@ -10,4 +11,12 @@ class AgentConfig(BaseModel):
     model: str
     temperature: float = 0.0
     api_key: Optional[SecretStr] = None
-    name: str = Field("default", description="Name of the agent")
\ No newline at end of file
+    name: str = Field("default", description="Name of the agent")
+    cache: bool = Field(False, description="Serve repeated identical calls from the LLM response cache")
+    endpoints: List[LLMEndpointConfig] = Field(default_factory=list, description="Pool of endpoints serving this agent")
+    routing: Literal["least_loaded", "weighted"] = Field("least_loaded", description="How calls are spread over endpoints")
+    hedge: bool = Field(False, description="Duplicate slow non-streaming calls and keep the first response")
+    latency_ms: float = Field(0.0, ge=0, description="Artificial latency per call (fake and local_replay providers)")
+    responses_path: Optional[str] = Field(None, description="YAML/JSON file of recorded responses (local_replay provider)")
+    small_agent: Optional[str] = Field(None, description="Agent whose model serves simple requests; this agent's model serves complex ones and escalations")
+    small_max_complexity: int = Field(2, ge=0, description="Highest request complexity score routed to small_agent")
\ No newline at end of file
@@ -0,0 +1,417 @@
+"""Multi-endpoint LLM pools.
+
+An agent can be served by several API keys, endpoints or deployments
+(``AgentConfig.endpoints``). ``LLMPool`` picks an endpoint per call:
+
+- Routing is ``least_loaded`` (fewest in-flight calls per unit of weight,
+  least recently used on ties) or ``weighted`` (random by weight).
+- Optional client-side token buckets cap requests and tokens per minute, so
+  calls wait locally instead of being rejected upstream.
+- A 429 puts the endpoint in cooldown for the time given by the
+  ``retry-after``/``x-ratelimit-reset-*`` headers (exponential backoff when
+  absent) and halves its bucket rates; successes restore them gradually.
+- Repeated transient failures (5xx, timeouts, connection errors) mark the
+  endpoint unhealthy for a cooldown period.
+
+Rate-limited and failed calls are retried on another endpoint, bounded by
+``LLM_POOL_MAX_ATTEMPTS``, ``LLM_POOL_MAX_WAIT_SEC`` and the request deadline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+from nl2sql.common.deadline import call_timeout
+from nl2sql.common.exceptions import NL2SQLError
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import llm_pool_requests_counter, llm_pool_wait_histogram
+from nl2sql.common.settings import settings
+
+logger = get_logger(__name__)
+
+OK = "ok"
+RATE_LIMITED = "rate_limited"
+FAILED = "failed"
+ERROR = "error"
+CANCELLED = "cancelled"
+
+# Lowest fraction of the configured rate a throttled bucket falls back to.
+_MIN_RATE_FACTOR = 0.1
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+_transient_errors: tuple = ()
+try:
+    from openai import APIConnectionError, APITimeoutError, RateLimitError
+
+    _transient_errors = (APIConnectionError, APITimeoutError)
+except ImportError:  # pragma: no cover - openai is a hard dependency of langchain-openai
+    RateLimitError = None
+
+
+class LLMPoolExhausted(NL2SQLError):
+    """Raised when no endpoint of a pool becomes available in time."""
+
+
+class TokenBucket:
+    """Per-minute token bucket whose rate can be throttled after 429s.
+
+    Not thread-safe on its own; ``LLMPool`` guards it with its lock.
+    """
+
+    def __init__(self, per_minute: float):
+        self.per_minute = float(per_minute)
+        self.factor = 1.0
+        self.tokens = self.per_minute
+        self.updated = time.monotonic()
+
+    @property
+    def capacity(self) -> float:
+        return self.per_minute * self.factor
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.capacity / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if available now)."""
+        self._refill(now)
+        # A request larger than the bucket runs once the bucket is full.
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60.0 / self.capacity
+
+    def take(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+    def throttle(self) -> None:
+        self.factor = max(_MIN_RATE_FACTOR, self.factor / 2)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def recover(self) -> None:
+        self.factor = min(1.0, self.factor + 0.1)
+
+
+class LLMEndpoint:
+    """One chat model in a pool, with its limits and health state.
+
+    Args:
+        name: Endpoint name used in metrics and health reports.
+        llm: Chat model serving the endpoint.
+        weight: Relative share of traffic.
+        rpm: Requests-per-minute limit (unlimited if None).
+        tpm: Tokens-per-minute limit (unlimited if None).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        llm: Any,
+        weight: float = 1.0,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+    ):
+        self.name = name
+        self.llm = llm
+        self.weight = weight
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.in_flight = 0
+        self.last_used = 0.0
+        self.cooldown_until = 0.0
+        self.unhealthy_until = 0.0
+        self.rate_limit_streak = 0
+        self.failure_streak = 0
+
+    def wait_time(self, estimated_tokens: float, now: float) -> float:
+        waits = [self.cooldown_until - now, self.unhealthy_until - now, 0.0]
+        if self.requests is not None:
+            waits.append(self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            waits.append(self.tokens.wait_time(estimated_tokens, now))
+        return max(waits)
+
+    def health(self, now: float) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": self.unhealthy_until <= now,
+            "in_flight": self.in_flight,
+            "cooldown_sec": round(max(0.0, self.cooldown_until - now), 3),
+            "rate_limit_streak": self.rate_limit_streak,
+            "failure_streak": self.failure_streak,
+            "rate_factor": min(
+                (b.factor for b in (self.requests, self.tokens) if b is not None),
+                default=1.0,
+            ),
+        }
+
+
+def _parse_duration(value: Any) -> Optional[float]:
+    """Parses header durations such as ``"2"``, ``"1.5s"``, ``"20ms"`` or ``"6m0s"``."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    parts = _DURATION.findall(str(value))
+    if not parts:
+        return None
+    return sum(float(n) * _UNITS[unit] for n, unit in parts)
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Cooldown requested by a 429 response, from its headers, or None."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    retry_ms = _parse_duration(headers.get("retry-after-ms"))
+    if retry_ms is not None:
+        return retry_ms / 1000.0
+    explicit = _parse_duration(headers.get("retry-after"))
+    if explicit is not None:
+        return explicit
+    resets = [
+        _parse_duration(headers.get(name))
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+    ]
+    resets = [r for r in resets if r is not None]
+    return max(resets) if resets else None
+
+
+def classify_error(exc: BaseException) -> str:
+    """Maps an LLM call error to a pool outcome."""
+    status = getattr(exc, "status_code", None)
+    if status == 429 or (RateLimitError is not None and isinstance(exc, RateLimitError)):
+        return RATE_LIMITED
+    if isinstance(exc, _transient_errors) or status in (408, 409) or (isinstance(status, int) and status >= 500):
+        return FAILED
+    return ERROR
+
+
+def _estimate_tokens(messages: Sequence[Any]) -> int:
+    chars = sum(len(m.content) if isinstance(m.content, str) else len(str(m.content)) for m in messages)
+    return chars // 4 + 1
+
+
+def _used_tokens(result: Any) -> Optional[int]:
+    for generation in getattr(result, "generations", None) or []:
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+        if usage and usage.get("total_tokens"):
+            return usage["total_tokens"]
+    usage = (getattr(result, "llm_output", None) or {}).get("token_usage") or {}
+    return usage.get("total_tokens")
+
+
+class LLMPool:
+    """Routes calls of one agent over several endpoints.
+
+    Args:
+        name: Agent name, used in metrics and errors.
+        endpoints: Endpoints in the pool.
+        routing: ``least_loaded`` or ``weighted``.
+    """
+
+    def __init__(self, name: str, endpoints: List[LLMEndpoint], routing: str = "least_loaded"):
+        if not endpoints:
+            raise ValueError(f"LLM pool '{name}' needs at least one endpoint.")
+        self.name = name
+        self.endpoints = endpoints
+        self.routing = routing
+        self._lock = threading.Lock()
+
+    def _select(self, estimated: int):
+        """Reserves an endpoint; returns (endpoint, 0) or (None, seconds to wait)."""
+        now = time.monotonic()
+        with self._lock:
+            waits = [(ep.wait_time(estimated, now), ep) for ep in self.endpoints]
+            ready = [ep for wait, ep in waits if wait <= 0]
+            if not ready:
+                return None, min(wait for wait, _ in waits)
+            if self.routing == "weighted":
+                endpoint = random.choices(ready, weights=[ep.weight for ep in ready])[0]
+            else:
+                endpoint = min(ready, key=lambda ep: (ep.in_flight / ep.weight, ep.last_used))
+            endpoint.in_flight += 1
+            endpoint.last_used = now
+            if endpoint.requests is not None:
+                endpoint.requests.take(1)
+            if endpoint.tokens is not None:
+                endpoint.tokens.take(estimated)
+            return endpoint, 0.0
+
+    def _next_wait(self, wait: float, waited: float) -> float:
+        left = call_timeout(operation="LLM call")
+        if waited + wait > settings.llm_pool_max_wait_sec or (left is not None and wait >= left):
+            raise LLMPoolExhausted(
+                f"No endpoint of LLM pool '{self.name}' available within the wait budget "
+                f"(next in {wait:.1f}s)."
+            )
+        return max(wait, 0.01)
+
+    def acquire(self, estimated: int) -> LLMEndpoint:
+        """Reserves an endpoint, waiting for capacity if all are busy."""
+        waited = 0.0
+        while True:
+            endpoint, wait = self._select(estimated)
+            if endpoint is not None:
+                if waited:
+                    llm_pool_wait_histogram.record(waited, {"agent": self.name})
+                return endpoint
+            wait = self._next_wait(wait, waited)
+            time.sleep(wait)
+            waited += wait
+
+    async def aacquire(self, estimated: int) -> LLMEndpoint:
+        """Async variant of ``acquire``; waits without blocking the loop."""
+        waited = 0.0
+        while True:
+            endpoint, wait = self._select(estimated)
+            if endpoint is not None:
+                if waited:
+                    llm_pool_wait_histogram.record(waited, {"agent": self.name})
+                return endpoint
+            wait = self._next_wait(wait, waited)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def release(
+        self,
+        endpoint: LLMEndpoint,
+        outcome: str,
+        exc: Optional[BaseException] = None,
+        estimated: int = 0,
+        used_tokens: Optional[int] = None,
+    ) -> None:
+        """Returns an endpoint to the pool and updates its limits and health."""
+        now = time.monotonic()
+        with self._lock:
+            endpoint.in_flight -= 1
+            buckets = [b for b in (endpoint.requests, endpoint.tokens) if b is not None]
+            if outcome == OK:
+                endpoint.rate_limit_streak = 0
+                endpoint.failure_streak = 0
+                endpoint.unhealthy_until = 0.0
+                for bucket in buckets:
+                    bucket.recover()
+                if used_tokens is not None and endpoint.tokens is not None:
+                    endpoint.tokens.take(used_tokens - estimated)
+            elif outcome == RATE_LIMITED:
+                endpoint.rate_limit_streak += 1
+                delay = retry_after(exc) if exc is not None else None
+                if delay is None:
+                    delay = min(
+                        settings.llm_pool_backoff_max_sec,
+                        settings.llm_pool_backoff_base_sec * 2 ** (endpoint.rate_limit_streak - 1),
+                    )
+                endpoint.cooldown_until = max(endpoint.cooldown_until, now + delay)
+                for bucket in buckets:
+                    bucket.throttle()
+            elif outcome == FAILED:
+                endpoint.failure_streak += 1
+                if endpoint.failure_streak >= settings.llm_pool_unhealthy_after:
+                    endpoint.unhealthy_until = now + settings.llm_pool_unhealthy_cooldown_sec
+                    logger.warning(
+                        f"LLM endpoint '{endpoint.name}' of pool '{self.name}' marked unhealthy "
+                        f"after {endpoint.failure_streak} consecutive failures."
+                    )
+        llm_pool_requests_counter.add(1, {"agent": self.name, "endpoint": endpoint.name, "outcome": outcome})
+
+    def _can_retry(self, outcome: str, attempt: int) -> bool:
+        return outcome in (RATE_LIMITED, FAILED) and attempt + 1 < settings.llm_pool_max_attempts
+
+    def generate(self, messages, stop=None, run_manager=None, **kwargs):
+        estimated = _estimate_tokens(messages)
+        attempt = 0
+        while True:
+            endpoint = self.acquire(estimated)
+            # Stays CANCELLED if the call is abandoned (e.g. a losing hedge).
+            outcome, error, used = CANCELLED, None, None
+            try:
+                result = endpoint.llm._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+                outcome, used = OK, _used_tokens(result)
+            except Exception as exc:
+                outcome, error = classify_error(exc), exc
+                if not self._can_retry(outcome, attempt):
+                    raise
+                attempt += 1
+                continue
+            finally:
+                self.release(endpoint, outcome, exc=error, estimated=estimated, used_tokens=used)
+            return result
+
+    async def agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        estimated = _estimate_tokens(messages)
+        attempt = 0
+        while True:
+            endpoint = await self.aacquire(estimated)
+            # Stays CANCELLED if the call is abandoned (e.g. a losing hedge).
+            outcome, error, used = CANCELLED, None, None
+            try:
+                result = await endpoint.llm._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+                outcome, used = OK, _used_tokens(result)
+            except Exception as exc:
+                outcome, error = classify_error(exc), exc
+                if not self._can_retry(outcome, attempt):
+                    raise
+                attempt += 1
+                continue
+            finally:
+                self.release(endpoint, outcome, exc=error, estimated=estimated, used_tokens=used)
+            return result
+
+    def stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[Any]:
+        """Streams from one endpoint; fails over only before the first chunk."""
+        estimated = _estimate_tokens(messages)
+        attempt = 0
+        while True:
+            endpoint = self.acquire(estimated)
+            outcome, error, started = OK, None, False
+            try:
+                for chunk in endpoint.llm._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    yield chunk
+            except Exception as exc:
+                outcome, error = classify_error(exc), exc
+                if started or not self._can_retry(outcome, attempt):
+                    raise
+                attempt += 1
+                continue
+            finally:
+                self.release(endpoint, outcome, exc=error)
+            return
+
+    async def astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[Any]:
+        """Async variant of ``stream``."""
+        estimated = _estimate_tokens(messages)
+        attempt = 0
+        while True:
+            endpoint = await self.aacquire(estimated)
+            outcome, error, started = OK, None, False
+            try:
+                async for chunk in endpoint.llm._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    yield chunk
+            except Exception as exc:
+                outcome, error = classify_error(exc), exc
+                if started or not self._can_retry(outcome, attempt):
+                    raise
+                attempt += 1
+                continue
+            finally:
+                self.release(endpoint, outcome, exc=error)
+            return
+
+    def health(self) -> List[Dict[str, Any]]:
+        """Per-endpoint health and load snapshot."""
+        now = time.monotonic()
+        with self._lock:
+            return [ep.health(now) for ep in self.endpoints]
@@ -1,16 +1,115 @@
+from nl2sql.common.deadline import call_timeout
 from nl2sql.secrets import SecretManager
+from langchain_core.caches import BaseCache
 from langchain_openai import ChatOpenAI
+from pydantic import PrivateAttr
+from .cache import AgentLLMCache, build_llm_cache
+from .cassette import Cassette, CassetteRecorder, active_cassette
+from .hedging import Hedger
+from .local import LOCAL_PROVIDERS, LocalChatModel, load_responses
 from .models import AgentConfig
-from typing import Dict, Any
+from .pool import LLMEndpoint, LLMPool
+from .routing import COMPLEX, ESCALATED, LARGE, SIMPLE, SMALL, ModelRoute
+from typing import Dict, Any, List, Optional
 from threading import RLock
 
+# Keys are never exposed through config listings, including per-endpoint ones.
+_SECRET_FIELDS = {"api_key": True, "endpoints": {"__all__": {"api_key"}}}
+
+
+class DeadlineAwareChatOpenAI(ChatOpenAI):
+    """ChatOpenAI whose requests are bounded by the active request deadline.
+
+    The remaining budget (see ``nl2sql.common.deadline``) is sent as the
+    per-request ``timeout`` so an abandoned request does not keep an LLM
+    call running past its deadline.
+
+    With a ``Hedger`` attached (agents with ``hedge: true``), slow
+    non-streaming calls are duplicated and the first response wins. With a
+    replay ``Cassette`` attached, calls are answered from the cassette and
+    never reach the API.
+    """
+
+    _hedger: Optional[Hedger] = PrivateAttr(default=None)
+    _cassette: Optional[Cassette] = PrivateAttr(default=None)
+
+    def _should_stream(self, *, async_api, run_manager=None, **kwargs) -> bool:
+        if self._cassette is not None:
+            return False
+        return super()._should_stream(async_api=async_api, run_manager=run_manager, **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self._cassette is not None:
+            return self._cassette.replay_llm(messages)
+        if self._hedger is None:
+            return self._send(messages, stop=stop, run_manager=run_manager, **kwargs)
+        return self._hedger.run(lambda: self._send(messages, stop=stop, run_manager=run_manager, **kwargs))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self._cassette is not None:
+            return await self._cassette.areplay_llm(messages)
+        if self._hedger is None:
+            return await self._asend(messages, stop=stop, run_manager=run_manager, **kwargs)
+        return await self._hedger.arun(lambda: self._asend(messages, stop=stop, run_manager=run_manager, **kwargs))
+
+    def _send(self, messages, stop=None, run_manager=None, **kwargs):
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _asend(self, messages, stop=None, run_manager=None, **kwargs):
+        return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    def _get_request_payload(self, input_, *, stop=None, **kwargs) -> dict:
+        payload = super()._get_request_payload(input_, stop=stop, **kwargs)
+        timeout = call_timeout(operation="LLM call")
+        if timeout is not None and "timeout" not in payload:
+            payload["timeout"] = timeout
+        return payload
+
+
+class PooledChatOpenAI(DeadlineAwareChatOpenAI):
+    """ChatOpenAI facade whose calls are served by an ``LLMPool``.
+
+    Prompt handling, structured output, tool binding and response caching
+    stay on this model; each request goes to the endpoint the pool picks.
+    """
+
+    _pool: Optional[LLMPool] = PrivateAttr(default=None)
+
+    def _send(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._pool.generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _asend(self, messages, stop=None, run_manager=None, **kwargs):
+        return await self._pool.agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        yield from self._pool.stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        async for chunk in self._pool.astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            yield chunk
+
 class LLMRegistry:
 
-    def __init__(self, secret_manager: SecretManager ):
+    def __init__(self, secret_manager: SecretManager, cache_backend: Optional[BaseCache] = None):
         self.secret_manager = secret_manager
         self.llms = {}
+        self.pools: Dict[str, LLMPool] = {}
         self._configs: Dict[str, AgentConfig] = {}
         self._lock = RLock()
+        self._revision = 0
+        self._cache_backend = cache_backend
+
+    def _cache_for(self, agent: AgentConfig) -> Optional[BaseCache]:
+        """Response cache for ``agent``, or None when it has not opted in.
+
+        The backend is created on first use and shared by all agents.
+        """
+        if not getattr(agent, "cache", False):
+            return None
+        with self._lock:
+            if self._cache_backend is None:
+                self._cache_backend = build_llm_cache()
+            return AgentLLMCache(self._cache_backend, agent.name)
 
     def register_llms(self, config: Dict[str, AgentConfig]):
         for agent in config.values():
@@ -22,6 +121,8 @@ class LLMRegistry:
             self._configs[agent.name] = agent
         if agent.provider == "openai":
             self.register_openai_llm(agent)
+        elif agent.provider in LOCAL_PROVIDERS:
+            self.register_local_llm(agent)
         else:
             raise ValueError(f"Unsupported LLM provider: {agent.provider}")
 
@@ -32,9 +133,87 @@ class LLMRegistry:
             raise ImportError("langchain-openai is not installed. Please install it using 'pip install langchain-openai'")
 
         api_key = self.secret_manager.resolve_object(agent.api_key)
-        llm = ChatOpenAI(model=agent.model, api_key=api_key,temperature=agent.temperature, tags=[agent.name], seed=42)
+        cassette = active_cassette()
+        replaying = cassette is not None and cassette.mode == "replay"
+        # Replayed agents never reach an endpoint, so no pool or real key is needed.
+        pool = None if replaying else self._build_openai_pool(agent, api_key)
+        if replaying and not api_key:
+            api_key = "cassette-replay"
+        llm_cls = PooledChatOpenAI if pool is not None else DeadlineAwareChatOpenAI
+        llm = llm_cls(
+            model=agent.model,
+            api_key=api_key if pool is None else pool.endpoints[0].llm.openai_api_key,
+            temperature=agent.temperature,
+            tags=[agent.name],
+            seed=42,
+            cache=self._cache_for(agent),
+            callbacks=[CassetteRecorder(cassette, agent.name)] if cassette is not None and not replaying else None,
+        )
+        if pool is not None:
+            llm._pool = pool
+        if replaying:
+            llm._cassette = cassette
+        if getattr(agent, "hedge", False):
+            llm._hedger = Hedger(agent.name)
         with self._lock:
             self.llms[agent.name] = llm
+            if pool is not None:
+                self.pools[agent.name] = pool
+            else:
+                self.pools.pop(agent.name, None)
+            self._revision += 1
+
+    def register_local_llm(self, agent: AgentConfig):
+        """Registers an offline model (``fake`` or ``local_replay``) for ``agent``."""
+        llm = LocalChatModel(
+            agent=agent.name,
+            mode=agent.provider,
+            latency_ms=getattr(agent, "latency_ms", 0.0),
+            responses=load_responses(getattr(agent, "responses_path", None)),
+            tags=[agent.name],
+            cache=self._cache_for(agent),
+        )
+        with self._lock:
+            self.llms[agent.name] = llm
+            self.pools.pop(agent.name, None)
+            self._revision += 1
+
+    def _build_openai_pool(self, agent: AgentConfig, api_key: Any) -> Optional[LLMPool]:
+        """Builds the endpoint pool for ``agent``, or None when it has no endpoints.
+
+        Endpoint clients do not retry on their own (``max_retries=0``): the
+        pool handles 429s and transient failures by moving to another endpoint.
+        """
+        endpoints = getattr(agent, "endpoints", None) or []
+        if not endpoints:
+            return None
+        members = []
+        for index, endpoint in enumerate(endpoints):
+            endpoint_key = self.secret_manager.resolve_object(endpoint.api_key) if endpoint.api_key else api_key
+            llm = DeadlineAwareChatOpenAI(
+                model=endpoint.model or agent.model,
+                api_key=endpoint_key,
+                base_url=endpoint.base_url,
+                temperature=agent.temperature,
+                seed=42,
+                max_retries=0,
+            )
+            members.append(
+                LLMEndpoint(
+                    name=endpoint.name or f"{agent.name}-{index}",
+                    llm=llm,
+                    weight=endpoint.weight,
+                    rpm=endpoint.rpm,
+                    tpm=endpoint.tpm,
+                )
+            )
+        return LLMPool(agent.name, members, routing=getattr(agent, "routing", "least_loaded"))
+
+    @property
+    def revision(self) -> int:
+        """Monotonic counter bumped whenever an LLM is (re)registered."""
+        with self._lock:
+            return self._revision
 
 
     
@@ -45,17 +224,41 @@ class LLMRegistry:
             return self.llms[name]
     
 
+    def route(self, name: str, complexity: int, escalate: bool = False) -> ModelRoute:
+        """Picks the small or large model for one call of agent ``name``.
+
+        Agents without ``small_agent`` (or whose small agent is not
+        registered) always get their own model, with ``tier=None``.
+        ``escalate`` forces the large model, e.g. on a planner retry.
+        """
+        with self._lock:
+            config = self._configs.get(name) or self._configs.get("default")
+            large = self.get_llm(name)
+            small = getattr(config, "small_agent", None)
+            if not small or small not in self.llms:
+                return ModelRoute(None, large, complexity, None)
+            simple = complexity <= config.small_max_complexity
+            if simple and not escalate:
+                return ModelRoute(SMALL, self.llms[small], complexity, SIMPLE)
+            return ModelRoute(LARGE, large, complexity, ESCALATED if simple else COMPLEX)
+
     def get_llm_config(self, name: str) -> Dict[str, Any]:
         with self._lock:
             if name not in self._configs:
                 name = "default"
             config = self._configs[name]
-            return config.model_dump(exclude={"api_key"})
+            return config.model_dump(exclude=_SECRET_FIELDS)
+
+    def endpoint_health(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Per-endpoint health of every pooled agent."""
+        with self._lock:
+            pools = dict(self.pools)
+        return {name: pool.health() for name, pool in pools.items()}
 
     def list_llms(self) -> Dict[str, Dict[str, Any]]:
         with self._lock:
             return {
-                name: config.model_dump(exclude={"api_key"})
+                name: config.model_dump(exclude=_SECRET_FIELDS)
                 for name, config in self._configs.items()
             }
 
@@ -0,0 +1,112 @@
+"""Complexity-based model routing (small -> large cascade).
+
+An agent configured with ``small_agent`` serves simple requests from that
+agent's (fast, cheap) model and everything else from its own model. A request
+is simple when its complexity score is at most ``small_max_complexity``.
+Retries always use the large model: a retry means the previous plan was
+rejected by a validator or failed, which starts the refiner loop.
+
+Per-tier calls (``nl2sql.llm_tier.calls``, by reason) and latency
+(``nl2sql.llm_tier.latency``) are exported for tuning the threshold.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator, List, NamedTuple, Optional, Sequence, Set
+
+from nl2sql.common.metrics import llm_tier_calls_counter, llm_tier_latency_histogram
+
+if TYPE_CHECKING:
+    from nl2sql.pipeline.nodes.decomposer.schemas import SubQuery
+    from nl2sql.pipeline.nodes.schema_retriever.schema import Table
+
+SMALL = "small"
+LARGE = "large"
+
+# Reasons a call landed on its tier.
+SIMPLE = "simple"
+COMPLEX = "complex"
+ESCALATED = "escalated"
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class ModelRoute(NamedTuple):
+    """Model chosen for one call.
+
+    ``tier`` and ``reason`` are None when the agent has no cascade configured.
+    """
+
+    tier: Optional[str]
+    llm: Any
+    complexity: int
+    reason: Optional[str]
+
+
+def _stems(text: Optional[str]) -> Set[str]:
+    # snake_case/camelCase split and a crude plural strip, so "OrderItems" matches "order items".
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text or "").replace("_", " ").lower()
+    return {w[:-1] if len(w) > 3 and w.endswith("s") else w for w in _WORD.findall(text)}
+
+
+def referenced_tables(sub_query: Optional["SubQuery"], tables: Sequence["Table"]) -> List["Table"]:
+    """The retrieved tables a sub-query actually refers to.
+
+    Schema retrieval returns the vector-search top-k, most of which a plan
+    never touches. A table counts when its name appears in the intent, or
+    when it is the only table with a column named after one of the
+    sub-query's metrics, filters, group-by or expected columns.
+    """
+    if sub_query is None:
+        return []
+    intent = _stems(sub_query.intent)
+    attributes = [m.name for m in sub_query.metrics]
+    attributes += [f.attribute for f in sub_query.filters]
+    attributes += [g.attribute for g in sub_query.group_by]
+    attributes += [c.name for c in sub_query.expected_schema]
+
+    referenced = {id(t) for t in tables if t.name and _stems(t.name.rsplit(".", 1)[-1]) <= intent}
+    for attribute in attributes:
+        wanted = _stems(attribute)
+        owners = [t for t in tables if any(_stems(c.name) == wanted for c in t.columns)]
+        if len(owners) == 1:
+            referenced.add(id(owners[0]))
+    return [t for t in tables if id(t) in referenced]
+
+
+def complexity_score(
+    sub_query: Optional["SubQuery"],
+    tables: Sequence["Table"] = (),
+    combine_groups: int = 0,
+) -> int:
+    """Scores how hard a sub-query is to plan.
+
+    Each referenced table (see ``referenced_tables``) beyond the first counts
+    2 (it needs a join); each filter, group-by attribute, metric beyond the
+    first and compare/join/union group the sub-query feeds counts 1. A
+    single-table count scores 0.
+    """
+    score = 2 * max(len(referenced_tables(sub_query, tables)) - 1, 0) + combine_groups
+    if sub_query is not None:
+        score += len(sub_query.filters) + len(sub_query.group_by) + max(len(sub_query.metrics) - 1, 0)
+    return score
+
+
+@contextmanager
+def tier_call(agent: str, route: ModelRoute) -> Iterator[None]:
+    """Records tier metrics for the call made inside the block."""
+    if route.tier not in (SMALL, LARGE):
+        yield
+        return
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        attributes = {"agent": agent, "tier": route.tier}
+        llm_tier_latency_histogram.record(time.perf_counter() - start, attributes)
+        llm_tier_calls_counter.add(1, {**attributes, "reason": route.reason, "outcome": outcome})
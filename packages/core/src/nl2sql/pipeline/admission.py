@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from enum import Enum
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Union
+
+from nl2sql.common.exceptions import NL2SQLError
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import (
+    admission_queue_depth,
+    admission_rejected_counter,
+    admission_wait_histogram,
+)
+from nl2sql.common.settings import settings
+
+logger = get_logger("admission")
+
+DEFAULT_TENANT = "default"
+
+
+class Priority(str, Enum):
+    """Admission priority classes; interactive requests are dequeued first."""
+
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
+_PRIORITY_RANK = {Priority.INTERACTIVE: 0, Priority.BATCH: 1}
+
+
+class AdmissionRejected(NL2SQLError):
+    """Raised when a request is shed instead of admitted.
+
+    Attributes:
+        reason: ``queue_full``, ``queue_timeout`` or ``shed`` (displaced by a
+            higher-priority request).
+        retry_after_sec: Suggested client back-off.
+    """
+
+    def __init__(self, reason: str, message: str, retry_after_sec: float = 1.0):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after_sec = retry_after_sec
+
+
+class _Ticket:
+    __slots__ = ("tenant_id", "priority", "seq", "future", "enqueued_at")
+
+    def __init__(self, tenant_id: str, priority: Priority, seq: int):
+        self.tenant_id = tenant_id
+        self.priority = priority
+        self.seq = seq
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.enqueued_at = time.monotonic()
+
+    @property
+    def sort_key(self) -> tuple:
+        return (_PRIORITY_RANK[self.priority], self.seq)
+
+
+class AdmissionController:
+    """Bounds concurrent pipeline executions globally and per tenant.
+
+    Requests that cannot start immediately wait in a bounded queue ordered by
+    priority class, then arrival. A waiter is admitted as soon as both the
+    global and its tenant's limits allow, so a saturated tenant never blocks
+    other tenants queued behind it. When the queue is full a new request is
+    rejected immediately, unless it outranks the newest lower-priority waiter,
+    which is shed in its place. Waiting longer than ``queue_timeout_sec``
+    rejects the request as well.
+
+    Shared by sync and async callers; waiters are parked on
+    ``concurrent.futures.Future`` objects.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        per_tenant: Optional[int] = None,
+        max_queue: int = 64,
+        queue_timeout_sec: float = 10.0,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+        if per_tenant is not None and per_tenant < 1:
+            raise ValueError("per_tenant must be >= 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must be >= 0")
+        self.max_concurrent = max_concurrent
+        self.per_tenant = per_tenant
+        self.max_queue = max_queue
+        self.queue_timeout_sec = queue_timeout_sec
+        self._active = 0
+        self._active_by_tenant: Dict[str, int] = {}
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _has_capacity(self, tenant_id: str) -> bool:
+        if self._active >= self.max_concurrent:
+            return False
+        if self.per_tenant is None:
+            return True
+        return self._active_by_tenant.get(tenant_id, 0) < self.per_tenant
+
+    def _grant(self, tenant_id: str) -> None:
+        self._active += 1
+        self._active_by_tenant[tenant_id] = self._active_by_tenant.get(tenant_id, 0) + 1
+
+    def _dequeue(self, index: int) -> _Ticket:
+        ticket = self._queue.pop(index)
+        admission_queue_depth.add(-1, {"priority": ticket.priority.value})
+        return ticket
+
+    def _dispatch(self) -> None:
+        # Caller holds the lock.
+        index = 0
+        while index < len(self._queue) and self._active < self.max_concurrent:
+            ticket = self._queue[index]
+            if not self._has_capacity(ticket.tenant_id):
+                index += 1
+                continue
+            self._dequeue(index)
+            self._grant(ticket.tenant_id)
+            ticket.future.set_result(None)
+
+    def _reject(self, reason: str, priority: Priority, message: str) -> AdmissionRejected:
+        admission_rejected_counter.add(1, {"reason": reason, "priority": priority.value})
+        logger.warning(f"Admission rejected ({reason}, {priority.value}): {message}")
+        return AdmissionRejected(reason, message)
+
+    def _enqueue(self, tenant_id: str, priority: Priority) -> Optional[_Ticket]:
+        """Admits immediately (returns None) or queues and returns a ticket."""
+        with self._lock:
+            # Queued waiters are always blocked by a limit, so a request with
+            # capacity does not jump ahead of anyone who could run.
+            if self._has_capacity(tenant_id):
+                self._grant(tenant_id)
+                return None
+
+            ticket = _Ticket(tenant_id, priority, next(self._seq))
+            if len(self._queue) >= self.max_queue:
+                lowest = self._queue[-1] if self._queue else None
+                if lowest is None or lowest.sort_key[0] <= ticket.sort_key[0]:
+                    raise self._reject(
+                        "queue_full", priority,
+                        f"Admission queue is full ({self.max_queue} waiting).",
+                    )
+                self._dequeue(len(self._queue) - 1)
+                lowest.future.set_exception(
+                    self._reject(
+                        "shed", lowest.priority,
+                        "Displaced from the admission queue by a higher-priority request.",
+                    )
+                )
+
+            self._queue.append(ticket)
+            self._queue.sort(key=lambda t: t.sort_key)
+            admission_queue_depth.add(1, {"priority": priority.value})
+            return ticket
+
+    def _abandon(self, ticket: _Ticket) -> bool:
+        """Removes a waiting ticket; False if it was admitted in the meantime."""
+        with self._lock:
+            for index, queued in enumerate(self._queue):
+                if queued is ticket:
+                    self._dequeue(index)
+                    return True
+            return False
+
+    def _timed_out(self, ticket: _Ticket) -> AdmissionRejected:
+        return self._reject(
+            "queue_timeout", ticket.priority,
+            f"Not admitted within {self.queue_timeout_sec}s.",
+        )
+
+    def _record_wait(self, priority: Priority, started: float) -> None:
+        admission_wait_histogram.record(
+            time.monotonic() - started, {"priority": priority.value}
+        )
+
+    def acquire(self, tenant_id: Optional[str] = None, priority: Union[Priority, str] = Priority.INTERACTIVE) -> None:
+        """Blocks until admitted.
+
+        Raises:
+            AdmissionRejected: If the queue is full, the request was shed, or
+                it was not admitted within ``queue_timeout_sec``.
+        """
+        tenant_id = tenant_id or DEFAULT_TENANT
+        priority = Priority(priority)
+        started = time.monotonic()
+        ticket = self._enqueue(tenant_id, priority)
+        if ticket is not None:
+            try:
+                ticket.future.result(timeout=self.queue_timeout_sec)
+            except concurrent.futures.TimeoutError:
+                if self._abandon(ticket):
+                    raise self._timed_out(ticket)
+            except AdmissionRejected:
+                raise
+            except BaseException:
+                if not self._abandon(ticket):
+                    self.release(tenant_id)
+                raise
+        self._record_wait(priority, started)
+
+    async def aacquire(self, tenant_id: Optional[str] = None, priority: Union[Priority, str] = Priority.INTERACTIVE) -> None:
+        """Async counterpart of ``acquire``; waits without blocking the event loop."""
+        tenant_id = tenant_id or DEFAULT_TENANT
+        priority = Priority(priority)
+        started = time.monotonic()
+        ticket = self._enqueue(tenant_id, priority)
+        if ticket is not None:
+            # asyncio.wait (not wait_for) so a timeout does not cancel the
+            # shared future that _dispatch resolves.
+            waiter = asyncio.wrap_future(ticket.future)
+            try:
+                done, _ = await asyncio.wait({waiter}, timeout=self.queue_timeout_sec)
+            except BaseException:
+                if not self._abandon(ticket):
+                    self.release(tenant_id)
+                raise
+            if not done and self._abandon(ticket):
+                raise self._timed_out(ticket)
+            ticket.future.result()
+        self._record_wait(priority, started)
+
+    def release(self, tenant_id: Optional[str] = None) -> None:
+        tenant_id = tenant_id or DEFAULT_TENANT
+        with self._lock:
+            self._active -= 1
+            remaining = self._active_by_tenant.get(tenant_id, 1) - 1
+            if remaining > 0:
+                self._active_by_tenant[tenant_id] = remaining
+            else:
+                self._active_by_tenant.pop(tenant_id, None)
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, tenant_id: Optional[str] = None, priority: Union[Priority, str] = Priority.INTERACTIVE) -> Iterator[None]:
+        self.acquire(tenant_id, priority)
+        try:
+            yield
+        finally:
+            self.release(tenant_id)
+
+    @asynccontextmanager
+    async def aslot(self, tenant_id: Optional[str] = None, priority: Union[Priority, str] = Priority.INTERACTIVE) -> AsyncIterator[None]:
+        await self.aacquire(tenant_id, priority)
+        try:
+            yield
+        finally:
+            self.release(tenant_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Point-in-time snapshot of active and queued requests."""
+        with self._lock:
+            return {
+                "active": self._active,
+                "queued": len(self._queue),
+                "queued_interactive": sum(1 for t in self._queue if t.priority is Priority.INTERACTIVE),
+                "queued_batch": sum(1 for t in self._queue if t.priority is Priority.BATCH),
+            }
+
+
+def build_admission_controller() -> Optional[AdmissionController]:
+    if not settings.admission_enabled:
+        return None
+    return AdmissionController(
+        max_concurrent=settings.admission_max_concurrent,
+        per_tenant=settings.admission_tenant_max_concurrent,
+        max_queue=settings.admission_max_queue,
+        queue_timeout_sec=settings.admission_queue_timeout_sec,
+    )
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import answer_cache_hit_counter, answer_cache_miss_counter
+from nl2sql.common.settings import settings
+from nl2sql.pipeline.single_flight import normalize_query
+
+logger = get_logger("answer_cache")
+
+AnswerCacheKey = Tuple[Hashable, ...]
+
+# Final-state fields replayed on a hit.
+CACHED_FIELDS = (
+    "datasource_resolver_response",
+    "decomposer_response",
+    "aggregator_response",
+    "artifact_refs",
+    "answer_synthesizer_response",
+)
+
+
+def build_answer_key(
+    user_query: str,
+    datasource_id: Optional[str],
+    user_context: Any,
+    execute: bool,
+) -> AnswerCacheKey:
+    """Builds the answer cache key for a request.
+
+    Schema versions are not part of the key: the datasources a question
+    resolves to are only known after the run, so they are recorded on the
+    entry and checked against the schema store on lookup.
+    """
+    roles = tuple(sorted(set(getattr(user_context, "roles", None) or [])))
+    tenant_id = getattr(user_context, "tenant_id", None)
+    return (normalize_query(user_query), datasource_id, tenant_id, roles, execute)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    result: Dict[str, Any]
+    schema_versions: Tuple[Tuple[str, str], ...]
+    expires_at: float
+
+
+class AnswerCache:
+    """Process-local LRU cache of final pipeline answers.
+
+    Stores the aggregator output, artifact refs and synthesized answer of
+    successful runs. An entry is served only while every datasource it read
+    is still on the schema version it was answered from and its TTL (the
+    shortest among those datasources) has not elapsed, so hits never touch an
+    LLM or a database.
+
+    Args:
+        max_entries: Max cached answers; least recently used are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[AnswerCacheKey, _Entry]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, ctx: Any, key: AnswerCacheKey) -> Optional[Dict[str, Any]]:
+        """Returns a copy of the cached final state for ``key``, or None.
+
+        The copy gets a fresh ``trace_id`` and an ``answer_cache`` reasoning
+        entry; errors and warnings are empty.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() >= entry.expires_at:
+                del self._entries[key]
+                entry = None
+        if entry is not None and not self._is_current(ctx, entry):
+            self._discard(key, entry)
+            entry = None
+        if entry is None:
+            answer_cache_miss_counter.add(1)
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        answer_cache_hit_counter.add(1)
+        return {
+            **entry.result,
+            "trace_id": str(uuid.uuid4()),
+            "errors": [],
+            "warnings": [],
+            "reasoning": [
+                {
+                    "node": "answer_cache",
+                    "content": [
+                        "Served from answer cache for schema versions "
+                        + ", ".join(f"{ds}@{v}" for ds, v in entry.schema_versions)
+                        + "."
+                    ],
+                }
+            ],
+        }
+
+    def put(self, ctx: Any, key: AnswerCacheKey, result: Dict[str, Any]) -> bool:
+        """Caches a successful final state.
+
+        Returns:
+            bool: False if the result is not cacheable (errors, no answer, a
+            datasource without schema version, or a TTL of 0).
+        """
+        if result.get("errors") or result.get("answer_synthesizer_response") is None:
+            return False
+        resolver = result.get("datasource_resolver_response")
+        resolved = getattr(resolver, "resolved_datasources", None) or []
+        if not resolved or any(not ds.schema_version for ds in resolved):
+            return False
+
+        ttl = min(self._ttl(ctx, ds.datasource_id) for ds in resolved)
+        if ttl <= 0:
+            return False
+
+        entry = _Entry(
+            result={k: result[k] for k in CACHED_FIELDS if k in result},
+            schema_versions=tuple(sorted((ds.datasource_id, ds.schema_version) for ds in resolved)),
+            expires_at=time.time() + ttl,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def purge(self, datasource_id: Optional[str] = None, tenant_id: Optional[str] = None) -> int:
+        """Drops cached answers, optionally only those reading ``datasource_id`` or owned by ``tenant_id``.
+
+        Returns:
+            int: Number of purged answers.
+        """
+        with self._lock:
+            purged = [
+                key
+                for key, entry in self._entries.items()
+                if (datasource_id is None or any(ds == datasource_id for ds, _ in entry.schema_versions))
+                and (tenant_id is None or key[2] == tenant_id)
+            ]
+            for key in purged:
+                del self._entries[key]
+        if purged:
+            logger.info(f"Purged {len(purged)} cached answer(s).")
+        return len(purged)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _discard(self, key: AnswerCacheKey, entry: _Entry) -> None:
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+    def _is_current(self, ctx: Any, entry: _Entry) -> bool:
+        return all(
+            ctx.schema_store.get_latest_version(ds_id) == version
+            for ds_id, version in entry.schema_versions
+        )
+
+    def _ttl(self, ctx: Any, datasource_id: str) -> float:
+        ttl = ctx.ds_registry.get_answer_cache_ttl(datasource_id)
+        return settings.answer_cache_ttl_sec if ttl is None else ttl
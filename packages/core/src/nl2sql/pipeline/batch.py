@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from nl2sql.common.concurrency import ConcurrencyLimits, use_limits
+from nl2sql.common.logger import get_logger
+
+logger = get_logger("batch")
+
+
+@dataclass(frozen=True)
+class BatchQuery:
+    """One question of a batch, optionally pinned to a datasource."""
+
+    query: str
+    datasource_id: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple[str, Optional[str]]:
+        return (" ".join(self.query.split()), self.datasource_id)
+
+
+BatchInput = Union[str, BatchQuery]
+
+
+@dataclass
+class BatchItemResult:
+    """Result of one unique question; ``indices`` lists every input position it answers."""
+
+    query: BatchQuery
+    indices: List[int]
+    result: Any = None
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        if self.error is not None:
+            return False
+        if isinstance(self.result, dict):
+            return not self.result.get("errors")
+        return bool(getattr(self.result, "success", True))
+
+
+@dataclass
+class BatchStats:
+    """Aggregate throughput statistics for a batch run."""
+
+    total: int = 0
+    unique: int = 0
+    completed: int = 0
+    failed: int = 0
+    elapsed_sec: float = 0.0
+    total_latency_sec: float = 0.0
+    max_latency_sec: float = 0.0
+
+    @property
+    def duplicates(self) -> int:
+        return self.total - self.unique
+
+    @property
+    def throughput_qps(self) -> float:
+        """Unique questions completed per second of wall time."""
+        return self.completed / self.elapsed_sec if self.elapsed_sec else 0.0
+
+    @property
+    def avg_latency_sec(self) -> float:
+        return self.total_latency_sec / self.completed if self.completed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "completed": self.completed,
+            "failed": self.failed,
+            "elapsed_sec": self.elapsed_sec,
+            "throughput_qps": self.throughput_qps,
+            "avg_latency_sec": self.avg_latency_sec,
+            "max_latency_sec": self.max_latency_sec,
+        }
+
+
+class BatchRun:
+    """Iterator over batch results in completion order.
+
+    Identical questions (whitespace-normalized, same datasource override) run
+    once. Before any work starts, the questions that need datasource
+    resolution are embedded in one batched call. ``stats`` is updated as
+    results are yielded and is final once iteration ends.
+    """
+
+    def __init__(
+        self,
+        batch: Sequence[BatchInput],
+        run_one: Callable[[BatchQuery], Any],
+        concurrency: int = 4,
+        limits: Optional[ConcurrencyLimits] = None,
+        vector_store: Any = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self._run_one = run_one
+        self._concurrency = concurrency
+        self._limits = limits
+        self._vector_store = vector_store
+        self._groups: Dict[Tuple[str, Optional[str]], Tuple[BatchQuery, List[int]]] = {}
+        for index, item in enumerate(batch):
+            query = item if isinstance(item, BatchQuery) else BatchQuery(query=item)
+            group = self._groups.setdefault(query.key, (query, []))
+            group[1].append(index)
+        self.stats = BatchStats(total=len(batch), unique=len(self._groups))
+        self._started = False
+        self._lock = threading.Lock()
+
+    def _prime_embeddings(self) -> None:
+        if self._vector_store is None:
+            return
+        queries = [q.query for q, _ in self._groups.values() if not q.datasource_id]
+        if not queries:
+            return
+        try:
+            self._vector_store.prime_query_embeddings(queries)
+        except Exception as exc:
+            # Resolution still works without primed vectors, one query at a time.
+            logger.warning(f"Batch embedding failed; falling back to per-query embedding: {exc}")
+
+    def _execute(self, query: BatchQuery, indices: List[int]) -> BatchItemResult:
+        start = time.perf_counter()
+        with use_limits(self._limits):
+            try:
+                result = self._run_one(query)
+                return BatchItemResult(query, indices, result=result, duration=time.perf_counter() - start)
+            except Exception as exc:
+                return BatchItemResult(query, indices, error=str(exc), duration=time.perf_counter() - start)
+
+    def _record(self, item: BatchItemResult, started: float) -> None:
+        with self._lock:
+            self.stats.completed += 1
+            if not item.success:
+                self.stats.failed += 1
+            self.stats.total_latency_sec += item.duration
+            self.stats.max_latency_sec = max(self.stats.max_latency_sec, item.duration)
+            self.stats.elapsed_sec = time.perf_counter() - started
+
+    def __iter__(self) -> Iterator[BatchItemResult]:
+        if self._started:
+            raise RuntimeError("BatchRun can only be iterated once.")
+        self._started = True
+        started = time.perf_counter()
+        self._prime_embeddings()
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._concurrency,
+            thread_name_prefix="nl2sql-batch",
+        ) as executor:
+            futures = [
+                executor.submit(self._execute, query, indices)
+                for query, indices in self._groups.values()
+            ]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    item = future.result()
+                    self._record(item, started)
+                    yield item
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        self.stats.elapsed_sec = time.perf_counter() - started
+        logger.info(f"Batch finished: {self.stats.to_dict()}")
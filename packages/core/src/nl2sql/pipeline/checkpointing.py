@@ -0,0 +1,535 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+import typing
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Set
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.types import Send
+from pydantic import BaseModel
+
+from nl2sql.auth import UserContext
+from nl2sql.common.cancellation import CancellationToken
+from nl2sql.common.errors import ErrorSeverity, PipelineError
+from nl2sql.common.exceptions import NL2SQLError
+from nl2sql.common.logger import get_logger
+from nl2sql.common.settings import settings
+
+logger = get_logger("checkpointing")
+
+# Task path marker LangGraph uses for edge-triggered (non-Send) tasks.
+_PULL = "__pregel_pull"
+_BLOCKING_SEVERITIES = {ErrorSeverity.ERROR, ErrorSeverity.CRITICAL}
+
+
+class ResumeUnavailable(NL2SQLError):
+    """Raised when a trace has no checkpoint it can be resumed from."""
+
+
+def _detach(obj: Any) -> Any:
+    """Drops request-scoped cancel tokens from a value before it is persisted.
+
+    Tokens wrap a ``threading.Event`` and only mean something to the process
+    that created them; resumed runs are given a fresh one.
+    """
+    if isinstance(obj, CancellationToken):
+        return None
+    if isinstance(obj, BaseModel):
+        if getattr(obj, "cancel_token", None) is not None:
+            return obj.model_copy(update={"cancel_token": None})
+        return obj
+    if isinstance(obj, Send):
+        return Send(obj.node, _detach(obj.arg))
+    if isinstance(obj, dict):
+        if isinstance(obj.get("cancel_token"), CancellationToken):
+            return {**obj, "cancel_token": None}
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_detach(item) for item in obj)
+    return obj
+
+
+def _collect_state_types(annotation: Any, found: Set[type]) -> None:
+    if isinstance(annotation, type):
+        if annotation in found:
+            return
+        if issubclass(annotation, BaseModel):
+            found.add(annotation)
+            for model_field in annotation.model_fields.values():
+                _collect_state_types(model_field.annotation, found)
+        elif issubclass(annotation, Enum):
+            found.add(annotation)
+        return
+    for arg in typing.get_args(annotation):
+        _collect_state_types(arg, found)
+
+
+def state_types() -> Set[type]:
+    """Pydantic models and enums reachable from ``GraphState``."""
+    # Imported here: node schemas import the context, which builds the checkpointer.
+    from nl2sql.pipeline.state import GraphState
+
+    found: Set[type] = set()
+    _collect_state_types(GraphState, found)
+    return found
+
+
+class CheckpointSerializer(JsonPlusSerializer):
+    """LangGraph serializer restricted to pipeline state types.
+
+    Only models and enums reachable from ``GraphState`` are rebuilt when a
+    checkpoint is loaded; cancel tokens are never written.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(allowed_msgpack_modules=state_types())
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        return super().dumps_typed(_detach(obj))
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """SQLite-backed LangGraph checkpointer.
+
+    Stores checkpoints, channel blobs and pending writes in one local database
+    shared by sync and async graph runs (async methods run the same queries on
+    a worker thread). Threads whose newest checkpoint is older than
+    ``retention_sec`` are deleted whenever a new thread starts.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        retention_sec: Optional[float] = None,
+        serde: Optional[CheckpointSerializer] = None,
+    ):
+        super().__init__(serde=serde or CheckpointSerializer())
+        self._path = path
+        self._retention_sec = retention_sec
+        self._lock = threading.Lock()
+        self._connection = self._connect()
+        self._initialize_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        if str(self._path) != ":memory:":
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self._path), check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL;")
+        return connection
+
+    def _initialize_schema(self) -> None:
+        with self._connection:
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    checkpoint_type TEXT NOT NULL,
+                    checkpoint BLOB NOT NULL,
+                    metadata_type TEXT NOT NULL,
+                    metadata BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_checkpoints_created_at
+                ON checkpoints (created_at);
+                CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    channel TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    value_type TEXT NOT NULL,
+                    value BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+                );
+                CREATE TABLE IF NOT EXISTS checkpoint_writes (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    value_type TEXT NOT NULL,
+                    value BLOB,
+                    task_path TEXT NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                );
+                """
+            )
+
+    def _load_blobs(self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for channel, version in versions.items():
+            row = self._connection.execute(
+                """
+                SELECT value_type, value FROM checkpoint_blobs
+                WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?;
+                """,
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if row is None or row[0] == "empty":
+                continue
+            values[channel] = self.serde.loads_typed((row[0], row[1]))
+        return values
+
+    def _load_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> list:
+        rows = self._connection.execute(
+            """
+            SELECT task_id, channel, value_type, value FROM checkpoint_writes
+            WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+            ORDER BY task_path, task_id, idx;
+            """,
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return [
+            (task_id, channel, self.serde.loads_typed((value_type, value)))
+            for task_id, channel, value_type, value in rows
+        ]
+
+    def _to_tuple(self, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, c_type, c_blob, m_type, m_blob = row
+        checkpoint: Checkpoint = self.serde.loads_typed((c_type, c_blob))
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_blobs(thread_id, checkpoint_ns, checkpoint["channel_versions"]),
+            },
+            metadata=self.serde.loads_typed((m_type, m_blob)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=self._load_writes(thread_id, checkpoint_ns, checkpoint_id),
+        )
+
+    _SELECT = """
+        SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+               checkpoint_type, checkpoint, metadata_type, metadata
+        FROM checkpoints
+    """
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            if checkpoint_id:
+                row = self._connection.execute(
+                    self._SELECT + " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?;",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._connection.execute(
+                    self._SELECT
+                    + " WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1;",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._to_tuple(row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config:
+            configurable = config["configurable"]
+            clauses.append("thread_id = ?")
+            params.append(configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._connection.execute(
+                self._SELECT + where + " ORDER BY checkpoint_id DESC;", params
+            ).fetchall()
+            results = []
+            for row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                item = self._to_tuple(row)
+                if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                    continue
+                results.append(item)
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        parent_id = configurable.get("checkpoint_id")
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+        c_type, c_blob = self.serde.dumps_typed(stored)
+        m_type, m_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        blobs = [
+            (thread_id, checkpoint_ns, channel, str(version), *(
+                self.serde.dumps_typed(values[channel]) if channel in values else ("empty", None)
+            ))
+            for channel, version in new_versions.items()
+        ]
+        with self._lock:
+            if parent_id is None and self._retention_sec is not None:
+                self._delete_expired()
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO checkpoint_blobs VALUES (?, ?, ?, ?, ?, ?);", blobs
+                )
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);",
+                    (thread_id, checkpoint_ns, checkpoint["id"], parent_id,
+                     c_type, c_blob, m_type, m_blob, time.time()),
+                )
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        configurable = config["configurable"]
+        key = (configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"])
+        # Special channels (errors, interrupts) overwrite; regular writes are kept once.
+        replace, keep = [], []
+        for idx, (channel, value) in enumerate(writes):
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            value_type, blob = self.serde.dumps_typed(value)
+            row = (*key, task_id, write_idx, channel, value_type, blob, task_path)
+            (replace if write_idx < 0 else keep).append(row)
+        with self._lock, self._connection:
+            for verb, rows in (("INSERT OR REPLACE", replace), ("INSERT OR IGNORE", keep)):
+                self._connection.executemany(
+                    f"{verb} INTO checkpoint_writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);", rows
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock, self._connection:
+            for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes"):
+                self._connection.execute(f"DELETE FROM {table} WHERE thread_id = ?;", (thread_id,))
+
+    def _delete_expired(self) -> None:
+        # Caller holds the lock.
+        cutoff = time.time() - self._retention_sec
+        with self._connection:
+            expired = [
+                row[0]
+                for row in self._connection.execute(
+                    "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(created_at) < ?;",
+                    (cutoff,),
+                )
+            ]
+            for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes"):
+                self._connection.executemany(
+                    f"DELETE FROM {table} WHERE thread_id = ?;", [(t,) for t in expired]
+                )
+        if expired:
+            logger.info(f"Deleted checkpoints for {len(expired)} expired trace(s).")
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+
+def build_checkpointer() -> Optional[BaseCheckpointSaver]:
+    """Checkpointer for the main graph, or None when checkpointing is disabled."""
+    if not settings.checkpoint_enabled:
+        return None
+    backend = (settings.checkpoint_backend or "sqlite").lower()
+    if backend == "memory":
+        return InMemorySaver(serde=CheckpointSerializer())
+    if backend == "sqlite":
+        return SqliteCheckpointSaver(
+            path=Path(settings.checkpoint_path),
+            retention_sec=settings.checkpoint_retention_sec,
+        )
+    raise ValueError(f"Unsupported checkpoint backend: {settings.checkpoint_backend}")
+
+
+def thread_config(trace_id: str) -> Dict[str, Any]:
+    """Checkpoint config for a request; each trace is one LangGraph thread."""
+    return {"configurable": {"thread_id": trace_id}}
+
+
+@dataclass
+class ResumePoint:
+    """Where a failed trace restarts and the state carried into the restart.
+
+    Attributes:
+        config: Checkpoint config of the fork point.
+        next_nodes: Nodes that run first after resuming.
+        user_context: Identity the original request ran with.
+        carried: Results of the failed run that are kept, so completed scans
+            are not executed again.
+    """
+
+    config: Dict[str, Any]
+    next_nodes: tuple
+    user_context: UserContext
+    carried: Dict[str, Any] = field(default_factory=dict)
+
+
+def _has_blocking_errors(values: Dict[str, Any]) -> bool:
+    errors = [PipelineError.model_validate(e) for e in values.get("errors") or []]
+    return any(e.severity in _BLOCKING_SEVERITIES for e in errors)
+
+
+def _is_resumable(snapshot: Any) -> bool:
+    """A clean checkpoint whose pending nodes were scheduled by plain edges.
+
+    Send-scheduled tasks (scan subgraphs, aggregator) carry a copy of the
+    state taken when they were scheduled, including the old deadline, so
+    resuming starts from the edge that schedules them instead.
+    """
+    if not snapshot.next or "__start__" in snapshot.next:
+        return False
+    if any(task.path[0] != _PULL for task in snapshot.tasks):
+        return False
+    return not _has_blocking_errors(snapshot.values)
+
+
+def find_resume_point(graph: Any, trace_id: str) -> ResumePoint:
+    """Locates the last successful checkpoint of ``trace_id``.
+
+    Successful scan results recorded after that checkpoint are carried into
+    the resumed run so only the failed work is redone.
+
+    Raises:
+        ResumeUnavailable: If checkpointing is disabled, the trace is unknown,
+            or it finished without errors.
+    """
+    if getattr(graph, "checkpointer", None) is None:
+        raise ResumeUnavailable("Checkpointing is disabled; set CHECKPOINT_ENABLED=true to resume traces.")
+    history = list(graph.get_state_history(thread_config(trace_id)))
+    if not history:
+        raise ResumeUnavailable(f"No checkpoints recorded for trace '{trace_id}'.")
+    latest = history[0]
+    if not latest.next and not _has_blocking_errors(latest.values):
+        raise ResumeUnavailable(f"Trace '{trace_id}' completed without errors.")
+
+    fork = next((snapshot for snapshot in history if _is_resumable(snapshot)), None)
+    if fork is None:
+        raise ResumeUnavailable(f"Trace '{trace_id}' failed before its first checkpoint; run it again.")
+
+    carried: Dict[str, Any] = {}
+    if fork.values.get("global_planner_response") is not None:
+        artifact_refs = dict(latest.values.get("artifact_refs") or {})
+        outputs = dict(latest.values.get("subgraph_outputs") or {})
+        # When a step raised, its sibling tasks' results exist only as pending writes.
+        for task in latest.tasks:
+            if task.error is None and isinstance(task.result, dict):
+                artifact_refs.update(task.result.get("artifact_refs") or {})
+                outputs.update(task.result.get("subgraph_outputs") or {})
+        carried["artifact_refs"] = artifact_refs
+        carried["subgraph_outputs"] = {
+            key: output for key, output in outputs.items() if output.status == "success"
+        }
+    return ResumePoint(
+        config=fork.config,
+        next_nodes=fork.next,
+        # The graph input is a dumped GraphState, so this may still be a dict.
+        user_context=UserContext.model_validate(fork.values.get("user_context") or {}),
+        carried=carried,
+    )
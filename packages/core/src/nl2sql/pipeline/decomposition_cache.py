@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Hashable, Optional, Tuple
+
+from nl2sql.common.metrics import decomposition_cache_hit_counter, decomposition_cache_miss_counter
+from nl2sql.pipeline.single_flight import normalize_query
+
+if TYPE_CHECKING:
+    from nl2sql.pipeline.nodes.datasource_resolver.schemas import DatasourceResolverResponse
+    from nl2sql.pipeline.nodes.decomposer.schemas import DecomposerResponse
+
+DecompositionCacheKey = Tuple[Hashable, ...]
+
+
+def decomposition_cache_key(
+    user_query: str,
+    resolver_response: DatasourceResolverResponse,
+) -> Optional[DecompositionCacheKey]:
+    """Builds the decomposition cache key.
+
+    The decomposer prompt only depends on the query and the resolved
+    datasources, so the key is the normalized query, the sorted resolved
+    datasource ids with their schema versions, and the allowed/unsupported
+    id sets. Resolutions without a schema version are not cacheable.
+    """
+    resolved = resolver_response.resolved_datasources
+    if not resolved or any(not ds.schema_version for ds in resolved):
+        return None
+    return (
+        normalize_query(user_query),
+        tuple(sorted((ds.datasource_id, ds.schema_version) for ds in resolved)),
+        tuple(sorted(resolver_response.allowed_datasource_ids)),
+        tuple(sorted(resolver_response.unsupported_datasource_ids)),
+    )
+
+
+class DecompositionCache:
+    """Process-local LRU cache of raw decomposer LLM responses with a TTL.
+
+    The decomposer still maps the cached response onto the current
+    resolution, so RBAC and capability filtering run on every request.
+
+    Args:
+        max_entries: Max cached decompositions; least recently used are evicted first.
+        ttl_sec: Age after which an entry is treated as missing (no expiry if None).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_sec: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self._entries: "OrderedDict[DecompositionCacheKey, Tuple[float, DecomposerResponse]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: DecompositionCacheKey) -> Optional[DecomposerResponse]:
+        response = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, response = entry
+                if self.ttl_sec is not None and time.time() - created_at > self.ttl_sec:
+                    del self._entries[key]
+                    response = None
+                else:
+                    self._entries.move_to_end(key)
+        counter = decomposition_cache_miss_counter if response is None else decomposition_cache_hit_counter
+        counter.add(1)
+        return response
+
+    def put(self, key: DecompositionCacheKey, response: DecomposerResponse) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
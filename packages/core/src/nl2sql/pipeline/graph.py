@@ -1,13 +1,16 @@
 from langgraph.graph import END, StateGraph
 
+from nl2sql.common.settings import settings
 from nl2sql.context import NL2SQLContext
 from nl2sql.pipeline.graph_utils import wrap_subgraph
+from nl2sql.pipeline.runnables import as_graph_node
 from nl2sql.pipeline.nodes.aggregator import EngineAggregatorNode
 from nl2sql.pipeline.nodes.answer_synthesizer import AnswerSynthesizerNode
 from nl2sql.pipeline.nodes.datasource_resolver import DatasourceResolverNode
 from nl2sql.pipeline.nodes.decomposer import DecomposerNode
 from nl2sql.pipeline.nodes.global_planner import GlobalPlannerNode
-from nl2sql.pipeline.routes import build_scan_layer_router, resolver_route
+from nl2sql.pipeline.nodes.single_source import SingleSourceRouterNode
+from nl2sql.pipeline.routes import build_scan_layer_router, build_single_source_router, resolver_route
 from nl2sql.pipeline.state import GraphState
 from nl2sql.pipeline.subgraphs import build_subgraph_registry
 
@@ -18,7 +21,10 @@ def build_graph(
     """Builds the main LangGraph pipeline.
 
     Constructs the graph with Semantic Analysis, Decomposer, Execution branches,
-    and Aggregator.
+    and Aggregator. With ``SINGLE_SOURCE_FAST_PATH_ENABLED``, simple questions
+    over one datasource go from the resolver straight to their SQL agent and
+    then to the answer synthesizer. When the context has a checkpointer, state is checkpointed
+    after every step under the request's ``trace_id``.
 
     Args:
         ctx (NL2SQLContext): The application context containing registries and services.
@@ -40,21 +46,31 @@ def build_graph(
         name: spec.builder(ctx) for name, spec in subgraph_specs.items()
     }
 
-    graph.add_node("datasource_resolver", resolver_node)
-    graph.add_node("decomposer", decomposer_node)
-    graph.add_node("global_planner", global_planner_node)
+    graph.add_node("datasource_resolver", as_graph_node(resolver_node))
+    graph.add_node("decomposer", as_graph_node(decomposer_node))
+    graph.add_node("global_planner", as_graph_node(global_planner_node))
     for name, subgraph in subgraph_runnables.items():
         graph.add_node(name, wrap_subgraph(subgraph, name, ctx))
-    graph.add_node("aggregator", aggregator_node)
-    graph.add_node("answer_synthesizer", synthesizer_node)
+    graph.add_node("aggregator", as_graph_node(aggregator_node))
+    graph.add_node("answer_synthesizer", as_graph_node(synthesizer_node))
     graph.add_node("layer_router", lambda state: {})
 
     graph.set_entry_point("datasource_resolver")
 
+    resolved_target = "decomposer"
+    if settings.single_source_fast_path_enabled:
+        resolved_target = "single_source_router"
+        graph.add_node("single_source_router", as_graph_node(SingleSourceRouterNode(ctx)))
+        graph.add_conditional_edges(
+            "single_source_router",
+            build_single_source_router(ctx, subgraph_specs),
+            list(subgraph_runnables.keys()) + ["decomposer", END],
+        )
+
     graph.add_conditional_edges(
         "datasource_resolver",
         resolver_route,
-        {"continue": "decomposer", "end": END},
+        {"continue": resolved_target, "end": END},
     )
 
     graph.add_edge("decomposer", "global_planner")
@@ -64,7 +80,7 @@ def build_graph(
     graph.add_conditional_edges(
         "layer_router",
         route_scan_layers,
-        list(subgraph_runnables.keys()) + ["aggregator", END],
+        list(subgraph_runnables.keys()) + ["aggregator", "answer_synthesizer", END],
     )
 
     for name in subgraph_runnables.keys():
@@ -72,4 +88,28 @@ def build_graph(
     graph.add_edge("aggregator", "answer_synthesizer")
     graph.add_edge("answer_synthesizer", END)
 
-    return graph.compile()
+    # Each trace is a checkpoint thread (see nl2sql.pipeline.checkpointing).
+    return graph.compile(checkpointer=getattr(ctx, "checkpointer", None))
+
+
+def get_compiled_graph(
+    ctx: NL2SQLContext,
+    execute: bool = True,
+):
+    """Returns the compiled pipeline graph for ``ctx``, building it on first use.
+
+    The graph is cached on the context and rebuilt only when the context's
+    configuration revision changes (datasources, LLM configs or policies).
+
+    Args:
+        ctx (NL2SQLContext): The application context.
+        execute (bool): Whether to allow execution against real databases.
+
+    Returns:
+        StateGraph: The compiled LangGraph runnable.
+    """
+    return ctx.graph_cache.get_or_build(
+        ctx.config_revision,
+        execute,
+        lambda: build_graph(ctx, execute=execute),
+    )
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from threading import RLock
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from nl2sql.common.logger import get_logger
+
+logger = get_logger("graph_cache")
+
+
+class CompiledGraphCache:
+    """Caches compiled pipeline graphs keyed by configuration revision.
+
+    Building the graph instantiates every node (LLM chains, executor registry,
+    artifact store) and compiles both the main graph and the subgraphs. The
+    result only depends on the context configuration, so it is built once and
+    reused until datasources, LLM configs or policies change.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[Hashable, ...], Any] = {}
+        self._lock = RLock()
+
+    def get_or_build(
+        self,
+        revision: Tuple[Hashable, ...],
+        variant: Hashable,
+        builder: Callable[[], Any],
+    ) -> Any:
+        """Returns the cached graph for ``variant`` or builds it.
+
+        Entries built for an older ``revision`` are dropped on access so stale
+        graphs never outlive a configuration change.
+
+        Args:
+            revision: Configuration revision of the owning context.
+            variant: Build variant (e.g. the ``execute`` flag).
+            builder: Zero-arg callable returning a compiled graph.
+
+        Returns:
+            Any: The compiled graph.
+        """
+        key = (revision, variant)
+        with self._lock:
+            graph = self._entries.get(key)
+            if graph is not None:
+                return graph
+
+            stale = [k for k in self._entries if k[0] != revision]
+            for k in stale:
+                del self._entries[k]
+            if stale:
+                logger.info(f"Invalidated {len(stale)} compiled graph(s) after configuration change.")
+
+            graph = builder()
+            self._entries[key] = graph
+            return graph
+
+    def invalidate(self) -> None:
+        """Drops all cached graphs."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
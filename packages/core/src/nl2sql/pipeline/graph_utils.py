@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Collection, Dict, List, Optional, Set
 
-from langchain_core.runnables import Runnable
+from langchain_core.runnables import Runnable, RunnableLambda
 
 from nl2sql.context import NL2SQLContext
+from nl2sql.pipeline.nodes.aggregator.schemas import AggregatorResponse
+from nl2sql.pipeline.nodes.decomposer.schemas import SubQuery
 from nl2sql.pipeline.nodes.global_planner.schemas import ExecutionDAG
-from nl2sql.pipeline.state import GraphState, SubgraphExecutionState
+from nl2sql.pipeline.state import GraphState
 from nl2sql.pipeline.subgraphs import SubgraphOutput, SubgraphSpec
 import logging
 
@@ -23,10 +25,25 @@ class StateAccessor:
         return getattr(self._state, key, default)
 
 
+def failed_scan_ids(subgraph_outputs: Dict[str, SubgraphOutput]) -> Set[str]:
+    """Scan nodes whose branch ended without an artifact (error, cancel or deadline)."""
+    return {
+        output.sub_query.id
+        for output in subgraph_outputs.values()
+        if output.artifact is None and output.sub_query is not None
+    }
+
+
 def next_scan_layer_ids(
     dag: ExecutionDAG,
     artifact_refs: Dict[str, Any],
+    failed_ids: Collection[str] = (),
 ) -> List[str]:
+    """Scan nodes of the first layer that still has undispatched scans.
+
+    Failed scans count as done: re-dispatching them would re-run schema
+    retrieval and planning on every super-step.
+    """
     node_index = {n.node_id: n for n in dag.nodes}
     for layer in dag.layers or []:
         pending_scan = [
@@ -35,6 +52,7 @@ def next_scan_layer_ids(
             if node_id in node_index
             and node_index[node_id].kind == "scan"
             and node_id not in artifact_refs
+            and node_id not in failed_ids
         ]
         if pending_scan:
             return pending_scan
@@ -57,76 +75,117 @@ def resolve_subgraph(
     return None
 
 
+def _combine_group_count(state: GraphState, sub_query: Optional[SubQuery]) -> int:
+    """Number of compare/join/union groups ``sub_query`` feeds into."""
+    response = state.decomposer_response
+    if response is None or sub_query is None:
+        return 0
+    return sum(
+        1
+        for group in response.combine_groups
+        if group.operation != "standalone" and any(i.subquery_id == sub_query.id for i in group.inputs)
+    )
+
+
 def build_scan_payload(
     state: GraphState,
     subgraph_name: str,
     node_id: str,
+    sub_query: Optional[SubQuery],
+    return_rows: bool = False,
 ) -> Dict[str, Any]:
-    trace_id = state.trace_id   
+    """Builds the ``Send`` payload for one scan branch.
+
+    Only the branch's own sub-query travels with the payload, and models are
+    passed by reference: branches never mutate them, and LangGraph does not
+    copy ``Send`` arguments. With ``return_rows`` the executor's rows come
+    back as the terminal result, so the branch needs no aggregation.
+    """
+    trace_id = state.trace_id
     return {
         "subgraph_id": f"{subgraph_name}:{node_id}:{trace_id}",
         "subgraph_name": subgraph_name,
         "trace_id": trace_id,
         "user_context": state.user_context,
-        "decomposer_response": state.decomposer_response,
-        "datasource_resolver_response": state.datasource_resolver_response,
+        "sub_query": sub_query,
+        "combine_group_count": _combine_group_count(state, sub_query),
+        "return_rows": return_rows,
+        "cancel_token": state.cancel_token,
+        "deadline": state.deadline,
     }
 
+
 def wrap_subgraph(
     subgraph: Runnable,
     subgraph_name: str,
     ctx: NL2SQLContext,
-) -> Callable[Dict[str, Any]]:
-    def _wrapper(state_dict: dict) -> Dict[str, Any]:
-        trace_id = state_dict.get("trace_id")
-        subgraph_id = state_dict.get("subgraph_id")
-        sub_query_id = subgraph_id.split(":")[1]
-        sub_query = None
-        decomposer_response = state_dict.get("decomposer_response")
-        for sq in decomposer_response.sub_queries:
-            if sq.id == sub_query_id:
-                sub_query = sq
-                break
-
-        sub_state = SubgraphExecutionState(
-            trace_id=trace_id,
-            user_context=state_dict.get("user_context"),
-            sub_query=sub_query,
-            subgraph_id=subgraph_id,
-            subgraph_name=subgraph_name,
-        )
-        result = subgraph.invoke(sub_state.model_dump())
+) -> Runnable:
+    # The payload and the subgraph result hold models produced by the pipeline
+    # itself. They are handed over as plain dicts of references: no
+    # ``model_dump`` into the subgraph and no re-validation of its result.
+    def _build_sub_state(state_dict: dict) -> Dict[str, Any]:
+        return {
+            "trace_id": state_dict.get("trace_id"),
+            "user_context": state_dict.get("user_context"),
+            "sub_query": state_dict.get("sub_query"),
+            "subgraph_id": state_dict.get("subgraph_id"),
+            "subgraph_name": subgraph_name,
+            "combine_group_count": state_dict.get("combine_group_count", 0),
+            "return_rows": state_dict.get("return_rows", False),
+            "cancel_token": state_dict.get("cancel_token"),
+            "deadline": state_dict.get("deadline"),
+        }
 
-        returned_state = SubgraphExecutionState.model_validate(result)
+    def _build_update(sub_state: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        sub_query = sub_state["sub_query"]
+        subgraph_id = sub_state["subgraph_id"]
+        returned_state = StateAccessor(result)
 
-        executor_response = returned_state.executor_response
-        planner_response = returned_state.ast_planner_response
-        generator_response = returned_state.generator_response
-        sub_reasoning = returned_state.reasoning
+        executor_response = returned_state.get("executor_response")
+        planner_response = returned_state.get("ast_planner_response")
+        generator_response = returned_state.get("generator_response")
+        errors = returned_state.get("errors") or []
+        sub_reasoning = returned_state.get("reasoning") or []
         artifact_refs: Dict[str, Any] = {}
-        artifact = executor_response.artifact
-        artifact_refs[sub_query.id] = artifact
+        # The subgraph can end before execution (cancelled, deadline, fatal error).
+        artifact = executor_response.artifact if executor_response else None
+        if artifact is not None:
+            artifact_refs[sub_query.id] = artifact
 
-        retry_count = returned_state.retry_count
-        status = "error" if returned_state.errors else "success"
+        retry_count = returned_state.get("retry_count", 0)
+        status = "error" if errors else "success"
         subgraph_output = SubgraphOutput(
             sub_query=sub_query,
             subgraph_name=subgraph_name,
             subgraph_id=subgraph_id,
             retry_count=retry_count,
-            plan=planner_response.plan,
+            plan=planner_response.plan if planner_response else None,
             sql_draft=generator_response.sql_draft if generator_response else None,
             artifact=artifact,
-            errors=returned_state.errors,
+            errors=errors,
             reasoning=sub_reasoning,
             status=status,
         )
 
-        return {
+        update = {
             "artifact_refs": artifact_refs,
             "subgraph_outputs": {subgraph_id: subgraph_output},
-            "errors": returned_state.errors,
-            "reasoning": returned_state.reasoning,
+            "errors": errors,
+            "reasoning": sub_reasoning,
         }
+        rows = executor_response.rows if executor_response else None
+        if rows is not None:
+            update["aggregator_response"] = AggregatorResponse(terminal_results={sub_query.id: rows})
+        return update
+
+    def _wrapper(state_dict: dict) -> Dict[str, Any]:
+        sub_state = _build_sub_state(state_dict)
+        result = subgraph.invoke(sub_state)
+        return _build_update(sub_state, result)
+
+    async def _awrapper(state_dict: dict) -> Dict[str, Any]:
+        sub_state = _build_sub_state(state_dict)
+        result = await subgraph.ainvoke(sub_state)
+        return _build_update(sub_state, result)
 
-    return _wrapper
+    return RunnableLambda(_wrapper, afunc=_awrapper, name=subgraph_name)
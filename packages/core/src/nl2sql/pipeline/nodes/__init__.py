@@ -10,6 +10,7 @@ from .refiner.node import RefinerNode
 from .validator.node import LogicalValidatorNode
 from .validator.physical_node import PhysicalValidatorNode
 from .answer_synthesizer.node import AnswerSynthesizerNode
+from .single_source.node import SingleSourceRouterNode
 
 __all__ = [
     "ASTPlannerNode", 
@@ -24,4 +25,5 @@ __all__ = [
     "PhysicalValidatorNode",
     "EngineAggregatorNode",
     "AnswerSynthesizerNode",
+    "SingleSourceRouterNode",
 ]
@@ -27,10 +27,15 @@ class EngineAggregatorNode:
         try:
             planner_response = state.global_planner_response
             artifact_refs = state.artifact_refs
-           
-            dag = planner_response.execution_dag
-            
-            terminal_results = self.service.execute(dag, artifact_refs)
+
+            if planner_response is None:
+                # Single-datasource fast path: one scan and nothing to combine.
+                terminal_results = {
+                    node_id: self.service.engine.to_rows(self.service.engine.load_scan(artifact))
+                    for node_id, artifact in (artifact_refs or {}).items()
+                }
+            else:
+                terminal_results = self.service.execute(planner_response.execution_dag, artifact_refs)
             aggregator_response = AggregatorResponse(
                 terminal_results=terminal_results,
                 computed_artifacts={},
@@ -0,0 +1,142 @@
+"""Deterministic answers for small results and compact payloads for large ones.
+
+``templated_answer`` builds the final answer without an LLM call when the
+result has a single terminal node that is empty, a scalar, a single row, or
+a table within ``ANSWER_FAST_PATH_MAX_ROWS`` x ``ANSWER_FAST_PATH_MAX_COLUMNS``.
+
+``summarize_results`` replaces each terminal result with more than
+``ANSWER_SUMMARY_MIN_ROWS`` rows by its row count, per-column statistics and
+the first ``ANSWER_SUMMARY_TOP_K`` rows, so large results do not flood the
+synthesis prompt.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional
+
+import polars as pl
+
+from nl2sql.common.logger import get_logger
+from nl2sql.common.settings import settings
+from .schemas import AggregatedResponse
+
+logger = get_logger("answer_synthesizer")
+
+_UNMAPPED_REASONS = {
+    "no_datasource": "no available datasource covers it",
+    "restricted_datasource": "you do not have access to the datasource it needs",
+    "unsupported_datasource": "the datasource it needs is not supported",
+}
+
+
+def _format_value(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            return str(value)
+        return f"{value:.4f}".rstrip("0").rstrip(".")
+    return str(value)
+
+
+def _cell(value: Any) -> str:
+    return _format_value(value).replace("|", "\\|").replace("\n", " ")
+
+
+def _markdown_table(rows: List[Dict[str, Any]], columns: List[str]) -> str:
+    lines = [
+        "| " + " | ".join(_cell(c) for c in columns) + " |",
+        "| " + " | ".join("---" for _ in columns) + " |",
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(_cell(row.get(c)) for c in columns) + " |")
+    return "\n".join(lines)
+
+
+def _warnings(unmapped_subqueries: List[Dict[str, Any]]) -> List[str]:
+    warnings = []
+    for item in unmapped_subqueries:
+        reason = _UNMAPPED_REASONS.get(item.get("reason"), "it could not be answered")
+        detail = f" ({item['detail']})" if item.get("detail") else ""
+        warnings.append(f"Skipped '{item.get('intent')}': {reason}{detail}.")
+    return warnings
+
+
+def templated_answer(
+    results: Any,
+    unmapped_subqueries: Optional[List[Dict[str, Any]]] = None,
+) -> Optional[AggregatedResponse]:
+    """Templated answer for a small result, or None when the LLM should answer."""
+    if not isinstance(results, dict) or len(results) != 1:
+        return None
+    rows = next(iter(results.values()))
+    if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        return None
+    columns: List[str] = []
+    for row in rows:
+        columns.extend(c for c in row if c not in columns)
+    if len(rows) > settings.answer_fast_path_max_rows or len(columns) > settings.answer_fast_path_max_columns:
+        return None
+
+    warnings = _warnings(unmapped_subqueries or [])
+    if not rows:
+        return AggregatedResponse(
+            summary="No results found.",
+            format_type="text",
+            content="The query returned no rows.",
+            warnings=warnings,
+        )
+    if len(rows) == 1 and len(columns) == 1:
+        text = f"{columns[0]}: {_format_value(rows[0].get(columns[0]))}"
+        return AggregatedResponse(summary=text, format_type="text", content=text, warnings=warnings)
+    if len(rows) == 1:
+        content = "\n".join(f"- {c}: {_format_value(rows[0].get(c))}" for c in columns)
+        return AggregatedResponse(summary="1 row returned.", format_type="list", content=content, warnings=warnings)
+    return AggregatedResponse(
+        summary=f"{len(rows)} rows returned.",
+        format_type="table",
+        content=_markdown_table(rows, columns),
+        warnings=warnings,
+    )
+
+
+def _column_stats(series: pl.Series) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"dtype": str(series.dtype), "nulls": series.null_count()}
+    try:
+        stats["distinct"] = series.n_unique()
+    except Exception:
+        pass
+    if series.dtype.is_numeric():
+        stats.update(min=series.min(), max=series.max(), mean=series.mean())
+    elif series.dtype.is_temporal() or series.dtype == pl.Utf8:
+        stats.update(min=series.min(), max=series.max())
+    return stats
+
+
+def _summarize(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {
+        "row_count": len(rows),
+        "top_rows": rows[: settings.answer_summary_top_k],
+    }
+    try:
+        frame = pl.DataFrame(rows, infer_schema_length=None, strict=False)
+        summary["columns"] = {name: _column_stats(frame[name]) for name in frame.columns}
+    except Exception as exc:
+        # Mixed or nested values: the row count and top rows still help.
+        logger.debug(f"Skipping column stats for result summary: {exc}")
+    return summary
+
+
+def summarize_results(results: Any) -> Any:
+    """Replaces each oversized terminal result with its summary."""
+    if not isinstance(results, dict):
+        return results
+    return {
+        node_id: _summarize(rows)
+        if isinstance(rows, list) and len(rows) > settings.answer_summary_min_rows
+        else rows
+        for node_id, rows in results.items()
+    }
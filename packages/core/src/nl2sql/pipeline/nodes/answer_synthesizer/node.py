@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 
 from langchain_core.prompts import ChatPromptTemplate
 
 if TYPE_CHECKING:
     from nl2sql.pipeline.state import GraphState
 
+from nl2sql.common.concurrency import allm_slot, llm_slot
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
 from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import answer_synthesis_counter
+from nl2sql.common.settings import settings
 from nl2sql.context import NL2SQLContext
+from .fast_path import summarize_results, templated_answer
 from .schemas import AggregatedResponse, AnswerSynthesizerResponse
-from .prompts import ANSWER_SYNTHESIZER_PROMPT
+from .prompts import ANSWER_SYNTHESIZER_SYSTEM_PROMPT, ANSWER_SYNTHESIZER_USER_PROMPT
 
 logger = get_logger("answer_synthesizer")
 
@@ -23,76 +27,126 @@ class AnswerSynthesizerNode:
     def __init__(self, ctx: NL2SQLContext):
         self.node_name = self.__class__.__name__.lower().replace("node", "")
         self.llm = ctx.llm_registry.get_llm(self.node_name)
-        self.prompt = ChatPromptTemplate.from_template(ANSWER_SYNTHESIZER_PROMPT)
+        self.prompt = ChatPromptTemplate.from_messages(
+            [("system", ANSWER_SYNTHESIZER_SYSTEM_PROMPT), ("human", ANSWER_SYNTHESIZER_USER_PROMPT)]
+        )
         self.chain = self.prompt | self.llm.with_structured_output(
             AggregatedResponse, method="function_calling"
         )
 
     def _serialize_result(self, result: Any) -> str:
+        result = summarize_results(result)
         try:
-            return json.dumps(result, indent=2, ensure_ascii=True)
-        except TypeError:
+            return json.dumps(result, separators=(",", ":"), ensure_ascii=True, default=str)
+        except (TypeError, ValueError):
             return str(result)
 
-    def __call__(self, state: GraphState) -> Dict[str, Any]:
-        aggregated_result = None
+    def _get_aggregated_result(self, state: GraphState) -> Any:
         if state.aggregator_response:
-            aggregated_result = state.aggregator_response.terminal_results
-        elif state.answer_synthesizer_response and state.answer_synthesizer_response.final_answer is not None:
-            aggregated_result = state.answer_synthesizer_response.final_answer
+            return state.aggregator_response.terminal_results
+        if state.answer_synthesizer_response and state.answer_synthesizer_response.final_answer is not None:
+            return state.answer_synthesizer_response.final_answer
+        return None
 
-        if aggregated_result is None:
-            return {
-                "errors": [
-                    PipelineError(
-                        node=self.node_name,
-                        message="No aggregated result available for synthesis.",
-                        severity=ErrorSeverity.ERROR,
-                        error_code=ErrorCode.INVALID_STATE,
-                    )
-                ]
-            }
+    def _missing_result_response(self) -> Dict[str, Any]:
+        return {
+            "errors": [
+                PipelineError(
+                    node=self.node_name,
+                    message="No aggregated result available for synthesis.",
+                    severity=ErrorSeverity.ERROR,
+                    error_code=ErrorCode.INVALID_STATE,
+                )
+            ]
+        }
 
-        try:
-            unmapped_subqueries = []
-            if state.decomposer_response:
-                unmapped_subqueries = [
-                    u.model_dump()
-                    for u in (state.decomposer_response.unmapped_subqueries or [])
-                ]
-            response: AggregatedResponse = self.chain.invoke(
+    def _unmapped_subqueries(self, state: GraphState) -> List[Dict[str, Any]]:
+        if not state.decomposer_response:
+            return []
+        return [u.model_dump() for u in (state.decomposer_response.unmapped_subqueries or [])]
+
+    def _templated_response(self, state: GraphState, aggregated_result: Any) -> Optional[Dict[str, Any]]:
+        """Answers small results without an LLM call when the fast path is enabled."""
+        if not settings.answer_fast_path_enabled or not state.aggregator_response:
+            return None
+        response = templated_answer(aggregated_result, self._unmapped_subqueries(state))
+        if response is None:
+            return None
+        answer_synthesis_counter.add(1, {"path": "template"})
+        return self._build_response(response)
+
+    def _build_inputs(self, state: GraphState, aggregated_result: Any) -> Dict[str, Any]:
+        unmapped_subqueries = self._unmapped_subqueries(state)
+        return {
+            "user_query": state.user_query,
+            "aggregated_result": self._serialize_result(aggregated_result),
+            "unmapped_subqueries": json.dumps(
+                unmapped_subqueries, indent=2, ensure_ascii=True
+            ),
+        }
+
+    def _build_response(self, response: AggregatedResponse) -> Dict[str, Any]:
+        return {
+            "answer_synthesizer_response": AnswerSynthesizerResponse(
+                final_answer=response.model_dump(),
+            ),
+            "reasoning": [
                 {
-                    "user_query": state.user_query,
-                    "aggregated_result": self._serialize_result(aggregated_result),
-                    "unmapped_subqueries": json.dumps(
-                        unmapped_subqueries, indent=2, ensure_ascii=True
-                    ),
+                    "node": self.node_name,
+                    "content": response.summary,
                 }
-            )
+            ],
+        }
 
+    def _failure_response(self, exc: Exception) -> Dict[str, Any]:
+        logger.error(f"Node {self.node_name} failed: {exc}")
+        return {
+            "answer_synthesizer_response": AnswerSynthesizerResponse(),
+            "errors": [
+                PipelineError(
+                    node=self.node_name,
+                    message=f"Answer synthesis failed: {exc}",
+                    severity=ErrorSeverity.ERROR,
+                    error_code=ErrorCode.AGGREGATOR_FAILED,
+                )
+            ]
+        }
 
-            return {
-                "answer_synthesizer_response": AnswerSynthesizerResponse(
-                    final_answer=response.model_dump(),
-                ),
-                "reasoning": [
-                    {
-                        "node": self.node_name,
-                        "content": response.summary,
-                    }
-                ],
-            }
+    def __call__(self, state: GraphState) -> Dict[str, Any]:
+        aggregated_result = self._get_aggregated_result(state)
+        if aggregated_result is None:
+            return self._missing_result_response()
 
+        templated = self._templated_response(state, aggregated_result)
+        if templated is not None:
+            return templated
+
+        try:
+            with llm_slot(self.node_name):
+                response: AggregatedResponse = self.chain.invoke(
+                    self._build_inputs(state, aggregated_result)
+                )
+            answer_synthesis_counter.add(1, {"path": "llm"})
+            return self._build_response(response)
+        except Exception as exc:
+            return self._failure_response(exc)
+
+    async def acall(self, state: GraphState) -> Dict[str, Any]:
+        """Async variant of ``__call__`` used when the graph runs via ``ainvoke``."""
+        aggregated_result = self._get_aggregated_result(state)
+        if aggregated_result is None:
+            return self._missing_result_response()
+
+        templated = self._templated_response(state, aggregated_result)
+        if templated is not None:
+            return templated
+
+        try:
+            async with allm_slot(self.node_name):
+                response: AggregatedResponse = await self.chain.ainvoke(
+                    self._build_inputs(state, aggregated_result)
+                )
+            answer_synthesis_counter.add(1, {"path": "llm"})
+            return self._build_response(response)
         except Exception as exc:
-            logger.error(f"Node {self.node_name} failed: {exc}")
-            return {
-                "answer_synthesizer_response": AnswerSynthesizerResponse(),
-                "errors": [
-                    PipelineError(
-                        node=self.node_name,
-                        message=f"Answer synthesis failed: {exc}",
-                        severity=ErrorSeverity.ERROR,
-                        error_code=ErrorCode.AGGREGATOR_FAILED,
-                    )
-                ]
-            }
+            return self._failure_response(exc)
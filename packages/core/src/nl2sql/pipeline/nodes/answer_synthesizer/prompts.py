@@ -1,14 +1,7 @@
 """Prompts for the AnswerSynthesizer node."""
 
-ANSWER_SYNTHESIZER_PROMPT = """You are a data analyst. Summarize the aggregated results for the user.
-
-User Query: {user_query}
-
-Aggregated Results (keyed by terminal node id):
-{aggregated_result}
-
-Unmapped Subqueries (if any):
-{unmapped_subqueries}
+# Static prefix shared by every call; per-request data goes in the user prompt.
+ANSWER_SYNTHESIZER_SYSTEM_PROMPT = """You are a data analyst. Summarize the aggregated results for the user.
 
 Instructions:
 1. Provide a concise summary.
@@ -16,4 +9,14 @@ Instructions:
 3. Produce the formatted content for the chosen format.
 4. If results contain error messages, explain them clearly.
 5. If there are unmapped subqueries, add user-facing warnings that explain what was skipped and why.
+6. A large result is given as a summary object (row_count, per-column stats, top_rows) instead of every row; base totals on row_count and the column stats, not on top_rows alone.
+"""
+
+ANSWER_SYNTHESIZER_USER_PROMPT = """User Query: {user_query}
+
+Aggregated Results (keyed by terminal node id):
+{aggregated_result}
+
+Unmapped Subqueries (if any):
+{unmapped_subqueries}
 """
@@ -1,13 +1,17 @@
 from __future__ import annotations
+import threading
 import traceback
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
 from langchain_core.runnables import Runnable
 from langchain_core.prompts import ChatPromptTemplate
 
-from .prompts import PLANNER_PROMPT, PLANNER_EXAMPLES
+from .prompts import PLANNER_SYSTEM_PROMPT, PLANNER_USER_PROMPT
 from .schemas import PlanModel, ASTPlannerResponse
+from nl2sql.common.concurrency import allm_slot, llm_slot
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
 from nl2sql.common.logger import get_logger
+from nl2sql.llm.routing import SMALL, ModelRoute, complexity_score, tier_call
+from nl2sql.pipeline.nodes.schema_retriever.render import render_schema
 from nl2sql.context import NL2SQLContext
 
 if TYPE_CHECKING:
@@ -22,6 +26,10 @@ class ASTPlannerNode:
     Uses an LLM to interpret the user query and semantic context, producing a
     deterministic Abstract Syntax Tree (AST) that represents the SQL query.
 
+    When the planner agent has a ``small_agent``, simple sub-queries are
+    planned by the small model on the first attempt; retries (after a
+    validator rejection or failure) and complex sub-queries use the large one.
+
     Attributes:
         llm (Optional[Runnable]): The Language Model executable.
         chain (Optional[Runnable]): The langchain chain for planning.
@@ -34,10 +42,76 @@ class ASTPlannerNode:
             ctx (NL2SQLContext): The context of the pipeline.
         """
         self.node_name = self.__class__.__name__.lower().replace('node', '')
+        self.llm_registry = ctx.llm_registry
         self.llm = ctx.llm_registry.get_llm(self.node_name)
 
-        self.prompt = ChatPromptTemplate.from_template(PLANNER_PROMPT)
+        self.prompt = ChatPromptTemplate.from_messages(
+            [("system", PLANNER_SYSTEM_PROMPT), ("human", PLANNER_USER_PROMPT)]
+        )
         self.chain = self.prompt | self.llm.with_structured_output(PlanModel)
+        # (small llm, chain) built on first use; the node is shared by concurrent scan branches.
+        self._small: Optional[Tuple[Runnable, Runnable]] = None
+        self._small_lock = threading.Lock()
+
+    def _select_chain(self, state: SubgraphExecutionState) -> Tuple[ModelRoute, Runnable]:
+        """Routes the call to the small or large model by sub-query complexity."""
+        complexity = complexity_score(state.sub_query, state.relevant_tables, state.combine_group_count)
+        route = self.llm_registry.route(self.node_name, complexity, escalate=state.retry_count > 0)
+        if route.tier != SMALL:
+            return route, self.chain
+        with self._small_lock:
+            if self._small is None or self._small[0] is not route.llm:
+                self._small = (route.llm, self.prompt | route.llm.with_structured_output(PlanModel))
+            return route, self._small[1]
+
+    def _build_inputs(self, state: SubgraphExecutionState) -> Dict[str, Any]:
+        relevant_tables = render_schema(state.relevant_tables, state.sub_query, node=self.node_name)
+
+        feedback = ""
+        if state.errors:
+            feedback = "\n".join(e.model_dump_json(indent=2) for e in state.errors)
+
+        query_text = state.sub_query.intent if state.sub_query else ""
+        expected_schema = []
+        if state.sub_query and state.sub_query.expected_schema:
+            expected_schema = [c.model_dump() for c in state.sub_query.expected_schema]
+        return {
+            "relevant_tables": relevant_tables,
+            "feedback": feedback,
+            "expected_schema": expected_schema,
+            "semantic_context": "",
+            "user_query": query_text,
+        }
+
+    def _build_response(self, plan: PlanModel) -> Dict[str, Any]:
+        return {
+            "ast_planner_response": ASTPlannerResponse(plan=plan),
+            "reasoning": [
+                {
+                    "node": self.node_name,
+                    "content": [
+                        f"Reasoning: {plan.reasoning or 'None'}",
+                        f"Tables: {', '.join(t.name for t in plan.tables)}",
+                    ],
+                }
+            ],
+            "errors": [],
+        }
+
+    def _failure_response(self) -> Dict[str, Any]:
+        logger.exception("Planner failed")
+        return {
+            "ast_planner_response": ASTPlannerResponse(plan=None),
+            "errors": [
+                PipelineError(
+                    node=self.node_name,
+                    message="Planner failed.",
+                    severity=ErrorSeverity.ERROR,
+                    error_code=ErrorCode.PLANNING_FAILURE,
+                    stack_trace=traceback.format_exc(),
+                )
+            ],
+        }
 
     def __call__(self, state: SubgraphExecutionState) -> Dict[str, Any]:
         """Executes the planning node.
@@ -50,55 +124,20 @@ class ASTPlannerNode:
                 and any 'errors' encountered.
         """
         try:
-            relevant_tables = '\n'.join(
-                t.model_dump_json(indent=2) for t in state.relevant_tables
-            )
-
-
-            feedback = ""
-            if state.errors:
-                feedback = "\n".join(e.model_dump_json(indent=2) for e in state.errors)
-
-            query_text = state.sub_query.intent if state.sub_query else ""
-            expected_schema = []
-            if state.sub_query and state.sub_query.expected_schema:
-                expected_schema = [c.model_dump() for c in state.sub_query.expected_schema]
-            plan: PlanModel = self.chain.invoke(
-                {
-                    "relevant_tables": relevant_tables,
-                    "examples": PLANNER_EXAMPLES,
-                    "feedback": feedback,
-                    "expected_schema": expected_schema,
-                    "semantic_context": "",
-                    "user_query": query_text,
-                }
-            )
-
-            return {
-                "ast_planner_response": ASTPlannerResponse(plan=plan),
-                "reasoning": [
-                    {
-                        "node": self.node_name,
-                        "content": [
-                            f"Reasoning: {plan.reasoning or 'None'}",
-                            f"Tables: {', '.join(t.name for t in plan.tables)}",
-                        ],
-                    }
-                ],
-                "errors": [],
-            }
-
-        except Exception as exc:
-            logger.exception("Planner failed")
-            return {
-                "ast_planner_response": ASTPlannerResponse(plan=None),
-                "errors": [
-                    PipelineError(
-                        node=self.node_name,
-                        message="Planner failed.",
-                        severity=ErrorSeverity.ERROR,
-                        error_code=ErrorCode.PLANNING_FAILURE,
-                        stack_trace=traceback.format_exc(),
-                    )
-                ],
-            }
+            route, chain = self._select_chain(state)
+            with llm_slot(self.node_name), tier_call(self.node_name, route):
+                plan: PlanModel = chain.invoke(self._build_inputs(state))
+            return self._build_response(plan)
+        except Exception:
+            return self._failure_response()
+
+    async def acall(self, state: SubgraphExecutionState) -> Dict[str, Any]:
+        """Async variant of ``__call__`` used when the graph runs via ``ainvoke``."""
+        try:
+            route, chain = self._select_chain(state)
+            async with allm_slot(self.node_name):
+                with tier_call(self.node_name, route):
+                    plan: PlanModel = await chain.ainvoke(self._build_inputs(state))
+            return self._build_response(plan)
+        except Exception:
+            return self._failure_response()
@@ -97,7 +97,9 @@ Plan:
 }
 """
 
-PLANNER_PROMPT = (
+# Static prefix: identical for every call, so provider-side prompt caching can
+# reuse it. Examples are embedded (braces escaped) rather than templated.
+PLANNER_SYSTEM_PROMPT = (
     "[ROLE]\n"
     "You are a SQL Planner. Your job is to create a structured, executable SQL plan"
     " in the form of a deterministic Abstract Syntax Tree (AST).\n\n"
@@ -129,10 +131,16 @@ PLANNER_PROMPT = (
     "- Use ISO 8601 dates.\n"
     "- No extra keys beyond the schema.\n\n"
 
+    "[EXAMPLES]\n"
+    + PLANNER_EXAMPLES.replace("{", "{{").replace("}", "}}")
+)
+
+# Dynamic suffix, ordered from most to least reusable across calls: the schema
+# repeats for every query on a datasource, the user query never does.
+PLANNER_USER_PROMPT = (
     "[RELEVANT_TABLES]\n{relevant_tables}\n\n"
     "[EXPECTED_SCHEMA]\n{expected_schema}\n\n"
     "[SEMANTIC_CONTEXT]\n{semantic_context}\n\n"
-    "[EXAMPLES]\n{examples}\n\n"
     "[FEEDBACK]\n{feedback}\n\n"
     "[USER_QUERY]\n{user_query}"
 )
@@ -141,113 +141,140 @@ class DatasourceResolverNode:
                 }
         
 
-    def __call__(self, state: GraphState) -> Dict[str, Any]:
-        try:
-            if state.datasource_id:
-                unsupported_ids = self._get_unsupported_datasources([state.datasource_id])
-                if unsupported_ids:
-                    return self._error_response(
-                        resolved_datasources=[],
-                        allowed_ids=[],
-                        unsupported_ids=unsupported_ids,
-                        message=f"Datasource not found: {state.datasource_id}.",
-                        severity=ErrorSeverity.ERROR,
-                        error_code=ErrorCode.INVALID_STATE,
-                    )
-
-                resolved = ResolvedDatasource(
-                    datasource_id=state.datasource_id,
-                    metadata={},
-                    schema_version=self._get_latest_schema_version(state.datasource_id),
-                )
-                allowed_ids = self._get_allowed_datasource_ids(
-                    state.user_context,
-                    [state.datasource_id],
-                )
-                if not allowed_ids:
-                    return self._error_response(
-                        resolved_datasources=[resolved],
-                        allowed_ids=[],
-                        unsupported_ids=[],
-                        message="Datasource not allowed.",
-                        severity=ErrorSeverity.CRITICAL,
-                        error_code=ErrorCode.SECURITY_VIOLATION,
-                    )
+    def _vector_store_unavailable_response(self) -> Dict[str, Any]:
+        return {
+            "datasource_resolver_response": DatasourceResolverResponse(),
+            "reasoning": [{"node": self.node_name, "content": "Vector store unavailable."}],
+        }
 
-                return {
-                    "datasource_resolver_response": DatasourceResolverResponse(
-                        resolved_datasources=[resolved],
-                        allowed_datasource_ids=allowed_ids,
-                        unsupported_datasource_ids=[],
-                    ),
-                    "reasoning": [
-                        {
-                            "node": self.node_name,
-                            "content": "Using explicit datasource override.",
-                        }
-                    ],
-                }
+    def _resolve_override(self, state: GraphState) -> Dict[str, Any]:
+        unsupported_ids = self._get_unsupported_datasources([state.datasource_id])
+        if unsupported_ids:
+            return self._error_response(
+                resolved_datasources=[],
+                allowed_ids=[],
+                unsupported_ids=unsupported_ids,
+                message=f"Datasource not found: {state.datasource_id}.",
+                severity=ErrorSeverity.ERROR,
+                error_code=ErrorCode.INVALID_STATE,
+            )
 
-            if not self.vector_store:
-                return {
-                    "datasource_resolver_response": DatasourceResolverResponse(),
-                    "reasoning": [{"node": self.node_name, "content": "Vector store unavailable."}],
+        resolved = ResolvedDatasource(
+            datasource_id=state.datasource_id,
+            metadata={},
+            schema_version=self._get_latest_schema_version(state.datasource_id),
+        )
+        allowed_ids = self._get_allowed_datasource_ids(
+            state.user_context,
+            [state.datasource_id],
+        )
+        if not allowed_ids:
+            return self._error_response(
+                resolved_datasources=[resolved],
+                allowed_ids=[],
+                unsupported_ids=[],
+                message="Datasource not allowed.",
+                severity=ErrorSeverity.CRITICAL,
+                error_code=ErrorCode.SECURITY_VIOLATION,
+            )
+
+        return {
+            "datasource_resolver_response": DatasourceResolverResponse(
+                resolved_datasources=[resolved],
+                allowed_datasource_ids=allowed_ids,
+                unsupported_datasource_ids=[],
+            ),
+            "reasoning": [
+                {
+                    "node": self.node_name,
+                    "content": "Using explicit datasource override.",
                 }
+            ],
+        }
 
-            query = state.user_query
-            candidate_docs = self.vector_store.retrieve_datasource_candidates(query, k=5)
-            candidate_datasources = self._get_candidate_datasources(candidate_docs)
-            candidate_ids = list(candidate_datasources.keys())
-            if not candidate_ids:
-                return self._error_response(
-                    resolved_datasources=[],
-                    allowed_ids=[],
-                    unsupported_ids=[],
-                    message="No datasource candidates resolved.",
+    def _resolve_candidates(self, state: GraphState, candidate_docs: list[Document]) -> Dict[str, Any]:
+        candidate_datasources = self._get_candidate_datasources(candidate_docs)
+        candidate_ids = list(candidate_datasources.keys())
+        if not candidate_ids:
+            return self._error_response(
+                resolved_datasources=[],
+                allowed_ids=[],
+                unsupported_ids=[],
+                message="No datasource candidates resolved.",
+                severity=ErrorSeverity.ERROR,
+                error_code=ErrorCode.SCHEMA_RETRIEVAL_FAILED,
+            )
+        unsupported_ids = self._get_unsupported_datasources(candidate_ids)
+        allowed_ids = self._get_allowed_datasource_ids(state.user_context, candidate_ids)
+        if not allowed_ids:
+            return self._error_response(
+                resolved_datasources=list(candidate_datasources.values()),
+                allowed_ids=[],
+                unsupported_ids=unsupported_ids,
+                message="No allowed datasources.",
+                severity=ErrorSeverity.CRITICAL,
+                error_code=ErrorCode.SECURITY_VIOLATION,
+            )
+
+
+        schema_version_mismatch_response = self._apply_schema_version_mismatch_policy(
+            list(candidate_datasources.values()),
+            allowed_ids,
+            unsupported_ids,
+        )
+        if schema_version_mismatch_response:
+            return schema_version_mismatch_response
+        
+
+        result = DatasourceResolverResponse(
+            resolved_datasources=list(candidate_datasources.values()),
+            allowed_datasource_ids=allowed_ids,
+            unsupported_datasource_ids=unsupported_ids,
+        )               
+        return {
+            "datasource_resolver_response": result,
+            "reasoning": [{"node": self.node_name, "content": "Ranked by vector similarity."}],
+        }
+
+    def _failure_response(self, exc: Exception) -> Dict[str, Any]:
+        logger.error(f"Datasource resolver failed: {exc}")
+        return {
+            "datasource_resolver_response": DatasourceResolverResponse(),
+            "errors": [
+                PipelineError(
+                    node=self.node_name,
+                    message=f"Datasource resolution failed: {exc}",
                     severity=ErrorSeverity.ERROR,
                     error_code=ErrorCode.SCHEMA_RETRIEVAL_FAILED,
                 )
-            unsupported_ids = self._get_unsupported_datasources(candidate_ids)
-            allowed_ids = self._get_allowed_datasource_ids(state.user_context, candidate_ids)
-            if not allowed_ids:
-                return self._error_response(
-                    resolved_datasources=list(candidate_datasources.values()),
-                    allowed_ids=[],
-                    unsupported_ids=unsupported_ids,
-                    message="No allowed datasources.",
-                    severity=ErrorSeverity.CRITICAL,
-                    error_code=ErrorCode.SECURITY_VIOLATION,
-                )
+            ],
+        }
 
+    def __call__(self, state: GraphState) -> Dict[str, Any]:
+        try:
+            if state.datasource_id:
+                return self._resolve_override(state)
 
-            schema_version_mismatch_response = self._apply_schema_version_mismatch_policy(
-                list(candidate_datasources.values()),
-                allowed_ids,
-                unsupported_ids,
-            )
-            if schema_version_mismatch_response:
-                return schema_version_mismatch_response
-            
+            if not self.vector_store:
+                return self._vector_store_unavailable_response()
 
-            result = DatasourceResolverResponse(
-                resolved_datasources=list(candidate_datasources.values()),
-                allowed_datasource_ids=allowed_ids,
-                unsupported_datasource_ids=unsupported_ids,
-            )               
-            return {
-                "datasource_resolver_response": result,
-                "reasoning": [{"node": self.node_name, "content": "Ranked by vector similarity."}],
-            }
+            candidate_docs = self.vector_store.retrieve_datasource_candidates(state.user_query, k=5)
+            return self._resolve_candidates(state, candidate_docs)
+        except Exception as exc:
+            return self._failure_response(exc)
+
+    async def acall(self, state: GraphState) -> Dict[str, Any]:
+        """Async variant of ``__call__`` used when the graph runs via ``ainvoke``."""
+        try:
+            if state.datasource_id:
+                return self._resolve_override(state)
+
+            if not self.vector_store:
+                return self._vector_store_unavailable_response()
+
+            candidate_docs = await self.vector_store.aretrieve_datasource_candidates(
+                state.user_query, k=5
+            )
+            return self._resolve_candidates(state, candidate_docs)
         except Exception as exc:
-            logger.error(f"Datasource resolver failed: {exc}")
-            return {
-                "datasource_resolver_response": DatasourceResolverResponse(),
-                "errors": [
-                    PipelineError(
-                        node=self.node_name,
-                        message=f"Datasource resolution failed: {exc}",
-                        severity=ErrorSeverity.ERROR,
-                        error_code=ErrorCode.SCHEMA_RETRIEVAL_FAILED,
-                    )
-                ],
-            }
+            return self._failure_response(exc)
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, Optional, TYPE_CHECKING
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
@@ -8,10 +8,12 @@ if TYPE_CHECKING:
     from nl2sql.pipeline.state import GraphState
 
 from .schemas import DecomposerResponse, SubQuery, UnmappedSubQuery, PostCombineOp
-from .prompts import DECOMPOSER_PROMPT
+from .prompts import DECOMPOSER_SYSTEM_PROMPT, DECOMPOSER_USER_PROMPT
+from nl2sql.common.concurrency import allm_slot, llm_slot
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
 from nl2sql.common.logger import get_logger
 from nl2sql.context import NL2SQLContext
+from nl2sql.pipeline.decomposition_cache import DecompositionCacheKey, decomposition_cache_key
 import hashlib
 import json
 
@@ -39,20 +41,48 @@ class DecomposerNode:
         """
         self.node_name = self.__class__.__name__.lower().replace('node', '')
         self.llm = ctx.llm_registry.get_llm(self.node_name)
-        self.prompt = ChatPromptTemplate.from_template(DECOMPOSER_PROMPT)
+        self.prompt = ChatPromptTemplate.from_messages(
+            [("system", DECOMPOSER_SYSTEM_PROMPT), ("human", DECOMPOSER_USER_PROMPT)]
+        )
         self.chain = self.prompt | self.llm.with_structured_output(
             DecomposerResponse, method="function_calling"
         )
+        self.cache = getattr(ctx, "decomposition_cache", None)
 
     def _stable_id(self, prefix: str, payload: Dict[str, Any]) -> str:
         data = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
         digest = hashlib.sha256(data.encode("utf-8")).hexdigest()[:12]
         return f"{prefix}_{digest}"
 
+    def _build_inputs(self, state: GraphState) -> Dict[str, Any]:
+        resolver_response = state.datasource_resolver_response
+        if not resolver_response or not resolver_response.resolved_datasources:
+            raise ValueError("Unable to resolve any datasource for the current user query.")
+
+        return {
+            "user_query": state.user_query,
+            "resolved_datasources": [
+                datasource.model_dump() for datasource in resolver_response.resolved_datasources
+            ],
+        }
+
+    def _cache_key(self, state: GraphState) -> Optional[DecompositionCacheKey]:
+        if self.cache is None:
+            return None
+        return decomposition_cache_key(state.user_query, state.datasource_resolver_response)
+
+    def _remember(self, key: Optional[DecompositionCacheKey], llm_response: DecomposerResponse) -> None:
+        # Empty decompositions are not worth replaying; let the LLM try again.
+        if key and llm_response.sub_queries:
+            self.cache.put(key, llm_response)
+
     def __call__(self, state: GraphState) -> Dict[str, Any]:
         """Executes the decomposer node.
 
-        Invokes the LLM to produce semantic sub-queries and combine groups.
+        Invokes the LLM to produce semantic sub-queries and combine groups,
+        unless the decomposition cache holds a response for the same query
+        and resolution. Cached responses still go through datasource mapping
+        and RBAC filtering.
 
         Args:
             state (GraphState): The current execution state.
@@ -61,159 +91,181 @@ class DecomposerNode:
             Dict[str, Any]: Dictionary containing 'sub_queries', confidence, reasoning, etc.
         """
         try:
-            resolver_response = state.datasource_resolver_response
-            if not resolver_response or not resolver_response.resolved_datasources:
-                raise ValueError("Unable to resolve any datasource for the current user query.")
-            
-            resolved_datasources = resolver_response.resolved_datasources 
-            resolved_payload = []
-            resolved_ids = set()
-            schema_version_map = {}
-            for datasource in resolved_datasources:
-                resolved_payload.append(datasource.model_dump())
-                resolved_ids.add(datasource.datasource_id)
-                schema_version_map[datasource.datasource_id] = datasource.schema_version
-
-            llm_response: DecomposerResponse = self.chain.invoke(
-                {
-                    "user_query": state.user_query,
-                    "resolved_datasources": resolved_payload,
-                }
-            )
+            inputs = self._build_inputs(state)
+            key = self._cache_key(state)
+            llm_response = self.cache.get(key) if key else None
+            cached = llm_response is not None
+            if not cached:
+                with llm_slot(self.node_name):
+                    llm_response: DecomposerResponse = self.chain.invoke(inputs)
+                self._remember(key, llm_response)
+            return self._build_response(state, llm_response, cached=cached)
+        except Exception as e:
+            return self._failure_response(e)
 
-            final_sub_queries = []
-            unmapped = []
-            allowed_ids = set(resolver_response.allowed_datasource_ids)
-            unsupported_ids = set(resolver_response.unsupported_datasource_ids)
-            id_map: Dict[str, str] = {}
-
-            for llm_sq in llm_response.sub_queries:
-                datasource_id = (llm_sq.datasource_id or "").strip() or None
-                if not datasource_id or datasource_id not in resolved_ids:
-                    unmapped.append(
-                        UnmappedSubQuery(
-                            intent=llm_sq.intent,
-                            reason="no_datasource",
-                            datasource_id=datasource_id,
-                            detail="Datasource is missing or not resolved for this sub-query.",
-                        )
-                    )
-                    continue
-                if datasource_id not in allowed_ids:
-                    unmapped.append(
-                        UnmappedSubQuery(
-                            intent=llm_sq.intent,
-                            reason="restricted_datasource",
-                            datasource_id=datasource_id,
-                            detail="Datasource is not allowed for the current user context.",
-                        )
-                    )
-                    continue
-                if datasource_id in unsupported_ids:
-                    unmapped.append(
-                        UnmappedSubQuery(
-                            intent=llm_sq.intent,
-                            reason="unsupported_datasource",
-                            datasource_id=datasource_id,
-                            detail="Datasource does not match any supported adapter capabilities.",
-                        )
+    async def acall(self, state: GraphState) -> Dict[str, Any]:
+        """Async variant of ``__call__`` used when the graph runs via ``ainvoke``."""
+        try:
+            inputs = self._build_inputs(state)
+            key = self._cache_key(state)
+            llm_response = self.cache.get(key) if key else None
+            cached = llm_response is not None
+            if not cached:
+                async with allm_slot(self.node_name):
+                    llm_response: DecomposerResponse = await self.chain.ainvoke(inputs)
+                self._remember(key, llm_response)
+            return self._build_response(state, llm_response, cached=cached)
+        except Exception as e:
+            return self._failure_response(e)
+
+    def _build_response(
+        self, state: GraphState, llm_response: DecomposerResponse, cached: bool = False
+    ) -> Dict[str, Any]:
+        resolver_response = state.datasource_resolver_response
+        resolved_ids = set()
+        schema_version_map = {}
+        for datasource in resolver_response.resolved_datasources:
+            resolved_ids.add(datasource.datasource_id)
+            schema_version_map[datasource.datasource_id] = datasource.schema_version
+
+        final_sub_queries = []
+        unmapped = []
+        allowed_ids = set(resolver_response.allowed_datasource_ids)
+        unsupported_ids = set(resolver_response.unsupported_datasource_ids)
+        id_map: Dict[str, str] = {}
+
+        for llm_sq in llm_response.sub_queries:
+            datasource_id = (llm_sq.datasource_id or "").strip() or None
+            if not datasource_id or datasource_id not in resolved_ids:
+                unmapped.append(
+                    UnmappedSubQuery(
+                        intent=llm_sq.intent,
+                        reason="no_datasource",
+                        datasource_id=datasource_id,
+                        detail="Datasource is missing or not resolved for this sub-query.",
                     )
-                    continue
-                stable_id = self._stable_id(
-                    "sq",
-                    {
-                        "datasource_id": datasource_id,
-                        "intent": llm_sq.intent,
-                        "metrics": [m.model_dump() for m in llm_sq.metrics],
-                        "filters": [f.model_dump() for f in llm_sq.filters],
-                        "group_by": [g.model_dump() for g in llm_sq.group_by],
-                        "expected_schema": [c.model_dump() for c in llm_sq.expected_schema],
-                    },
                 )
-                id_map[llm_sq.id] = stable_id
-                sq = SubQuery(
-                    id=stable_id,
-                    intent=llm_sq.intent,
-                    datasource_id=datasource_id,
-                    metrics=llm_sq.metrics,
-                    filters=llm_sq.filters,
-                    group_by=llm_sq.group_by,
-                    expected_schema=llm_sq.expected_schema,
-                    schema_version=schema_version_map.get(datasource_id),
+                continue
+            if datasource_id not in allowed_ids:
+                unmapped.append(
+                    UnmappedSubQuery(
+                        intent=llm_sq.intent,
+                        reason="restricted_datasource",
+                        datasource_id=datasource_id,
+                        detail="Datasource is not allowed for the current user context.",
+                    )
                 )
-                final_sub_queries.append(sq)
-
-            valid_ids = {sq.id for sq in final_sub_queries}
-            combine_groups = []
-            for group in llm_response.combine_groups:
-                updated_inputs = []
-                for inp in group.inputs:
-                    mapped_id = id_map.get(inp.subquery_id, inp.subquery_id)
-                    if mapped_id in valid_ids:
-                        updated_inputs.append(inp.model_copy(update={"subquery_id": mapped_id}))
-                if not updated_inputs:
-                    continue
-                combine_groups.append(group.model_copy(update={"inputs": updated_inputs}))
-
-            combine_groups = sorted(combine_groups, key=lambda g: g.group_id)
-            final_sub_queries = sorted(final_sub_queries, key=lambda s: s.id)
-
-            post_combine_ops = []
-            for op in llm_response.post_combine_ops or []:
-                op_id = self._stable_id(
-                    "op",
-                    {
-                        "target_group_id": op.target_group_id,
-                        "operation": op.operation,
-                        "filters": [f.model_dump() for f in op.filters],
-                        "metrics": [m.model_dump() for m in op.metrics],
-                        "group_by": [g.model_dump() for g in op.group_by],
-                        "order_by": [o.model_dump() for o in op.order_by],
-                        "limit": op.limit,
-                        "expected_schema": [c.model_dump() for c in op.expected_schema],
-                        "metadata": op.metadata,
-                    },
+                continue
+            if datasource_id in unsupported_ids:
+                unmapped.append(
+                    UnmappedSubQuery(
+                        intent=llm_sq.intent,
+                        reason="unsupported_datasource",
+                        datasource_id=datasource_id,
+                        detail="Datasource does not match any supported adapter capabilities.",
+                    )
                 )
-                post_combine_ops.append(op.model_copy(update={"op_id": op_id}))
+                continue
+            stable_id = self._stable_id(
+                "sq",
+                {
+                    "datasource_id": datasource_id,
+                    "intent": llm_sq.intent,
+                    "metrics": [m.model_dump() for m in llm_sq.metrics],
+                    "filters": [f.model_dump() for f in llm_sq.filters],
+                    "group_by": [g.model_dump() for g in llm_sq.group_by],
+                    "expected_schema": [c.model_dump() for c in llm_sq.expected_schema],
+                },
+            )
+            id_map[llm_sq.id] = stable_id
+            sq = SubQuery(
+                id=stable_id,
+                intent=llm_sq.intent,
+                datasource_id=datasource_id,
+                metrics=llm_sq.metrics,
+                filters=llm_sq.filters,
+                group_by=llm_sq.group_by,
+                expected_schema=llm_sq.expected_schema,
+                schema_version=schema_version_map.get(datasource_id),
+            )
+            final_sub_queries.append(sq)
+
+        valid_ids = {sq.id for sq in final_sub_queries}
+        combine_groups = []
+        for group in llm_response.combine_groups:
+            updated_inputs = []
+            for inp in group.inputs:
+                mapped_id = id_map.get(inp.subquery_id, inp.subquery_id)
+                if mapped_id in valid_ids:
+                    updated_inputs.append(inp.model_copy(update={"subquery_id": mapped_id}))
+            if not updated_inputs:
+                continue
+            combine_groups.append(group.model_copy(update={"inputs": updated_inputs}))
 
-            post_combine_ops = sorted(post_combine_ops, key=lambda o: o.op_id)
+        combine_groups = sorted(combine_groups, key=lambda g: g.group_id)
+        final_sub_queries = sorted(final_sub_queries, key=lambda s: s.id)
 
-            response = DecomposerResponse(
-                sub_queries=final_sub_queries,
-                combine_groups=combine_groups,
-                post_combine_ops=post_combine_ops,
-                unmapped_subqueries=unmapped,
+        post_combine_ops = []
+        for op in llm_response.post_combine_ops or []:
+            op_id = self._stable_id(
+                "op",
+                {
+                    "target_group_id": op.target_group_id,
+                    "operation": op.operation,
+                    "filters": [f.model_dump() for f in op.filters],
+                    "metrics": [m.model_dump() for m in op.metrics],
+                    "group_by": [g.model_dump() for g in op.group_by],
+                    "order_by": [o.model_dump() for o in op.order_by],
+                    "limit": op.limit,
+                    "expected_schema": [c.model_dump() for c in op.expected_schema],
+                    "metadata": op.metadata,
+                },
             )
+            post_combine_ops.append(op.model_copy(update={"op_id": op_id}))
 
-            return {
-                "decomposer_response": response,
-                "reasoning": [{"node": self.node_name, "content": "Decomposition completed."}],
-            }
+        post_combine_ops = sorted(post_combine_ops, key=lambda o: o.op_id)
 
-        except Exception as e:
-            logger.error(f"Node {self.node_name} failed: {e}")
-
-            return {
-                "decomposer_response": DecomposerResponse(
-                    sub_queries=[],
-                    combine_groups=[],
-                    post_combine_ops=[],
-                    unmapped_subqueries=[],
-                ),
-                "reasoning": [
-                    {
-                        "node": self.node_name,
-                        "content": f"Decomposition failed: {str(e)}",
-                        "type": "error",
-                    }
-                ],
-                "errors": [
-                    PipelineError(
-                        node=self.node_name,
-                        message=f"Decomposition failed: {str(e)}",
-                        severity=ErrorSeverity.CRITICAL,
-                        error_code=ErrorCode.ORCHESTRATOR_CRASH,
-                        stack_trace=str(e),
-                    )
-                ],
-            }
+        response = DecomposerResponse(
+            sub_queries=final_sub_queries,
+            combine_groups=combine_groups,
+            post_combine_ops=post_combine_ops,
+            unmapped_subqueries=unmapped,
+        )
+
+        return {
+            "decomposer_response": response,
+            "reasoning": [
+                {
+                    "node": self.node_name,
+                    "content": "Decomposition reused from cache." if cached else "Decomposition completed.",
+                }
+            ],
+        }
+
+    def _failure_response(self, e: Exception) -> Dict[str, Any]:
+        logger.error(f"Node {self.node_name} failed: {e}")
+
+        return {
+            "decomposer_response": DecomposerResponse(
+                sub_queries=[],
+                combine_groups=[],
+                post_combine_ops=[],
+                unmapped_subqueries=[],
+            ),
+            "reasoning": [
+                {
+                    "node": self.node_name,
+                    "content": f"Decomposition failed: {str(e)}",
+                    "type": "error",
+                }
+            ],
+            "errors": [
+                PipelineError(
+                    node=self.node_name,
+                    message=f"Decomposition failed: {str(e)}",
+                    severity=ErrorSeverity.CRITICAL,
+                    error_code=ErrorCode.ORCHESTRATOR_CRASH,
+                    stack_trace=str(e),
+                )
+            ],
+        }
@@ -1,20 +1,13 @@
 """Prompts for the Query Decomposer node."""
 
-DECOMPOSER_PROMPT = """
-SYSTEM:
-You are a Semantic Query Decomposer. You output ONLY structured semantic intent.
+# Static prefix: identical for every call, so provider-side prompt caching can
+# reuse it. Only the human message below varies per request.
+DECOMPOSER_SYSTEM_PROMPT = """You are a Semantic Query Decomposer. You output ONLY structured semantic intent.
 
 TASK:
 Decompose the user query into semantic sub-queries and combine groups.
 Your output must be deterministic and strictly follow the JSON contract.
 
-INPUTS:
-User Query:
-{user_query}
-
-Resolved Datasources (id + semantic metadata):
-{resolved_datasources}
-
 RULES:
 1) Use resolved_datasources metadata to select the most appropriate datasource for each subquery.
 2) If an intent cannot be mapped to any resolved datasource, emit it under unmapped_subqueries.
@@ -94,3 +87,11 @@ VALIDATION:
 - post_combine_ops.target_group_id must reference an existing group_id.
 - expected_schema must match semantic outputs only.
 """
+
+# Datasource metadata repeats across queries, so it precedes the user query.
+DECOMPOSER_USER_PROMPT = """Resolved Datasources (id + semantic metadata):
+{resolved_datasources}
+
+User Query:
+{user_query}
+"""
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 
 from nl2sql.common.cancellation import is_cancelled
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
 from nl2sql.common.logger import get_logger
 from nl2sql.context import NL2SQLContext
-from nl2sql.execution.contracts import ExecutorRequest
-from nl2sql.execution.executor import ExecutorRegistry
+from nl2sql.execution.contracts import ExecutorRequest, ExecutorResponse
+from nl2sql.execution.executor import ExecutorRegistry, ExecutorService
 from nl2sql_adapter_sdk.capabilities import DatasourceCapability
 
 if TYPE_CHECKING:
@@ -25,64 +25,88 @@ class ExecutorNode:
         self.registry = ExecutorRegistry(ctx.ds_registry)
         self.tenant_id = ctx.tenant_id
 
+    def _error_response(self, message: str, error_code: ErrorCode) -> Dict[str, Any]:
+        error = PipelineError(
+            node=self.node_name,
+            message=message,
+            severity=ErrorSeverity.ERROR,
+            error_code=error_code,
+        )
+        return {"executor_response": None, "errors": [error]}
+
+    def _prepare(
+        self, state: SubgraphExecutionState
+    ) -> Tuple[Optional[ExecutorService], Optional[ExecutorRequest], Optional[Dict[str, Any]]]:
+        """Resolves the executor and request, or an error response to return instead."""
+        if is_cancelled(state.cancel_token):
+            return None, None, self._error_response("Pipeline cancelled by user.", ErrorCode.CANCELLED)
+
+        ds_id = state.sub_query.datasource_id
+        sql = state.generator_response.sql_draft
+
+        if not sql:
+            return None, None, self._error_response("No SQL to execute.", ErrorCode.MISSING_SQL)
+
+        if not ds_id:
+            return None, None, self._error_response(
+                "No datasource_id in state.", ErrorCode.MISSING_DATASOURCE_ID
+            )
+
+        executor = self.registry.get_executor(ds_id)
+        if executor is None:
+            return None, None, self._error_response(
+                f"No executor available for datasource '{ds_id}'.", ErrorCode.INVALID_STATE
+            )
+
+        request = ExecutorRequest(
+            node_id=state.sub_query.id,
+            trace_id=state.trace_id,
+            subgraph_name=state.subgraph_name,
+            datasource_id=ds_id,
+            schema_version=state.sub_query.schema_version,
+            sql=sql,
+            user_context=state.user_context,
+            tenant_id=self.tenant_id,
+            deadline=state.deadline,
+            return_rows=state.return_rows,
+        )
+        return executor, request, None
+
+    def _build_response(self, response: ExecutorResponse) -> Dict[str, Any]:
+        return {
+            "executor_response": response,
+            "errors": response.errors,
+            "reasoning": response.reasoning,
+        }
+
+    def _failure_response(self, exc: Exception) -> Dict[str, Any]:
+        logger.error(f"Node {self.node_name} failed: {exc}")
+        error = PipelineError(
+            node=self.node_name,
+            message=f"Executor crash: {exc}",
+            severity=ErrorSeverity.CRITICAL,
+            error_code=ErrorCode.EXECUTOR_CRASH,
+        )
+        return {
+            "executor_response": None,
+            "errors": [error],
+        }
+
     def __call__(self, state: SubgraphExecutionState) -> Dict[str, Any]:
         try:
-            ds_id = state.sub_query.datasource_id 
-            sql = state.generator_response.sql_draft 
-
-            if not sql:
-                error = PipelineError(
-                    node=self.node_name,
-                    message="No SQL to execute.",
-                    severity=ErrorSeverity.ERROR,
-                    error_code=ErrorCode.MISSING_SQL,
-                )
-                return {"executor_response": None, "errors": [error]}
-
-            if not ds_id:
-                error = PipelineError(
-                    node=self.node_name,
-                    message="No datasource_id in state.",
-                    severity=ErrorSeverity.ERROR,
-                    error_code=ErrorCode.MISSING_DATASOURCE_ID,
-                )
-                return {"executor_response": None, "errors": [error]}
-
-            executor = self.registry.get_executor(ds_id)
-            if executor is None:
-                error = PipelineError(
-                    node=self.node_name,
-                    message=f"No executor available for datasource '{ds_id}'.",
-                    severity=ErrorSeverity.ERROR,
-                    error_code=ErrorCode.INVALID_STATE,
-                )
-                return {"executor_response": None, "errors": [error]}
-
-            request = ExecutorRequest(
-                node_id=state.sub_query.id,
-                trace_id=state.trace_id,
-                subgraph_name=state.subgraph_name,
-                datasource_id=ds_id,
-                schema_version=state.sub_query.schema_version,
-                sql=sql,
-                user_context=state.user_context,
-                tenant_id=self.tenant_id,
-            )
-            response = executor.execute(request)
-            return {
-                "executor_response": response,
-                "errors": response.errors,
-                "reasoning": response.reasoning,
-            }
+            executor, request, error_response = self._prepare(state)
+            if error_response:
+                return error_response
+            return self._build_response(executor.execute(request))
         except Exception as exc:
-            logger.error(f"Node {self.node_name} failed: {exc}")
-            error = PipelineError(
-                node=self.node_name,
-                message=f"Executor crash: {exc}",
-                severity=ErrorSeverity.CRITICAL,
-                error_code=ErrorCode.EXECUTOR_CRASH,
-            )
-            return {
-                "executor_response": None,
-                "errors": [error],
-            }
+            return self._failure_response(exc)
+
+    async def acall(self, state: SubgraphExecutionState) -> Dict[str, Any]:
+        """Async variant of ``__call__`` used when the graph runs via ``ainvoke``."""
+        try:
+            executor, request, error_response = self._prepare(state)
+            if error_response:
+                return error_response
+            return self._build_response(await executor.aexecute(request))
+        except Exception as exc:
+            return self._failure_response(exc)
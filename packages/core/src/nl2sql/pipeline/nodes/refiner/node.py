@@ -6,9 +6,11 @@ from langchain_core.runnables import Runnable
 
 if TYPE_CHECKING:
     from nl2sql.pipeline.state import SubgraphExecutionState
-from .prompts import REFINER_PROMPT
+from .prompts import REFINER_SYSTEM_PROMPT, REFINER_USER_PROMPT
+from nl2sql.common.concurrency import allm_slot, llm_slot
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
 from nl2sql.pipeline.nodes.refiner.schemas import RefinerResponse
+from nl2sql.pipeline.nodes.schema_retriever.render import render_schema
 
 from nl2sql.common.logger import get_logger
 
@@ -37,11 +39,85 @@ class RefinerNode:
         """
         self.node_name = self.__class__.__name__.lower().replace('node', '')
         self.llm = ctx.llm_registry.get_llm(self.node_name)
-        self.prompt = ChatPromptTemplate.from_template(REFINER_PROMPT)
+        self.prompt = ChatPromptTemplate.from_messages(
+            [("system", REFINER_SYSTEM_PROMPT), ("human", REFINER_USER_PROMPT)]
+        )
         self.chain = None
         if self.llm is not None:
             self.chain = self.prompt | self.llm | StrOutputParser()
 
+    def _missing_llm_response(self) -> Dict[str, Any]:
+        error = PipelineError(
+            node=self.node_name,
+            message="No LLM configured for refiner.",
+            severity=ErrorSeverity.ERROR,
+            error_code=ErrorCode.MISSING_LLM,
+        )
+        return {
+            "refiner_response": RefinerResponse(errors=[error]),
+            "errors": [error],
+        }
+
+    def _build_inputs(self, state: SubgraphExecutionState) -> Dict[str, Any]:
+        relevant_tables = render_schema(state.relevant_tables, state.sub_query, node=self.node_name)
+
+        failed_plan_str = "No plan generated."
+        if state.ast_planner_response and state.ast_planner_response.plan:
+            try:
+                failed_plan_str = json.dumps(state.ast_planner_response.plan, indent=2)
+            except:
+                failed_plan_str = str(state.ast_planner_response.plan)
+
+        # Extract messages from PipelineError objects
+        errors_str = "\n".join(f"- {e.message}" for e in state.errors)
+
+        reasoning_str = "No reasoning history."
+        if state.reasoning:
+            reasoning_str = "\n".join(
+                f"[{r.get('node', 'unknown')}]: {r.get('content')}" for r in state.reasoning
+            )
+
+        return {
+            "user_query": state.sub_query.intent if state.sub_query else "",
+            "relevant_tables": relevant_tables,
+            "failed_plan": failed_plan_str,
+            "errors": errors_str,
+            "reasoning": reasoning_str
+        }
+
+    def _build_response(self, feedback: str) -> Dict[str, Any]:
+        warning = PipelineError(
+            node=self.node_name,
+            message=feedback,
+            severity=ErrorSeverity.WARNING, # Feedback for retry
+            error_code=ErrorCode.PLAN_FEEDBACK,
+        )
+        response = RefinerResponse(
+            feedback=feedback,
+            errors=[warning],
+            reasoning=[{"node": self.node_name, "content": feedback}],
+        )
+        return {
+            "refiner_response": response,
+            "errors": [warning],
+            "reasoning": response.reasoning,
+        }
+
+    def _failure_response(self, e: Exception) -> Dict[str, Any]:
+        logger.error(f"Node {self.node_name} failed: {e}")
+        error = PipelineError(
+            node=self.node_name,
+            message=f"Refiner failed: {e}",
+            severity=ErrorSeverity.ERROR,
+            error_code=ErrorCode.REFINER_FAILED,
+            stack_trace=str(e),
+        )
+        return {
+            "refiner_response": RefinerResponse(errors=[error]),
+            "reasoning": [{"node": self.node_name, "content": f"Refiner failed: {e}", "type": "error"}],
+            "errors": [error],
+        }
+
     def __call__(self, state: SubgraphExecutionState) -> Dict[str, Any]:
         """
         Executes the summarization step.
@@ -54,79 +130,20 @@ class RefinerNode:
         """
         try:
             if not self.chain:
-                error = PipelineError(
-                    node=self.node_name,
-                    message="No LLM configured for refiner.",
-                    severity=ErrorSeverity.ERROR,
-                    error_code=ErrorCode.MISSING_LLM,
-                )
-                return {
-                    "refiner_response": RefinerResponse(errors=[error]),
-                    "errors": [error],
-                }
-            relevant_tables = ""
-            if state.relevant_tables:
-                lines = []
-                for tbl in state.relevant_tables:
-                    lines.append(tbl.model_dump_json(indent=2))
-                    lines.append("---")
-                relevant_tables = "\n".join(lines)
-
-            failed_plan_str = "No plan generated."
-            if state.ast_planner_response and state.ast_planner_response.plan:
-                try:
-                    failed_plan_str = json.dumps(state.ast_planner_response.plan, indent=2)
-                except:
-                    failed_plan_str = str(state.ast_planner_response.plan)
-
-            # Extract messages from PipelineError objects
-            errors_str = "\n".join(f"- {e.message}" for e in state.errors)
-
-            reasoning_str = "No reasoning history."
-            if state.reasoning:
-                reasoning_str = "\n".join(
-                    f"[{r.get('node', 'unknown')}]: {r.get('content')}" for r in state.reasoning
-                )
+                return self._missing_llm_response()
+            with llm_slot(self.node_name):
+                feedback = self.chain.invoke(self._build_inputs(state))
+            return self._build_response(feedback)
+        except Exception as e:
+            return self._failure_response(e)
 
-            try:
-                feedback = self.chain.invoke({
-                    "user_query": state.sub_query.intent if state.sub_query else "",
-                    "relevant_tables": relevant_tables,
-                    "failed_plan": failed_plan_str,
-                    "errors": errors_str,
-                    "reasoning": reasoning_str
-                })
-                
-                warning = PipelineError(
-                    node=self.node_name,
-                    message=feedback,
-                    severity=ErrorSeverity.WARNING, # Feedback for retry
-                    error_code=ErrorCode.PLAN_FEEDBACK,
-                )
-                response = RefinerResponse(
-                    feedback=feedback,
-                    errors=[warning],
-                    reasoning=[{"node": self.node_name, "content": feedback}],
-                )
-                return {
-                    "refiner_response": response,
-                    "errors": [warning],
-                    "reasoning": response.reasoning,
-                }
-            except Exception as e:
-                    raise e
-                     
+    async def acall(self, state: SubgraphExecutionState) -> Dict[str, Any]:
+        """Async variant of ``__call__`` used when the graph runs via ``ainvoke``."""
+        try:
+            if not self.chain:
+                return self._missing_llm_response()
+            async with allm_slot(self.node_name):
+                feedback = await self.chain.ainvoke(self._build_inputs(state))
+            return self._build_response(feedback)
         except Exception as e:
-            logger.error(f"Node {self.node_name} failed: {e}")
-            error = PipelineError(
-                node=self.node_name,
-                message=f"Refiner failed: {e}",
-                severity=ErrorSeverity.ERROR,
-                error_code=ErrorCode.REFINER_FAILED,
-                stack_trace=str(e),
-            )
-            return {
-                "refiner_response": RefinerResponse(errors=[error]),
-                "reasoning": [{"node": self.node_name, "content": f"Refiner failed: {e}", "type": "error"}],
-                "errors": [error],
-            }
+            return self._failure_response(e)
@@ -1,12 +1,23 @@
-REFINER_PROMPT = """You are an expert SQL debugger and schema analyst.
+# Static prefix shared by every call; per-request data goes in the user prompt.
+REFINER_SYSTEM_PROMPT = """You are an expert SQL debugger and schema analyst.
 Your goal is to analyze a failed SQL generation attempt and provide actionable, schema-aware feedback to the Planner.
 
-### Context
-User Query: "{user_query}"
+### Instructions
+1. Analyze the Errors in the context of the Schema and User Query.
+2. If the error is an Execution Error (e.g., syntax error, runtime error), analyze why the SQL failed and suggest a fix in the Plan.
+2. If the error is about a missing table or column, check the Schema for the correct name.
+   - Example: Error "Column 'revenue' not found", Schema has "total_revenue". -> Suggest "Use 'total_revenue' instead of 'revenue'".
+3. If the plan is empty or missing, analyze the User Query and suggest which tables/columns to use.
+4. Provide a concise, numbered list of specific fixes. Do not generate SQL. Focus on correcting the Plan.
+"""
 
-### Database Schema
+# The schema repeats across retries of a sub-query, so it comes first.
+REFINER_USER_PROMPT = """### Database Schema
 {relevant_tables}
 
+### Context
+User Query: "{user_query}"
+
 ### Failed Plan
 {failed_plan}
 
@@ -16,13 +27,5 @@ User Query: "{user_query}"
 ### Previous Reasoning (Trace)
 {reasoning}
 
-### Instructions
-1. Analyze the Errors in the context of the Schema and User Query.
-2. If the error is an Execution Error (e.g., syntax error, runtime error), analyze why the SQL failed and suggest a fix in the Plan.
-2. If the error is about a missing table or column, check the Schema for the correct name.
-   - Example: Error "Column 'revenue' not found", Schema has "total_revenue". -> Suggest "Use 'total_revenue' instead of 'revenue'".
-3. If the plan is empty or missing, analyze the User Query and suggest which tables/columns to use.
-4. Provide a concise, numbered list of specific fixes. Do not generate SQL. Focus on correcting the Plan.
-
 ### Feedback
 """
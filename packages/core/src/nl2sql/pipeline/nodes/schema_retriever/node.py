@@ -135,6 +135,109 @@ class SchemaRetrieverNode:
 
         return tables_out
 
+    def _add_candidate_tables(
+        self,
+        tables: Dict[str, Set[str]],
+        schema_docs: List[Any],
+        column_docs: List[Any],
+    ) -> None:
+        for doc in schema_docs or []:
+            table = doc.metadata.get("table")
+            if table:
+                tables[table].update([])
+        for doc in column_docs or []:
+            table = doc.metadata.get("table")
+            column = doc.metadata.get("column")
+            if not table:
+                continue
+            tables[table].update([])
+            if column:
+                tables[table].add(column)
+
+    def _build_response(
+        self,
+        sub_query: SubQuery,
+        tables: Dict[str, Set[str]],
+        planning_docs: List[Any],
+    ) -> Dict[str, Any]:
+        datasource_id = sub_query.datasource_id
+        schema_version = sub_query.schema_version
+
+        for doc in planning_docs:
+            doc_type = doc.metadata.get("type")
+            if doc_type == "schema.column":
+                table = doc.metadata.get("table")
+                column = doc.metadata.get("column")
+                if table and column:
+                    tables[table].add(column)
+
+            if doc_type == "schema.relationship":
+                from_table = doc.metadata.get("from_table")
+                to_table = doc.metadata.get("to_table")
+                if from_table:
+                    tables[from_table].update(doc.metadata.get("from_columns"))
+                if to_table:
+                    tables[to_table].update(doc.metadata.get("to_columns"))
+
+        if not tables:
+            snapshot = self._resolve_snapshot(datasource_id, schema_version)
+            relevant_tables = self._build_tables_from_snapshot(
+                snapshot,
+                resolved_tables=None,
+                schema_version=schema_version,
+            )
+            return {
+                "relevant_tables": relevant_tables,
+                "reasoning": [
+                    {
+                        "node": self.node_name,
+                        "content": "Vector retrieval produced no candidates. Using full schema snapshot.",
+                        "type": "warning",
+                    }
+                ],
+                "warnings": [
+                    {
+                        "node": self.node_name,
+                        "content": "Vector retrieval produced no candidates. Using full schema snapshot.",
+                    }
+                ],
+            }
+
+        snapshot = self._resolve_snapshot(datasource_id, schema_version)
+        relevant_tables = self._build_tables_from_snapshot(
+            snapshot,
+            resolved_tables=tables,
+            schema_version=schema_version,
+        )
+
+
+
+        return {
+            "relevant_tables": relevant_tables,
+            "reasoning": [
+                {
+                    "node": self.node_name,
+                    "content": (
+                        f"Retrieved {len(relevant_tables)} tables "
+                        f"with {sum(len(t.columns) for t in relevant_tables)} columns."
+                    ),
+                }
+            ],
+        }
+
+    def _failure_response(self, exc: Exception) -> Dict[str, Any]:
+        logger.error(f"Schema retrieval failed: {exc}")
+        return {
+            "relevant_tables": [],
+            "reasoning": [
+                {
+                    "node": self.node_name,
+                    "content": f"Schema retrieval failed: {exc}",
+                    "type": "error",
+                }
+            ],
+        }
+
     def __call__(self, state: SubgraphExecutionState) -> Dict[str, Any]:
         try:
             sub_query = state.sub_query
@@ -142,34 +245,19 @@ class SchemaRetrieverNode:
                 return {"relevant_tables": []}
 
             datasource_id = sub_query.datasource_id
-            schema_version = sub_query.schema_version
             query = self._build_semantic_query(sub_query)
 
             tables: Dict[str, Set[str]] = defaultdict(set)
-            schema_docs = []
-            column_docs = []
-
             if self.vector_store:
                 schema_docs = self.vector_store.retrieve_schema_context(
                     query, datasource_id, k=8
                 )
-                if schema_docs:
-                    for doc in schema_docs:
-                        table = doc.metadata.get("table")
-                        if table:
-                            tables[table].update([])
-                else:
+                column_docs = []
+                if not schema_docs:
                     column_docs = self.vector_store.retrieve_column_candidates(
                         query, datasource_id, k=8
                     )
-                    for doc in column_docs:
-                        table = doc.metadata.get("table")
-                        column = doc.metadata.get("column")
-                        if not table:
-                            continue
-                        tables[table].update([])
-                        if column:
-                            tables[table].add(column)
+                self._add_candidate_tables(tables, schema_docs, column_docs)
 
             planning_docs = []
             if self.vector_store and tables:
@@ -177,76 +265,38 @@ class SchemaRetrieverNode:
                     query, datasource_id, list(tables.keys()), k=12
                 )
 
-            for doc in planning_docs:
-                doc_type = doc.metadata.get("type")
-                if doc_type == "schema.column":
-                    table = doc.metadata.get("table")
-                    column = doc.metadata.get("column")
-                    if table and column:
-                        tables[table].add(column)
-
-                if doc_type == "schema.relationship":
-                    from_table = doc.metadata.get("from_table")
-                    to_table = doc.metadata.get("to_table")
-                    if from_table:
-                        tables[from_table].update(doc.metadata.get("from_columns"))
-                    if to_table:
-                        tables[to_table].update(doc.metadata.get("to_columns"))
-
-            if not tables:
-                snapshot = self._resolve_snapshot(datasource_id, schema_version)
-                relevant_tables = self._build_tables_from_snapshot(
-                    snapshot,
-                    resolved_tables=None,
-                    schema_version=schema_version,
-                )
-                return {
-                    "relevant_tables": relevant_tables,
-                    "reasoning": [
-                        {
-                            "node": self.node_name,
-                            "content": "Vector retrieval produced no candidates. Using full schema snapshot.",
-                            "type": "warning",
-                        }
-                    ],
-                    "warnings": [
-                        {
-                            "node": self.node_name,
-                            "content": "Vector retrieval produced no candidates. Using full schema snapshot.",
-                        }
-                    ],
-                }
+            return self._build_response(sub_query, tables, planning_docs)
+        except Exception as exc:
+            return self._failure_response(exc)
 
-            snapshot = self._resolve_snapshot(datasource_id, schema_version)
-            relevant_tables = self._build_tables_from_snapshot(
-                snapshot,
-                resolved_tables=tables,
-                schema_version=schema_version,
-            )
+    async def acall(self, state: SubgraphExecutionState) -> Dict[str, Any]:
+        """Async variant of ``__call__`` used when the graph runs via ``ainvoke``."""
+        try:
+            sub_query = state.sub_query
+            if not sub_query:
+                return {"relevant_tables": []}
 
+            datasource_id = sub_query.datasource_id
+            query = self._build_semantic_query(sub_query)
 
+            tables: Dict[str, Set[str]] = defaultdict(set)
+            if self.vector_store:
+                schema_docs = await self.vector_store.aretrieve_schema_context(
+                    query, datasource_id, k=8
+                )
+                column_docs = []
+                if not schema_docs:
+                    column_docs = await self.vector_store.aretrieve_column_candidates(
+                        query, datasource_id, k=8
+                    )
+                self._add_candidate_tables(tables, schema_docs, column_docs)
 
-            return {
-                "relevant_tables": relevant_tables,
-                "reasoning": [
-                    {
-                        "node": self.node_name,
-                        "content": (
-                            f"Retrieved {len(relevant_tables)} tables "
-                            f"with {sum(len(t.columns) for t in relevant_tables)} columns."
-                        ),
-                    }
-                ],
-            }
+            planning_docs = []
+            if self.vector_store and tables:
+                planning_docs = await self.vector_store.aretrieve_planning_context(
+                    query, datasource_id, list(tables.keys()), k=12
+                )
+
+            return self._build_response(sub_query, tables, planning_docs)
         except Exception as exc:
-            logger.error(f"Schema retrieval failed: {exc}")
-            return {
-                "relevant_tables": [],
-                "reasoning": [
-                    {
-                        "node": self.node_name,
-                        "content": f"Schema retrieval failed: {exc}",
-                        "type": "error",
-                    }
-                ],
-            }
+            return self._failure_response(exc)
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import math
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import schema_prompt_tokens_counter, schema_prompt_tokens_saved_counter
+from nl2sql.common.settings import settings
+from .schema import Column, Table
+
+if TYPE_CHECKING:
+    from nl2sql.pipeline.nodes.decomposer.schemas import SubQuery
+
+logger = get_logger("schema_render")
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Relevance weights used to rank columns before dropping them for budget.
+_KEY_SCORE = 4
+_ATTRIBUTE_SCORE = 3
+_NAME_SCORE = 2
+_DESCRIPTION_SCORE = 1
+
+_OMITTED_NOTE = "  -- {} less relevant column(s) omitted"
+_OMITTED_NOTE_TOKENS = math.ceil(len(_OMITTED_NOTE.format(99999) + "\n") / 4)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), tokenizer-independent."""
+    return math.ceil(len(text) / 4)
+
+
+def _words(text: Optional[str]) -> Set[str]:
+    if not text:
+        return set()
+    # Split snake_case and camelCase so "customerId" matches "customer id".
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text).replace("_", " ")
+    return set(_WORD.findall(text.lower()))
+
+
+def _relationships(tables: Sequence[Table]) -> List[Dict[str, Any]]:
+    """Collects relationships across tables, dropping duplicates."""
+    seen: Set[Tuple] = set()
+    out: List[Dict[str, Any]] = []
+    for table in tables:
+        for rel in getattr(table, "relationships", None) or []:
+            key = (
+                rel.get("from_table"),
+                tuple(rel.get("from_columns") or []),
+                rel.get("to_table"),
+                tuple(rel.get("to_columns") or []),
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            out.append(rel)
+    return out
+
+
+def _key_columns(table: Table, relationships: List[Dict[str, Any]]) -> Set[str]:
+    keys = set(table.primary_key or [])
+    for columns in (table.foreign_keys or {}).values():
+        keys.update(columns)
+    for rel in relationships:
+        if _short_name(rel.get("from_table")) == table.name:
+            keys.update(rel.get("from_columns") or [])
+        if _short_name(rel.get("to_table")) == table.name:
+            keys.update(rel.get("to_columns") or [])
+    return keys
+
+
+def _short_name(full_name: Optional[str]) -> Optional[str]:
+    return full_name.rsplit(".", 1)[-1] if full_name else full_name
+
+
+def _format_value(value: Any) -> str:
+    return f"'{value}'" if isinstance(value, str) else str(value)
+
+
+def _render_column(column: Column, filtered: bool) -> str:
+    line = f"  {column.name} {column.type or ''}".rstrip()
+    notes: List[str] = []
+    if column.description:
+        notes.append(column.description.strip())
+    stats = column.stats or {}
+    samples = stats.get("sample_values") or []
+    distinct = stats.get("distinct_count")
+    # Sample values help the planner spell filter literals; only low-cardinality
+    # columns get them, since samples of a high-cardinality column mislead.
+    if samples and distinct is not None and distinct <= settings.schema_prompt_max_distinct_for_samples:
+        shown = samples[: settings.schema_prompt_max_sample_values]
+        notes.append("values: " + ", ".join(_format_value(v) for v in shown))
+    if filtered and (stats.get("min_value") is not None or stats.get("max_value") is not None):
+        notes.append(f"range: {_format_value(stats.get('min_value'))}..{_format_value(stats.get('max_value'))}")
+    if notes:
+        line += " -- " + "; ".join(notes)
+    return line
+
+
+def _render_relationship(rel: Dict[str, Any]) -> str:
+    line = (
+        f"  {rel.get('from_table')}({', '.join(rel.get('from_columns') or [])}) -> "
+        f"{rel.get('to_table')}({', '.join(rel.get('to_columns') or [])})"
+    )
+    if rel.get("cardinality"):
+        line += f" [{rel['cardinality']}]"
+    return line
+
+
+class _ColumnEntry:
+    __slots__ = ("table_index", "column_index", "line", "tokens", "score")
+
+    def __init__(self, table_index: int, column_index: int, line: str, score: int):
+        self.table_index = table_index
+        self.column_index = column_index
+        self.line = line
+        self.tokens = estimate_tokens(line + "\n")
+        self.score = score
+
+
+def render_schema(
+    tables: Sequence[Table],
+    sub_query: Optional[SubQuery] = None,
+    max_tokens: Optional[int] = None,
+    node: str = "unknown",
+) -> str:
+    """Renders relevant tables as terse DDL-like text within a token budget.
+
+    Each table is a ``TABLE name -- description`` header with its primary key
+    and one line per column. Sample values are shown only for low-cardinality
+    columns and value ranges only for columns the sub-query filters on.
+    Relationships are listed once, after all tables.
+
+    When the text exceeds ``max_tokens`` (``SCHEMA_PROMPT_MAX_TOKENS`` by
+    default), columns are dropped from least to most relevant: key columns
+    rank highest, then columns named by sub-query filters/group-by/metrics,
+    then columns whose name or description shares words with the intent.
+    Every table keeps at least one column. As a last resort the text is cut.
+
+    Args:
+        tables: Tables from the schema retriever.
+        sub_query: Sub-query used to rank columns.
+        max_tokens: Token budget; no limit if 0.
+        node: Calling node, used as metric label.
+
+    Returns:
+        str: The rendered schema.
+    """
+    if not tables:
+        return ""
+    budget = settings.schema_prompt_max_tokens if max_tokens is None else max_tokens
+    relationships = _relationships(tables)
+
+    attributes: Set[str] = set()
+    query_words: Set[str] = set()
+    filtered: Set[str] = set()
+    if sub_query is not None:
+        query_words = _words(sub_query.intent)
+        for f in sub_query.filters:
+            attributes.add(f.attribute.lower())
+            filtered.add(f.attribute.lower())
+        attributes.update(g.attribute.lower() for g in sub_query.group_by)
+        attributes.update(m.name.lower() for m in sub_query.metrics)
+        attributes.update(c.name.lower() for c in sub_query.expected_schema)
+        for attribute in attributes:
+            query_words |= _words(attribute)
+
+    headers: List[List[str]] = []
+    entries: List[_ColumnEntry] = []
+    for t_idx, table in enumerate(tables):
+        header = [f"TABLE {table.name}" + (f" -- {table.description.strip()}" if table.description else "")]
+        if table.primary_key:
+            header.append(f"  PRIMARY KEY ({', '.join(table.primary_key)})")
+        headers.append(header)
+
+        keys = _key_columns(table, relationships)
+        for c_idx, column in enumerate(table.columns):
+            name = column.name.lower()
+            name_words = _words(column.name)
+            score = 0
+            if column.name in keys:
+                score += _KEY_SCORE
+            if name in attributes:
+                score += _ATTRIBUTE_SCORE
+            if name_words & query_words:
+                score += _NAME_SCORE
+            if _words(column.description) & query_words:
+                score += _DESCRIPTION_SCORE
+            line = _render_column(column, filtered=name in filtered)
+            entries.append(_ColumnEntry(t_idx, c_idx, line, score))
+
+    relationship_lines: List[str] = []
+    if relationships:
+        relationship_lines = ["RELATIONSHIPS"] + [_render_relationship(r) for r in relationships]
+
+    fixed_tokens = sum(estimate_tokens("\n".join(h) + "\n") for h in headers)
+    fixed_tokens += estimate_tokens("\n".join(relationship_lines))
+    total = fixed_tokens + sum(e.tokens for e in entries)
+
+    dropped: Set[int] = set()
+    if budget and total > budget:
+        remaining_per_table = [len(t.columns) for t in tables]
+        # Least relevant first; later columns of a table go before earlier ones.
+        order = sorted(range(len(entries)), key=lambda i: (entries[i].score, -entries[i].column_index))
+        for i in order:
+            if total <= budget:
+                break
+            entry = entries[i]
+            if remaining_per_table[entry.table_index] <= 1:
+                continue
+            if remaining_per_table[entry.table_index] == len(tables[entry.table_index].columns):
+                total += _OMITTED_NOTE_TOKENS
+            remaining_per_table[entry.table_index] -= 1
+            dropped.add(i)
+            total -= entry.tokens
+
+    blocks: List[str] = []
+    kept_by_table: Dict[int, List[str]] = {}
+    for i, entry in enumerate(entries):
+        if i not in dropped:
+            kept_by_table.setdefault(entry.table_index, []).append(entry.line)
+    for t_idx, header in enumerate(headers):
+        lines = header + kept_by_table.get(t_idx, [])
+        omitted = len(tables[t_idx].columns) - len(kept_by_table.get(t_idx, []))
+        if omitted:
+            lines.append(_OMITTED_NOTE.format(omitted))
+        blocks.append("\n".join(lines))
+    if relationship_lines:
+        blocks.append("\n".join(relationship_lines))
+    text = "\n\n".join(blocks)
+
+    if budget and estimate_tokens(text) > budget:
+        note = "\n-- schema truncated to fit the prompt budget"
+        text = text[: max(budget * 4 - len(note), 0)].rsplit("\n", 1)[0] + note
+
+    baseline = sum(estimate_tokens(t.model_dump_json(indent=2)) for t in tables)
+    rendered = estimate_tokens(text)
+    schema_prompt_tokens_counter.add(rendered, {"node": node})
+    if baseline > rendered:
+        schema_prompt_tokens_saved_counter.add(baseline - rendered, {"node": node})
+    if dropped:
+        logger.debug(f"Dropped {len(dropped)} column(s) from the {node} schema prompt to fit {budget} tokens.")
+    return text
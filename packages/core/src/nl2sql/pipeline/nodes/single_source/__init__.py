@@ -0,0 +1,4 @@
+from .node import SINGLE_SOURCE_GROUP_ID, SingleSourceRouterNode, single_source_candidate
+from .schemas import SingleSourceVerdict
+
+__all__ = ["SINGLE_SOURCE_GROUP_ID", "SingleSourceRouterNode", "SingleSourceVerdict", "single_source_candidate"]
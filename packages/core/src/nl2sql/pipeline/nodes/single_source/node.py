@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from langchain_core.prompts import ChatPromptTemplate
+
+if TYPE_CHECKING:
+    from nl2sql.pipeline.state import GraphState
+
+from nl2sql.common.concurrency import allm_slot, llm_slot
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import single_source_route_counter
+from nl2sql.common.settings import settings
+from nl2sql.context import NL2SQLContext
+from nl2sql.pipeline.nodes.datasource_resolver.schemas import DatasourceResolverResponse
+from nl2sql.pipeline.nodes.decomposer.schemas import (
+    CombineGroup,
+    CombineInput,
+    DecomposerResponse,
+    SubQuery,
+)
+from .prompts import SINGLE_SOURCE_SYSTEM_PROMPT, SINGLE_SOURCE_USER_PROMPT
+from .schemas import SingleSourceVerdict
+
+logger = get_logger("single_source")
+
+# Combine group of fast-path decompositions; routers use it to tell them apart.
+SINGLE_SOURCE_GROUP_ID = "cg_single_source"
+
+# Wording that usually means two result sets the aggregator has to combine.
+_MULTI_PART = re.compile(
+    r"\b(compare[sd]?|comparison|comparing|versus|vs\.?|difference between|relative to|"
+    r"ratio of|side by side|as well as|and also|respectively|combined with)\b",
+    re.IGNORECASE,
+)
+
+SIMPLE = "simple"
+
+
+def single_source_candidate(
+    user_query: str,
+    resolver_response: Optional[DatasourceResolverResponse],
+) -> Tuple[Optional[str], str]:
+    """Applies the fast-path rules to a resolved question.
+
+    Returns:
+        The datasource to query and ``"simple"``, or None and the rule that
+        sent the question down the full pipeline.
+    """
+    if resolver_response is None or len(resolver_response.resolved_datasources) != 1:
+        return None, "multiple_datasources"
+    if resolver_response.unsupported_datasource_ids:
+        return None, "unsupported_datasource"
+    datasource_id = resolver_response.resolved_datasources[0].datasource_id
+    if datasource_id not in resolver_response.allowed_datasource_ids:
+        return None, "restricted_datasource"
+    if len(user_query.split()) > settings.single_source_max_words:
+        return None, "too_long"
+    if _MULTI_PART.search(user_query) or user_query.count("?") > 1 or ";" in user_query:
+        return None, "multi_part"
+    return datasource_id, SIMPLE
+
+
+class SingleSourceRouterNode:
+    """Detects simple single-datasource questions and skips decomposition for them.
+
+    Questions that pass ``single_source_candidate`` (and, when an agent named
+    ``singlesourcerouter`` is configured, that model's verdict) get a one
+    sub-query decomposition built without an LLM call; the graph sends it
+    straight to the SQL agent and the executor's rows become the terminal
+    result. Other questions continue to the decomposer.
+    """
+
+    def __init__(self, ctx: NL2SQLContext):
+        self.node_name = self.__class__.__name__.lower().replace("node", "")
+        self.chain = None
+        # Only an explicitly configured agent is used; the default model would
+        # cost as much as the decomposer call this node is meant to save.
+        llm_registry = getattr(ctx, "llm_registry", None)
+        if self.node_name in (getattr(llm_registry, "llms", None) or {}):
+            prompt = ChatPromptTemplate.from_messages(
+                [("system", SINGLE_SOURCE_SYSTEM_PROMPT), ("human", SINGLE_SOURCE_USER_PROMPT)]
+            )
+            self.chain = prompt | llm_registry.get_llm(self.node_name).with_structured_output(
+                SingleSourceVerdict, method="function_calling"
+            )
+
+    def _build_inputs(self, state: GraphState) -> Dict[str, Any]:
+        datasource = state.datasource_resolver_response.resolved_datasources[0]
+        return {"user_query": state.user_query, "datasource": datasource.model_dump()}
+
+    def _sub_query(self, state: GraphState, datasource_id: str) -> SubQuery:
+        payload = {"datasource_id": datasource_id, "intent": state.user_query}
+        data = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+        resolved = state.datasource_resolver_response.resolved_datasources[0]
+        return SubQuery(
+            id=f"sq_{hashlib.sha256(data.encode('utf-8')).hexdigest()[:12]}",
+            datasource_id=datasource_id,
+            intent=state.user_query,
+            schema_version=resolved.schema_version,
+        )
+
+    def _build_response(self, state: GraphState, datasource_id: Optional[str], reason: str) -> Dict[str, Any]:
+        sub_query = None
+        if datasource_id is not None:
+            try:
+                sub_query = self._sub_query(state, datasource_id)
+            except ValueError:
+                # SQL keywords in the question; the decomposer rewrites the intent.
+                reason = "physical_tokens"
+
+        route = "fast_path" if sub_query is not None else "full"
+        single_source_route_counter.add(1, {"route": route, "reason": reason})
+        if sub_query is None:
+            return {
+                "reasoning": [{"node": self.node_name, "content": f"Full pipeline ({reason})."}],
+            }
+
+        group = CombineGroup(
+            group_id=SINGLE_SOURCE_GROUP_ID,
+            operation="standalone",
+            inputs=[CombineInput(subquery_id=sub_query.id, role="base")],
+        )
+        return {
+            "decomposer_response": DecomposerResponse(sub_queries=[sub_query], combine_groups=[group]),
+            "reasoning": [
+                {"node": self.node_name, "content": f"Single-datasource fast path on '{datasource_id}'."}
+            ],
+        }
+
+    def _verdict_failed(self, exc: Exception) -> Tuple[None, str]:
+        logger.warning(f"Node {self.node_name} classifier failed, using the full pipeline: {exc}")
+        return None, "model_error"
+
+    def __call__(self, state: GraphState) -> Dict[str, Any]:
+        datasource_id, reason = single_source_candidate(state.user_query, state.datasource_resolver_response)
+        if datasource_id is not None and self.chain is not None:
+            try:
+                with llm_slot(self.node_name):
+                    verdict: SingleSourceVerdict = self.chain.invoke(self._build_inputs(state))
+                if not verdict.single_source:
+                    datasource_id, reason = None, "model"
+            except Exception as exc:
+                datasource_id, reason = self._verdict_failed(exc)
+        return self._build_response(state, datasource_id, reason)
+
+    async def acall(self, state: GraphState) -> Dict[str, Any]:
+        """Async variant of ``__call__`` used when the graph runs via ``ainvoke``."""
+        datasource_id, reason = single_source_candidate(state.user_query, state.datasource_resolver_response)
+        if datasource_id is not None and self.chain is not None:
+            try:
+                async with allm_slot(self.node_name):
+                    verdict: SingleSourceVerdict = await self.chain.ainvoke(self._build_inputs(state))
+                if not verdict.single_source:
+                    datasource_id, reason = None, "model"
+            except Exception as exc:
+                datasource_id, reason = self._verdict_failed(exc)
+        return self._build_response(state, datasource_id, reason)
@@ -0,0 +1,19 @@
+"""Prompts for the SingleSourceRouter node."""
+
+# Static prefix shared by every call; per-request data goes in the user prompt.
+SINGLE_SOURCE_SYSTEM_PROMPT = """You decide whether a question can be answered by ONE SQL query against ONE datasource.
+
+Answer single_source = false if the question:
+1. Compares or combines separate result sets (e.g. this year versus last year as two figures, two unrelated metrics).
+2. Asks several independent questions at once.
+3. Needs data the datasource description does not cover.
+
+Otherwise answer single_source = true. Filters, grouping, sorting, limits and aggregates in a single query are fine.
+"""
+
+SINGLE_SOURCE_USER_PROMPT = """Datasource:
+{datasource}
+
+Question:
+{user_query}
+"""
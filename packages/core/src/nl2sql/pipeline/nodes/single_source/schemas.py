@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+
+class SingleSourceVerdict(BaseModel):
+    """Classifier verdict on whether one SQL query answers the question."""
+    single_source: bool = Field(
+        description="True if a single SQL query against the datasource fully answers the question."
+    )
+    reason: str = Field(default="", description="Short justification.")
@@ -6,15 +6,19 @@ import traceback
 if TYPE_CHECKING:
     from nl2sql.pipeline.state import SubgraphExecutionState
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
-from nl2sql.pipeline.nodes.ast_planner.schemas import PlanModel, Expr
+from nl2sql.pipeline.nodes.ast_planner.schemas import ASTPlannerResponse, PlanModel, Expr
 from nl2sql.context import NL2SQLContext
 from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import plan_repair_counter
 from nl2sql.common.settings import settings
+from nl2sql.pipeline.nodes.validator.repair import repair_plan
 from nl2sql.pipeline.nodes.validator.schemas import LogicalValidatorResponse
 
 
 logger = get_logger("logical_validator")
 
+_BLOCKING_SEVERITIES = (ErrorSeverity.CRITICAL, ErrorSeverity.ERROR)
+
 
 class ValidatorVisitor:
     """Traverses the Expr AST to validate column existence and scoping.
@@ -129,6 +133,7 @@ class LogicalValidatorNode:
         self.registry = ctx.ds_registry
         self.rbac = ctx.rbac
         self.strict_columns = settings.logical_validator_strict_columns
+        self.repair_enabled = settings.plan_repair_enabled
 
     def _normalize_table_key(
         self,
@@ -730,7 +735,52 @@ class LogicalValidatorNode:
 
         return errors
 
+    def _blocking(self, errors: List[PipelineError]) -> List[PipelineError]:
+        return [e for e in errors if e.severity in _BLOCKING_SEVERITIES]
+
+    def _try_repair(
+        self, state: SubgraphExecutionState, plan: PlanModel, errors: List[PipelineError]
+    ) -> Optional[Dict[str, Any]]:
+        """Repairs and re-validates a rejected plan; None sends it to the refiner.
+
+        Only plans whose errors are all retryable are repaired, so policy
+        violations are never rewritten into something that passes. Rules
+        such as ``group_by`` only run here: they never reject a plan.
+        """
+        if not self.repair_enabled or not all(e.is_retryable for e in self._blocking(errors)):
+            return None
+        alias_to_cols, _, _ = self._build_alias_map(state, plan)
+        expected_names = [c.name for c in state.sub_query.expected_schema if c.name] if state.sub_query else []
+        result = repair_plan(plan, alias_to_cols, expected_names)
+        if result is None:
+            plan_repair_counter.add(1, {"outcome": "no_rule"})
+            return None
 
+        repaired, applied = result
+        repaired_state = state.model_copy(update={"ast_planner_response": ASTPlannerResponse(plan=repaired)})
+        new_errors = self._validate_static(repaired_state) + self._validate_policy(repaired_state)
+        rules = ",".join(applied)
+        if self._blocking(new_errors):
+            plan_repair_counter.add(1, {"outcome": "failed", "rules": rules})
+            logger.debug("Plan repair (%s) did not pass validation: %s", rules, [e.message for e in new_errors])
+            return None
+
+        plan_repair_counter.add(1, {"outcome": "repaired", "rules": rules})
+        response = LogicalValidatorResponse(
+            errors=new_errors,
+            reasoning=[
+                {
+                    "node": "logical_validator",
+                    "content": [f"Repaired plan ({rules}): {e.message}" for e in self._blocking(errors)],
+                }
+            ],
+        )
+        return {
+            "ast_planner_response": ASTPlannerResponse(plan=repaired),
+            "logical_validator_response": response,
+            "errors": new_errors,
+            "reasoning": response.reasoning,
+        }
 
     def __call__(self, state: SubgraphExecutionState) -> Dict[str, Any]:
         """Executes the validation node.
@@ -778,7 +828,10 @@ class LogicalValidatorNode:
             errors.extend(self._validate_static(state))
             errors.extend(self._validate_policy(state))
 
-            if any(e.severity in (ErrorSeverity.CRITICAL, ErrorSeverity.ERROR) for e in errors):
+            if self._blocking(errors):
+                repaired = self._try_repair(state, plan, errors)
+                if repaired is not None:
+                    return repaired
                 response = LogicalValidatorResponse(
                     errors=errors,
                     reasoning=[{"node": node_name, "content": [e.message for e in errors]}],
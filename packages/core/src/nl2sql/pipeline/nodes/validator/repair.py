@@ -0,0 +1,195 @@
+"""Deterministic repairs for plans that fail logical validation.
+
+Planners often produce plans that are right in substance but wrong in a
+mechanical detail. ``repair_plan`` fixes those details so the plan can be
+re-validated at once, without a refiner and planner round trip:
+
+- ``alias_case``: a column or join alias differs from a table alias only in case.
+- ``column_alias``: a column is qualified with the wrong (or an undeclared)
+  alias but exists on exactly one plan table.
+- ``select_alias_case``: a select alias differs from an ``expected_schema``
+  name only in case.
+- ``group_by``: an aggregating plan is missing non-aggregated select items
+  from its GROUP BY. Validation does not flag this (grouping by a key makes
+  its dependent columns valid in several dialects); the rule only runs while
+  repairing a plan rejected for another reason.
+- ``ordinals``: ordinals are not contiguous from 0; items keep their order.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from nl2sql.pipeline.nodes.ast_planner.schemas import Expr, GroupByItem, PlanModel, SelectItem
+
+AGGREGATE_FUNCS = {"COUNT", "SUM", "AVG", "MIN", "MAX"}
+
+
+def _walk(expr: Optional[Expr]) -> Iterator[Expr]:
+    if expr is None:
+        return
+    yield expr
+    for child in (expr.left, expr.right, expr.expr, expr.else_expr, *expr.args):
+        yield from _walk(child)
+    for when in expr.whens:
+        yield from _walk(when.condition)
+        yield from _walk(when.result)
+
+
+def _plan_exprs(plan: PlanModel) -> Iterator[Expr]:
+    roots = [plan.where, plan.having]
+    roots += [s.expr for s in plan.select_items]
+    roots += [g.expr for g in plan.group_by]
+    roots += [o.expr for o in plan.order_by]
+    roots += [j.condition for j in plan.joins]
+    for root in roots:
+        yield from _walk(root)
+
+
+def _column_name(expr: Expr) -> str:
+    return (expr.column_name or "").lower().split(".")[-1]
+
+
+def _normalized(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: item.lower() if key in ("alias", "column_name") and isinstance(item, str) else _normalized(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_normalized(item) for item in value]
+    return value
+
+
+def _expr_key(expr: Expr) -> str:
+    return json.dumps(_normalized(expr.model_dump()), sort_keys=True, default=str)
+
+
+def is_aggregate(expr: Expr) -> bool:
+    """Whether ``expr`` contains an aggregate function call."""
+    return any(
+        node.kind == "func" and (node.is_aggregate or str(node.func_name).upper() in AGGREGATE_FUNCS)
+        for node in _walk(expr)
+    )
+
+
+def ungrouped_select_items(plan: PlanModel) -> List[SelectItem]:
+    """Non-aggregated select items an aggregating plan leaves out of GROUP BY.
+
+    An item is grouped when its expression, or every column it reads, appears
+    in GROUP BY. Plans without aggregates or GROUP BY are not checked.
+    """
+    if not plan.group_by and not any(is_aggregate(s.expr) for s in plan.select_items):
+        return []
+    grouped = {_expr_key(g.expr) for g in plan.group_by}
+    missing = []
+    for item in plan.select_items:
+        if is_aggregate(item.expr):
+            continue
+        columns = [node for node in _walk(item.expr) if node.kind == "column" and _column_name(node) != "*"]
+        if not columns or _expr_key(item.expr) in grouped:
+            continue
+        if all(_expr_key(column) in grouped for column in columns):
+            continue
+        missing.append(item)
+    return missing
+
+
+def _fix_alias_case(plan: PlanModel) -> bool:
+    canonical = {t.alias.lower(): t.alias for t in plan.tables}
+    declared = set(canonical.values())
+    changed = False
+    for node in _plan_exprs(plan):
+        if node.kind == "column" and node.alias and node.alias not in declared:
+            fixed = canonical.get(node.alias.lower())
+            if fixed:
+                node.alias, changed = fixed, True
+    for join in plan.joins:
+        for field in ("left_alias", "right_alias"):
+            alias = getattr(join, field)
+            fixed = canonical.get(alias.lower()) if alias not in declared else None
+            if fixed:
+                setattr(join, field, fixed)
+                changed = True
+    return changed
+
+
+def _fix_column_aliases(plan: PlanModel, alias_to_cols: Dict[str, Set[str]]) -> bool:
+    changed = False
+    for node in _plan_exprs(plan):
+        if node.kind != "column" or not node.alias:
+            continue
+        name = _column_name(node)
+        if not name or name == "*" or name in alias_to_cols.get(node.alias, ()):
+            continue
+        owners = [alias for alias, columns in alias_to_cols.items() if name in columns]
+        if len(owners) == 1:
+            node.alias, changed = owners[0], True
+    return changed
+
+
+def _fix_select_alias_case(plan: PlanModel, expected_names: Sequence[str]) -> bool:
+    canonical = {name.lower(): name for name in expected_names}
+    changed = False
+    for item in plan.select_items:
+        if item.alias and item.alias not in canonical.values():
+            fixed = canonical.get(item.alias.lower())
+            if fixed:
+                item.alias, changed = fixed, True
+    return changed
+
+
+def _fix_group_by(plan: PlanModel) -> bool:
+    missing = ungrouped_select_items(plan)
+    next_ordinal = max((g.ordinal for g in plan.group_by), default=-1) + 1
+    for offset, item in enumerate(missing):
+        plan.group_by.append(GroupByItem(expr=item.expr.model_copy(deep=True), ordinal=next_ordinal + offset))
+    return bool(missing)
+
+
+def _fix_ordinals(plan: PlanModel) -> bool:
+    changed = False
+    for field in ("tables", "joins", "select_items", "group_by", "order_by"):
+        items = getattr(plan, field)
+        if [i.ordinal for i in items] == list(range(len(items))):
+            continue
+        ordered = sorted(items, key=lambda i: i.ordinal)
+        for ordinal, item in enumerate(ordered):
+            item.ordinal = ordinal
+        setattr(plan, field, ordered)
+        changed = True
+    return changed
+
+
+def repair_plan(
+    plan: PlanModel,
+    alias_to_cols: Dict[str, Set[str]],
+    expected_names: Sequence[str] = (),
+) -> Optional[Tuple[PlanModel, List[str]]]:
+    """Applies every repair rule to a copy of ``plan``.
+
+    Args:
+        plan: The plan that failed validation; it is not modified.
+        alias_to_cols: Lower-cased column names per plan table alias.
+        expected_names: The sub-query's ``expected_schema`` column names.
+
+    Returns:
+        The repaired plan and the names of the rules that changed it, or
+        None when no rule applies.
+    """
+    repaired = plan.model_copy(deep=True)
+    applied = [
+        name
+        for name, fix in (
+            ("alias_case", lambda: _fix_alias_case(repaired)),
+            ("column_alias", lambda: _fix_column_aliases(repaired, alias_to_cols)),
+            ("select_alias_case", lambda: _fix_select_alias_case(repaired, expected_names)),
+            ("group_by", lambda: _fix_group_by(repaired)),
+            ("ordinals", lambda: _fix_ordinals(repaired)),
+        )
+        if fix()
+    ]
+    if not applied:
+        return None
+    return PlanModel.model_validate(repaired.model_dump()), applied
@@ -1,9 +1,12 @@
 import time
 import traceback
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence
 from dataclasses import dataclass, field
 
 from nl2sql.auth import UserContext
+from nl2sql.common.concurrency import ConcurrencyLimits
+from nl2sql.pipeline.admission import Priority
+from nl2sql.pipeline.batch import BatchInput, BatchQuery, BatchRun
 from nl2sql.pipeline.runtime import run_with_graph
 from nl2sql.common.settings import settings
 from nl2sql.context import NL2SQLContext
@@ -36,6 +39,7 @@ class PipelineRunner:
         datasource_id: Optional[str] = None,
         execute: bool = True,
         callbacks: List[Any] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> PipelineResult:
         """
         Executes the pipeline graph.
@@ -55,6 +59,7 @@ class PipelineRunner:
                 execute=execute,
                 callbacks=callbacks or [],
                 user_context=user_context,
+                priority=priority,
             )
 
             return PipelineResult(
@@ -70,3 +75,39 @@ class PipelineRunner:
                 traceback=traceback.format_exc(),
                 duration=time.perf_counter() - start_time,
             )
+
+    def run_queries(
+        self,
+        batch: Sequence[BatchInput],
+        concurrency: int = 4,
+        role: str = "admin",
+        execute: bool = True,
+        per_datasource_concurrency: Optional[int] = None,
+        per_llm_concurrency: Optional[int] = None,
+        callbacks: List[Any] = None,
+    ) -> BatchRun:
+        """
+        Executes a batch of queries; yields BatchItemResult (wrapping
+        PipelineResult) in completion order with aggregate stats on ``.stats``.
+        """
+
+        def _run_one(item: BatchQuery) -> PipelineResult:
+            return self.run(
+                item.query,
+                role=role,
+                datasource_id=item.datasource_id,
+                execute=execute,
+                callbacks=callbacks,
+                priority=Priority.BATCH,
+            )
+
+        return BatchRun(
+            batch,
+            _run_one,
+            concurrency=concurrency,
+            limits=ConcurrencyLimits(
+                per_llm=per_llm_concurrency,
+                per_datasource=per_datasource_concurrency,
+            ),
+            vector_store=getattr(self.ctx, "vector_store", None),
+        )
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Hashable, Iterable, Optional, Tuple
+
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import plan_cache_hit_counter, plan_cache_miss_counter
+
+if TYPE_CHECKING:
+    from nl2sql.pipeline.nodes.ast_planner.schemas import PlanModel
+    from nl2sql.pipeline.state import SubgraphExecutionState
+
+logger = get_logger("plan_cache")
+
+PlanCacheKey = Tuple[str, str, str, Tuple[str, ...], Hashable]
+
+
+def plan_cache_key(state: SubgraphExecutionState, revision: Hashable = None) -> Optional[PlanCacheKey]:
+    """Builds the plan cache key for a SQL agent state.
+
+    The key is (sub-query id, datasource, schema version, role set, config
+    revision). Sub-query ids are stable hashes of the semantic sub-query, so
+    repeated sub-questions map to the same entry. Sub-queries without a
+    schema version are not cacheable.
+
+    Args:
+        state: SQL agent subgraph state.
+        revision: Configuration revision of the owning context.
+
+    Returns:
+        Optional[PlanCacheKey]: The key, or None if the state is not cacheable.
+    """
+    sub_query = state.sub_query
+    if not sub_query or not sub_query.datasource_id or not sub_query.schema_version:
+        return None
+    roles = tuple(sorted(set(state.user_context.roles))) if state.user_context else ()
+    return (sub_query.id, sub_query.datasource_id, sub_query.schema_version, roles, revision)
+
+
+class PlanCache:
+    """Process-local LRU cache of validated AST plans.
+
+    Only plans that passed logical validation and executed successfully are
+    stored, so a hit lets the SQL agent skip schema retrieval, the planner LLM
+    and the validate/refine loop. Entries are dropped when their schema
+    version is evicted from the schema store.
+
+    Args:
+        max_entries: Max cached plans; least recently used are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[PlanCacheKey, PlanModel]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: PlanCacheKey) -> Optional[PlanModel]:
+        with self._lock:
+            plan = self._entries.get(key)
+            if plan is not None:
+                self._entries.move_to_end(key)
+        counter = plan_cache_miss_counter if plan is None else plan_cache_hit_counter
+        counter.add(1, {"datasource_id": key[1]})
+        return plan
+
+    def put(self, key: PlanCacheKey, plan: PlanModel) -> None:
+        with self._lock:
+            self._entries[key] = plan
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: PlanCacheKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def evict_schema_versions(self, datasource_id: str, schema_versions: Iterable[str]) -> int:
+        """Drops plans built against the given schema versions of a datasource.
+
+        Returns:
+            int: Number of evicted plans.
+        """
+        versions = set(schema_versions)
+        if not versions:
+            return 0
+        with self._lock:
+            stale = [k for k in self._entries if k[1] == datasource_id and k[2] in versions]
+            for k in stale:
+                del self._entries[k]
+        if stale:
+            logger.info(f"Evicted {len(stale)} cached plan(s) for {datasource_id} schema versions {sorted(versions)}.")
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
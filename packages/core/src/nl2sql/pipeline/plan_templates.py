@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import copy
+import json
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import plan_template_hit_counter, plan_template_miss_counter
+
+if TYPE_CHECKING:
+    from nl2sql.pipeline.nodes.ast_planner.schemas import PlanModel
+    from nl2sql.pipeline.nodes.decomposer.schemas import SubQuery
+
+logger = get_logger("plan_templates")
+
+TemplateKey = Tuple[Hashable, ...]
+
+
+@dataclass(frozen=True)
+class _Slot:
+    literal_index: int
+    filter_index: int
+    element_index: Optional[int]
+    # Set for LIKE patterns built from a ``contains`` filter: the bound value
+    # replaces this text inside the literal instead of the whole literal.
+    pattern_text: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PlanTemplate:
+    """A plan with literal slots bound to sub-query filter values."""
+
+    plan: Dict[str, Any]
+    slots: Tuple[_Slot, ...]
+
+    def bind(self, sub_query: SubQuery) -> Optional[PlanModel]:
+        """Returns the plan with ``sub_query``'s filter values, or None if they do not fit."""
+        from nl2sql.pipeline.nodes.ast_planner.schemas import PlanModel
+
+        dump = copy.deepcopy(self.plan)
+        literals = _literal_nodes(dump)
+        for slot in self.slots:
+            new_value = _filter_values(sub_query)[slot.filter_index][slot.element_index or 0]
+            node = literals[slot.literal_index]
+            if slot.pattern_text is not None:
+                node["value"] = node["value"].replace(slot.pattern_text, str(new_value))
+                continue
+            bound = _coerce(node["value"], new_value)
+            if bound is None:
+                return None
+            node["value"] = bound
+        try:
+            return PlanModel.model_validate(dump)
+        except ValueError:
+            return None
+
+
+def _literal_nodes(node: Any) -> List[Dict[str, Any]]:
+    """Collects literal Expr dicts of a plan dump in a deterministic order."""
+    found: List[Dict[str, Any]] = []
+
+    def walk(value: Any) -> None:
+        if isinstance(value, dict):
+            if value.get("kind") == "literal" and not value.get("is_null"):
+                found.append(value)
+            for key in sorted(value):
+                walk(value[key])
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    walk(node)
+    return found
+
+
+def _filter_values(sub_query: SubQuery) -> List[List[Any]]:
+    return [f.value if isinstance(f.value, list) else [f.value] for f in sub_query.filters]
+
+
+def _value_shape(value: Any) -> Hashable:
+    if isinstance(value, list):
+        return ("list", len(value), tuple(type(v).__name__ for v in value))
+    return type(value).__name__
+
+
+def _coerce(old: Any, new: Any) -> Any:
+    """Casts ``new`` to the type the plan used for the slot, or None if it cannot."""
+    if isinstance(old, bool) or isinstance(new, bool):
+        return new if isinstance(old, bool) and isinstance(new, bool) else None
+    try:
+        return type(old)(new)
+    except (TypeError, ValueError):
+        return None
+
+
+def _masked_intent(sub_query: SubQuery) -> str:
+    intent = sub_query.intent
+    values = sorted({str(v) for vs in _filter_values(sub_query) for v in vs}, key=len, reverse=True)
+    for value in values:
+        if value:
+            intent = re.sub(re.escape(value), "?", intent, flags=re.IGNORECASE)
+    return " ".join(intent.split()).casefold()
+
+
+def template_key(sub_query: SubQuery, revision: Hashable = None) -> Optional[TemplateKey]:
+    """Builds the shape key shared by sub-queries that differ only in filter literals."""
+    if not sub_query.datasource_id or not sub_query.schema_version or not sub_query.filters:
+        return None
+
+    def _dump(items) -> str:
+        return json.dumps([i.model_dump() for i in items], sort_keys=True)
+
+    return (
+        sub_query.datasource_id,
+        sub_query.schema_version,
+        revision,
+        _masked_intent(sub_query),
+        _dump(sub_query.metrics),
+        _dump(sub_query.group_by),
+        _dump(sub_query.expected_schema),
+        tuple((f.attribute, f.operator, _value_shape(f.value)) for f in sub_query.filters),
+    )
+
+
+def build_plan_template(sub_query: SubQuery, plan: PlanModel) -> Optional[PlanTemplate]:
+    """Abstracts ``plan`` into a template, or returns None if literals do not map cleanly.
+
+    Every filter value must appear among the plan's literals, and every
+    literal may match at most one filter value.
+    """
+    dump = plan.model_dump()
+    literals = _literal_nodes(dump)
+    values = _filter_values(sub_query)
+    operators = [f.operator for f in sub_query.filters]
+
+    slots: List[_Slot] = []
+    bound_values = set()
+    for literal_index, node in enumerate(literals):
+        literal = node["value"]
+        matches: List[_Slot] = []
+        for filter_index, elements in enumerate(values):
+            for element_index, value in enumerate(elements):
+                element = element_index if isinstance(sub_query.filters[filter_index].value, list) else None
+                if str(literal) == str(value):
+                    matches.append(_Slot(literal_index, filter_index, element))
+                elif (
+                    operators[filter_index] == "contains"
+                    and isinstance(literal, str)
+                    and str(value)
+                    and str(value) in literal
+                ):
+                    matches.append(_Slot(literal_index, filter_index, element, pattern_text=str(value)))
+        if len(matches) > 1:
+            return None
+        if matches:
+            slots.append(matches[0])
+            bound_values.add((matches[0].filter_index, matches[0].element_index or 0))
+
+    expected = {(i, j) for i, elements in enumerate(values) for j in range(len(elements))}
+    if bound_values != expected:
+        return None
+    return PlanTemplate(plan=dump, slots=tuple(slots))
+
+
+class PlanTemplateStore:
+    """Process-local LRU store of plan templates keyed by sub-query shape.
+
+    Sub-queries that differ only in filter literals ("sales in EU" vs "sales
+    in US") share a shape: datasource, schema version, metrics, group-by,
+    expected schema, filter attributes/operators/value types, and the intent
+    with the literals masked. A template recorded from one successful run is
+    bound to the literals of the next, skipping the planner LLM; the bound
+    plan still goes through logical validation.
+
+    Args:
+        max_entries: Max templates; least recently used are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[TemplateKey, PlanTemplate]" = OrderedDict()
+        self._lock = Lock()
+
+    def match(self, sub_query: SubQuery, revision: Hashable = None) -> Optional[PlanModel]:
+        """Returns a plan bound to ``sub_query``'s literals, or None."""
+        key = template_key(sub_query, revision)
+        if key is None:
+            return None
+        with self._lock:
+            template = self._entries.get(key)
+            if template is not None:
+                self._entries.move_to_end(key)
+        plan = template.bind(sub_query) if template is not None else None
+        counter = plan_template_miss_counter if plan is None else plan_template_hit_counter
+        counter.add(1, {"datasource_id": sub_query.datasource_id})
+        return plan
+
+    def record(self, sub_query: SubQuery, plan: PlanModel, revision: Hashable = None) -> bool:
+        """Stores a template for a plan that validated and executed successfully.
+
+        Returns:
+            bool: True if a template was stored.
+        """
+        key = template_key(sub_query, revision)
+        if key is None:
+            return False
+        template = build_plan_template(sub_query, plan)
+        if template is None:
+            return False
+        with self._lock:
+            self._entries[key] = template
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def discard(self, sub_query: SubQuery, revision: Hashable = None) -> None:
+        key = template_key(sub_query, revision)
+        if key is None:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def evict_schema_versions(self, datasource_id: str, schema_versions: Iterable[str]) -> int:
+        """Drops templates built against the given schema versions of a datasource.
+
+        Returns:
+            int: Number of evicted templates.
+        """
+        versions = set(schema_versions)
+        if not versions:
+            return 0
+        with self._lock:
+            stale = [k for k in self._entries if k[0] == datasource_id and k[1] in versions]
+            for k in stale:
+                del self._entries[k]
+        if stale:
+            logger.info(f"Evicted {len(stale)} plan template(s) for {datasource_id} schema versions {sorted(versions)}.")
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
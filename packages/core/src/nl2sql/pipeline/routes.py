@@ -5,14 +5,17 @@ from typing import Dict
 from langgraph.graph import END
 from langgraph.types import Send
 
+from nl2sql.common.cancellation import is_cancelled
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
 from nl2sql.context import NL2SQLContext
 from nl2sql.pipeline.graph_utils import (
     StateAccessor,
     build_scan_payload,
+    failed_scan_ids,
     next_scan_layer_ids,
     resolve_subgraph,
 )
+from nl2sql.pipeline.nodes.single_source import SINGLE_SOURCE_GROUP_ID
 from nl2sql.pipeline.state import GraphState
 from nl2sql.pipeline.subgraphs import SubgraphSpec
 from nl2sql.common.logger import get_logger
@@ -23,18 +26,60 @@ logger = get_logger("router")
 def resolver_route(state: GraphState) -> str:
     accessor = StateAccessor(state)
     resolver_response = accessor.get("datasource_resolver_response")
-    if not resolver_response:
+    if not resolver_response or is_cancelled(accessor.get("cancel_token")):
         return "end"
     if not resolver_response.resolved_datasources or not resolver_response.allowed_datasource_ids:
         return "end"
     return "continue"
 
 
+def is_single_source_run(state: GraphState) -> bool:
+    """Whether the decomposition was built by the single-datasource fast path."""
+    decomposer_response = state.decomposer_response
+    return (
+        state.global_planner_response is None
+        and decomposer_response is not None
+        and any(g.group_id == SINGLE_SOURCE_GROUP_ID for g in decomposer_response.combine_groups)
+    )
+
+
+def build_single_source_router(
+    ctx: NL2SQLContext,
+    subgraph_specs: Dict[str, SubgraphSpec],
+):
+    """Routes fast-path questions to their SQL agent and the rest to the decomposer."""
+
+    def route_single_source(state: GraphState):
+        if is_cancelled(state.cancel_token):
+            return END
+        decomposer_response = state.decomposer_response
+        if not decomposer_response or len(decomposer_response.sub_queries) != 1:
+            return "decomposer"
+        sub_query = decomposer_response.sub_queries[0]
+        target = resolve_subgraph(sub_query.datasource_id, ctx, subgraph_specs)
+        if not target:
+            # The full pipeline reports the missing subgraph.
+            return "decomposer"
+        payload = build_scan_payload(state, target, sub_query.id, sub_query, return_rows=True)
+        return [Send(target, payload)]
+
+    return route_single_source
+
+
 def build_scan_layer_router(
     ctx: NL2SQLContext,
     subgraph_specs: Dict[str, SubgraphSpec],
 ):
     def route_scan_layers(state: GraphState):
+        if is_cancelled(state.cancel_token):
+            return END
+        if is_single_source_run(state):
+            # Single-datasource fast path: the branch already ran. The synthesizer
+            # answers from its rows or reports the failure, as on the full path.
+            if state.aggregator_response is None and state.artifact_refs:
+                # Too many rows to return inline; the aggregator reads the artifact.
+                return "aggregator"
+            return "answer_synthesizer"
         global_planner_response = state.global_planner_response
         dag = global_planner_response.execution_dag if global_planner_response else None
         decomposer_response = state.decomposer_response
@@ -45,8 +90,12 @@ def build_scan_layer_router(
             return END
 
         node_index = {n.node_id: n for n in dag.nodes}
-        target_ids = next_scan_layer_ids(dag, artifact_refs)
+        failed_ids = failed_scan_ids(state.subgraph_outputs or {})
+        target_ids = next_scan_layer_ids(dag, artifact_refs, failed_ids)
         if not target_ids:
+            if failed_ids:
+                # Nothing to aggregate without every scan; the synthesizer reports the errors.
+                return "answer_synthesizer"
             return [
                 Send("aggregator",state)
             ]
@@ -70,7 +119,7 @@ def build_scan_layer_router(
                     severity=ErrorSeverity.ERROR,
                     error_code=ErrorCode.INVALID_STATE,
                 )
-            payload = build_scan_payload(state, target, node_id)
+            payload = build_scan_payload(state, target, node_id, sub_query_map.get(node_id))
             branches.append(Send(target, payload))
 
         return branches
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import inspect
+from typing import Any, Dict, Optional
+
+from langchain_core.runnables import RunnableLambda
+
+from nl2sql.common.cancellation import is_cancelled
+from nl2sql.common.deadline import is_expired, use_deadline
+from nl2sql.common.errors import ErrorCode, ErrorSeverity, PipelineError
+
+_STOP_CODES = (ErrorCode.CANCELLED, ErrorCode.PIPELINE_TIMEOUT)
+
+
+def _stop_update(state: Any, node_name: str) -> Optional[Dict[str, Any]]:
+    """Update to return instead of running a node, or None to run it.
+
+    The first node to observe cancellation or an expired deadline records
+    the error; later nodes are skipped silently.
+    """
+    cancelled = is_cancelled(getattr(state, "cancel_token", None))
+    expired = is_expired(getattr(state, "deadline", None))
+    if not (cancelled or expired):
+        return None
+    if any(e.error_code in _STOP_CODES for e in getattr(state, "errors", None) or []):
+        return {}
+    if cancelled:
+        message, code = "Pipeline cancelled by user.", ErrorCode.CANCELLED
+    else:
+        message, code = "Request deadline exceeded.", ErrorCode.PIPELINE_TIMEOUT
+    return {
+        "errors": [
+            PipelineError(
+                node=node_name,
+                message=message,
+                severity=ErrorSeverity.ERROR,
+                error_code=code,
+            )
+        ]
+    }
+
+
+def as_graph_node(node: Any, name: Optional[str] = None) -> Any:
+    """Registers a node behind the request's cancellation and deadline checks.
+
+    Every call first checks the state's cancel token and deadline and skips
+    the node once either has fired; otherwise the node runs with the state's
+    deadline active (see ``nl2sql.common.deadline``) so its LLM, vector and
+    database calls are bounded by the remaining budget. Nodes exposing an
+    ``acall`` coroutine get it used under ``graph.ainvoke`` while
+    ``graph.invoke`` keeps calling ``__call__``.
+    """
+    node_name = name or getattr(node, "node_name", None) or getattr(node, "__name__", None) or "node"
+    acall = getattr(node, "acall", None)
+
+    def _call(state: Any) -> Dict[str, Any]:
+        stop = _stop_update(state, node_name)
+        if stop is not None:
+            return stop
+        with use_deadline(getattr(state, "deadline", None)):
+            return node(state)
+
+    if not inspect.iscoroutinefunction(acall):
+        return RunnableLambda(_call, name=node_name)
+
+    async def _acall(state: Any) -> Dict[str, Any]:
+        stop = _stop_update(state, node_name)
+        if stop is not None:
+            return stop
+        with use_deadline(getattr(state, "deadline", None)):
+            return await acall(state)
+
+    return RunnableLambda(_call, afunc=_acall, name=node_name)
@@ -1,20 +1,39 @@
 from __future__ import annotations
 
+import asyncio
 import concurrent.futures
+import contextlib
+import queue
 import signal
 import sys
 import threading
 import time
 import traceback
-from typing import Callable, Dict, List, Optional
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from langgraph.types import Command
 
 from nl2sql.auth import UserContext
-from nl2sql.common.cancellation import cancel, is_cancelled, reset
+from nl2sql.common.cancellation import CancellationToken, async_wait, cancel, register, unregister
+from nl2sql.common.deadline import deadline_after
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
+from nl2sql.common.logger import get_logger
 from nl2sql.common.settings import settings
 from nl2sql.context import NL2SQLContext
-from nl2sql.pipeline.graph import build_graph
+from nl2sql.pipeline.admission import AdmissionRejected, Priority
+from nl2sql.pipeline.answer_cache import build_answer_key
+from nl2sql.pipeline.checkpointing import (
+    ResumePoint,
+    ResumeUnavailable,
+    find_resume_point,
+    thread_config,
+)
+from nl2sql.pipeline.graph import get_compiled_graph
+from nl2sql.pipeline.single_flight import build_flight_key
 from nl2sql.pipeline.state import GraphState
+from nl2sql.pipeline.streaming import STREAM_MODES, PipelineEvent, PipelineEventTranslator
+
+logger = get_logger("runtime")
 
 _keyboard_listener_started = False
 
@@ -48,6 +67,15 @@ def _start_keyboard_cancel_listener() -> None:
 
 
 def _install_signal_handlers() -> Callable[[], None]:
+    """Routes SIGINT/SIGTERM to process-wide cancellation.
+
+    Signal handlers can only be installed from the main thread; when the
+    pipeline is driven from worker threads (e.g. inside an API server) this is
+    a no-op and cancellation relies on request tokens instead.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return lambda: None
+
     previous = {}
 
     def _handler(signum, frame):
@@ -66,89 +94,720 @@ def _install_signal_handlers() -> Callable[[], None]:
     return _restore
 
 
-def run_with_graph(
+def _cancelled_result() -> Dict:
+    return {
+        "errors": [
+            PipelineError(
+                node="orchestrator",
+                message="Pipeline cancelled by user.",
+                severity=ErrorSeverity.ERROR,
+                error_code=ErrorCode.CANCELLED,
+            )
+        ]
+    }
+
+
+def _timeout_result(timeout_sec: float) -> Dict:
+    error_msg = f"Pipeline execution timed out after {timeout_sec} seconds."
+    return {
+        "errors": [
+            PipelineError(
+                node="orchestrator",
+                message=error_msg,
+                severity=ErrorSeverity.ERROR,
+                error_code=ErrorCode.PIPELINE_TIMEOUT,
+            )
+        ],
+        "final_answer": "I apologize, but the request timed out. Please try again with a simpler query.",
+    }
+
+
+def _crash_result(e: Exception) -> Dict:
+    # Fallback for other runtime crashes
+    return {
+        "errors": [
+            PipelineError(
+                node="orchestrator",
+                message=f"Pipeline crashed: {str(e)}",
+                severity=ErrorSeverity.ERROR,
+                error_code=ErrorCode.UNKNOWN_ERROR,
+                stack_trace=traceback.format_exc(),
+            )
+        ]
+    }
+
+
+def _admission_slot(ctx: NL2SQLContext, user_context: UserContext, priority: Priority):
+    """Admission slot for a request; a no-op when the context has no controller."""
+    controller = getattr(ctx, "admission", None)
+    if controller is None:
+        return contextlib.nullcontext()
+    tenant_id = user_context.tenant_id or getattr(ctx, "tenant_id", None)
+    return controller.slot(tenant_id, priority)
+
+
+@contextlib.asynccontextmanager
+async def _aadmission_slot(ctx: NL2SQLContext, user_context: UserContext, priority: Priority):
+    controller = getattr(ctx, "admission", None)
+    if controller is None:
+        yield
+        return
+    tenant_id = user_context.tenant_id or getattr(ctx, "tenant_id", None)
+    async with controller.aslot(tenant_id, priority):
+        yield
+
+
+def _graph_config(graph, trace_id: str, callbacks: Optional[List]) -> Dict:
+    config = {"callbacks": callbacks}
+    if getattr(graph, "checkpointer", None) is not None:
+        config.update(thread_config(trace_id))
+    return config
+
+
+def _invoke_graph(
+    ctx: NL2SQLContext,
+    graph,
+    make_input: Callable[[Optional[float]], object],
+    config: Dict,
+    user_context: UserContext,
+    cancel_token: CancellationToken,
+    priority: Priority,
+) -> Dict:
+    """Runs one graph invocation on the context's shared worker pool.
+
+    ``make_input`` receives the request deadline, which starts once the
+    request is admitted, and returns the graph input. ``cancel_token`` is
+    cancelled on timeout so the worker stops at its next checkpoint.
+    """
+    register(cancel_token)
+    restore_signals = _install_signal_handlers()
+    _start_keyboard_cancel_listener()
+
+    timeout_sec = settings.global_timeout_sec
+
+    try:
+        with _admission_slot(ctx, user_context, priority):
+            # The deadline starts once admitted; queue time has its own bound.
+            graph_input = make_input(deadline_after(timeout_sec))
+            future = ctx.worker_pool.submit(graph.invoke, graph_input, config=config)
+            start_time = time.monotonic()
+            while True:
+                if cancel_token.is_cancelled():
+                    future.cancel()
+                    return _cancelled_result()
+                elapsed = time.monotonic() - start_time
+                if elapsed >= timeout_sec:
+                    # A graph still queued on the shared pool must not start after we gave up.
+                    future.cancel()
+                    raise concurrent.futures.TimeoutError()
+
+                done, _ = concurrent.futures.wait([future], timeout=min(0.25, timeout_sec - elapsed))
+                if done:
+                    return future.result()
+    except concurrent.futures.TimeoutError:
+        cancel_token.cancel()
+        return _timeout_result(timeout_sec)
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        return _crash_result(e)
+    finally:
+        unregister(cancel_token)
+        restore_signals()
+
+
+async def _ainvoke_graph(
+    ctx: NL2SQLContext,
+    graph,
+    make_input: Callable[[Optional[float]], object],
+    config: Dict,
+    user_context: UserContext,
+    cancel_token: CancellationToken,
+    priority: Priority,
+) -> Dict:
+    """Async counterpart of ``_invoke_graph`` built on ``graph.ainvoke``.
+
+    Cancelling the awaiting task also cancels the token so in-flight nodes
+    stop at their next checkpoint.
+    """
+    register(cancel_token)
+
+    timeout_sec = settings.global_timeout_sec
+
+    run_task = cancel_task = None
+    try:
+        async with _aadmission_slot(ctx, user_context, priority):
+            graph_input = make_input(deadline_after(timeout_sec))
+            run_task = asyncio.ensure_future(graph.ainvoke(graph_input, config=config))
+            cancel_task = asyncio.ensure_future(async_wait(cancel_token, timeout=timeout_sec))
+            await asyncio.wait({run_task, cancel_task}, return_when=asyncio.FIRST_COMPLETED)
+            if run_task.done():
+                return run_task.result()
+
+            run_task.cancel()
+            if cancel_task.result():
+                return _cancelled_result()
+            cancel_token.cancel()
+            return _timeout_result(timeout_sec)
+    except asyncio.CancelledError:
+        cancel_token.cancel()
+        if run_task is not None:
+            run_task.cancel()
+        raise
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        return _crash_result(e)
+    finally:
+        if cancel_task is not None:
+            cancel_task.cancel()
+        unregister(cancel_token)
+
+
+def _initial_input(initial_state: GraphState) -> Callable[[Optional[float]], Dict]:
+    def _make(deadline: Optional[float]) -> Dict:
+        initial_state.deadline = deadline
+        return initial_state.model_dump()
+
+    return _make
+
+
+def _resume_input(point: ResumePoint, cancel_token: CancellationToken) -> Callable[[Optional[float]], Command]:
+    def _make(deadline: Optional[float]) -> Command:
+        return Command(update={**point.carried, "cancel_token": cancel_token, "deadline": deadline})
+
+    return _make
+
+
+def _run_with_graph(
     ctx: NL2SQLContext,
     user_query: str,
     datasource_id: Optional[str] = None,
     execute: bool = True,
     callbacks: Optional[List] = None,
     user_context: UserContext = None,
+    cancel_token: Optional[CancellationToken] = None,
+    priority: Priority = Priority.INTERACTIVE,
 ) -> Dict:
-    """Convenience function to run the full pipeline."""
-    reset()
-    restore_signals = _install_signal_handlers()
-    _start_keyboard_cancel_listener()
+    """Runs the full pipeline once, without request coalescing.
 
-    graph = build_graph(
+    The graph runs on the context's shared worker pool. ``cancel_token`` scopes
+    cancellation to this request; one is created when not supplied, and it is
+    cancelled on timeout so the worker stops at its next checkpoint.
+    """
+    cancel_token = cancel_token or CancellationToken()
+    graph = get_compiled_graph(
         ctx,
         execute=execute,
     )
 
     initial_state = GraphState(
         user_query=user_query,
-        user_context=user_context,
+        user_context=user_context or UserContext(),
         datasource_id=datasource_id,
+        cancel_token=cancel_token,
+    )
+    return _invoke_graph(
+        ctx,
+        graph,
+        _initial_input(initial_state),
+        _graph_config(graph, initial_state.trace_id, callbacks),
+        initial_state.user_context,
+        cancel_token,
+        priority,
     )
 
-    timeout_sec = settings.global_timeout_sec
 
-    def _invoke():
-        return graph.invoke(
-            initial_state.model_dump(),
-            config={"callbacks": callbacks},
-        )
+async def _arun_with_graph(
+    ctx: NL2SQLContext,
+    user_query: str,
+    datasource_id: Optional[str] = None,
+    execute: bool = True,
+    callbacks: Optional[List] = None,
+    user_context: UserContext = None,
+    cancel_token: Optional[CancellationToken] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Dict:
+    """Async counterpart of ``_run_with_graph``.
 
+    Runs ``graph.ainvoke`` on the caller's event loop, so LLM, vector and
+    database waits do not hold a worker thread. Timeout and ``cancel_token``
+    behave as in the sync path.
+    """
+    cancel_token = cancel_token or CancellationToken()
+    graph = get_compiled_graph(
+        ctx,
+        execute=execute,
+    )
+
+    initial_state = GraphState(
+        user_query=user_query,
+        user_context=user_context or UserContext(),
+        datasource_id=datasource_id,
+        cancel_token=cancel_token,
+    )
+    return await _ainvoke_graph(
+        ctx,
+        graph,
+        _initial_input(initial_state),
+        _graph_config(graph, initial_state.trace_id, callbacks),
+        initial_state.user_context,
+        cancel_token,
+        priority,
+    )
+
+
+def _flight_key(
+    ctx: NL2SQLContext,
+    user_query: str,
+    datasource_id: Optional[str],
+    execute: bool,
+    callbacks: Optional[List],
+    user_context: UserContext,
+) -> Optional[tuple]:
+    """Returns the single-flight key, or None when the request must run alone.
+
+    Requests with callbacks are never coalesced since followers would not see
+    their callbacks fire.
+    """
+    if not settings.single_flight_enabled or callbacks:
+        return None
+    if getattr(ctx, "single_flight", None) is None:
+        return None
     try:
-        # Use configured thread pool size for pipeline execution
-        with concurrent.futures.ThreadPoolExecutor(max_workers=settings.sandbox_exec_workers) as executor:
-            future = executor.submit(_invoke)
-            start_time = time.monotonic()
-            while True:
-                if is_cancelled():
-                    future.cancel()
-                    return {
-                        "errors": [
-                            PipelineError(
-                                node="orchestrator",
-                                message="Pipeline cancelled by user.",
-                                severity=ErrorSeverity.ERROR,
-                                error_code=ErrorCode.CANCELLED,
-                            )
-                        ]
-                    }
-                elapsed = time.monotonic() - start_time
-                if elapsed >= timeout_sec:
-                    raise concurrent.futures.TimeoutError()
+        return build_flight_key(ctx, user_query, datasource_id, user_context, execute)
+    except Exception as e:
+        logger.warning(f"Could not build single-flight key; running uncoalesced: {e}")
+        return None
 
-                try:
-                    return future.result(timeout=0.25)
-                except concurrent.futures.TimeoutError:
-                    continue
-    except concurrent.futures.TimeoutError:
-        error_msg = f"Pipeline execution timed out after {timeout_sec} seconds."
-        return {
-            "errors": [
-                PipelineError(
-                    node="orchestrator",
-                    message=error_msg,
-                    severity=ErrorSeverity.ERROR,
-                    error_code=ErrorCode.PIPELINE_TIMEOUT,
-                )
-            ],
-            "final_answer": "I apologize, but the request timed out. Please try again with a simpler query.",
-        }
+
+def _answer_key(
+    ctx: NL2SQLContext,
+    user_query: str,
+    datasource_id: Optional[str],
+    execute: bool,
+    callbacks: Optional[List],
+    user_context: UserContext,
+) -> Optional[tuple]:
+    """Returns the answer cache key, or None when the cache must be bypassed.
+
+    Requests with callbacks bypass the cache since a hit runs no nodes.
+    """
+    if callbacks or getattr(ctx, "answer_cache", None) is None:
+        return None
+    return build_answer_key(user_query, datasource_id, user_context, execute)
+
+
+def _cached_answer(
+    ctx: NL2SQLContext,
+    key: Optional[tuple],
+    user_query: str,
+    datasource_id: Optional[str],
+    user_context: UserContext,
+) -> Optional[Dict]:
+    if key is None:
+        return None
+    try:
+        cached = ctx.answer_cache.get(ctx, key)
     except Exception as e:
-        # Fallback for other runtime crashes
-        return {
-            "errors": [
-                PipelineError(
-                    node="orchestrator",
-                    message=f"Pipeline crashed: {str(e)}",
-                    severity=ErrorSeverity.ERROR,
-                    error_code=ErrorCode.UNKNOWN_ERROR,
-                    stack_trace=traceback.format_exc(),
-                )
-            ]
-        }
+        logger.warning(f"Answer cache lookup failed; running the pipeline: {e}")
+        return None
+    if cached is None:
+        return None
+    return {**cached, "user_query": user_query, "datasource_id": datasource_id, "user_context": user_context}
+
+
+def _remember_answer(ctx: NL2SQLContext, key: Optional[tuple], result: Dict) -> Dict:
+    if key is not None:
+        try:
+            ctx.answer_cache.put(ctx, key, result)
+        except Exception as e:
+            logger.warning(f"Could not cache answer: {e}")
+    return result
+
+
+def run_with_graph(
+    ctx: NL2SQLContext,
+    user_query: str,
+    datasource_id: Optional[str] = None,
+    execute: bool = True,
+    callbacks: Optional[List] = None,
+    user_context: UserContext = None,
+    cancel_token: Optional[CancellationToken] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Dict:
+    """Convenience function to run the full pipeline.
+
+    Concurrent identical requests (same normalized query, datasource override,
+    tenant, roles and active schema versions) attach to one execution through
+    ``ctx.single_flight`` and share its final state. ``cancel_token`` scopes
+    cancellation to this caller; a shared execution stops only once every
+    attached caller has cancelled.
+
+    Executions pass through ``ctx.admission`` first; ``priority`` selects the
+    admission class. When ``ctx.answer_cache`` is enabled, a cached answer for
+    the same question, tenant and roles on unchanged schema versions is
+    returned without admission or execution.
+
+    Raises:
+        AdmissionRejected: If admission control sheds the request.
+    """
+    user_context = user_context or UserContext()
+    answer_key = _answer_key(ctx, user_query, datasource_id, execute, callbacks, user_context)
+    cached = _cached_answer(ctx, answer_key, user_query, datasource_id, user_context)
+    if cached is not None:
+        return cached
+
+    key = _flight_key(ctx, user_query, datasource_id, execute, callbacks, user_context)
+    if key is None:
+        result = _run_with_graph(
+            ctx, user_query, datasource_id, execute, callbacks, user_context, cancel_token, priority
+        )
+    else:
+        result = ctx.single_flight.run(
+            key,
+            lambda token: _run_with_graph(
+                ctx, user_query, datasource_id, execute, callbacks, user_context, token, priority
+            ),
+            cancel_token or CancellationToken(),
+            _cancelled_result,
+        )
+    return _remember_answer(ctx, answer_key, result)
+
+
+async def arun_with_graph(
+    ctx: NL2SQLContext,
+    user_query: str,
+    datasource_id: Optional[str] = None,
+    execute: bool = True,
+    callbacks: Optional[List] = None,
+    user_context: UserContext = None,
+    cancel_token: Optional[CancellationToken] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Dict:
+    """Async counterpart of ``run_with_graph``.
+
+    Runs ``graph.ainvoke`` on the caller's event loop, so LLM, vector and
+    database waits do not hold a worker thread. Identical in-flight requests
+    are coalesced and cached answers served as in the sync path, across sync
+    and async callers.
+    """
+    user_context = user_context or UserContext()
+    answer_key = _answer_key(ctx, user_query, datasource_id, execute, callbacks, user_context)
+    cached = _cached_answer(ctx, answer_key, user_query, datasource_id, user_context)
+    if cached is not None:
+        return cached
+
+    key = _flight_key(ctx, user_query, datasource_id, execute, callbacks, user_context)
+    if key is None:
+        result = await _arun_with_graph(
+            ctx, user_query, datasource_id, execute, callbacks, user_context, cancel_token, priority
+        )
+    else:
+        result = await ctx.single_flight.arun(
+            key,
+            lambda token: _arun_with_graph(
+                ctx, user_query, datasource_id, execute, callbacks, user_context, token, priority
+            ),
+            cancel_token or CancellationToken(),
+            _cancelled_result,
+        )
+    return _remember_answer(ctx, answer_key, result)
+
+
+def _check_resume_owner(point: ResumePoint, user_context: Optional[UserContext], trace_id: str) -> None:
+    if user_context is None:
+        return
+    owner = point.user_context
+    if (owner.user_id, owner.tenant_id) != (user_context.user_id, user_context.tenant_id):
+        raise ResumeUnavailable(f"Trace '{trace_id}' belongs to a different user.")
+
+
+def resume_with_graph(
+    ctx: NL2SQLContext,
+    trace_id: str,
+    execute: bool = True,
+    callbacks: Optional[List] = None,
+    user_context: Optional[UserContext] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Dict:
+    """Resumes a failed trace from its last successful checkpoint.
+
+    Requires checkpointing (``CHECKPOINT_ENABLED``). Nodes that completed
+    before the failure are not run again, and scans that succeeded in the
+    failed layer keep their artifacts, so only the failed work repeats. The
+    resumed run gets a fresh deadline and cancel token, runs as the user the
+    trace was started for, and keeps ``trace_id``. Concurrent resumes of the
+    same trace share one execution.
+
+    Args:
+        user_context: When given, must match the trace's user and tenant.
+
+    Raises:
+        ResumeUnavailable: If the trace cannot be resumed.
+        AdmissionRejected: If admission control sheds the request.
+    """
+    graph = get_compiled_graph(ctx, execute=execute)
+    point = find_resume_point(graph, trace_id)
+    _check_resume_owner(point, user_context, trace_id)
+    logger.info(f"Resuming trace {trace_id} at {', '.join(point.next_nodes)}")
+
+    def _resume(token: CancellationToken) -> Dict:
+        return _invoke_graph(
+            ctx,
+            graph,
+            _resume_input(point, token),
+            {**point.config, "callbacks": callbacks},
+            point.user_context,
+            token,
+            priority,
+        )
+
+    if callbacks or not settings.single_flight_enabled or getattr(ctx, "single_flight", None) is None:
+        return _resume(cancel_token or CancellationToken())
+    return ctx.single_flight.run(
+        ("resume", trace_id), _resume, cancel_token or CancellationToken(), _cancelled_result
+    )
+
+
+async def aresume_with_graph(
+    ctx: NL2SQLContext,
+    trace_id: str,
+    execute: bool = True,
+    callbacks: Optional[List] = None,
+    user_context: Optional[UserContext] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Dict:
+    """Async counterpart of ``resume_with_graph``."""
+    graph = get_compiled_graph(ctx, execute=execute)
+    point = await asyncio.to_thread(find_resume_point, graph, trace_id)
+    _check_resume_owner(point, user_context, trace_id)
+    logger.info(f"Resuming trace {trace_id} at {', '.join(point.next_nodes)}")
+
+    def _resume(token: CancellationToken):
+        return _ainvoke_graph(
+            ctx,
+            graph,
+            _resume_input(point, token),
+            {**point.config, "callbacks": callbacks},
+            point.user_context,
+            token,
+            priority,
+        )
+
+    if callbacks or not settings.single_flight_enabled or getattr(ctx, "single_flight", None) is None:
+        return await _resume(cancel_token or CancellationToken())
+    return await ctx.single_flight.arun(
+        ("resume", trace_id), _resume, cancel_token or CancellationToken(), _cancelled_result
+    )
+
+
+def _stream_with_graph(
+    ctx: NL2SQLContext,
+    user_query: str,
+    datasource_id: Optional[str] = None,
+    execute: bool = True,
+    callbacks: Optional[List] = None,
+    user_context: UserContext = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> Iterator[PipelineEvent]:
+    """Streams one pipeline execution, without admission control.
+
+    The graph streams on the context's shared worker pool; events are handed
+    to the caller through a queue so timeout and cancellation are enforced
+    between events. Closing the iterator early cancels the request token.
+    The last event is ``result`` on success or ``error`` otherwise.
+    """
+    cancel_token = cancel_token or CancellationToken()
+    register(cancel_token)
+
+    graph = get_compiled_graph(
+        ctx,
+        execute=execute,
+    )
+
+    initial_state = GraphState(
+        user_query=user_query,
+        user_context=user_context or UserContext(),
+        datasource_id=datasource_id,
+        cancel_token=cancel_token,
+        deadline=deadline_after(settings.global_timeout_sec),
+    )
+    translator = PipelineEventTranslator(initial_state.trace_id)
+    chunks: "queue.Queue" = queue.Queue()
+    done = object()
+    timeout_sec = settings.global_timeout_sec
+    finished = False
+
+    def _produce():
+        try:
+            for mode, chunk in graph.stream(
+                initial_state.model_dump(),
+                config=_graph_config(graph, initial_state.trace_id, callbacks),
+                stream_mode=STREAM_MODES,
+            ):
+                if cancel_token.is_cancelled():
+                    return
+                chunks.put((mode, chunk))
+        except Exception as e:
+            chunks.put(("error", _crash_result(e)))
+        finally:
+            chunks.put(done)
+
+    producer = None
+    try:
+        producer = ctx.worker_pool.submit(_produce)
+        deadline = time.monotonic() + timeout_sec
+        while True:
+            if cancel_token.is_cancelled():
+                yield translator.error_event(_cancelled_result())
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                cancel_token.cancel()
+                yield translator.error_event(_timeout_result(timeout_sec))
+                return
+            try:
+                item = chunks.get(timeout=min(0.25, remaining))
+            except queue.Empty:
+                continue
+            if item is done:
+                finished = True
+                yield translator.result_event()
+                return
+            mode, chunk = item
+            if mode == "error":
+                finished = True
+                yield translator.error_event(chunk)
+                return
+            yield from translator.translate(mode, chunk)
     finally:
-        restore_signals()
+        if not finished:
+            cancel_token.cancel()
+            if producer is not None:
+                producer.cancel()
+        unregister(cancel_token)
+
+
+async def _astream_with_graph(
+    ctx: NL2SQLContext,
+    user_query: str,
+    datasource_id: Optional[str] = None,
+    execute: bool = True,
+    callbacks: Optional[List] = None,
+    user_context: UserContext = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> AsyncIterator[PipelineEvent]:
+    """Async counterpart of ``_stream_with_graph`` built on ``graph.astream``."""
+    cancel_token = cancel_token or CancellationToken()
+    register(cancel_token)
+
+    graph = get_compiled_graph(
+        ctx,
+        execute=execute,
+    )
+
+    initial_state = GraphState(
+        user_query=user_query,
+        user_context=user_context or UserContext(),
+        datasource_id=datasource_id,
+        cancel_token=cancel_token,
+        deadline=deadline_after(settings.global_timeout_sec),
+    )
+    translator = PipelineEventTranslator(initial_state.trace_id)
+    timeout_sec = settings.global_timeout_sec
+    finished = False
+
+    stream = graph.astream(
+        initial_state.model_dump(),
+        config=_graph_config(graph, initial_state.trace_id, callbacks),
+        stream_mode=STREAM_MODES,
+    ).__aiter__()
+    next_chunk = None
+    try:
+        deadline = time.monotonic() + timeout_sec
+        while True:
+            if cancel_token.is_cancelled():
+                yield translator.error_event(_cancelled_result())
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                cancel_token.cancel()
+                yield translator.error_event(_timeout_result(timeout_sec))
+                return
+            if next_chunk is None:
+                next_chunk = asyncio.ensure_future(stream.__anext__())
+            await asyncio.wait({next_chunk}, timeout=min(0.25, remaining))
+            if not next_chunk.done():
+                continue
+            ready, next_chunk = next_chunk, None
+            try:
+                mode, chunk = ready.result()
+            except StopAsyncIteration:
+                finished = True
+                yield translator.result_event()
+                return
+            except Exception as e:
+                finished = True
+                yield translator.error_event(_crash_result(e))
+                return
+            for event in translator.translate(mode, chunk):
+                yield event
+    finally:
+        if not finished:
+            cancel_token.cancel()
+        if next_chunk is not None:
+            next_chunk.cancel()
+        unregister(cancel_token)
+
+
+def stream_with_graph(
+    ctx: NL2SQLContext,
+    user_query: str,
+    datasource_id: Optional[str] = None,
+    execute: bool = True,
+    callbacks: Optional[List] = None,
+    user_context: UserContext = None,
+    cancel_token: Optional[CancellationToken] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Iterator[PipelineEvent]:
+    """Runs the pipeline and yields progress events as they happen.
+
+    The stream holds an admission slot from its first event until it ends;
+    ``AdmissionRejected`` is raised before any event if the request is shed.
+    See ``_stream_with_graph`` for timeout and cancellation behaviour.
+    """
+    user_context = user_context or UserContext()
+    with _admission_slot(ctx, user_context, priority):
+        yield from _stream_with_graph(
+            ctx, user_query, datasource_id, execute, callbacks, user_context, cancel_token
+        )
+
+
+async def astream_with_graph(
+    ctx: NL2SQLContext,
+    user_query: str,
+    datasource_id: Optional[str] = None,
+    execute: bool = True,
+    callbacks: Optional[List] = None,
+    user_context: UserContext = None,
+    cancel_token: Optional[CancellationToken] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> AsyncIterator[PipelineEvent]:
+    """Async counterpart of ``stream_with_graph`` built on ``graph.astream``.
+
+    Suitable for SSE/NDJSON responses: if the consumer stops iterating (e.g.
+    the client disconnects) the request token is cancelled.
+    """
+    user_context = user_context or UserContext()
+    async with _aadmission_slot(ctx, user_context, priority):
+        events = _astream_with_graph(
+            ctx, user_query, datasource_id, execute, callbacks, user_context, cancel_token
+        )
+        try:
+            async for event in events:
+                yield event
+        finally:
+            await events.aclose()
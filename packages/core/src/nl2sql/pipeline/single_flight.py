@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from nl2sql.common.cancellation import CancellationToken
+from nl2sql.common.logger import get_logger
+from nl2sql.common.metrics import single_flight_counter
+
+logger = get_logger("single_flight")
+
+_POLL_INTERVAL_SEC = 0.25
+
+
+class _FlightToken(CancellationToken):
+    """Cancellation token of a shared execution.
+
+    Cancelled explicitly (timeout, process-wide cancel) or once every attached
+    caller has cancelled its own token, so one caller giving up does not stop
+    the execution the others are waiting for.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._waiters: List[CancellationToken] = []
+        self._waiters_lock = threading.Lock()
+
+    def attach(self, token: CancellationToken) -> None:
+        with self._waiters_lock:
+            self._waiters.append(token)
+
+    def is_cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        with self._waiters_lock:
+            waiters = list(self._waiters)
+        return bool(waiters) and all(t.is_cancelled() for t in waiters)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_cancelled():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            self._event.wait(_POLL_INTERVAL_SEC if remaining is None else min(_POLL_INTERVAL_SEC, remaining))
+        return True
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.token = _FlightToken()
+        self.followers = 0
+        self.task: Optional["asyncio.Future"] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent executions that share a key.
+
+    The first caller for a key (the leader) runs the work; callers arriving
+    while it is in flight attach to it and receive the same final state.
+    Works across sync and async callers: flights are tracked with
+    ``concurrent.futures.Future`` objects.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable, cancel_token: CancellationToken) -> Tuple[_Flight, bool]:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+            else:
+                flight.followers += 1
+            flight.token.attach(cancel_token)
+        return flight, leader
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if flight.followers:
+            single_flight_counter.add(flight.followers)
+            logger.info(f"Shared one execution with {flight.followers} coalesced request(s).")
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def run(
+        self,
+        key: Hashable,
+        fn: Callable[[CancellationToken], Dict[str, Any]],
+        cancel_token: CancellationToken,
+        on_cancel: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Runs ``fn`` for ``key`` or waits for the in-flight execution.
+
+        Args:
+            key: Coalescing key.
+            fn: Work to run; receives the shared execution's token.
+            cancel_token: The caller's own token.
+            on_cancel: Result to return if the caller cancels while waiting.
+
+        Returns:
+            Dict[str, Any]: A shallow copy of the shared final state.
+        """
+        flight, leader = self._join(key, cancel_token)
+        if leader:
+            try:
+                flight.future.set_result(fn(flight.token))
+            except BaseException as exc:
+                flight.future.set_exception(exc)
+            finally:
+                self._finish(key, flight)
+
+        while True:
+            done, _ = concurrent.futures.wait([flight.future], timeout=_POLL_INTERVAL_SEC)
+            if done:
+                return dict(flight.future.result())
+            if cancel_token.is_cancelled():
+                return on_cancel()
+
+    async def arun(
+        self,
+        key: Hashable,
+        fn: Callable[[CancellationToken], Awaitable[Dict[str, Any]]],
+        cancel_token: CancellationToken,
+        on_cancel: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Async counterpart of ``run``.
+
+        The leader starts the work as a separate task and then waits like any
+        follower, so cancelling the leader's own await (e.g. a disconnected
+        client) does not abort the execution other callers share.
+        """
+        flight, leader = self._join(key, cancel_token)
+        if leader:
+            flight.task = asyncio.ensure_future(fn(flight.token))
+
+            def _settle(task: "asyncio.Future") -> None:
+                try:
+                    flight.future.set_result(task.result())
+                except BaseException as exc:
+                    flight.future.set_exception(exc)
+                finally:
+                    self._finish(key, flight)
+
+            flight.task.add_done_callback(_settle)
+
+        waiter = asyncio.wrap_future(flight.future)
+        while True:
+            done, _ = await asyncio.wait({waiter}, timeout=_POLL_INTERVAL_SEC)
+            if done:
+                return dict(waiter.result())
+            if cancel_token.is_cancelled():
+                return on_cancel()
+
+
+def normalize_query(user_query: str) -> str:
+    """Collapses whitespace and case so trivially different texts share a key."""
+    return " ".join(user_query.split()).casefold()
+
+
+def build_flight_key(
+    ctx: Any,
+    user_query: str,
+    datasource_id: Optional[str],
+    user_context: Any,
+    execute: bool,
+) -> Tuple[Hashable, ...]:
+    """Builds the coalescing key for a request.
+
+    Combines normalized query text, the datasource override, tenant and role
+    set, and the active schema versions of every datasource the request can
+    resolve to, so a schema refresh never shares results across versions.
+    """
+    normalized_query = normalize_query(user_query)
+    roles = tuple(sorted(getattr(user_context, "roles", None) or []))
+    tenant_id = getattr(user_context, "tenant_id", None)
+
+    if datasource_id:
+        datasource_ids = [datasource_id]
+    else:
+        datasource_ids = sorted(ctx.ds_registry.list_ids())
+    schema_versions = tuple(
+        (ds_id, ctx.schema_store.get_latest_version(ds_id)) for ds_id in datasource_ids
+    )
+    return (normalized_query, datasource_id, tenant_id, roles, schema_versions, execute)
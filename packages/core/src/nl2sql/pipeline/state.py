@@ -4,8 +4,9 @@ from typing import Any, Dict, List, Optional, Annotated
 import operator
 import uuid
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 
+from nl2sql.common.cancellation import CancellationToken
 from nl2sql.common.errors import PipelineError
 from nl2sql.auth import UserContext
 from nl2sql.pipeline.nodes.datasource_resolver.schemas import DatasourceResolverResponse
@@ -49,6 +50,8 @@ class GraphState(BaseModel):
         warnings (List[Dict[str, Any]]): Warning messages emitted by nodes.
         subgraph_id (Optional[str]): ID of the subgraph execution.
         subgraph_name (Optional[str]): Name of the subgraph execution.
+        cancel_token (Optional[CancellationToken]): Request-scoped cancellation token.
+        deadline (Optional[float]): Request deadline as epoch seconds; None if unbounded.
     """
     model_config = ConfigDict(extra="ignore", arbitrary_types_allowed=True)
 
@@ -68,6 +71,12 @@ class GraphState(BaseModel):
     warnings: Annotated[List[Dict[str, Any]], operator.add] = Field(default_factory=list)
     subgraph_id: Optional[str] = Field(default=None)
     subgraph_name: Optional[str] = Field(default=None)
+    cancel_token: Optional[CancellationToken] = Field(default=None, description="Request-scoped cancellation token.")
+    deadline: Optional[float] = Field(default=None, description="Request deadline as epoch seconds.")
+
+    @field_serializer("cancel_token", when_used="json")
+    def _serialize_cancel_token(self, token: Optional[CancellationToken]) -> None:
+        return None
 
 
 class SubgraphExecutionState(BaseModel):
@@ -79,6 +88,8 @@ class SubgraphExecutionState(BaseModel):
     subgraph_id: Optional[str] = None
     subgraph_name: Optional[str] = None
     relevant_tables: List[Table] = Field(default_factory=list)
+    combine_group_count: int = 0
+    return_rows: bool = False
 
     ast_planner_response: Optional[ASTPlannerResponse] = Field(default=None)
     logical_validator_response: Optional[LogicalValidatorResponse] = Field(default=None)
@@ -91,3 +102,9 @@ class SubgraphExecutionState(BaseModel):
     errors: Annotated[List[PipelineError], operator.add] = Field(default_factory=list)
     reasoning: Annotated[List[Dict[str, Any]], operator.add] = Field(default_factory=list)
     warnings: Annotated[List[Dict[str, Any]], operator.add] = Field(default_factory=list)
+    cancel_token: Optional[CancellationToken] = Field(default=None)
+    deadline: Optional[float] = Field(default=None)
+
+    @field_serializer("cancel_token", when_used="json")
+    def _serialize_cancel_token(self, token: Optional[CancellationToken]) -> None:
+        return None
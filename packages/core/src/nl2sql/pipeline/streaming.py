@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from pydantic_core import to_jsonable_python
+
+STREAM_MODES: List[str] = ["updates", "messages", "values"]
+"""LangGraph stream modes consumed by ``PipelineEventTranslator``."""
+
+TOKEN_NODES: Tuple[str, ...] = ("answer_synthesizer",)
+"""Nodes whose LLM token chunks are forwarded as ``token`` events."""
+
+_INTERNAL_KEYS = {"cancel_token"}
+
+
+class PipelineEvent(BaseModel):
+    """A single progress event emitted while a pipeline request runs.
+
+    Attributes:
+        event (str): One of ``node`` (a node finished and produced a state
+            update), ``token`` (an LLM output fragment), ``result`` (final
+            state) or ``error`` (the request stopped early).
+        trace_id (str): Trace identifier of the request.
+        node (Optional[str]): Originating graph node, when applicable.
+        data (Any): JSON-safe payload.
+    """
+
+    event: str
+    trace_id: str
+    node: Optional[str] = None
+    data: Any = Field(default=None)
+
+    def to_sse(self) -> str:
+        """Formats the event as a Server-Sent Events frame."""
+        return f"event: {self.event}\ndata: {self.model_dump_json()}\n\n"
+
+    def to_ndjson(self) -> str:
+        """Formats the event as one newline-delimited JSON line."""
+        return self.model_dump_json() + "\n"
+
+
+def to_jsonable(value: Any) -> Any:
+    """Converts state fragments (pydantic models, dicts, lists) to JSON-safe data."""
+    if isinstance(value, dict):
+        value = {k: v for k, v in value.items() if k not in _INTERNAL_KEYS}
+    return to_jsonable_python(value, fallback=str)
+
+
+def _message_text(message: Any) -> str:
+    content = getattr(message, "content", "")
+    if isinstance(content, str) and content:
+        return content
+    if isinstance(content, list):
+        text = "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+        if text:
+            return text
+    # Structured-output agents stream their answer as tool-call arguments.
+    chunks = getattr(message, "tool_call_chunks", None) or []
+    return "".join(chunk.get("args") or "" for chunk in chunks)
+
+
+class PipelineEventTranslator:
+    """Turns LangGraph ``stream``/``astream`` chunks into ``PipelineEvent``s.
+
+    Expects chunks produced with ``stream_mode=STREAM_MODES``, i.e.
+    ``(mode, payload)`` tuples. The latest ``values`` payload is retained so a
+    final ``result`` event can be emitted once the graph finishes.
+    """
+
+    def __init__(self, trace_id: str, token_nodes: Iterable[str] = TOKEN_NODES):
+        self.trace_id = trace_id
+        self.token_nodes = set(token_nodes)
+        self.final_state: Optional[Dict[str, Any]] = None
+
+    def translate(self, mode: str, chunk: Any) -> Iterator[PipelineEvent]:
+        if mode == "updates":
+            for node, update in (chunk or {}).items():
+                if node.startswith("__") or not update:
+                    continue
+                yield PipelineEvent(
+                    event="node",
+                    trace_id=self.trace_id,
+                    node=node,
+                    data=to_jsonable(update),
+                )
+        elif mode == "messages":
+            message, metadata = chunk
+            node = (metadata or {}).get("langgraph_node")
+            if node not in self.token_nodes:
+                return
+            text = _message_text(message)
+            if text:
+                yield PipelineEvent(
+                    event="token",
+                    trace_id=self.trace_id,
+                    node=node,
+                    data={"text": text},
+                )
+        elif mode == "values":
+            self.final_state = chunk
+
+    def result_event(self) -> PipelineEvent:
+        state = self.final_state
+        if isinstance(state, BaseModel):
+            state = dict(state)
+        return PipelineEvent(
+            event="result",
+            trace_id=self.trace_id,
+            data=to_jsonable(state or {}),
+        )
+
+    def error_event(self, payload: Dict[str, Any]) -> PipelineEvent:
+        return PipelineEvent(
+            event="error",
+            trace_id=self.trace_id,
+            node="orchestrator",
+            data=to_jsonable(payload),
+        )
@@ -1,12 +1,16 @@
 from typing import Dict
-from langchain_core.runnables import Runnable
+from langchain_core.runnables import Runnable, RunnableLambda
 from langgraph.graph import END, StateGraph
 
-from nl2sql.common.cancellation import is_cancelled, wait as wait_cancel
+from nl2sql.common.cancellation import async_wait as async_wait_cancel, is_cancelled, wait as wait_cancel
+from nl2sql.common.deadline import is_expired, remaining
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
 from nl2sql.common.settings import settings
+from nl2sql.pipeline.plan_cache import plan_cache_key
+from nl2sql.pipeline.runnables import as_graph_node
 from nl2sql.pipeline.state import SubgraphExecutionState
 from nl2sql.pipeline.nodes.ast_planner import ASTPlannerNode
+from nl2sql.pipeline.nodes.ast_planner.schemas import ASTPlannerResponse
 from nl2sql.pipeline.nodes.schema_retriever import SchemaRetrieverNode
 from nl2sql.pipeline.nodes.validator import LogicalValidatorNode, PhysicalValidatorNode
 from nl2sql.pipeline.nodes.refiner import RefinerNode
@@ -31,6 +35,14 @@ def build_sql_agent_graph(
     Feedback Loop:
     (LogicalValidator Error) -> RetryHandler -> Refiner -> Planner
     (PhysicalValidator Error) -> RetryHandler -> Refiner -> Planner
+
+    Plan Cache (when ``ctx.plan_cache`` is set):
+    PlanCacheLookup -(hit)-> Generator -> Executor -> PlanCacheStore
+    PlanCacheLookup -(miss)-> SchemaRetriever -> ... -> Executor -> PlanCacheStore
+
+    Plan Templates (when ``ctx.plan_templates`` is set):
+    SchemaRetriever -> PlanTemplateLookup -(hit)-> LogicalValidator -> ... -> Executor -> PlanTemplateStore
+    SchemaRetriever -> PlanTemplateLookup -(miss)-> Planner -> ... -> Executor -> PlanTemplateStore
     """
     graph = StateGraph(SubgraphExecutionState)
 
@@ -41,6 +53,9 @@ def build_sql_agent_graph(
     refiner = RefinerNode(ctx)
     generator = GeneratorNode(ctx)
     executor = ExecutorNode(ctx)
+    plan_cache = getattr(ctx, "plan_cache", None)
+    plan_templates = getattr(ctx, "plan_templates", None)
+    config_revision = getattr(ctx, "config_revision", None)
 
     def _get_subgraph_id(state: SubgraphExecutionState) -> str:
         if state.subgraph_id:
@@ -51,46 +66,95 @@ def build_sql_agent_graph(
     def _get_retry_count(state: SubgraphExecutionState) -> int:
         return state.retry_count
 
-    def retry_node(state: SubgraphExecutionState) -> Dict:
-        """Increments retry count with exponential backoff and jitter."""
-        count = _get_retry_count(state)
-        if is_cancelled():
-            return {
-                "errors": [
-                    PipelineError(
-                        node="retry_handler",
-                        message="Pipeline cancelled by user.",
-                        severity=ErrorSeverity.ERROR,
-                        error_code=ErrorCode.CANCELLED,
-                    )
-                ]
-            }
-        if count >= settings.sql_agent_max_retries:
-            return {"retry_count": count}
+    def _cancelled_update() -> Dict:
+        return {
+            "errors": [
+                PipelineError(
+                    node="retry_handler",
+                    message="Pipeline cancelled by user.",
+                    severity=ErrorSeverity.ERROR,
+                    error_code=ErrorCode.CANCELLED,
+                )
+            ]
+        }
 
+    def _out_of_budget_update(delay: float, left: float) -> Dict:
+        return {
+            "errors": [
+                PipelineError(
+                    node="retry_handler",
+                    message=(
+                        f"Skipping retry: {left:.1f}s left, but backoff ({delay:.1f}s) plus "
+                        f"the minimum retry budget ({settings.sql_agent_retry_min_budget_sec}s) does not fit."
+                    ),
+                    severity=ErrorSeverity.ERROR,
+                    error_code=ErrorCode.PIPELINE_TIMEOUT,
+                )
+            ]
+        }
+
+    def _retry_delay(count: int) -> float:
         base_delay = min(settings.sql_agent_retry_max_delay_sec, settings.sql_agent_retry_base_delay_sec * (2 ** count))
         jitter = random.uniform(0.0, settings.sql_agent_retry_jitter_sec)
-        sleep_time = base_delay + jitter
-
-        if wait_cancel(timeout=sleep_time):
-            return {
-                "errors": [
-                    PipelineError(
-                        node="retry_handler",
-                        message="Pipeline cancelled by user.",
-                        severity=ErrorSeverity.ERROR,
-                        error_code=ErrorCode.CANCELLED,
-                    )
-                ]
-            }
+        return base_delay + jitter
+
+    def _plan_retry(state: SubgraphExecutionState):
+        """Returns (update, delay): an update that ends retrying, or the backoff to wait."""
+        count = _get_retry_count(state)
+        if is_cancelled(state.cancel_token):
+            return _cancelled_update(), None
+        if count >= settings.sql_agent_max_retries:
+            return {"retry_count": count}, None
+
+        delay = _retry_delay(count)
+        left = remaining(state.deadline)
+        if left is not None and left < delay + settings.sql_agent_retry_min_budget_sec:
+            return _out_of_budget_update(delay, left), None
+        return None, delay
+
+    def retry_node(state: SubgraphExecutionState) -> Dict:
+        """Increments retry count with exponential backoff and jitter.
+
+        Retries that cannot finish within the request deadline are skipped.
+        """
+        update, delay = _plan_retry(state)
+        if update is not None:
+            return update
+
+        if wait_cancel(state.cancel_token, timeout=delay):
+            return _cancelled_update()
 
         return {
-            "retry_count": count + 1,
+            "retry_count": _get_retry_count(state) + 1,
         }
 
+    async def aretry_node(state: SubgraphExecutionState) -> Dict:
+        """Async variant of ``retry_node``; backs off without blocking a thread."""
+        update, delay = _plan_retry(state)
+        if update is not None:
+            return update
+
+        if await async_wait_cancel(state.cancel_token, timeout=delay):
+            return _cancelled_update()
+
+        return {
+            "retry_count": _get_retry_count(state) + 1,
+        }
+
+    def _should_stop(state: SubgraphExecutionState) -> bool:
+        return is_cancelled(state.cancel_token) or is_expired(state.deadline)
+
+    def check_retry(state: SubgraphExecutionState) -> str:
+        """Ends the loop when the retry handler gave up instead of backing off."""
+        if _should_stop(state):
+            return "end"
+        if any(e.node == "retry_handler" for e in state.errors):
+            return "end"
+        return "refine"
+
     def check_planner(state: SubgraphExecutionState) -> str:
         """Routes based on planner result."""
-        if is_cancelled():
+        if _should_stop(state):
             return "end"
         if not (state.ast_planner_response and state.ast_planner_response.plan):
             # If explicit errors exist, check retryability
@@ -105,7 +169,7 @@ def build_sql_agent_graph(
 
     def check_logical_validation(state: SubgraphExecutionState) -> str:
         """Routes based on logical validation result."""
-        if is_cancelled():
+        if _should_stop(state):
             return "end"
         if state.logical_validator_response and state.logical_validator_response.errors:
             # Critical/Fatal errors stop execution immediately
@@ -119,7 +183,7 @@ def build_sql_agent_graph(
 
     def check_physical_validation(state: SubgraphExecutionState) -> str:
         """Routes based on physical validation result."""
-        if is_cancelled():
+        if _should_stop(state):
             return "end"
         if state.physical_validator_response and state.physical_validator_response.errors:
              # Critical/Fatal errors stop execution immediately
@@ -131,18 +195,106 @@ def build_sql_agent_graph(
             return "end"
         return "ok"
 
-    graph.add_node("schema_retriever", schema_retriever)
-    graph.add_node("ast_planner", ast_planner)
-    graph.add_node("logical_validator", logical_validator)
-    graph.add_node("generator", generator)
-    graph.add_node("physical_validator", physical_validator)
-    graph.add_node("executor", executor)
-    graph.add_node("refiner", refiner)
-    graph.add_node("retry_handler", retry_node)
+    def plan_cache_lookup(state: SubgraphExecutionState) -> Dict:
+        """Reuses a validated plan for this sub-query, skipping planning on a hit."""
+        key = plan_cache_key(state, config_revision)
+        plan = plan_cache.get(key) if key else None
+        if plan is None:
+            return {}
+        return {
+            "ast_planner_response": ASTPlannerResponse(plan=plan),
+            "reasoning": [
+                {
+                    "node": "plan_cache",
+                    "content": [f"Reused cached plan for sub-query {state.sub_query.id}."],
+                }
+            ],
+        }
+
+    def plan_cache_store(state: SubgraphExecutionState) -> Dict:
+        """Caches the plan once it executed successfully; drops it otherwise."""
+        key = plan_cache_key(state, config_revision)
+        if not key:
+            return {}
+        plan = state.ast_planner_response.plan if state.ast_planner_response else None
+        if plan is not None and _executed_ok(state):
+            plan_cache.put(key, plan)
+        else:
+            plan_cache.discard(key)
+        return {}
+
+    def _executed_ok(state: SubgraphExecutionState) -> bool:
+        response = state.executor_response
+        return response is not None and not response.errors and response.artifact is not None
 
-    graph.set_entry_point("schema_retriever")
+    def plan_template_lookup(state: SubgraphExecutionState) -> Dict:
+        """Binds this sub-query's filter literals into a matching plan template."""
+        if not state.sub_query:
+            return {}
+        plan = plan_templates.match(state.sub_query, config_revision)
+        if plan is None:
+            return {}
+        return {
+            "ast_planner_response": ASTPlannerResponse(plan=plan),
+            "reasoning": [
+                {
+                    "node": "plan_templates",
+                    "content": [f"Bound sub-query {state.sub_query.id} literals into a plan template."],
+                }
+            ],
+        }
+
+    def plan_template_store(state: SubgraphExecutionState) -> Dict:
+        """Records a template from a plan that executed successfully."""
+        plan = state.ast_planner_response.plan if state.ast_planner_response else None
+        if state.sub_query and plan is not None and _executed_ok(state):
+            plan_templates.record(state.sub_query, plan, config_revision)
+        return {}
+
+    def check_plan_cache(state: SubgraphExecutionState) -> str:
+        """Routes cache hits straight to SQL generation."""
+        if _should_stop(state):
+            return "end"
+        if state.ast_planner_response and state.ast_planner_response.plan:
+            return "hit"
+        return "miss"
 
-    graph.add_edge("schema_retriever", "ast_planner")
+    graph.add_node("schema_retriever", as_graph_node(schema_retriever))
+    graph.add_node("ast_planner", as_graph_node(ast_planner))
+    graph.add_node("logical_validator", as_graph_node(logical_validator))
+    graph.add_node("generator", as_graph_node(generator))
+    graph.add_node("physical_validator", as_graph_node(physical_validator))
+    graph.add_node("executor", as_graph_node(executor))
+    graph.add_node("refiner", as_graph_node(refiner))
+    graph.add_node(
+        "retry_handler",
+        RunnableLambda(retry_node, afunc=aretry_node, name="retry_handler"),
+    )
+
+    if plan_cache is not None:
+        graph.add_node("plan_cache_lookup", as_graph_node(plan_cache_lookup, name="plan_cache_lookup"))
+        graph.add_node("plan_cache_store", as_graph_node(plan_cache_store, name="plan_cache_store"))
+        graph.set_entry_point("plan_cache_lookup")
+        graph.add_conditional_edges(
+            "plan_cache_lookup",
+            check_plan_cache,
+            {"hit": "generator", "miss": "schema_retriever", "end": END},
+        )
+    else:
+        graph.set_entry_point("schema_retriever")
+
+    if plan_templates is not None:
+        graph.add_node("plan_template_lookup", as_graph_node(plan_template_lookup, name="plan_template_lookup"))
+        graph.add_node("plan_template_store", as_graph_node(plan_template_store, name="plan_template_store"))
+        graph.add_edge("schema_retriever", "plan_template_lookup")
+        # Bound plans skip the planner but not validation.
+        graph.add_conditional_edges(
+            "plan_template_lookup",
+            check_plan_cache,
+            {"hit": "logical_validator", "miss": "ast_planner", "end": END},
+        )
+    else:
+        graph.add_edge("schema_retriever", "ast_planner")
 
     graph.add_conditional_edges(
         "ast_planner",
@@ -164,9 +316,17 @@ def build_sql_agent_graph(
         {"ok": "executor", "retry": "retry_handler", "end": END},
     ) """
 
-    graph.add_edge("executor", END)
+    stores = [name for name, enabled in (("plan_cache_store", plan_cache), ("plan_template_store", plan_templates)) if enabled is not None]
+    for source, target in zip(["executor"] + stores, stores + [END]):
+        graph.add_edge(source, target)
 
-    graph.add_edge("retry_handler", "refiner")
+    graph.add_conditional_edges(
+        "retry_handler",
+        check_retry,
+        {"refine": "refiner", "end": END},
+    )
     graph.add_edge("refiner", "ast_planner")
 
-    return graph.compile()
+    # Resumes restart a failed scan from scratch, so per-step checkpoints of
+    # the subgraph would only add serialization cost.
+    return graph.compile(checkpointer=False)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import concurrent.futures
+import contextvars
+from threading import Lock
+from typing import Any, Callable, Optional
+
+from nl2sql.common.logger import get_logger
+
+logger = get_logger("worker_pool")
+
+
+class PipelineWorkerPool:
+    """Long-lived, bounded thread pool for pipeline executions.
+
+    Owned by ``NL2SQLContext`` so that concurrent requests share one set of
+    worker threads instead of creating an executor per call. The underlying
+    executor is created lazily on first submit.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "nl2sql-pipeline"):
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self.max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = Lock()
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"Starting pipeline worker pool with {self.max_workers} workers.")
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self._thread_name_prefix,
+                )
+            return self._executor
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> concurrent.futures.Future:
+        # Run in a copy of the caller's context so request-scoped context vars
+        # (log trace ids, concurrency limits) follow the work onto the pool.
+        context = contextvars.copy_context()
+        return self._get_executor().submit(context.run, fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
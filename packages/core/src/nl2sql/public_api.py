@@ -88,6 +88,7 @@ class NL2SQL:
         datasource_id: Optional[str] = None,
         execute: bool = True,
         user_context=None,
+        priority="interactive",
     ):
         """
         Execute a natural language query against the database.
@@ -96,9 +97,128 @@ class NL2SQL:
             natural_language=natural_language,
             datasource_id=datasource_id,
             execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    async def arun_query(
+        self,
+        natural_language: str,
+        datasource_id: Optional[str] = None,
+        execute: bool = True,
+        user_context=None,
+        priority="interactive",
+    ):
+        """
+        Execute a natural language query without blocking the event loop.
+        """
+        return await self.query.arun_query(
+            natural_language=natural_language,
+            datasource_id=datasource_id,
+            execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    def resume_query(
+        self,
+        trace_id: str,
+        execute: bool = True,
+        user_context=None,
+        priority="interactive",
+    ):
+        """
+        Resume a failed query from its last successful pipeline step.
+        """
+        return self.query.resume_query(
+            trace_id,
+            execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    async def aresume_query(
+        self,
+        trace_id: str,
+        execute: bool = True,
+        user_context=None,
+        priority="interactive",
+    ):
+        """
+        Resume a failed query without blocking the event loop.
+        """
+        return await self.query.aresume_query(
+            trace_id,
+            execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    def stream_query(
+        self,
+        natural_language: str,
+        datasource_id: Optional[str] = None,
+        execute: bool = True,
+        user_context=None,
+        priority="interactive",
+    ):
+        """
+        Execute a natural language query, yielding pipeline progress events.
+        """
+        return self.query.stream_query(
+            natural_language=natural_language,
+            datasource_id=datasource_id,
+            execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    def astream_query(
+        self,
+        natural_language: str,
+        datasource_id: Optional[str] = None,
+        execute: bool = True,
+        user_context=None,
+        priority="interactive",
+    ):
+        """
+        Async iterator of pipeline progress events for a natural language query.
+        """
+        return self.query.astream_query(
+            natural_language=natural_language,
+            datasource_id=datasource_id,
+            execute=execute,
+            user_context=user_context,
+            priority=priority,
+        )
+
+    def run_queries(
+        self,
+        batch,
+        concurrency: int = 4,
+        per_datasource_concurrency: Optional[int] = None,
+        per_llm_concurrency: Optional[int] = None,
+        execute: bool = True,
+        user_context=None,
+    ):
+        """
+        Execute a batch of natural language queries, yielding results as they complete.
+        """
+        return self.query.run_queries(
+            batch,
+            concurrency=concurrency,
+            per_datasource_concurrency=per_datasource_concurrency,
+            per_llm_concurrency=per_llm_concurrency,
+            execute=execute,
             user_context=user_context
         )
 
+    def purge_answer_cache(self, datasource_id: Optional[str] = None, tenant_id: Optional[str] = None) -> int:
+        """
+        Drop cached answers, optionally for one datasource or tenant.
+        """
+        return self.query.purge_answer_cache(datasource_id=datasource_id, tenant_id=tenant_id)
+
     def add_datasource(self, config):
         """
         Programmatically add a datasource to the engine.
@@ -10,5 +10,6 @@ class NodeMetrics:
     total_tokens: int = 0
     prompt_tokens: int = 0
     completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
     error: Optional[str] = None
     datasource_id: Optional[str] = None
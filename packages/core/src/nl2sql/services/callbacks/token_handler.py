@@ -5,6 +5,16 @@ from nl2sql.services.callbacks.node_context import current_node_run_id
 from nl2sql.services.callbacks.node_metrics import NodeMetrics
 
 
+def _cached_prompt_tokens(usage: dict) -> int:
+    """Prompt tokens served from the provider's prefix cache.
+
+    OpenAI reports ``prompt_tokens_details.cached_tokens``; LangChain's
+    normalised usage uses ``input_token_details.cache_read``.
+    """
+    details = usage.get("prompt_tokens_details") or usage.get("input_token_details") or {}
+    return int(details.get("cached_tokens") or details.get("cache_read") or usage.get("cache_read_input_tokens") or 0)
+
+
 class TokenHandler:
     """Handles token usage tracking and metrics."""
 
@@ -23,6 +33,7 @@ class TokenHandler:
         p = usage.get("prompt_tokens") or usage.get("input_tokens", 0)
         c = usage.get("completion_tokens") or usage.get("output_tokens", 0)
         t = usage.get("total_tokens") or (p + c)
+        cached = min(_cached_prompt_tokens(usage), int(p))
 
         run_id = current_node_run_id.get()
 
@@ -35,22 +46,24 @@ class TokenHandler:
                 "prompt_tokens": p,
                 "completion_tokens": c,
                 "total_tokens": t,
+                "cached_prompt_tokens": cached,
+                "uncached_prompt_tokens": int(p) - cached,
                 "run_id": run_id,
             }
         )
 
-        token_usage_counter.add(
-            t,
-            attributes={
-                "agent": agent_name,
-                "model": model_name,
-                "datasource_id": str(current_datasource_id.get() or "none"),
-                "type": "total"
-            }
-        )
+        attributes = {
+            "agent": agent_name,
+            "model": model_name,
+            "datasource_id": str(current_datasource_id.get() or "none"),
+        }
+        token_usage_counter.add(t, attributes={**attributes, "type": "total"})
+        token_usage_counter.add(cached, attributes={**attributes, "type": "prompt_cached"})
+        token_usage_counter.add(int(p) - cached, attributes={**attributes, "type": "prompt_uncached"})
 
         if run_id and run_id in self.node_metrics:
             m = self.node_metrics[run_id]
             m.prompt_tokens += int(p)
             m.completion_tokens += int(c)
             m.total_tokens += int(t)
+            m.cached_prompt_tokens += cached
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+
+from nl2sql.common.errors import ErrorCode, ErrorSeverity, PipelineError
+from nl2sql.execution.contracts import ArtifactRef, ExecutorResponse
+from nl2sql.pipeline.nodes.generator.schemas import GeneratorResponse
+
+_SQL_AGENT = "nl2sql.pipeline.subgraphs.sql_agent"
+
+
+def _executor_response(state, ok):
+    artifact = None
+    errors = []
+    if ok:
+        artifact = ArtifactRef(
+            uri=f"file:///{state.sub_query.id}.parquet",
+            backend="local",
+            format="parquet",
+            row_count=1,
+            columns=["n"],
+            bytes=1,
+            content_hash=state.sub_query.id,
+            created_at=datetime(2026, 1, 1),
+            path_template="{sq_id}",
+        )
+    else:
+        errors = [
+            PipelineError(
+                node="executor",
+                message="boom",
+                severity=ErrorSeverity.ERROR,
+                error_code=ErrorCode.EXECUTION_ERROR,
+            )
+        ]
+    return ExecutorResponse(
+        executor_name="sql_executor",
+        subgraph_name="sql_agent",
+        node_id=state.sub_query.id,
+        trace_id=state.trace_id,
+        tenant_id="t",
+        artifact=artifact,
+        errors=errors,
+    )
+
+
+@pytest.fixture
+def stub_sql_agent_nodes(monkeypatch):
+    """Replaces the SQL agent subgraph's nodes with in-memory fakes.
+
+    Returns a function taking the planner and logical validator fakes. The
+    executor returns a real ``ExecutorResponse`` (with an artifact when
+    ``executor_ok``) because the graph coerces state between nodes; its calls
+    are counted in ``calls["executor"]`` when ``calls`` is given.
+    """
+
+    def _stub(planner, logical, executor_ok=True, calls=None):
+        def executor(state):
+            if calls is not None:
+                calls["executor"] += 1
+            return {"executor_response": _executor_response(state, executor_ok)}
+
+        monkeypatch.setattr(f"{_SQL_AGENT}.SchemaRetrieverNode", lambda _ctx: (lambda _s: {"relevant_tables": []}))
+        monkeypatch.setattr(f"{_SQL_AGENT}.ASTPlannerNode", lambda _ctx: planner)
+        monkeypatch.setattr(f"{_SQL_AGENT}.LogicalValidatorNode", lambda _ctx: logical)
+        monkeypatch.setattr(
+            f"{_SQL_AGENT}.GeneratorNode",
+            lambda _ctx: (lambda _s: {"generator_response": GeneratorResponse(sql_draft="SELECT 1")}),
+        )
+        monkeypatch.setattr(f"{_SQL_AGENT}.PhysicalValidatorNode", lambda _ctx: (lambda _s: {}))
+        monkeypatch.setattr(f"{_SQL_AGENT}.ExecutorNode", lambda _ctx: executor)
+        monkeypatch.setattr(f"{_SQL_AGENT}.RefinerNode", lambda _ctx: (lambda _s: {}))
+
+    return _stub
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from nl2sql.pipeline.admission import AdmissionController, AdmissionRejected, Priority
+from nl2sql.pipeline.runtime import run_with_graph
+from nl2sql.pipeline.worker_pool import PipelineWorkerPool
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def _queue_in_background(controller, tenant, priority, admitted, errors):
+    def _run():
+        try:
+            controller.acquire(tenant, priority)
+            admitted.append((tenant, priority))
+        except AdmissionRejected as e:
+            errors.append(e.reason)
+
+    thread = threading.Thread(target=_run)
+    thread.start()
+    return thread
+
+
+def test_full_queue_rejects_immediately():
+    # Validates fast 429s because a spike must not pile up unbounded waiters.
+    # Arrange
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout_sec=2)
+    controller.acquire("t1")
+    admitted, errors = [], []
+    waiter = _queue_in_background(controller, "t1", Priority.INTERACTIVE, admitted, errors)
+    _wait_for(lambda: controller.stats()["queued"] == 1)
+
+    # Act
+    start = time.monotonic()
+    with pytest.raises(AdmissionRejected) as exc:
+        controller.acquire("t1")
+
+    # Assert
+    assert exc.value.reason == "queue_full"
+    assert time.monotonic() - start < 0.5
+    controller.release("t1")
+    waiter.join(2)
+    assert admitted == [("t1", Priority.INTERACTIVE)]
+
+
+def test_saturated_tenant_does_not_block_other_tenants():
+    # Validates per-tenant limits because one noisy tenant must not starve the rest.
+    # Arrange
+    controller = AdmissionController(max_concurrent=4, per_tenant=1, max_queue=4, queue_timeout_sec=2)
+    controller.acquire("noisy")
+    admitted, errors = [], []
+    waiter = _queue_in_background(controller, "noisy", Priority.INTERACTIVE, admitted, errors)
+    _wait_for(lambda: controller.stats()["queued"] == 1)
+
+    # Act
+    controller.acquire("quiet")
+
+    # Assert
+    assert controller.stats() == {"active": 2, "queued": 1, "queued_interactive": 1, "queued_batch": 0}
+    controller.release("noisy")
+    waiter.join(2)
+    assert admitted == [("noisy", Priority.INTERACTIVE)]
+
+
+def test_interactive_waiters_are_admitted_before_batch_and_shed_it_when_full():
+    # Validates priority classes because batch load must yield to interactive users.
+    # Arrange
+    controller = AdmissionController(max_concurrent=1, max_queue=2, queue_timeout_sec=2)
+    controller.acquire()
+    admitted, errors = [], []
+    threads = [_queue_in_background(controller, "t", Priority.BATCH, admitted, errors) for _ in range(2)]
+    _wait_for(lambda: controller.stats()["queued"] == 2)
+
+    # Act
+    threads.append(_queue_in_background(controller, "t", Priority.INTERACTIVE, admitted, errors))
+    _wait_for(lambda: errors == ["shed"])
+    controller.release()
+    _wait_for(lambda: len(admitted) == 1)
+    controller.release()
+    for t in threads:
+        t.join(2)
+
+    # Assert
+    assert [p for _, p in admitted] == [Priority.INTERACTIVE, Priority.BATCH]
+
+
+def test_waiter_is_rejected_after_queue_deadline():
+    # Validates queue-time deadlines because requests must fail fast instead of hitting the global timeout.
+    # Arrange
+    controller = AdmissionController(max_concurrent=1, queue_timeout_sec=0.1)
+    controller.acquire()
+
+    # Act
+    with pytest.raises(AdmissionRejected) as exc:
+        controller.acquire()
+
+    # Assert
+    assert exc.value.reason == "queue_timeout"
+    assert controller.stats()["queued"] == 0
+
+
+def test_async_slot_waits_without_blocking_the_loop():
+    # Validates the async path because the API admits requests on one event loop.
+    # Arrange
+    controller = AdmissionController(max_concurrent=1, queue_timeout_sec=2)
+    order = []
+
+    async def _request(name):
+        async with controller.aslot("t"):
+            order.append(name)
+            await asyncio.sleep(0.05)
+
+    async def _main():
+        await asyncio.gather(_request("a"), _request("b"), _request("c"))
+
+    # Act
+    asyncio.run(_main())
+
+    # Assert
+    assert sorted(order) == ["a", "b", "c"]
+    assert controller.stats()["active"] == 0
+
+
+def test_run_with_graph_surfaces_rejection(monkeypatch):
+    # Validates runtime integration because shed requests must not be reported as pipeline crashes.
+    # Arrange
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: None)
+    ctx = SimpleNamespace(
+        worker_pool=PipelineWorkerPool(max_workers=1),
+        admission=AdmissionController(max_concurrent=1, max_queue=0),
+    )
+    ctx.admission.acquire()
+
+    # Act / Assert
+    with pytest.raises(AdmissionRejected):
+        run_with_graph(ctx, "total sales")
+    ctx.worker_pool.shutdown()
@@ -0,0 +1,145 @@
+import asyncio
+from types import SimpleNamespace
+
+from nl2sql.auth import UserContext
+from nl2sql.pipeline.answer_cache import AnswerCache, build_answer_key
+from nl2sql.pipeline.nodes.answer_synthesizer.schemas import AnswerSynthesizerResponse
+from nl2sql.pipeline.nodes.datasource_resolver.schemas import DatasourceResolverResponse, ResolvedDatasource
+from nl2sql.pipeline.runtime import arun_with_graph, run_with_graph
+from nl2sql.pipeline.worker_pool import PipelineWorkerPool
+
+
+class _Graph:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def invoke(self, state, config=None):
+        return self._fn(state)
+
+    async def ainvoke(self, state, config=None):
+        return self._fn(state)
+
+
+def _ctx(versions=None, ttls=None):
+    versions = versions if versions is not None else {"sales": "v1"}
+    ttls = ttls or {}
+    return SimpleNamespace(
+        worker_pool=PipelineWorkerPool(max_workers=2),
+        answer_cache=AnswerCache(),
+        ds_registry=SimpleNamespace(get_answer_cache_ttl=lambda ds_id: ttls.get(ds_id)),
+        schema_store=SimpleNamespace(get_latest_version=lambda ds_id: versions.get(ds_id)),
+    )
+
+
+def _result(ds_ids=("sales",), version="v1", errors=None):
+    return {
+        "datasource_resolver_response": DatasourceResolverResponse(
+            resolved_datasources=[ResolvedDatasource(datasource_id=ds, schema_version=version) for ds in ds_ids]
+        ),
+        "answer_synthesizer_response": AnswerSynthesizerResponse(final_answer={"summary": "42"}),
+        "artifact_refs": {},
+        "errors": errors or [],
+    }
+
+
+def _counting_graph(monkeypatch, result):
+    calls = []
+
+    def fn(state):
+        calls.append(state["user_query"])
+        return dict(result)
+
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _Graph(fn))
+    return calls
+
+
+def test_answer_key_normalizes_query_and_roles():
+    # Validates key stability because trivially different repeats must share an answer.
+    a = build_answer_key("Total  Sales", None, UserContext(tenant_id="t", roles=["b", "a"]), True)
+    b = build_answer_key("total sales", None, UserContext(tenant_id="t", roles=["a", "b"]), True)
+    c = build_answer_key("total sales", None, UserContext(tenant_id="u", roles=["a", "b"]), True)
+    assert a == b
+    assert a != c
+
+
+def test_repeated_question_is_served_from_cache(monkeypatch):
+    # Validates the fast path because recurring questions must not rerun the pipeline.
+    # Arrange
+    calls = _counting_graph(monkeypatch, _result())
+    ctx = _ctx()
+
+    # Act
+    first = run_with_graph(ctx, "total sales")
+    second = run_with_graph(ctx, "Total sales ")
+
+    # Assert
+    assert len(calls) == 1
+    assert second["answer_synthesizer_response"].final_answer == {"summary": "42"}
+    assert second["reasoning"][0]["node"] == "answer_cache"
+    assert second["trace_id"] != first.get("trace_id")
+
+
+def test_async_path_shares_the_cache(monkeypatch):
+    # Validates parity because sync and async callers see the same cache.
+    calls = _counting_graph(monkeypatch, _result())
+    ctx = _ctx()
+
+    run_with_graph(ctx, "total sales")
+    asyncio.run(arun_with_graph(ctx, "total sales"))
+
+    assert len(calls) == 1
+
+
+def test_schema_version_change_invalidates_answer(monkeypatch):
+    # Validates freshness because answers from an old schema must not be served.
+    # Arrange
+    calls = _counting_graph(monkeypatch, _result())
+    versions = {"sales": "v1"}
+    ctx = _ctx(versions=versions)
+    run_with_graph(ctx, "total sales")
+
+    # Act
+    versions["sales"] = "v2"
+    run_with_graph(ctx, "total sales")
+
+    # Assert
+    assert len(calls) == 2
+
+
+def test_datasource_ttl_of_zero_disables_caching(monkeypatch):
+    # Validates per-datasource TTLs because volatile sources may opt out.
+    calls = _counting_graph(monkeypatch, _result(ds_ids=("sales", "crm")))
+    ctx = _ctx(versions={"sales": "v1", "crm": "v1"}, ttls={"crm": 0})
+
+    run_with_graph(ctx, "total sales")
+    run_with_graph(ctx, "total sales")
+
+    assert len(calls) == 2
+    assert len(ctx.answer_cache) == 0
+
+
+def test_failed_runs_are_not_cached(monkeypatch):
+    # Validates admission because errors must be retried, not replayed.
+    calls = _counting_graph(monkeypatch, _result(errors=["boom"]))
+    ctx = _ctx()
+
+    run_with_graph(ctx, "total sales")
+    run_with_graph(ctx, "total sales")
+
+    assert len(calls) == 2
+
+
+def test_purge_by_datasource_and_tenant():
+    # Validates the purge API because operators must drop answers after data loads.
+    # Arrange
+    ctx = _ctx(versions={"sales": "v1", "crm": "v1"})
+    cache = ctx.answer_cache
+    cache.put(ctx, build_answer_key("q1", None, UserContext(tenant_id="t1"), True), _result(ds_ids=("sales",)))
+    cache.put(ctx, build_answer_key("q2", None, UserContext(tenant_id="t1"), True), _result(ds_ids=("crm",)))
+    cache.put(ctx, build_answer_key("q3", None, UserContext(tenant_id="t2"), True), _result(ds_ids=("crm",)))
+
+    # Act / Assert
+    assert cache.purge(datasource_id="sales") == 1
+    assert cache.purge(tenant_id="t2") == 1
+    assert cache.purge() == 1
+    assert len(cache) == 0
@@ -0,0 +1,77 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from nl2sql.common.settings import settings
+from nl2sql.pipeline.nodes.aggregator.schemas import AggregatorResponse
+from nl2sql.pipeline.nodes.answer_synthesizer.fast_path import summarize_results, templated_answer
+from nl2sql.pipeline.nodes.answer_synthesizer.node import AnswerSynthesizerNode
+from nl2sql.pipeline.state import GraphState
+
+
+def test_templated_answer_covers_scalar_row_and_table_shapes():
+    # Validates the templates because small results must be answered without an LLM.
+    scalar = templated_answer({"sq1": [{"total": 12.5}]})
+    row = templated_answer({"sq1": [{"id": 1, "name": "a"}]})
+    table = templated_answer({"sq1": [{"id": 1, "name": "a|b"}, {"id": 2, "name": None}]})
+    empty = templated_answer({"sq1": []}, [{"intent": "hr headcount", "reason": "no_datasource"}])
+
+    assert (scalar.format_type, scalar.content) == ("text", "total: 12.5")
+    assert (row.format_type, row.content) == ("list", "- id: 1\n- name: a")
+    assert table.format_type == "table"
+    assert table.content.splitlines()[2:] == ["| 1 | a\\|b |", "| 2 | null |"]
+    assert empty.warnings == ["Skipped 'hr headcount': no available datasource covers it."]
+
+
+def test_templated_answer_defers_to_the_llm_beyond_thresholds(monkeypatch):
+    # Validates the thresholds because large or multi-result answers need the LLM to explain them.
+    monkeypatch.setattr(settings, "answer_fast_path_max_rows", 2)
+
+    assert templated_answer({"sq1": [{"id": i} for i in range(3)]}) is None
+    assert templated_answer({"sq1": [{"id": 1}], "sq2": [{"id": 2}]}) is None
+
+
+def test_large_results_are_summarized_with_column_stats(monkeypatch):
+    # Validates the summary because large results must not be dumped into the prompt verbatim.
+    monkeypatch.setattr(settings, "answer_summary_min_rows", 5)
+    monkeypatch.setattr(settings, "answer_summary_top_k", 2)
+    rows = [{"id": i, "region": "eu" if i % 2 else "us"} for i in range(10)]
+
+    summary = summarize_results({"big": rows, "small": rows[:3]})
+
+    assert summary["small"] == rows[:3]
+    assert summary["big"]["row_count"] == 10
+    assert summary["big"]["top_rows"] == rows[:2]
+    assert summary["big"]["columns"]["id"]["max"] == 9
+    assert summary["big"]["columns"]["region"]["distinct"] == 2
+
+
+def test_answer_synthesizer_skips_the_llm_for_templated_answers(monkeypatch):
+    # Validates the fast path because a scalar answer should not cost an LLM call.
+    # Arrange
+    monkeypatch.setattr(settings, "answer_fast_path_enabled", True)
+    ctx = SimpleNamespace(llm_registry=MagicMock())
+    node = AnswerSynthesizerNode(ctx)
+    node.chain = MagicMock()
+    state = GraphState(
+        user_query="how many orders?",
+        aggregator_response=AggregatorResponse(terminal_results={"sq1": [{"count": 42}]}),
+    )
+
+    # Act
+    result = node(state)
+
+    # Assert
+    node.chain.invoke.assert_not_called()
+    assert result["answer_synthesizer_response"].final_answer["content"] == "count: 42"
+
+
+def test_serialized_result_is_compact_json():
+    # Validates compact serialization because indentation only adds prompt tokens.
+    ctx = SimpleNamespace(llm_registry=MagicMock())
+    node = AnswerSynthesizerNode(ctx)
+
+    serialized = node._serialize_result({"sq1": [{"id": 1, "name": "a"}]})
+
+    assert serialized == '{"sq1":[{"id":1,"name":"a"}]}'
+    assert json.loads(serialized)["sq1"][0]["id"] == 1
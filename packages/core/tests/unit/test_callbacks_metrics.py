@@ -4,6 +4,8 @@ from langchain_core.outputs import LLMResult, Generation
 
 from nl2sql.services.callbacks.token_handler import TokenHandler
 from nl2sql.services.callbacks.node_handlers import NodeHandler
+from nl2sql.services.callbacks.node_context import current_node_run_id
+from nl2sql.services.callbacks.node_metrics import NodeMetrics
 from nl2sql.common.metrics import TOKEN_LOG, LATENCY_LOG, reset_usage
 
 
@@ -25,6 +27,27 @@ def test_token_handler_records_usage():
     assert TOKEN_LOG[-1]["agent"] == "planner"
 
 
+def test_token_handler_splits_cached_prompt_tokens():
+    # Validates cache accounting because prefix-cache hit rates must be measurable per node.
+    # Arrange
+    reset_usage()
+    metrics = NodeMetrics()
+    handler = TokenHandler(node_metrics={"run-1": metrics})
+    usage = {"total_tokens": 1100, "prompt_tokens": 1000, "completion_tokens": 100, "prompt_tokens_details": {"cached_tokens": 768}}
+    token = current_node_run_id.set("run-1")
+
+    # Act
+    try:
+        handler.on_llm_end(LLMResult(generations=[[Generation(text="ok")]], llm_output={"token_usage": usage}))
+    finally:
+        current_node_run_id.reset(token)
+
+    # Assert
+    assert TOKEN_LOG[-1]["cached_prompt_tokens"] == 768
+    assert TOKEN_LOG[-1]["uncached_prompt_tokens"] == 232
+    assert metrics.cached_prompt_tokens == 768
+
+
 def test_node_handler_records_latency():
     # Validates latency metrics because node performance must be tracked.
     # Arrange
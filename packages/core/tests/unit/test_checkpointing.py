@@ -0,0 +1,213 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from nl2sql.auth import UserContext
+from nl2sql.common.cancellation import CancellationToken
+from nl2sql.common.errors import ErrorCode, ErrorSeverity, PipelineError
+from nl2sql.common.settings import settings
+from nl2sql.execution.contracts import ArtifactRef, ExecutorResponse
+from nl2sql.pipeline.checkpointing import (
+    CheckpointSerializer,
+    ResumeUnavailable,
+    SqliteCheckpointSaver,
+)
+from nl2sql.pipeline.graph import build_graph
+from nl2sql.pipeline.nodes.datasource_resolver.schemas import DatasourceResolverResponse, ResolvedDatasource
+from nl2sql.pipeline.nodes.decomposer.schemas import DecomposerResponse, SubQuery
+from nl2sql.pipeline.nodes.global_planner.schemas import (
+    ColumnSpec,
+    ExecutionDAG,
+    GlobalPlannerResponse,
+    LogicalNode,
+    RelationSchema,
+)
+from nl2sql.pipeline.runtime import aresume_with_graph, resume_with_graph, run_with_graph
+from nl2sql.pipeline.state import GraphState
+from nl2sql.pipeline.subgraphs.registry import SubgraphSpec
+from nl2sql.pipeline.worker_pool import PipelineWorkerPool
+from nl2sql_adapter_sdk.capabilities import DatasourceCapability
+
+
+def _error(node, code):
+    return PipelineError(node=node, message="boom", severity=ErrorSeverity.ERROR, error_code=code)
+
+
+def _artifact(sq_id):
+    return ArtifactRef(
+        uri=f"file:///{sq_id}.parquet",
+        backend="local",
+        format="parquet",
+        row_count=1,
+        columns=["n"],
+        bytes=1,
+        content_hash=sq_id,
+        created_at=datetime(2026, 1, 1),
+        path_template="{sq_id}",
+    )
+
+
+class _Pipeline:
+    """Stub nodes around the real main graph, counting calls per node."""
+
+    def __init__(self, monkeypatch, tmp_path):
+        self.calls = {}
+        self.failing = set()
+        self.erroring = set()
+        sub_queries = [SubQuery(id=i, datasource_id="ds", intent=i) for i in ("sq_a", "sq_b")]
+        scan_schema = RelationSchema(columns=[ColumnSpec(name="n")])
+
+        def node(name, update):
+            def _call(state):
+                self.calls[name] = self.calls.get(name, 0) + 1
+                if name in self.failing:
+                    return {"errors": [_error(name, ErrorCode.AGGREGATOR_FAILED)]}
+                return update
+            return lambda _ctx: _call
+
+        def scan(state):
+            sq_id = state["subgraph_id"].split(":")[1]
+            self.calls[sq_id] = self.calls.get(sq_id, 0) + 1
+            if sq_id in self.failing:
+                raise RuntimeError(f"{sq_id} failed")
+            if sq_id in self.erroring:
+                return {**state, "errors": [_error(sq_id, ErrorCode.EXECUTION_ERROR)]}
+            response = ExecutorResponse(
+                executor_name="sql_executor", subgraph_name="sql_agent", node_id=sq_id,
+                trace_id=state["trace_id"], artifact=_artifact(sq_id), tenant_id="default",
+            )
+            return {**state, "executor_response": response}
+
+        resolver = DatasourceResolverResponse(
+            resolved_datasources=[ResolvedDatasource(datasource_id="ds")], allowed_datasource_ids=["ds"]
+        )
+        dag = ExecutionDAG(
+            nodes=[LogicalNode(node_id=sq.id, kind="scan", output_schema=scan_schema) for sq in sub_queries],
+            edges=[],
+        )
+        target = "nl2sql.pipeline.graph"
+        # These tests cover resuming multi-scan DAGs; short questions would take the single-source fast path.
+        monkeypatch.setattr(settings, "single_source_fast_path_enabled", False)
+        monkeypatch.setattr(f"{target}.DatasourceResolverNode", node("resolver", {"datasource_resolver_response": resolver}))
+        monkeypatch.setattr(f"{target}.DecomposerNode", node("decomposer", {"decomposer_response": DecomposerResponse(sub_queries=sub_queries, combine_groups=[])}))
+        monkeypatch.setattr(f"{target}.GlobalPlannerNode", node("global_planner", {"global_planner_response": GlobalPlannerResponse(execution_dag=dag)}))
+        monkeypatch.setattr(f"{target}.EngineAggregatorNode", node("aggregator", {}))
+        monkeypatch.setattr(f"{target}.AnswerSynthesizerNode", node("synthesizer", {}))
+        monkeypatch.setattr(
+            f"{target}.build_subgraph_registry",
+            lambda _ctx: {
+                "sql_agent": SubgraphSpec(
+                    name="sql_agent",
+                    required_capabilities={DatasourceCapability.SUPPORTS_SQL.value},
+                    builder=lambda _c: RunnableLambda(scan),
+                )
+            },
+        )
+        self.ctx = SimpleNamespace(
+            checkpointer=SqliteCheckpointSaver(path=tmp_path / "checkpoints.db"),
+            ds_registry=SimpleNamespace(get_capabilities=lambda _ds: {DatasourceCapability.SUPPORTS_SQL.value}),
+            worker_pool=PipelineWorkerPool(max_workers=2),
+        )
+        graph = build_graph(self.ctx)
+        monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: graph)
+
+    def close(self):
+        self.ctx.worker_pool.shutdown()
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    p = _Pipeline(monkeypatch, tmp_path)
+    yield p
+    p.close()
+
+
+def _trace_id(result):
+    return result["trace_id"]
+
+
+def test_resume_after_late_failure_skips_completed_nodes(pipeline):
+    # Validates resume because recovering from an aggregator error must not repeat LLM-backed nodes.
+    # Arrange
+    pipeline.failing = {"aggregator"}
+    failed = run_with_graph(pipeline.ctx, "total sales")
+    assert [e.error_code for e in failed["errors"]] == [ErrorCode.AGGREGATOR_FAILED]
+    pipeline.failing = set()
+
+    # Act
+    resumed = resume_with_graph(pipeline.ctx, _trace_id(failed))
+
+    # Assert
+    assert resumed["errors"] == []
+    assert resumed["trace_id"] == failed["trace_id"]
+    assert pipeline.calls == {
+        "resolver": 1, "decomposer": 1, "global_planner": 1,
+        "sq_a": 1, "sq_b": 1, "aggregator": 2, "synthesizer": 2,
+    }
+
+
+def test_failed_scan_is_dispatched_once_and_reported(pipeline):
+    # Validates layer routing because a scan that returns errors must not be re-sent every super-step.
+    # Arrange
+    pipeline.erroring = {"sq_b"}
+
+    # Act
+    result = run_with_graph(pipeline.ctx, "total sales")
+
+    # Assert
+    assert [e.error_code for e in result["errors"]] == [ErrorCode.EXECUTION_ERROR]
+    assert pipeline.calls["sq_a"] == 1 and pipeline.calls["sq_b"] == 1
+    assert "aggregator" not in pipeline.calls
+    assert pipeline.calls["synthesizer"] == 1
+
+
+def test_resume_reruns_only_failed_scan(pipeline):
+    # Validates partial recovery because scans that succeeded keep their artifacts.
+    # Arrange
+    pipeline.failing = {"sq_b"}
+    failed = run_with_graph(pipeline.ctx, "total sales")
+    assert [e.error_code for e in failed["errors"]] == [ErrorCode.UNKNOWN_ERROR]
+    trace_id = pipeline.ctx.checkpointer.list(None).__next__().config["configurable"]["thread_id"]
+    pipeline.failing = set()
+
+    # Act
+    resumed = asyncio.run(aresume_with_graph(pipeline.ctx, trace_id))
+
+    # Assert
+    assert set(resumed["artifact_refs"]) == {"sq_a", "sq_b"}
+    assert pipeline.calls["sq_a"] == 1
+    assert pipeline.calls["sq_b"] == 2
+    assert pipeline.calls["decomposer"] == 1
+
+
+def test_resume_rejects_completed_trace_and_other_users(pipeline):
+    # Validates guards because resuming must not re-run healthy traces or leak across users.
+    # Arrange
+    ok = run_with_graph(pipeline.ctx, "total sales", user_context=UserContext(user_id="u1"))
+    pipeline.failing = {"aggregator"}
+    failed = run_with_graph(pipeline.ctx, "total sales", user_context=UserContext(user_id="u1"))
+
+    # Act / Assert
+    with pytest.raises(ResumeUnavailable):
+        resume_with_graph(pipeline.ctx, _trace_id(ok))
+    with pytest.raises(ResumeUnavailable):
+        resume_with_graph(pipeline.ctx, _trace_id(failed), user_context=UserContext(user_id="u2"))
+    with pytest.raises(ResumeUnavailable):
+        resume_with_graph(pipeline.ctx, "unknown-trace")
+
+
+def test_serializer_drops_cancel_tokens():
+    # Validates persistence because live tokens cannot be serialized and must not be restored.
+    # Arrange
+    serde = CheckpointSerializer()
+    state = GraphState(user_query="q", cancel_token=CancellationToken(), deadline=1.0)
+
+    # Act
+    restored = serde.loads_typed(serde.dumps_typed(state))
+
+    # Assert
+    assert restored.cancel_token is None
+    assert restored.user_query == "q"
@@ -0,0 +1,186 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from nl2sql.common.deadline import DeadlineExceeded, call_timeout, deadline_after, use_deadline
+from nl2sql.common.errors import ErrorCode, ErrorSeverity, PipelineError
+from nl2sql.execution.contracts import ExecutorRequest
+from nl2sql.execution.executor.sql_executor import SqlExecutorService
+from nl2sql.indexing.vector_store import VectorStore
+from nl2sql.pipeline.nodes.ast_planner.schemas import ASTPlannerResponse
+from nl2sql.pipeline.nodes.decomposer.schemas import SubQuery
+from nl2sql.pipeline.runnables import as_graph_node
+from nl2sql.pipeline.state import SubgraphExecutionState
+from nl2sql.pipeline.subgraphs.sql_agent import build_sql_agent_graph
+from nl2sql_adapter_sdk.capabilities import DatasourceCapability
+
+
+def test_call_timeout_is_bounded_by_active_deadline():
+    # Validates per-call budgets because an LLM timeout must never outlive the request.
+    # Act
+    unbounded = call_timeout(30.0)
+    with use_deadline(deadline_after(2.0)):
+        bounded = call_timeout(30.0)
+        shorter_default = call_timeout(0.5)
+
+    # Assert
+    assert unbounded == 30.0
+    assert 0 < bounded <= 2.0
+    assert shorter_default == 0.5
+
+
+def test_call_timeout_raises_once_deadline_passed():
+    # Validates fail-fast because starting I/O after the deadline only wastes capacity.
+    with use_deadline(time.time() - 1):
+        with pytest.raises(DeadlineExceeded):
+            call_timeout(operation="LLM call")
+
+
+def test_vector_search_is_abandoned_when_deadline_runs_out():
+    # Validates bounded searches because a hung vector store must not hold the request past its deadline.
+    # Arrange
+    store = VectorStore.__new__(VectorStore)
+    store.initialize_if_not_exists = lambda: None
+    store.vectorstore = SimpleNamespace(max_marginal_relevance_search=lambda *a, **kw: time.sleep(2.0) or [])
+
+    # Act
+    start = time.monotonic()
+    with use_deadline(deadline_after(0.2)):
+        with pytest.raises(DeadlineExceeded, match="schema search"):
+            store.retrieve_schema_context("q", "ds1")
+
+    # Assert
+    assert time.monotonic() - start < 1.0
+
+
+def test_graph_node_skips_work_after_deadline_and_records_one_error():
+    # Validates node guards because every node after the deadline must be a no-op.
+    # Arrange
+    calls = []
+    node = as_graph_node(lambda s: calls.append(s) or {}, name="planner")
+    state = SimpleNamespace(deadline=time.time() - 1, cancel_token=None, errors=[])
+
+    # Act
+    first = node.invoke(state)
+    state.errors = first["errors"]
+    second = node.invoke(state)
+
+    # Assert
+    assert calls == []
+    assert [e.error_code for e in first["errors"]] == [ErrorCode.PIPELINE_TIMEOUT]
+    assert second == {}
+
+
+def test_graph_node_runs_under_state_deadline():
+    # Validates deadline activation because clients read the budget from context, not arguments.
+    # Arrange
+    seen = []
+    node = as_graph_node(lambda s: seen.append(call_timeout()) or {}, name="planner")
+    state = SimpleNamespace(deadline=deadline_after(5.0), cancel_token=None, errors=[])
+
+    # Act
+    node.invoke(state)
+
+    # Assert
+    assert 0 < seen[0] <= 5.0
+
+
+def test_sql_agent_skips_retry_that_does_not_fit_budget(monkeypatch):
+    # Validates budget-aware retries because a doomed retry only delays the timeout error.
+    # Arrange
+    calls = {"planner": 0, "refiner": 0}
+
+    def planner(state):
+        calls["planner"] += 1
+        error = PipelineError(
+            node="ast_planner",
+            message="fail",
+            severity=ErrorSeverity.ERROR,
+            error_code=ErrorCode.PLANNING_FAILURE,
+            is_retryable=True,
+        )
+        return {"ast_planner_response": ASTPlannerResponse(plan=None), "errors": [error]}
+
+    def refiner(state):
+        calls["refiner"] += 1
+        return {}
+
+    for name in ("SchemaRetrieverNode", "LogicalValidatorNode", "GeneratorNode", "PhysicalValidatorNode", "ExecutorNode"):
+        monkeypatch.setattr(f"nl2sql.pipeline.subgraphs.sql_agent.{name}", lambda _ctx: (lambda _s: {}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.ASTPlannerNode", lambda _ctx: planner)
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.RefinerNode", lambda _ctx: refiner)
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.settings.sql_agent_retry_min_budget_sec", 10.0)
+
+    graph = build_sql_agent_graph(SimpleNamespace())
+    state = SubgraphExecutionState(
+        trace_id="t",
+        sub_query=SubQuery(id="sq1", datasource_id="ds1", intent="q"),
+        deadline=deadline_after(3.0),
+    )
+
+    # Act
+    start = time.monotonic()
+    result = graph.invoke(state)
+
+    # Assert
+    assert calls == {"planner": 1, "refiner": 0}
+    assert time.monotonic() - start < 1.0
+    assert any(
+        e.node == "retry_handler" and e.error_code == ErrorCode.PIPELINE_TIMEOUT
+        for e in result["errors"]
+    )
+
+
+class _CapturingAdapter:
+    def __init__(self):
+        self.requests = []
+
+    def execute(self, request):
+        self.requests.append(request)
+        return SimpleNamespace(success=False, error=None)
+
+
+def _executor_with(adapter):
+    registry = SimpleNamespace(
+        get_capabilities=lambda _ds: {DatasourceCapability.SUPPORTS_SQL.value},
+        get_adapter=lambda _ds: adapter,
+    )
+    return SqlExecutorService(registry)
+
+
+def _request(deadline):
+    return ExecutorRequest(
+        node_id="n",
+        trace_id="t",
+        subgraph_name="sql_agent",
+        datasource_id="ds1",
+        sql="SELECT 1",
+        tenant_id="default",
+        deadline=deadline,
+    )
+
+
+def test_sql_executor_passes_remaining_budget_as_statement_timeout():
+    # Validates statement timeouts because a slow query must be killed at the database.
+    # Arrange
+    adapter = _CapturingAdapter()
+
+    # Act
+    _executor_with(adapter).execute(_request(deadline_after(4.0)))
+
+    # Assert
+    assert 0 < adapter.requests[0].limits["timeout_ms"] <= 4000
+
+
+def test_sql_executor_does_not_start_after_deadline():
+    # Validates fail-fast because an expired request must not occupy a database slot.
+    # Arrange
+    adapter = _CapturingAdapter()
+
+    # Act
+    response = _executor_with(adapter).execute(_request(time.time() - 1))
+
+    # Assert
+    assert adapter.requests == []
+    assert [e.error_code for e in response.errors] == [ErrorCode.EXECUTION_TIMEOUT]
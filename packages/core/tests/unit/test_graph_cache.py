@@ -0,0 +1,95 @@
+import json
+from types import SimpleNamespace
+
+from nl2sql.api.policy_api import PolicyAPI
+from nl2sql.configs import ConfigManager
+from nl2sql.context import NL2SQLContext
+from nl2sql.pipeline.graph import get_compiled_graph
+from nl2sql.pipeline.graph_cache import CompiledGraphCache
+
+
+def test_graph_cache_reuses_compiled_graph(monkeypatch):
+    # Validates reuse because graph compilation must not run per request.
+    # Arrange
+    calls = {"build": 0}
+
+    def fake_build(ctx, execute=True):
+        calls["build"] += 1
+        return object()
+
+    monkeypatch.setattr("nl2sql.pipeline.graph.build_graph", fake_build)
+    ctx = SimpleNamespace(graph_cache=CompiledGraphCache(), config_revision=(0, 0, 0))
+
+    # Act
+    first = get_compiled_graph(ctx, execute=True)
+    second = get_compiled_graph(ctx, execute=True)
+
+    # Assert
+    assert first is second
+    assert calls["build"] == 1
+
+
+def test_graph_cache_rebuilds_on_revision_change(monkeypatch):
+    # Validates invalidation because config changes must rebuild nodes.
+    # Arrange
+    monkeypatch.setattr("nl2sql.pipeline.graph.build_graph", lambda ctx, execute=True: object())
+    ctx = SimpleNamespace(graph_cache=CompiledGraphCache(), config_revision=(0, 0, 0))
+    first = get_compiled_graph(ctx, execute=True)
+
+    # Act
+    ctx.config_revision = (1, 0, 0)
+    second = get_compiled_graph(ctx, execute=True)
+
+    # Assert
+    assert first is not second
+    assert len(ctx.graph_cache) == 1
+
+
+def test_graph_cache_keys_on_execute_flag(monkeypatch):
+    # Validates variants because dry-run and execute graphs are cached separately.
+    # Arrange
+    monkeypatch.setattr("nl2sql.pipeline.graph.build_graph", lambda ctx, execute=True: object())
+    ctx = SimpleNamespace(graph_cache=CompiledGraphCache(), config_revision=(0, 0, 0))
+
+    # Act
+    run = get_compiled_graph(ctx, execute=True)
+    dry = get_compiled_graph(ctx, execute=False)
+
+    # Assert
+    assert run is not dry
+    assert len(ctx.graph_cache) == 2
+
+
+def _policies_file(tmp_path, tables):
+    path = tmp_path / "policies.json"
+    role = {"description": "Analyst", "role": "analyst", "allowed_datasources": ["ds1"], "allowed_tables": tables}
+    path.write_text(json.dumps({"version": 1, "roles": {"analyst": role}}), encoding="utf-8")
+    return path
+
+
+def test_policy_reload_recompiles_graph_and_drops_cached_answers(monkeypatch, tmp_path):
+    # Validates the reload path because nodes capture RBAC at build time, so a stale graph
+    # (or a cached answer) would keep serving tables the new policies revoke.
+    # Arrange
+    monkeypatch.setattr("nl2sql.pipeline.graph.build_graph", lambda ctx, execute=True: object())
+    cleared = []
+    ctx = NL2SQLContext.__new__(NL2SQLContext)
+    ctx.config_manager = ConfigManager()
+    ctx.ds_registry = SimpleNamespace(revision=0)
+    ctx.llm_registry = SimpleNamespace(revision=0)
+    ctx._policies_revision = 0
+    ctx.graph_cache = CompiledGraphCache()
+    ctx.plan_cache = ctx.plan_templates = None
+    ctx.answer_cache = SimpleNamespace(clear=lambda: cleared.append("answers"))
+    api = PolicyAPI(ctx)
+    api.reload_policies(_policies_file(tmp_path, ["ds1.orders", "ds1.users"]))
+    first = get_compiled_graph(ctx, execute=True)
+
+    # Act
+    api.reload_policies(_policies_file(tmp_path, ["ds1.orders"]))
+    second = get_compiled_graph(ctx, execute=True)
+
+    # Assert
+    assert first is not second
+    assert ctx.rbac.policies["analyst"].allowed_tables == ["ds1.orders"]
+    assert cleared == ["answers", "answers"]
@@ -0,0 +1,97 @@
+import asyncio
+
+from langchain_core.language_models import FakeListChatModel
+from pydantic import SecretStr
+
+from nl2sql.llm import AgentConfig, InMemoryLLMCache, LLMRegistry, SqliteLLMCache
+from nl2sql.llm.cache import AgentLLMCache
+from nl2sql.secrets import SecretManager
+
+
+class _Counter:
+    def __init__(self):
+        self.calls = []
+
+    def add(self, amount, attributes=None):
+        self.calls.append((amount, attributes))
+
+
+def _model(backend, agent="planner"):
+    responses = ["first", "second", "third", "fourth", "fifth"]
+    return FakeListChatModel(responses=responses, cache=AgentLLMCache(backend, agent))
+
+
+def test_identical_calls_are_served_from_cache(monkeypatch):
+    # Validates caching because deterministic agents should not pay twice for the same prompt.
+    # Arrange
+    hits, misses = _Counter(), _Counter()
+    monkeypatch.setattr("nl2sql.llm.cache.llm_cache_hit_counter", hits)
+    monkeypatch.setattr("nl2sql.llm.cache.llm_cache_miss_counter", misses)
+    model = _model(InMemoryLLMCache())
+
+    # Act
+    first = model.invoke("plan sales").content
+    repeated = model.invoke("plan sales").content
+    repeated_async = asyncio.run(model.ainvoke("plan sales")).content
+    other = model.invoke("plan returns").content
+
+    # Assert
+    assert (first, repeated, repeated_async, other) == ("first", "first", "first", "second")
+    assert hits.calls == [(1, {"agent": "planner"})] * 2
+    assert len(misses.calls) == 2
+
+
+def test_sqlite_cache_is_shared_across_instances(tmp_path):
+    # Validates the on-disk backend because worker processes must reuse each other's responses.
+    # Arrange
+    path = tmp_path / "llm_cache.db"
+    _model(SqliteLLMCache(path)).invoke("plan sales")
+
+    # Act
+    answer = _model(SqliteLLMCache(path)).invoke("plan sales").content
+
+    # Assert
+    assert answer == "first"
+
+
+def test_cache_limits_apply_ttl_and_lru(monkeypatch, tmp_path):
+    # Validates limits because an unbounded cache would grow without end and serve stale answers.
+    for backend in (InMemoryLLMCache(max_entries=2, ttl_sec=60), SqliteLLMCache(tmp_path / "c.db", max_entries=2, ttl_sec=60)):
+        # Arrange
+        now = [1000.0]
+        monkeypatch.setattr("nl2sql.llm.cache.time.time", lambda: now[0])
+        model = _model(backend)
+        model.invoke("a")
+        model.invoke("b")
+        now[0] += 1
+        model.invoke("a")
+        now[0] += 1
+
+        # Act
+        model.invoke("c")
+        a_after_evict = model.invoke("a").content
+        b_after_evict = model.invoke("b").content
+        now[0] += 120
+        a_after_ttl = model.invoke("a").content
+
+        # Assert
+        assert a_after_evict == "first"
+        assert b_after_evict == "fourth"
+        assert a_after_ttl == "fifth"
+        assert len(backend) <= 2
+
+
+def test_registry_attaches_cache_only_to_opted_in_agents(tmp_path):
+    # Validates per-agent opt-in because non-deterministic agents must always call the provider.
+    # Arrange
+    registry = LLMRegistry(SecretManager(), cache_backend=InMemoryLLMCache())
+    key = SecretStr("sk-test")
+
+    # Act
+    registry.register_llm(AgentConfig(provider="openai", model="m", name="planner", api_key=key, cache=True))
+    registry.register_llm(AgentConfig(provider="openai", model="m", name="synth", api_key=key))
+
+    # Assert
+    assert isinstance(registry.get_llm("planner").cache, AgentLLMCache)
+    assert registry.get_llm("planner").cache.agent_name == "planner"
+    assert registry.get_llm("synth").cache is None
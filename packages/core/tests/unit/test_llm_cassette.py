@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+from nl2sql.indexing.embeddings import LocalHashEmbeddings
+from nl2sql.llm.cassette import Cassette, CassetteEmbeddings, CassetteMiss, CassetteRecorder
+
+
+def _prompt(text="plan sales"):
+    return [HumanMessage(content=text)]
+
+
+def test_recorded_llm_responses_replay_by_prompt_hash(tmp_path):
+    # Validates the round trip because offline benchmarks must see the same model output.
+    # Arrange
+    path = tmp_path / "cassette.jsonl"
+    recorder = CassetteRecorder(Cassette(str(path), "record"), "planner")
+    llm = FakeListChatModel(responses=["first", "second"], callbacks=[recorder])
+    llm.invoke(_prompt())
+    llm.invoke(_prompt())
+
+    # Act
+    replay = Cassette(str(path), "replay")
+    answers = [replay.replay_llm(_prompt()).generations[0].message.content for _ in range(3)]
+
+    # Assert
+    assert answers == ["first", "second", "first"]
+    assert len(replay) == 2
+
+
+def test_unrecorded_prompt_raises_cassette_miss(tmp_path):
+    # Validates misses because replay must never fall through to a real API.
+    path = tmp_path / "cassette.jsonl"
+    FakeListChatModel(responses=["x"], callbacks=[CassetteRecorder(Cassette(str(path), "record"), "a")]).invoke(_prompt())
+
+    with pytest.raises(CassetteMiss):
+        asyncio.run(Cassette(str(path), "replay").areplay_llm(_prompt("something else")))
+
+
+def test_embeddings_replay_without_the_real_model(tmp_path):
+    # Validates embedding replay because vector search must be reproducible offline.
+    # Arrange
+    path = tmp_path / "cassette.jsonl"
+    inner = LocalHashEmbeddings(dimensions=16)
+    recorded = CassetteEmbeddings(Cassette(str(path), "record"), "local", inner=inner).embed_documents(["a b", "c"])
+
+    # Act
+    replay = CassetteEmbeddings(Cassette(str(path), "replay"), "local")
+
+    # Assert
+    assert replay.embed_documents(["a b", "c"]) == recorded
+    assert replay.embed_query("c") == recorded[1]
+    with pytest.raises(CassetteMiss):
+        replay.embed_query("unseen")
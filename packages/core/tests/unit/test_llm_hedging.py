@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from nl2sql.llm.hedging import Hedger
+
+
+@pytest.fixture(autouse=True)
+def _hedge_settings(monkeypatch):
+    monkeypatch.setattr("nl2sql.llm.hedging.settings.llm_hedge_min_samples", 3)
+    monkeypatch.setattr("nl2sql.llm.hedging.settings.llm_hedge_min_delay_sec", 0.01)
+    monkeypatch.setattr("nl2sql.llm.hedging.settings.llm_hedge_max_ratio", 0.5)
+
+
+def _warm(hedger, latency=0.01, calls=3):
+    for _ in range(calls):
+        hedger.run(lambda: time.sleep(latency))
+
+
+def test_no_hedging_until_latencies_are_known():
+    # Validates warm-up because hedging without a latency baseline would double every call.
+    hedger = Hedger("planner")
+    assert hedger.hedge_delay() is None
+
+    _warm(hedger)
+
+    assert hedger.hedge_delay() == pytest.approx(0.01, abs=0.02)
+
+
+def test_slow_call_is_hedged_and_first_response_wins():
+    # Validates hedging because a stuck request must not define the pipeline's latency.
+    # Arrange
+    hedger = Hedger("planner")
+    _warm(hedger)
+    calls = []
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            calls.append(len(calls))
+            attempt = calls[-1]
+        time.sleep(1.0 if attempt == 0 else 0.01)
+        return attempt
+
+    # Act
+    start = time.monotonic()
+    result = hedger.run(call)
+
+    # Assert
+    assert result == 1
+    assert time.monotonic() - start < 0.5
+
+
+def test_hedge_budget_caps_extra_requests(monkeypatch):
+    # Validates the spend cap because hedges must stay a small fraction of calls.
+    monkeypatch.setattr("nl2sql.llm.hedging.settings.llm_hedge_max_ratio", 0.0)
+    hedger = Hedger("planner")
+    _warm(hedger)
+    calls = []
+
+    result = hedger.run(lambda: calls.append(1) or time.sleep(0.1) or "slow")
+
+    assert result == "slow"
+    assert len(calls) == 1
+
+
+def test_async_hedge_cancels_the_loser():
+    # Validates cancellation because a losing request must not keep consuming quota.
+    # Arrange
+    hedger = Hedger("planner")
+    _warm(hedger)
+    state = {"calls": 0, "cancelled": False}
+
+    async def acall():
+        state["calls"] += 1
+        attempt = state["calls"]
+        try:
+            await asyncio.sleep(1.0 if attempt == 1 else 0.01)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        return attempt
+
+    async def main():
+        result = await hedger.arun(acall)
+        await asyncio.sleep(0)
+        return result
+
+    # Act
+    result = asyncio.run(main())
+
+    # Assert
+    assert result == 2
+    assert state["cancelled"] is True
@@ -0,0 +1,83 @@
+import asyncio
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from nl2sql.indexing.embeddings import LocalHashEmbeddings
+from nl2sql.llm.local import LocalChatModel
+from nl2sql.pipeline.nodes.ast_planner.prompts import PLANNER_SYSTEM_PROMPT, PLANNER_USER_PROMPT
+from nl2sql.pipeline.nodes.ast_planner.schemas import PlanModel
+from nl2sql.pipeline.nodes.decomposer.prompts import DECOMPOSER_SYSTEM_PROMPT, DECOMPOSER_USER_PROMPT
+from nl2sql.pipeline.nodes.decomposer.schemas import DecomposerResponse
+
+
+def _decompose(llm, query="Show revenue from last year"):
+    prompt = ChatPromptTemplate.from_messages([("system", DECOMPOSER_SYSTEM_PROMPT), ("human", DECOMPOSER_USER_PROMPT)])
+    chain = prompt | llm.with_structured_output(DecomposerResponse, method="function_calling")
+    return chain.invoke({"user_query": query, "resolved_datasources": [{"datasource_id": "sales_db"}]})
+
+
+def test_fake_decomposition_targets_the_resolved_datasource():
+    # Validates the rule output because offline runs must pass the decomposer's own validation.
+    response = _decompose(LocalChatModel(agent="decomposer"))
+
+    assert [sq.datasource_id for sq in response.sub_queries] == ["sales_db"]
+    assert "from" not in response.sub_queries[0].intent.lower()
+    assert response.combine_groups[0].operation == "standalone"
+
+
+def test_fake_plan_selects_expected_columns_from_the_first_table():
+    # Validates planning because the generator and executor need a plan over real tables.
+    prompt = ChatPromptTemplate.from_messages([("system", PLANNER_SYSTEM_PROMPT), ("human", PLANNER_USER_PROMPT)])
+    chain = prompt | LocalChatModel().with_structured_output(PlanModel)
+
+    plan = chain.invoke(
+        {
+            "relevant_tables": "TABLE orders -- sales orders\n  PRIMARY KEY (id)\n  id INTEGER\n  amount DECIMAL",
+            "feedback": "",
+            "expected_schema": [{"name": "amount", "dtype": "float"}],
+            "semantic_context": "",
+            "user_query": "order amounts",
+        }
+    )
+
+    assert plan.tables[0].name == "orders"
+    assert [(i.expr.column_name, i.alias) for i in plan.select_items] == [("amount", "amount")]
+
+
+def test_replay_serves_recordings_round_robin_with_latency():
+    # Validates replay because load tests depend on recorded outputs and realistic timing.
+    # Arrange
+    recorded = {
+        "sub_queries": [{"id": "sq_9", "datasource_id": "hr_db", "intent": "headcount"}],
+        "combine_groups": [{"group_id": "g", "operation": "standalone", "inputs": [{"subquery_id": "sq_9"}]}],
+    }
+    llm = LocalChatModel(
+        agent="decomposer",
+        mode="local_replay",
+        latency_ms=20,
+        responses={"decomposer": [recorded, "plain text"]},
+    )
+
+    # Act
+    first = _decompose(llm)
+    text = asyncio.run(llm.ainvoke("hello")).content
+    again = _decompose(llm)
+
+    # Assert
+    assert first.sub_queries[0].id == "sq_9"
+    assert text == "plain text"
+    assert again == first
+
+
+def test_local_embeddings_are_deterministic_and_similarity_preserving():
+    # Validates embeddings because offline retrieval must be repeatable and roughly semantic.
+    embeddings = LocalHashEmbeddings(dimensions=64)
+    sales, sales_again, hr = embeddings.embed_documents(["sales revenue", "sales revenue", "employee headcount"])
+    query = embeddings.embed_query("total sales revenue")
+
+    def dot(a, b):
+        return sum(x * y for x, y in zip(a, b))
+
+    assert sales == sales_again
+    assert len(sales) == 64
+    assert dot(query, sales) > dot(query, hr)
@@ -0,0 +1,117 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+from nl2sql.llm.pool import LLMEndpoint, LLMPool, LLMPoolExhausted, TokenBucket, retry_after
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, headers=None):
+        super().__init__("429")
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class _Flaky:
+    """Chat model stub that raises the queued errors before answering."""
+
+    def __init__(self, errors=(), answer="ok"):
+        self.errors = list(errors)
+        self.model = FakeListChatModel(responses=[answer] * 10)
+        self.calls = 0
+
+    def _generate(self, messages, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.model._generate(messages, **kwargs)
+
+    async def _agenerate(self, messages, **kwargs):
+        return self._generate(messages, **kwargs)
+
+
+def _messages():
+    return [HumanMessage(content="plan sales")]
+
+
+def _text(result):
+    return result.generations[0].message.content
+
+
+def test_rate_limited_call_fails_over_and_cools_down_endpoint():
+    # Validates 429 handling because rate limits must move traffic instead of failing requests.
+    # Arrange
+    first = _Flaky(errors=[_RateLimited({"retry-after": "20"})], answer="first")
+    second = _Flaky(answer="second")
+    pool = LLMPool("planner", [LLMEndpoint("a", first), LLMEndpoint("b", second)])
+
+    # Act
+    answer = _text(pool.generate(_messages()))
+
+    # Assert
+    assert answer == "second"
+    health = {h["name"]: h for h in pool.health()}
+    assert 19 < health["a"]["cooldown_sec"] <= 20
+    assert health["a"]["rate_limit_streak"] == 1
+    assert health["b"]["in_flight"] == 0
+
+
+def test_least_loaded_routing_spreads_sequential_calls():
+    # Validates routing because idle endpoints should share load rather than pile onto one key.
+    first, second = _Flaky(), _Flaky()
+    pool = LLMPool("planner", [LLMEndpoint("a", first), LLMEndpoint("b", second)])
+
+    for _ in range(4):
+        pool.generate(_messages())
+
+    assert (first.calls, second.calls) == (2, 2)
+
+
+def test_non_retryable_errors_are_raised_without_failover():
+    # Validates error classification because bad requests fail the same way on every endpoint.
+    second = _Flaky()
+    pool = LLMPool("planner", [LLMEndpoint("a", _Flaky(errors=[ValueError("bad")])), LLMEndpoint("b", second)])
+
+    with pytest.raises(ValueError):
+        pool.generate(_messages())
+    assert second.calls == 0
+
+
+def test_exhausted_pool_raises_when_wait_exceeds_budget(monkeypatch):
+    # Validates the wait budget because callers must not stall behind a long cooldown.
+    monkeypatch.setattr("nl2sql.llm.pool.settings.llm_pool_max_wait_sec", 1.0)
+    endpoint = _Flaky(errors=[_RateLimited({"retry-after-ms": "60000"})])
+    pool = LLMPool("planner", [LLMEndpoint("a", endpoint)])
+
+    with pytest.raises(LLMPoolExhausted):
+        pool.generate(_messages())
+
+
+def test_async_generate_uses_the_pool():
+    # Validates parity because async nodes share the same endpoints and limits.
+    pool = LLMPool("planner", [LLMEndpoint("a", _Flaky(errors=[_RateLimited()])), LLMEndpoint("b", _Flaky(answer="b"))])
+
+    assert _text(asyncio.run(pool.agenerate(_messages()))) == "b"
+
+
+def test_token_bucket_throttles_and_recovers():
+    # Validates adaptive limits because a 429 should slow the client before the next one.
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(60)
+    assert bucket.wait_time(1, bucket.updated) == pytest.approx(1.0)
+
+    bucket.throttle()
+    assert bucket.capacity == 30
+    bucket.recover()
+    assert bucket.factor == pytest.approx(0.6)
+
+
+def test_retry_after_parses_rate_limit_reset_headers():
+    # Validates header parsing because OpenAI reports resets as durations like "6m0s".
+    assert retry_after(_RateLimited({"x-ratelimit-reset-requests": "1s", "x-ratelimit-reset-tokens": "6m0s"})) == 360
+    assert retry_after(_RateLimited({"retry-after-ms": "250"})) == 0.25
+    assert retry_after(_RateLimited()) is None
@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from nl2sql.llm import AgentConfig, LLMRegistry
+from nl2sql.llm.routing import LARGE, SIMPLE, SMALL, ModelRoute, complexity_score
+from nl2sql.pipeline.nodes.ast_planner.node import ASTPlannerNode
+from nl2sql.pipeline.nodes.ast_planner.schemas import PlanModel
+from nl2sql.pipeline.nodes.decomposer.schemas import FilterSpec, GroupBySpec, SubQuery
+from nl2sql.pipeline.nodes.schema_retriever.schema import Column, Table
+from nl2sql.pipeline.state import SubgraphExecutionState
+from nl2sql.secrets import SecretManager
+
+
+def _sub_query(filters=0, group_by=0, intent="count orders"):
+    return SubQuery(
+        id="sq1",
+        datasource_id="ds1",
+        intent=intent,
+        filters=[FilterSpec(attribute=f"a{i}", operator="=", value=i) for i in range(filters)],
+        group_by=[GroupBySpec(attribute=f"g{i}") for i in range(group_by)],
+    )
+
+
+def _tables(count):
+    return [Table(name=f"t{i}", columns=[Column(name="id", type="int")]) for i in range(count)]
+
+
+def _registry():
+    registry = LLMRegistry(SecretManager())
+    registry.register_llm(AgentConfig(provider="fake", model="default"))
+    registry.register_llm(
+        AgentConfig(provider="fake", model="large", name="astplanner", small_agent="astplanner_small", small_max_complexity=2)
+    )
+    registry.register_llm(AgentConfig(provider="fake", model="small", name="astplanner_small"))
+    return registry
+
+
+def test_complexity_score_counts_joins_filters_groups_and_combines():
+    # Validates scoring because routing thresholds are tuned against it.
+    assert complexity_score(_sub_query(), _tables(1)) == 0
+    sub_query = _sub_query(filters=2, group_by=1, intent="count t0 per t1 and t2")
+    assert complexity_score(sub_query, _tables(3), combine_groups=1) == 8
+
+
+def test_complexity_score_ignores_retrieved_tables_the_sub_query_does_not_reference():
+    # Validates table counting because the retriever returns a top-k of tables, not the ones a plan joins.
+    # Arrange
+    names = ["orders", "customers", "products", "order_items", "invoices", "payments", "shipments", "regions"]
+    tables = [Table(name=f"sales.{n}", columns=[Column(name="id", type="int")]) for n in names]
+    tables[1].columns.append(Column(name="segment", type="string"))
+    registry = _registry()
+
+    # Act
+    simple = complexity_score(_sub_query(intent="How many orders were placed last week"), tables)
+    grouped = complexity_score(
+        SubQuery(id="sq1", datasource_id="ds1", intent="Orders per segment", group_by=[GroupBySpec(attribute="segment")]),
+        tables,
+    )
+
+    # Assert
+    assert simple == 0
+    assert registry.route("astplanner", simple).tier == SMALL
+    assert grouped == 3
+
+
+def test_registry_routes_simple_requests_to_the_small_model():
+    # Validates the cascade because trivial plans should not pay for the large model.
+    registry = _registry()
+
+    simple = registry.route("astplanner", complexity=1)
+    complex_ = registry.route("astplanner", complexity=5)
+    escalated = registry.route("astplanner", complexity=1, escalate=True)
+
+    assert (simple.tier, simple.llm) == (SMALL, registry.llms["astplanner_small"])
+    assert (complex_.tier, complex_.reason) == (LARGE, "complex")
+    assert (escalated.tier, escalated.reason, escalated.llm) == (LARGE, "escalated", registry.llms["astplanner"])
+    assert registry.route("decomposer", complexity=0).tier is None
+
+
+def test_planner_uses_small_chain_first_and_large_chain_on_retry():
+    # Validates escalation because a rejected small-model plan must be retried on the large model.
+    # Arrange
+    large, small = MagicMock(), MagicMock()
+    ctx = SimpleNamespace(llm_registry=MagicMock())
+    ctx.llm_registry.get_llm.return_value = large
+    node = ASTPlannerNode(ctx)
+    node.chain = MagicMock()
+    node.chain.invoke.return_value = PlanModel(reasoning="large")
+    state = SubgraphExecutionState(trace_id="t", sub_query=_sub_query(), relevant_tables=_tables(1))
+
+    # Act
+    ctx.llm_registry.route.return_value = ModelRoute(SMALL, small, 0, SIMPLE)
+    route, chain = node._select_chain(state)
+    ctx.llm_registry.route.return_value = ModelRoute(LARGE, large, 0, "escalated")
+    node(state.model_copy(update={"retry_count": 1}))
+
+    # Assert
+    assert route.tier == SMALL and chain is not node.chain
+    small.with_structured_output.assert_called_once_with(PlanModel)
+    assert ctx.llm_registry.route.call_args.kwargs["escalate"] is True
+    node.chain.invoke.assert_called_once()
@@ -73,3 +73,105 @@ def test_decomposer_maps_unmapped_and_stabilizes_ids():
     assert result.sub_queries[0].datasource_id == "allowed"
     assert result.unmapped_subqueries
     assert result.post_combine_ops[0].op_id.startswith("op_")
+
+
+def test_decomposer_async_path_matches_sync_path():
+    # Validates the async entry point because graph.ainvoke must produce the same decomposition.
+    # Arrange
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    llm = MagicMock()
+    llm.with_structured_output.return_value = llm
+    ctx = SimpleNamespace(llm_registry=MagicMock())
+    ctx.llm_registry.get_llm.return_value = llm
+    node = DecomposerNode(ctx)
+    llm_response = DecomposerResponse(
+        sub_queries=[
+            SubQuery(id="sq1", intent="ok", datasource_id="allowed", metrics=[], filters=[], group_by=[], expected_schema=[]),
+        ],
+        combine_groups=[],
+        post_combine_ops=[],
+        unmapped_subqueries=[],
+    )
+    node.chain = MagicMock()
+    node.chain.invoke.return_value = llm_response
+    node.chain.ainvoke = AsyncMock(return_value=llm_response)
+    state = GraphState(
+        user_query="test",
+        datasource_resolver_response=DatasourceResolverResponse(
+            resolved_datasources=[ResolvedDatasource(datasource_id="allowed", metadata={})],
+            allowed_datasource_ids=["allowed"],
+            unsupported_datasource_ids=[],
+        ),
+    )
+
+    # Act
+    sync_result = node(state)["decomposer_response"]
+    async_result = asyncio.run(node.acall(state))["decomposer_response"]
+
+    # Assert
+    node.chain.ainvoke.assert_awaited_once()
+    assert async_result == sync_result
+
+
+def _cached_node_and_state(allowed):
+    from nl2sql.pipeline.decomposition_cache import DecompositionCache
+
+    llm = MagicMock()
+    llm.with_structured_output.return_value = llm
+    ctx = SimpleNamespace(llm_registry=MagicMock(), decomposition_cache=DecompositionCache())
+    ctx.llm_registry.get_llm.return_value = llm
+    node = DecomposerNode(ctx)
+    node.chain = MagicMock()
+    node.chain.invoke.return_value = DecomposerResponse(
+        sub_queries=[
+            SubQuery(id="sq1", intent="ok", datasource_id="sales", metrics=[], filters=[], group_by=[], expected_schema=[]),
+        ],
+        combine_groups=[],
+        post_combine_ops=[],
+        unmapped_subqueries=[],
+    )
+
+    def _state(query, version="v1", allowed_ids=allowed):
+        return GraphState(
+            user_query=query,
+            datasource_resolver_response=DatasourceResolverResponse(
+                resolved_datasources=[ResolvedDatasource(datasource_id="sales", schema_version=version)],
+                allowed_datasource_ids=list(allowed_ids),
+                unsupported_datasource_ids=[],
+            ),
+        )
+
+    return node, _state
+
+
+def test_decomposer_reuses_cached_decomposition():
+    # Validates the cache because repeated questions must skip the decomposer LLM.
+    # Arrange
+    node, make_state = _cached_node_and_state(["sales"])
+
+    # Act
+    first = node(make_state("Total sales"))
+    second = node(make_state("total  sales"))
+
+    # Assert
+    node.chain.invoke.assert_called_once()
+    assert second["decomposer_response"] == first["decomposer_response"]
+    assert second["reasoning"][0]["content"] == "Decomposition reused from cache."
+
+
+def test_decomposer_cache_is_keyed_on_schema_version_and_access():
+    # Validates the key because schema refreshes and RBAC changes must not replay stale output.
+    # Arrange
+    node, make_state = _cached_node_and_state(["sales"])
+    node(make_state("total sales"))
+
+    # Act
+    node(make_state("total sales", version="v2"))
+    restricted = node(make_state("total sales", allowed_ids=[]))
+
+    # Assert
+    assert node.chain.invoke.call_count == 3
+    assert restricted["decomposer_response"].sub_queries == []
+    assert restricted["decomposer_response"].unmapped_subqueries[0].reason == "restricted_datasource"
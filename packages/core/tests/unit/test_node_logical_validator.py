@@ -136,8 +136,9 @@ def test_logical_validator_duplicate_aliases():
     assert any(e.error_code == ErrorCode.INVALID_PLAN_STRUCTURE for e in result["errors"])
 
 
-def test_logical_validator_invalid_ordinals():
+def test_logical_validator_invalid_ordinals(monkeypatch):
     # Validates ordinal checks because non-contiguous ordinals should be rejected.
+    monkeypatch.setattr(settings, "plan_repair_enabled", False)
     node = LogicalValidatorNode(_ctx())
     plan = PlanModel(
         query_type="READ",
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+
+from nl2sql.common.concurrency import ConcurrencyLimits, KeyedLimiter, datasource_slot, llm_slot
+from nl2sql.pipeline.batch import BatchQuery, BatchRun
+
+
+class _VectorStore:
+    def __init__(self):
+        self.primed = []
+
+    def prime_query_embeddings(self, queries):
+        self.primed.append(list(queries))
+        return len(queries)
+
+
+def test_batch_dedupes_identical_questions_and_maps_all_indices():
+    # Validates deduplication because repeated nightly questions must only run once.
+    # Arrange
+    calls = []
+
+    def run_one(item):
+        calls.append(item.query)
+        return {"answer": item.query}
+
+    batch = ["total sales", "total  sales ", BatchQuery("total sales", datasource_id="ds1"), "top users"]
+
+    # Act
+    run = BatchRun(batch, run_one, concurrency=2)
+    results = list(run)
+
+    # Assert
+    assert sorted(calls) == ["top users", "total sales", "total sales"]
+    indices = sorted(i for r in results for i in r.indices)
+    assert indices == [0, 1, 2, 3]
+    assert run.stats.total == 4
+    assert run.stats.unique == 3
+    assert run.stats.duplicates == 1
+    assert run.stats.completed == 3
+    assert run.stats.throughput_qps > 0
+
+
+def test_batch_embeds_unresolved_questions_once_up_front():
+    # Validates shared embedding because the resolver should not embed per request.
+    # Arrange
+    store = _VectorStore()
+
+    # Act
+    list(BatchRun(["a", "b", "a", BatchQuery("c", datasource_id="ds1")], lambda q: {}, vector_store=store))
+
+    # Assert
+    assert store.primed == [["a", "b"]]
+
+
+def test_batch_reports_failures_without_stopping():
+    # Validates isolation because one broken question must not abort the batch.
+    # Arrange
+    def run_one(item):
+        if item.query == "bad":
+            raise RuntimeError("boom")
+        if item.query == "errors":
+            return {"errors": ["x"]}
+        return {}
+
+    # Act
+    run = BatchRun(["ok", "bad", "errors"], run_one, concurrency=3)
+    results = {r.query.query: r for r in run}
+
+    # Assert
+    assert results["ok"].success
+    assert results["bad"].error == "boom"
+    assert not results["errors"].success
+    assert run.stats.failed == 2
+
+
+def test_batch_limits_bound_concurrency_per_datasource_and_llm():
+    # Validates per-key limits because one datasource/LLM must not absorb the whole batch.
+    # Arrange
+    lock = threading.Lock()
+    active = {"ds": 0, "llm": 0}
+    peak = {"ds": 0, "llm": 0}
+
+    def _enter(kind):
+        with lock:
+            active[kind] += 1
+            peak[kind] = max(peak[kind], active[kind])
+        time.sleep(0.02)
+        with lock:
+            active[kind] -= 1
+
+    def run_one(item):
+        with llm_slot("decomposer"):
+            _enter("llm")
+        with datasource_slot("ds1"):
+            _enter("ds")
+        return {}
+
+    limits = ConcurrencyLimits(per_llm=2, per_datasource=1)
+
+    # Act
+    list(BatchRun([f"q{i}" for i in range(8)], run_one, concurrency=8, limits=limits))
+
+    # Assert
+    assert peak["llm"] <= 2
+    assert peak["ds"] == 1
+
+
+def test_slots_are_noops_without_active_limits():
+    # Validates the default path because single queries must not pay for batch limits.
+    # Act / Assert
+    with llm_slot("decomposer"), datasource_slot("ds1"):
+        pass
+
+
+def test_cancelled_async_waiter_does_not_leak_its_slot():
+    # Validates cancellation because a lost slot would deadlock the key after `limit` cancellations.
+    # Arrange
+    limiter = KeyedLimiter(1)
+
+    async def _wait():
+        async with limiter.aslot("decomposer"):
+            pass
+
+    async def _main():
+        with limiter.slot("decomposer"):
+            waiter = asyncio.ensure_future(_wait())
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        # Act
+        await asyncio.wait_for(_wait(), timeout=1)
+        return waiter
+
+    # Assert
+    assert asyncio.run(_main()).cancelled()
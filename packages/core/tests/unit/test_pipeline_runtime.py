@@ -0,0 +1,206 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from nl2sql.common import cancellation
+from nl2sql.common.cancellation import CancellationToken
+from nl2sql.common.errors import ErrorCode
+from nl2sql.common.settings import settings
+from nl2sql.pipeline.runtime import arun_with_graph, run_with_graph
+from nl2sql.pipeline.worker_pool import PipelineWorkerPool
+
+
+class _Graph:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def invoke(self, state, config=None):
+        return self._fn(state)
+
+    async def ainvoke(self, state, config=None):
+        return await self._fn(state)
+
+
+def _ctx():
+    return SimpleNamespace(worker_pool=PipelineWorkerPool(max_workers=4))
+
+
+def test_run_with_graph_uses_shared_worker_pool(monkeypatch):
+    # Validates pool reuse because requests must not create an executor per call.
+    # Arrange
+    threads = set()
+
+    def fn(state):
+        threads.add(threading.current_thread().name)
+        return {"user_query": state["user_query"]}
+
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _Graph(fn))
+    ctx = _ctx()
+
+    # Act
+    results = [run_with_graph(ctx, f"q{i}") for i in range(3)]
+
+    # Assert
+    assert [r["user_query"] for r in results] == ["q0", "q1", "q2"]
+    assert all(name.startswith("nl2sql-pipeline") for name in threads)
+    ctx.worker_pool.shutdown()
+
+
+def test_run_with_graph_threads_request_token_into_state(monkeypatch):
+    # Validates token propagation because nodes must observe their own request only.
+    # Arrange
+    seen = {}
+
+    def fn(state):
+        seen["token"] = state["cancel_token"]
+        return {}
+
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _Graph(fn))
+    token = CancellationToken()
+
+    # Act
+    run_with_graph(_ctx(), "q", cancel_token=token)
+
+    # Assert
+    assert seen["token"] is token
+
+
+def test_cancelling_one_request_does_not_affect_another(monkeypatch):
+    # Validates isolation because a cancel must not leak across concurrent requests.
+    # Arrange
+    release = threading.Event()
+
+    def fn(state):
+        release.wait(timeout=5)
+        return {"cancelled": state["cancel_token"].is_cancelled()}
+
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _Graph(fn))
+    ctx = _ctx()
+    first, second = CancellationToken(), CancellationToken()
+    results = {}
+
+    t1 = threading.Thread(target=lambda: results.__setitem__("first", run_with_graph(ctx, "a", cancel_token=first)))
+    t2 = threading.Thread(target=lambda: results.__setitem__("second", run_with_graph(ctx, "b", cancel_token=second)))
+    t1.start()
+    t2.start()
+
+    # Act
+    first.cancel()
+    t1.join(timeout=5)
+    release.set()
+    t2.join(timeout=5)
+
+    # Assert
+    assert results["first"]["errors"][0].error_code == ErrorCode.CANCELLED
+    assert results["second"] == {"cancelled": False}
+    ctx.worker_pool.shutdown()
+
+
+def test_timed_out_request_never_starts_once_dequeued(monkeypatch):
+    # Validates timeout cleanup because a graph queued behind busy workers must not run after the caller gave up.
+    # Arrange
+    started = threading.Event()
+    release = threading.Event()
+    monkeypatch.setattr(
+        "nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _Graph(lambda _s: started.set())
+    )
+    monkeypatch.setattr(settings, "global_timeout_sec", 0.2)
+    ctx = SimpleNamespace(worker_pool=PipelineWorkerPool(max_workers=1))
+    blocker = ctx.worker_pool.submit(release.wait, 5)
+
+    # Act
+    result = run_with_graph(ctx, "q")
+    release.set()
+    blocker.result(timeout=5)
+    ctx.worker_pool.shutdown()
+
+    # Assert
+    assert result["errors"][0].error_code == ErrorCode.PIPELINE_TIMEOUT
+    assert not started.is_set()
+
+
+def test_process_wide_cancel_reaches_registered_tokens():
+    # Validates signal fan-out because SIGINT must stop every in-flight request.
+    # Arrange
+    token = CancellationToken()
+    cancellation.register(token)
+
+    # Act
+    cancellation.cancel()
+
+    # Assert
+    assert token.is_cancelled()
+    cancellation.unregister(token)
+
+
+def test_process_wide_cancel_does_not_outlive_in_flight_requests():
+    # Validates the fan-out leaves no global flag because later requests would otherwise start cancelled.
+    # Arrange
+    cancellation.cancel()
+
+    # Act
+    later = CancellationToken()
+
+    # Assert
+    assert not cancellation.is_cancelled()
+    assert not cancellation.is_cancelled(later)
+    assert cancellation.wait(timeout=0) is False
+
+
+def test_arun_with_graph_awaits_graph_on_event_loop(monkeypatch):
+    # Validates the async path because it must not hop onto the worker pool.
+    # Arrange
+    seen = {}
+
+    async def fn(state):
+        seen["token"] = state["cancel_token"]
+        return {"user_query": state["user_query"]}
+
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _Graph(fn))
+    ctx = SimpleNamespace()
+    token = CancellationToken()
+
+    # Act
+    result = asyncio.run(arun_with_graph(ctx, "q", cancel_token=token))
+
+    # Assert
+    assert result == {"user_query": "q"}
+    assert seen["token"] is token
+
+
+def test_arun_with_graph_times_out_and_cancels_token(monkeypatch):
+    # Validates the timeout because a hung LLM call must not hold the request forever.
+    # Arrange
+    async def fn(state):
+        await asyncio.sleep(5)
+        return {}
+
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _Graph(fn))
+    monkeypatch.setattr("nl2sql.pipeline.runtime.settings.global_timeout_sec", 0.2)
+    token = CancellationToken()
+
+    # Act
+    result = asyncio.run(arun_with_graph(SimpleNamespace(), "q", cancel_token=token))
+
+    # Assert
+    assert result["errors"][0].error_code == ErrorCode.PIPELINE_TIMEOUT
+    assert token.is_cancelled()
+
+
+def test_arun_with_graph_returns_cancelled_when_token_cancelled(monkeypatch):
+    # Validates cancellation because the caller's token must stop an awaiting request.
+    # Arrange
+    token = CancellationToken()
+
+    async def fn(state):
+        token.cancel()
+        await asyncio.sleep(5)
+        return {}
+
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _Graph(fn))
+
+    # Act
+    result = asyncio.run(arun_with_graph(SimpleNamespace(), "q", cancel_token=token))
+
+    # Assert
+    assert result["errors"][0].error_code == ErrorCode.CANCELLED
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langgraph.graph import END, StateGraph
+
+from nl2sql.common.cancellation import CancellationToken
+from nl2sql.common.errors import ErrorCode
+from nl2sql.pipeline.runtime import astream_with_graph, stream_with_graph
+from nl2sql.pipeline.state import GraphState
+from nl2sql.pipeline.streaming import PipelineEventTranslator
+from nl2sql.pipeline.worker_pool import PipelineWorkerPool
+
+
+def _graph():
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="two rows found")]))
+
+    def resolver(state):
+        return {"reasoning": [{"node": "datasource_resolver", "content": "resolved"}]}
+
+    def synthesizer(state):
+        llm.invoke("summarize")
+        return {"warnings": [{"node": "answer_synthesizer", "content": "done"}]}
+
+    graph = StateGraph(GraphState)
+    graph.add_node("datasource_resolver", resolver)
+    graph.add_node("answer_synthesizer", synthesizer)
+    graph.set_entry_point("datasource_resolver")
+    graph.add_edge("datasource_resolver", "answer_synthesizer")
+    graph.add_edge("answer_synthesizer", END)
+    return graph.compile()
+
+
+def test_translator_emits_node_updates_and_synthesizer_tokens_only():
+    # Validates filtering because only answer tokens should reach clients, not planner chatter.
+    # Arrange
+    translator = PipelineEventTranslator("t1")
+    tool_chunk = AIMessageChunk(content="", tool_call_chunks=[{"name": "x", "args": '{"summary"', "id": "1", "index": 0}])
+
+    # Act
+    events = list(translator.translate("updates", {"decomposer": {"reasoning": [{"node": "decomposer"}]}, "layer_router": {}}))
+    events += list(translator.translate("messages", (AIMessageChunk(content="plan"), {"langgraph_node": "ast_planner"})))
+    events += list(translator.translate("messages", (tool_chunk, {"langgraph_node": "answer_synthesizer"})))
+
+    # Assert
+    assert [(e.event, e.node) for e in events] == [("node", "decomposer"), ("token", "answer_synthesizer")]
+    assert events[1].data == {"text": '{"summary"'}
+
+
+def test_stream_with_graph_yields_progress_then_result(monkeypatch):
+    # Validates ordering because clients render progress before the final answer arrives.
+    # Arrange
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _graph())
+    ctx = SimpleNamespace(worker_pool=PipelineWorkerPool(max_workers=2))
+
+    # Act
+    events = list(stream_with_graph(ctx, "how many rows?"))
+
+    # Assert
+    kinds = [(e.event, e.node) for e in events]
+    assert kinds[0] == ("node", "datasource_resolver")
+    assert ("token", "answer_synthesizer") in kinds
+    assert kinds[-1] == ("result", None)
+    assert events[-1].data["user_query"] == "how many rows?"
+    assert "cancel_token" not in events[-1].data
+    json.loads(events[-1].to_ndjson())
+    ctx.worker_pool.shutdown()
+
+
+def test_astream_with_graph_formats_sse_frames(monkeypatch):
+    # Validates the async stream because the API route serves it as text/event-stream.
+    # Arrange
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _graph())
+
+    async def collect():
+        return [event async for event in astream_with_graph(SimpleNamespace(), "q")]
+
+    # Act
+    events = asyncio.run(collect())
+
+    # Assert
+    assert events[-1].event == "result"
+    frame = events[0].to_sse()
+    assert frame.startswith("event: node\ndata: ")
+    assert frame.endswith("\n\n")
+
+
+def test_stream_with_graph_times_out_with_error_event(monkeypatch):
+    # Validates the deadline because a stalled node must still end the stream.
+    # Arrange
+    class _SlowGraph:
+        def stream(self, state, config=None, stream_mode=None):
+            time.sleep(1)
+            return iter(())
+
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _SlowGraph())
+    monkeypatch.setattr("nl2sql.pipeline.runtime.settings.global_timeout_sec", 0.2)
+    ctx = SimpleNamespace(worker_pool=PipelineWorkerPool(max_workers=1))
+    token = CancellationToken()
+
+    # Act
+    events = list(stream_with_graph(ctx, "q", cancel_token=token))
+
+    # Assert
+    assert [e.event for e in events] == ["error"]
+    assert events[0].data["errors"][0]["error_code"] == ErrorCode.PIPELINE_TIMEOUT.value
+    assert token.is_cancelled()
+    ctx.worker_pool.shutdown(wait=False)
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+from nl2sql.auth import UserContext
+from nl2sql.pipeline.plan_cache import PlanCache, plan_cache_key
+from nl2sql.pipeline.state import SubgraphExecutionState
+from nl2sql.pipeline.subgraphs.sql_agent import build_sql_agent_graph
+from nl2sql.pipeline.nodes.decomposer.schemas import SubQuery
+from nl2sql.pipeline.nodes.ast_planner.schemas import ASTPlannerResponse, PlanModel, TableRef, SelectItem, Expr
+from nl2sql.pipeline.nodes.validator.schemas import LogicalValidatorResponse
+
+
+def _plan_ok():
+    return PlanModel(
+        tables=[TableRef(name="users", alias="u", ordinal=0)],
+        select_items=[SelectItem(expr=Expr(kind="column", alias="u", column_name="id"), ordinal=0)],
+        joins=[],
+    )
+
+
+def _state(schema_version="v1", roles=("analyst",)):
+    return SubgraphExecutionState(
+        trace_id="t",
+        sub_query=SubQuery(id="sq1", datasource_id="ds1", intent="q", schema_version=schema_version),
+        user_context=UserContext(roles=list(roles)),
+    )
+
+
+def test_plan_cache_key_requires_schema_version():
+    # Validates cacheability because plans are only valid for a known schema.
+    assert plan_cache_key(_state(schema_version=None)) is None
+    assert plan_cache_key(_state()) == ("sq1", "ds1", "v1", ("analyst",), None)
+
+
+def test_plan_cache_key_ignores_role_order():
+    # Validates key stability because role lists are unordered sets.
+    assert plan_cache_key(_state(roles=("b", "a"))) == plan_cache_key(_state(roles=("a", "b", "a")))
+
+
+def test_plan_cache_evicts_least_recently_used():
+    # Validates bounded size because the cache is process-local.
+    cache = PlanCache(max_entries=2)
+    keys = [(f"sq{i}", "ds1", "v1", (), None) for i in range(3)]
+    cache.put(keys[0], _plan_ok())
+    cache.put(keys[1], _plan_ok())
+    cache.get(keys[0])
+    cache.put(keys[2], _plan_ok())
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert len(cache) == 2
+
+
+def test_plan_cache_evicts_schema_versions():
+    # Validates invalidation because evicted schema versions must not serve plans.
+    cache = PlanCache()
+    cache.put(("sq1", "ds1", "v1", (), None), _plan_ok())
+    cache.put(("sq1", "ds1", "v2", (), None), _plan_ok())
+    cache.put(("sq1", "ds2", "v1", (), None), _plan_ok())
+
+    assert cache.evict_schema_versions("ds1", ["v1"]) == 1
+    assert cache.get(("sq1", "ds1", "v1", (), None)) is None
+    assert cache.get(("sq1", "ds2", "v1", (), None)) is not None
+
+
+def _stub_nodes(stub_sql_agent_nodes, calls, executor_ok=True):
+    def planner(state):
+        calls["planner"] += 1
+        return {"ast_planner_response": ASTPlannerResponse(plan=_plan_ok()), "errors": []}
+
+    def logical(state):
+        calls["logical"] += 1
+        return {"logical_validator_response": LogicalValidatorResponse(errors=[]), "errors": []}
+
+    stub_sql_agent_nodes(planner, logical, executor_ok=executor_ok, calls=calls)
+
+
+def test_sql_agent_reuses_cached_plan(stub_sql_agent_nodes):
+    # Validates the fast path because repeated sub-queries must skip planning and validation.
+    # Arrange
+    calls = {"planner": 0, "logical": 0, "executor": 0}
+    _stub_nodes(stub_sql_agent_nodes, calls)
+    ctx = SimpleNamespace(plan_cache=PlanCache())
+    graph = build_sql_agent_graph(ctx)
+
+    # Act
+    graph.invoke(_state())
+    result = graph.invoke(_state())
+
+    # Assert
+    assert calls == {"planner": 1, "logical": 1, "executor": 2}
+    assert result["ast_planner_response"].plan == _plan_ok()
+
+
+def test_sql_agent_does_not_cache_failed_execution(stub_sql_agent_nodes):
+    # Validates admission because only plans that executed successfully are reused.
+    # Arrange
+    calls = {"planner": 0, "logical": 0, "executor": 0}
+    _stub_nodes(stub_sql_agent_nodes, calls, executor_ok=False)
+    ctx = SimpleNamespace(plan_cache=PlanCache())
+    graph = build_sql_agent_graph(ctx)
+
+    # Act
+    graph.invoke(_state())
+    graph.invoke(_state())
+
+    # Assert
+    assert calls["planner"] == 2
+    assert len(ctx.plan_cache) == 0
@@ -0,0 +1,154 @@
+from types import SimpleNamespace
+
+from nl2sql.auth import UserContext
+from nl2sql.common.errors import ErrorCode
+from nl2sql.pipeline.nodes.ast_planner.schemas import (
+    ASTPlannerResponse,
+    Expr,
+    GroupByItem,
+    JoinSpec,
+    PlanModel,
+    SelectItem,
+    TableRef,
+)
+from nl2sql.pipeline.nodes.decomposer.schemas import ExpectedColumn, SubQuery
+from nl2sql.pipeline.nodes.schema_retriever.schema import Column, Table
+from nl2sql.pipeline.nodes.validator.node import LogicalValidatorNode
+from nl2sql.pipeline.nodes.validator.repair import repair_plan, ungrouped_select_items
+from nl2sql.pipeline.state import SubgraphExecutionState
+
+
+def _col(alias, name):
+    return Expr(kind="column", alias=alias, column_name=name)
+
+
+def _count():
+    return Expr(kind="func", func_name="COUNT", args=[_col("o", "id")], is_aggregate=True)
+
+
+def _node(allowed=("*",)):
+    rbac = SimpleNamespace(get_allowed_tables=lambda _ctx: list(allowed))
+    return LogicalValidatorNode(SimpleNamespace(ds_registry=SimpleNamespace(), rbac=rbac))
+
+
+def _state(plan, expected=()):
+    return SubgraphExecutionState(
+        trace_id="t",
+        sub_query=SubQuery(
+            id="sq1",
+            datasource_id="ds1",
+            intent="q",
+            expected_schema=[ExpectedColumn(name=n) for n in expected],
+        ),
+        relevant_tables=[
+            Table(
+                name="users",
+                columns=[Column(name="id", type="int"), Column(name="region", type="string")],
+                relationships=[
+                    {"from_table": "users", "to_table": "orders", "from_columns": ["id"], "to_columns": ["user_id"]}
+                ],
+            ),
+            Table(name="orders", columns=[Column(name="id", type="int"), Column(name="user_id", type="int")]),
+        ],
+        ast_planner_response=ASTPlannerResponse(plan=plan),
+        user_context=UserContext(),
+    )
+
+
+def _tables():
+    return [TableRef(name="users", alias="u", ordinal=0), TableRef(name="orders", alias="o", ordinal=1)]
+
+
+def _join(left="u"):
+    condition = Expr(kind="binary", op="=", left=_col(left, "id"), right=_col("o", "user_id"))
+    return JoinSpec(left_alias=left, right_alias="o", condition=condition, ordinal=0)
+
+
+def test_repair_fixes_aliases_case_group_by_and_ordinals():
+    # Validates each rule because these are the planner mistakes the refiner loop used to absorb.
+    # Arrange
+    plan = PlanModel(
+        tables=_tables(),
+        joins=[_join(left="U")],
+        select_items=[
+            SelectItem(expr=_col("o", "region"), alias="Region", ordinal=3),
+            SelectItem(expr=_count(), alias="orders", ordinal=5),
+        ],
+    )
+    alias_to_cols = {"u": {"id", "region"}, "o": {"id", "user_id"}}
+
+    # Act
+    repaired, applied = repair_plan(plan, alias_to_cols, ["region", "orders"])
+
+    # Assert
+    assert applied == ["alias_case", "column_alias", "select_alias_case", "group_by", "ordinals"]
+    assert repaired.joins[0].left_alias == "u" and repaired.joins[0].condition.left.alias == "u"
+    assert repaired.select_items[0].expr.alias == "u"
+    assert [(s.alias, s.ordinal) for s in repaired.select_items] == [("region", 0), ("orders", 1)]
+    assert [g.expr.column_name for g in repaired.group_by] == ["region"]
+    assert plan.select_items[0].expr.alias == "o"
+    assert repair_plan(repaired, alias_to_cols, ["region", "orders"]) is None
+
+
+def test_validator_accepts_valid_plans_without_rewriting_their_grouping():
+    # Validates GROUP BY is only a repair rule because plans grouped by a key, or wrapping
+    # aggregates in other functions, validated before repair existed and must keep passing.
+    # Arrange
+    by_key = PlanModel(
+        tables=_tables(),
+        joins=[_join()],
+        select_items=[
+            SelectItem(expr=_col("u", "id"), ordinal=0),
+            SelectItem(expr=_col("u", "region"), ordinal=1),
+            SelectItem(expr=_count(), ordinal=2),
+        ],
+        group_by=[GroupByItem(expr=_col("u", "id"), ordinal=0)],
+    )
+    wrapped = PlanModel(
+        tables=_tables(),
+        joins=[_join()],
+        select_items=[SelectItem(expr=Expr(kind="func", func_name="ROUND", args=[_count()]), ordinal=0)],
+    )
+
+    # Act
+    results = [_node()(_state(plan)) for plan in (by_key, wrapped)]
+
+    # Assert
+    assert ungrouped_select_items(by_key) == [by_key.select_items[1]]
+    assert ungrouped_select_items(wrapped) == []
+    for result in results:
+        assert result["errors"] == []
+        assert "ast_planner_response" not in result
+
+
+def test_validator_returns_repaired_plan_without_errors():
+    # Validates the fast recovery because a repairable plan must skip the refiner and planner calls.
+    # Arrange
+    plan = PlanModel(
+        tables=_tables(),
+        joins=[_join()],
+        select_items=[SelectItem(expr=_col("u", "region"), ordinal=1), SelectItem(expr=_count(), ordinal=2)],
+    )
+
+    # Act
+    result = _node()(_state(plan))
+
+    # Assert
+    assert result["errors"] == []
+    assert not result["logical_validator_response"].errors
+    repaired = result["ast_planner_response"].plan
+    assert [s.ordinal for s in repaired.select_items] == [0, 1]
+    assert len(repaired.group_by) == 1
+
+
+def test_validator_never_repairs_policy_violations():
+    # Validates the guard because security failures must not be rewritten into passing plans.
+    plan = PlanModel(
+        tables=[TableRef(name="users", alias="u", ordinal=1)],
+        select_items=[SelectItem(expr=_col("u", "id"), ordinal=0)],
+    )
+
+    result = _node(allowed=("ds1.orders",))(_state(plan))
+
+    assert "ast_planner_response" not in result
+    assert any(e.error_code == ErrorCode.SECURITY_VIOLATION for e in result["errors"])
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+from nl2sql.auth import UserContext
+from nl2sql.pipeline.plan_templates import PlanTemplateStore, build_plan_template, template_key
+from nl2sql.pipeline.state import SubgraphExecutionState
+from nl2sql.pipeline.subgraphs.sql_agent import build_sql_agent_graph
+from nl2sql.pipeline.nodes.decomposer.schemas import FilterSpec, MetricSpec, SubQuery
+from nl2sql.pipeline.nodes.ast_planner.schemas import ASTPlannerResponse, Expr, PlanModel, SelectItem, TableRef
+from nl2sql.pipeline.nodes.validator.schemas import LogicalValidatorResponse
+
+
+def _sub_query(region="EU", year=2024, sq_id="sq1"):
+    return SubQuery(
+        id=sq_id,
+        datasource_id="ds1",
+        intent=f"Total sales in {region} for {year}",
+        metrics=[MetricSpec(name="total sales", aggregation="sum")],
+        filters=[
+            FilterSpec(attribute="region", operator="=", value=region),
+            FilterSpec(attribute="year", operator="=", value=year),
+        ],
+        schema_version="v1",
+    )
+
+
+def _eq(column, value):
+    return Expr(
+        kind="binary",
+        op="=",
+        left=Expr(kind="column", alias="s", column_name=column),
+        right=Expr(kind="literal", value=value),
+    )
+
+
+def _plan(region="EU", year=2024):
+    return PlanModel(
+        tables=[TableRef(name="sales", alias="s", ordinal=0)],
+        select_items=[SelectItem(expr=Expr(kind="column", alias="s", column_name="amount"), ordinal=0)],
+        joins=[],
+        where=Expr(kind="binary", op="AND", left=_eq("region", region), right=_eq("year", year)),
+    )
+
+
+def test_sub_queries_differing_only_in_literals_share_a_key():
+    # Validates shape matching because only filter literals may vary between template uses.
+    assert template_key(_sub_query("EU", 2024)) == template_key(_sub_query("US", 2023, sq_id="sq2"))
+    assert template_key(_sub_query("EU", 2024)) != template_key(_sub_query("EU", "2024"))
+
+
+def test_template_binds_new_literals():
+    # Validates binding because the reused plan must filter on the new values.
+    template = build_plan_template(_sub_query(), _plan())
+
+    plan = template.bind(_sub_query("US", 2023))
+
+    assert plan == _plan("US", 2023)
+
+
+def test_plans_with_unmapped_filter_values_are_not_templated():
+    # Validates safety because a literal the template cannot rebind would leak the old value.
+    assert build_plan_template(_sub_query(), _plan(region="Europe")) is None
+
+
+def test_plans_with_ambiguous_literals_are_not_templated():
+    # Validates safety because a literal matching two filters cannot be bound unambiguously.
+    sub_query = _sub_query(region="2024", year=2024)
+
+    assert build_plan_template(sub_query, _plan(region="2024", year=2024)) is None
+
+
+def test_store_evicts_schema_versions():
+    # Validates invalidation because templates are only valid for their schema.
+    store = PlanTemplateStore()
+    store.record(_sub_query(), _plan())
+
+    assert store.evict_schema_versions("ds1", ["v1"]) == 1
+    assert store.match(_sub_query("US", 2023)) is None
+
+
+def _state(sub_query):
+    return SubgraphExecutionState(trace_id="t", sub_query=sub_query, user_context=UserContext(roles=["analyst"]))
+
+
+def test_sql_agent_skips_planner_but_not_validation_on_template_hit(stub_sql_agent_nodes):
+    # Validates the template path because bound plans must still be validated and generated.
+    # Arrange
+    calls = {"planner": 0, "logical": 0}
+
+    def planner(state):
+        calls["planner"] += 1
+        return {"ast_planner_response": ASTPlannerResponse(plan=_plan()), "errors": []}
+
+    def logical(state):
+        calls["logical"] += 1
+        return {"logical_validator_response": LogicalValidatorResponse(errors=[]), "errors": []}
+
+    stub_sql_agent_nodes(planner, logical)
+    ctx = SimpleNamespace(plan_templates=PlanTemplateStore())
+    graph = build_sql_agent_graph(ctx)
+
+    # Act
+    graph.invoke(_state(_sub_query()))
+    result = graph.invoke(_state(_sub_query("US", 2023, sq_id="sq2")))
+
+    # Assert
+    assert calls == {"planner": 1, "logical": 2}
+    assert result["ast_planner_response"].plan == _plan("US", 2023)
@@ -0,0 +1,75 @@
+from nl2sql.pipeline.nodes.decomposer.schemas import FilterSpec, SubQuery
+from nl2sql.pipeline.nodes.schema_retriever.render import estimate_tokens, render_schema
+from nl2sql.pipeline.nodes.schema_retriever.schema import Column, Table
+
+
+def _orders(extra_columns=0):
+    columns = [
+        Column(name="id", type="INTEGER"),
+        Column(name="customer_id", type="INTEGER"),
+        Column(
+            name="status",
+            type="VARCHAR",
+            stats={"distinct_count": 3, "sample_values": ["open", "closed"], "min_value": "closed", "max_value": "open"},
+        ),
+        Column(
+            name="amount",
+            type="DECIMAL",
+            stats={"distinct_count": 5000, "sample_values": [1, 2], "min_value": 0, "max_value": 900},
+        ),
+    ]
+    columns += [Column(name=f"misc_{i}", type="VARCHAR", description="unrelated attribute") for i in range(extra_columns)]
+    rel = {
+        "from_table": "sales.orders",
+        "to_table": "sales.customers",
+        "from_columns": ["customer_id"],
+        "to_columns": ["id"],
+        "cardinality": "many_to_one",
+    }
+    return Table(name="orders", columns=columns, primary_key=["id"], relationships=[rel, dict(rel)])
+
+
+def _sub_query():
+    return SubQuery(
+        id="sq1",
+        datasource_id="ds1",
+        intent="order amount by status",
+        filters=[FilterSpec(attribute="amount", operator=">", value=10)],
+    )
+
+
+def test_render_is_compact_and_dedupes_relationships():
+    # Validates the format because prompts must stay small without losing join paths.
+    text = render_schema([_orders()], _sub_query(), max_tokens=0)
+
+    assert "TABLE orders" in text
+    assert "PRIMARY KEY (id)" in text
+    assert text.count("sales.orders(customer_id) -> sales.customers(id)") == 1
+    assert estimate_tokens(text) < estimate_tokens(_orders().model_dump_json(indent=2))
+
+
+def test_stats_are_shown_only_when_relevant():
+    # Validates stat pruning because high-cardinality samples and unfiltered ranges add noise.
+    text = render_schema([_orders()], _sub_query(), max_tokens=0)
+
+    assert "values: 'open', 'closed'" in text
+    assert "range: 0..900" in text
+    assert "range: 'closed'" not in text
+    assert "values: 1, 2" not in text
+
+
+def test_budget_drops_least_relevant_columns_first():
+    # Validates the hard budget because wide tables must not blow up prompts.
+    # Arrange
+    full = render_schema([_orders(extra_columns=40)], _sub_query(), max_tokens=0)
+    budget = estimate_tokens(full) // 3
+
+    # Act
+    text = render_schema([_orders(extra_columns=40)], _sub_query(), max_tokens=budget)
+
+    # Assert
+    assert estimate_tokens(text) <= budget
+    assert "misc_39" not in text
+    for column in ("id", "customer_id", "status", "amount"):
+        assert f"  {column} " in text
+    assert "less relevant column(s) omitted" in text
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from nl2sql.auth import UserContext
+from nl2sql.common.cancellation import CancellationToken
+from nl2sql.pipeline.runtime import arun_with_graph, run_with_graph
+from nl2sql.pipeline.single_flight import SingleFlight, build_flight_key
+from nl2sql.pipeline.worker_pool import PipelineWorkerPool
+
+
+class _Graph:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def invoke(self, state, config=None):
+        return self._fn(state)
+
+    async def ainvoke(self, state, config=None):
+        return await self._fn(state)
+
+
+def _ctx(versions=None):
+    versions = versions or {"sales": "v1", "crm": "v1"}
+    return SimpleNamespace(
+        worker_pool=PipelineWorkerPool(max_workers=8),
+        single_flight=SingleFlight(),
+        ds_registry=SimpleNamespace(list_ids=lambda: list(versions)),
+        schema_store=SimpleNamespace(get_latest_version=lambda ds_id: versions[ds_id]),
+    )
+
+
+def test_concurrent_duplicates_share_one_execution(monkeypatch):
+    # Validates coalescing because identical concurrent questions must not each run the graph.
+    # Arrange
+    calls = []
+    release = threading.Event()
+
+    def fn(state):
+        calls.append(state["user_query"])
+        release.wait(2)
+        return {"final_answer": "42"}
+
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _Graph(fn))
+    ctx = _ctx()
+    user = UserContext(roles=["analyst"])
+    results = []
+
+    def _call(query):
+        results.append(run_with_graph(ctx, query, user_context=user))
+
+    # Act
+    threads = [threading.Thread(target=_call, args=(q,)) for q in ["Total sales", " total  SALES", "total sales"]]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    # Assert
+    assert len(calls) == 1
+    assert [r["final_answer"] for r in results] == ["42", "42", "42"]
+    assert len({id(r) for r in results}) == 3
+    assert ctx.single_flight.in_flight() == 0
+    ctx.worker_pool.shutdown()
+
+
+def test_flight_key_separates_roles_tenants_and_schema_versions():
+    # Validates key isolation because results must never leak across permissions or schema versions.
+    # Arrange
+    ctx = _ctx()
+    analyst = UserContext(roles=["analyst"], tenant_id="t1")
+
+    # Act
+    base = build_flight_key(ctx, "Total sales", None, analyst, True)
+    same = build_flight_key(ctx, "total   sales", None, UserContext(roles=["analyst"], tenant_id="t1"), True)
+    other_role = build_flight_key(ctx, "total sales", None, UserContext(roles=["admin"], tenant_id="t1"), True)
+    other_tenant = build_flight_key(ctx, "total sales", None, UserContext(roles=["analyst"], tenant_id="t2"), True)
+    override = build_flight_key(ctx, "total sales", "sales", analyst, True)
+    refreshed = build_flight_key(_ctx({"sales": "v2", "crm": "v1"}), "total sales", None, analyst, True)
+
+    # Assert
+    assert base == same
+    assert len({base, other_role, other_tenant, override, refreshed}) == 5
+
+
+def test_follower_cancel_does_not_stop_shared_execution():
+    # Validates scoped cancellation because one caller giving up must not fail the others.
+    # Arrange
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    seen = {}
+
+    def work(token):
+        started.set()
+        release.wait(2)
+        seen["cancelled"] = token.is_cancelled()
+        return {"ok": True}
+
+    leader_result = {}
+    leader = threading.Thread(
+        target=lambda: leader_result.update(flights.run("k", work, CancellationToken(), lambda: {"ok": False}))
+    )
+    leader.start()
+    started.wait(2)
+    follower_token = CancellationToken()
+    follower_token.cancel()
+
+    # Act
+    follower_result = flights.run("k", work, follower_token, lambda: {"cancelled": True})
+    release.set()
+    leader.join(5)
+
+    # Assert
+    assert follower_result == {"cancelled": True}
+    assert leader_result == {"ok": True}
+    assert seen["cancelled"] is False
+
+
+def test_arun_with_graph_coalesces_async_duplicates(monkeypatch):
+    # Validates the async path because API requests arrive on one event loop.
+    # Arrange
+    calls = []
+
+    async def fn(state):
+        calls.append(state["user_query"])
+        await asyncio.sleep(0.1)
+        return {"final_answer": "42"}
+
+    monkeypatch.setattr("nl2sql.pipeline.runtime.get_compiled_graph", lambda ctx, execute=True: _Graph(fn))
+    ctx = _ctx()
+
+    async def _main():
+        return await asyncio.gather(*(arun_with_graph(ctx, "total sales") for _ in range(3)))
+
+    # Act
+    results = asyncio.run(_main())
+
+    # Assert
+    assert len(calls) == 1
+    assert [r["final_answer"] for r in results] == ["42", "42", "42"]
+    ctx.worker_pool.shutdown()
@@ -0,0 +1,152 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from langgraph.types import Send
+
+from nl2sql.execution.contracts import ArtifactRef, ExecutorResponse
+from nl2sql.common.errors import ErrorCode, ErrorSeverity, PipelineError
+from nl2sql.pipeline.graph_utils import build_scan_payload, wrap_subgraph
+from nl2sql.pipeline.nodes.aggregator.node import EngineAggregatorNode
+from nl2sql.pipeline.nodes.datasource_resolver.schemas import DatasourceResolverResponse, ResolvedDatasource
+from nl2sql.pipeline.nodes.decomposer.schemas import DecomposerResponse
+from nl2sql.pipeline.nodes.single_source import SingleSourceRouterNode, SingleSourceVerdict, single_source_candidate
+from nl2sql.pipeline.routes import build_scan_layer_router, build_single_source_router
+from nl2sql.pipeline.state import GraphState
+from nl2sql.pipeline.subgraphs import SubgraphSpec
+
+
+def _resolved(*ids, allowed=None):
+    return DatasourceResolverResponse(
+        resolved_datasources=[ResolvedDatasource(datasource_id=i, schema_version="v1") for i in ids],
+        allowed_datasource_ids=list(ids if allowed is None else allowed),
+    )
+
+
+def _state(query="how many orders shipped last week", resolved=None):
+    return GraphState(user_query=query, datasource_resolver_response=resolved or _resolved("sales"))
+
+
+def _node(llms=None):
+    ctx = SimpleNamespace(llm_registry=MagicMock())
+    ctx.llm_registry.llms = llms or {}
+    return SingleSourceRouterNode(ctx)
+
+
+def test_rules_accept_only_simple_single_datasource_questions():
+    # Validates the rules because multi-source or multi-part questions need decomposition.
+    assert single_source_candidate("total revenue by region", _resolved("sales")) == ("sales", "simple")
+    assert single_source_candidate("total revenue", _resolved("sales", "hr"))[1] == "multiple_datasources"
+    assert single_source_candidate("total revenue", _resolved("sales", allowed=[]))[1] == "restricted_datasource"
+    assert single_source_candidate("compare revenue to last year", _resolved("sales"))[1] == "multi_part"
+
+
+def test_router_builds_single_sub_query_without_llm():
+    # Validates the fast path because it must skip the decomposer's LLM call.
+    result = _node()(_state())
+
+    response = result["decomposer_response"]
+    assert [sq.datasource_id for sq in response.sub_queries] == ["sales"]
+    assert response.sub_queries[0].schema_version == "v1"
+    assert response.combine_groups[0].inputs[0].subquery_id == response.sub_queries[0].id
+
+
+def test_router_falls_back_to_full_pipeline_on_sql_tokens_or_model_veto():
+    # Validates fallbacks because sub-query intents must stay free of SQL and the model can veto.
+    assert "decomposer_response" not in _node()(_state(query="select everything from orders"))
+
+    node = _node(llms={"singlesourcerouter": MagicMock()})
+    node.chain = MagicMock()
+    node.chain.invoke.return_value = SingleSourceVerdict(single_source=False, reason="two metrics")
+    assert "decomposer_response" not in node(_state())
+
+
+def test_fast_path_sends_rows_back_and_routes_to_synthesizer():
+    # Validates the wiring because fast-path results must reach the synthesizer without aggregation.
+    # Arrange
+    ctx = SimpleNamespace(ds_registry=MagicMock())
+    ctx.ds_registry.get_capabilities.return_value = {"supports_sql"}
+    specs = {"sql_agent": SubgraphSpec(name="sql_agent", required_capabilities={"supports_sql"}, builder=MagicMock())}
+    state = _state()
+    state.decomposer_response = _node()(state)["decomposer_response"]
+    sub_query = state.decomposer_response.sub_queries[0]
+    executor_response = ExecutorResponse(
+        executor_name="sql_executor", subgraph_name="sql_agent", node_id=sub_query.id,
+        trace_id=state.trace_id, tenant_id="t", rows=[{"count": 3}],
+    )
+    subgraph = MagicMock()
+    subgraph.invoke.side_effect = lambda sub_state: {**sub_state, "executor_response": executor_response}
+
+    # Act
+    sends = build_single_source_router(ctx, specs)(state)
+    update = wrap_subgraph(subgraph, "sql_agent", ctx).invoke(sends[0].arg)
+    state.aggregator_response = update["aggregator_response"]
+    next_step = build_scan_layer_router(ctx, specs)(state)
+
+    # Assert
+    assert isinstance(sends[0], Send) and sends[0].node == "sql_agent"
+    assert subgraph.invoke.call_args.args[0]["return_rows"] is True
+    assert update["aggregator_response"].terminal_results == {sub_query.id: [{"count": 3}]}
+    assert next_step == "answer_synthesizer"
+    assert build_scan_payload(state, "sql_agent", sub_query.id, sub_query)["return_rows"] is False
+    assert build_single_source_router(ctx, specs)(_state()) == "decomposer"
+
+
+def test_failed_fast_path_scan_still_reaches_synthesizer():
+    # Validates failure routing because a failed fast-path scan must end with a reported outcome, like the full path.
+    # Arrange
+    ctx = SimpleNamespace(ds_registry=MagicMock())
+    ctx.ds_registry.get_capabilities.return_value = {"supports_sql"}
+    specs = {"sql_agent": SubgraphSpec(name="sql_agent", required_capabilities={"supports_sql"}, builder=MagicMock())}
+    state = _state()
+    state.decomposer_response = _node()(state)["decomposer_response"]
+    error = PipelineError(node="executor", message="boom", severity=ErrorSeverity.ERROR, error_code=ErrorCode.EXECUTION_ERROR)
+    subgraph = MagicMock()
+    subgraph.invoke.side_effect = lambda sub_state: {**sub_state, "errors": [error]}
+
+    # Act
+    sends = build_single_source_router(ctx, specs)(state)
+    update = wrap_subgraph(subgraph, "sql_agent", ctx).invoke(sends[0].arg)
+    next_step = build_scan_layer_router(ctx, specs)(state.model_copy(update={"errors": update["errors"]}))
+    planner_failed = _state()
+    planner_failed.decomposer_response = DecomposerResponse(sub_queries=state.decomposer_response.sub_queries, combine_groups=[])
+
+    # Assert
+    assert "aggregator_response" not in update
+    assert next_step == "answer_synthesizer"
+    assert build_scan_layer_router(ctx, specs)(planner_failed) != "answer_synthesizer"
+
+
+def test_large_fast_path_result_is_read_back_by_the_aggregator():
+    # Validates the inline cap because a scan too large to carry in graph state must still be answered.
+    # Arrange
+    ctx = SimpleNamespace(ds_registry=MagicMock())
+    ctx.ds_registry.get_capabilities.return_value = {"supports_sql"}
+    specs = {"sql_agent": SubgraphSpec(name="sql_agent", required_capabilities={"supports_sql"}, builder=MagicMock())}
+    state = _state()
+    state.decomposer_response = _node()(state)["decomposer_response"]
+    sub_query = state.decomposer_response.sub_queries[0]
+    artifact = ArtifactRef(
+        uri="file:///big.parquet", backend="local", format="parquet", row_count=5000, columns=["n"],
+        bytes=1, content_hash="big", created_at=datetime(2026, 1, 1), path_template="{sq_id}",
+    )
+    executor_response = ExecutorResponse(
+        executor_name="sql_executor", subgraph_name="sql_agent", node_id=sub_query.id,
+        trace_id=state.trace_id, tenant_id="t", artifact=artifact,
+    )
+    subgraph = MagicMock()
+    subgraph.invoke.side_effect = lambda sub_state: {**sub_state, "executor_response": executor_response}
+    aggregator = EngineAggregatorNode(SimpleNamespace())
+    aggregator.service.engine = SimpleNamespace(load_scan=lambda ref: ref.uri, to_rows=lambda frame: [{"uri": frame}])
+
+    # Act
+    sends = build_single_source_router(ctx, specs)(state)
+    update = wrap_subgraph(subgraph, "sql_agent", ctx).invoke(sends[0].arg)
+    state.artifact_refs = update["artifact_refs"]
+    next_step = build_scan_layer_router(ctx, specs)(state)
+    result = aggregator(state)
+
+    # Assert
+    assert "aggregator_response" not in update
+    assert next_step == "aggregator"
+    assert result["aggregator_response"].terminal_results == {sub_query.id: [{"uri": "file:///big.parquet"}]}
@@ -1,3 +1,4 @@
+import asyncio
 from types import SimpleNamespace
 
 import pytest
@@ -8,6 +9,7 @@ from nl2sql.pipeline.nodes.decomposer.schemas import SubQuery
 from nl2sql.pipeline.nodes.ast_planner.schemas import ASTPlannerResponse, PlanModel, TableRef, SelectItem, Expr
 from nl2sql.pipeline.nodes.validator.schemas import LogicalValidatorResponse, PhysicalValidatorResponse
 from nl2sql.pipeline.nodes.generator.schemas import GeneratorResponse
+from nl2sql.common.cancellation import CancellationToken
 from nl2sql.common.errors import PipelineError, ErrorSeverity, ErrorCode
 
 
@@ -179,3 +181,74 @@ def test_sql_agent_physical_retry(monkeypatch):
 
     assert call_count["physical"] >= 2
     assert result["executor_response"] is not None
+
+
+def test_sql_agent_stops_retrying_when_request_cancelled(monkeypatch):
+    # Validates request-scoped cancellation because a cancelled token must end the retry loop.
+    call_count = {"planner": 0}
+
+    def planner(state):
+        call_count["planner"] += 1
+        return {"ast_planner_response": ASTPlannerResponse(plan=None), "errors": [PipelineError(node="astplanner", message="fail", severity=ErrorSeverity.ERROR, error_code=ErrorCode.PLANNING_FAILURE)]}
+
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.SchemaRetrieverNode", lambda _ctx: (lambda _s: {"relevant_tables": []}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.ASTPlannerNode", lambda _ctx: planner)
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.LogicalValidatorNode", lambda _ctx: (lambda _s: {}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.GeneratorNode", lambda _ctx: (lambda _s: {}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.PhysicalValidatorNode", lambda _ctx: (lambda _s: {}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.ExecutorNode", lambda _ctx: (lambda _s: {}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.RefinerNode", lambda _ctx: (lambda _s: {}))
+
+    graph = build_sql_agent_graph(SimpleNamespace())
+    token = CancellationToken()
+    token.cancel()
+
+    state = SubgraphExecutionState(
+        trace_id="t",
+        sub_query=SubQuery(id="sq1", datasource_id="ds1", intent="q"),
+        cancel_token=token,
+    )
+
+    result = graph.invoke(state)
+
+    # Every node checks the token first, so nothing runs for a cancelled request.
+    assert call_count["planner"] == 0
+    assert result.get("executor_response") is None
+    assert [e.error_code for e in result["errors"]] == [ErrorCode.CANCELLED]
+
+
+def test_sql_agent_ainvoke_uses_async_node_entry_points(monkeypatch):
+    # Validates async dispatch because ainvoke must await node coroutines instead of sync calls.
+    calls = []
+
+    class _Node:
+        def __init__(self, name, update):
+            self.node_name = name
+            self._update = update
+
+        def __call__(self, state):
+            calls.append(("sync", self.node_name))
+            return self._update
+
+        async def acall(self, state):
+            calls.append(("async", self.node_name))
+            return self._update
+
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.SchemaRetrieverNode", lambda _ctx: _Node("schema_retriever", {"relevant_tables": []}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.ASTPlannerNode", lambda _ctx: _Node("planner", {"ast_planner_response": ASTPlannerResponse(plan=_plan_ok()), "errors": []}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.LogicalValidatorNode", lambda _ctx: (lambda _s: {"logical_validator_response": LogicalValidatorResponse(errors=[]), "errors": []}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.GeneratorNode", lambda _ctx: (lambda _s: {"generator_response": GeneratorResponse(sql_draft="SELECT 1")}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.PhysicalValidatorNode", lambda _ctx: (lambda _s: {}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.ExecutorNode", lambda _ctx: _Node("executor", {"executor_response": SimpleNamespace(errors=[], reasoning=[]), "errors": []}))
+    monkeypatch.setattr("nl2sql.pipeline.subgraphs.sql_agent.RefinerNode", lambda _ctx: (lambda _s: {}))
+
+    graph = build_sql_agent_graph(SimpleNamespace())
+    state = SubgraphExecutionState(
+        trace_id="t",
+        sub_query=SubQuery(id="sq1", datasource_id="ds1", intent="q"),
+    )
+
+    result = asyncio.run(graph.ainvoke(state))
+
+    assert result["executor_response"] is not None
+    assert calls == [("async", "schema_retriever"), ("async", "planner"), ("async", "executor")]
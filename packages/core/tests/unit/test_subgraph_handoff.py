@@ -0,0 +1,78 @@
+import asyncio
+from types import SimpleNamespace
+
+from nl2sql.auth import UserContext
+from nl2sql.common.errors import ErrorCode, ErrorSeverity, PipelineError
+from nl2sql.pipeline.graph_utils import build_scan_payload, wrap_subgraph
+from nl2sql.pipeline.nodes.decomposer.schemas import DecomposerResponse, SubQuery
+from nl2sql.pipeline.nodes.schema_retriever.schema import Table
+from nl2sql.pipeline.state import GraphState
+
+
+def _state():
+    sub_queries = [SubQuery(id=f"sq_{i}", datasource_id="ds", intent=f"q{i}") for i in range(3)]
+    return GraphState(
+        user_query="q",
+        user_context=UserContext(user_id="u1"),
+        decomposer_response=DecomposerResponse(sub_queries=sub_queries, combine_groups=[]),
+    )
+
+
+class _RecordingSubgraph:
+    def __init__(self, result):
+        self.inputs = []
+        self.result = result
+
+    def invoke(self, state):
+        self.inputs.append(state)
+        return {**state, **self.result}
+
+    async def ainvoke(self, state):
+        return self.invoke(state)
+
+
+def test_scan_payload_carries_only_target_sub_query():
+    # Validates fan-out payloads because copying every sub-query into every branch grows quadratically.
+    # Arrange
+    state = _state()
+    target = state.decomposer_response.sub_queries[1]
+
+    # Act
+    payload = build_scan_payload(state, "sql_agent", target.id, target)
+
+    # Assert
+    assert payload["sub_query"] is target
+    assert payload["user_context"] is state.user_context
+    assert "decomposer_response" not in payload
+    assert "datasource_resolver_response" not in payload
+    assert payload["subgraph_id"] == f"sql_agent:sq_1:{state.trace_id}"
+
+
+def test_wrapper_hands_models_to_subgraph_by_reference():
+    # Validates zero-copy handoff because dumping and re-validating state per branch is pure overhead.
+    # Arrange
+    state = _state()
+    target = state.decomposer_response.sub_queries[2]
+    error = PipelineError(
+        node="ast_planner", message="x", severity=ErrorSeverity.ERROR, error_code=ErrorCode.PLANNING_FAILURE
+    )
+    tables = [Table(name="orders")]
+    subgraph = _RecordingSubgraph({"relevant_tables": tables, "errors": [error], "retry_count": 2})
+    wrapped = wrap_subgraph(subgraph, "sql_agent", SimpleNamespace())
+    payload = build_scan_payload(state, "sql_agent", target.id, target)
+
+    # Act
+    sync_update = wrapped.invoke(payload)
+    async_update = asyncio.run(wrapped.ainvoke(payload))
+
+    # Assert
+    sent = subgraph.inputs[0]
+    assert sent["sub_query"] is target
+    assert sent["user_context"] is state.user_context
+    for update in (sync_update, async_update):
+        output = update["subgraph_outputs"][payload["subgraph_id"]]
+        assert output.sub_query is target
+        assert output.retry_count == 2
+        assert output.status == "error"
+        assert update["errors"] == [error]
+        assert update["artifact_refs"] == {}